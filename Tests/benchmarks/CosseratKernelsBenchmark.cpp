@@ -0,0 +1,292 @@
+// Microbenchmarks of the Lie group kernels of the Cosserat mappings and of full apply / applyJ / applyJT sweeps,
+// for the Vec3 (angular strain) and Vec6 (full strain) templates and several numbers of sections and frames.
+//
+// Google Benchmark prints the results, for machine readable output use e.g.
+//     Cosserat_benchmark --benchmark_format=json --benchmark_out=kernels.json --benchmark_repetitions=5
+// and compare two runs with the compare.py tool of Google Benchmark.
+
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/DiscreteCosseratMapping.h>
+
+#include <benchmark/benchmark.h>
+
+#include <sofa/component/statecontainer/MechanicalObject.h>
+#include <sofa/core/MechanicalParams.h>
+#include <sofa/simpleapi/SimpleApi.h>
+#include <sofa/simulation/Node.h>
+#include <sofa/simulation/Simulation.h>
+#include <sofa/simulation/graph/init.h>
+
+#include <sstream>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+namespace
+{
+using sofa::defaulttype::Rigid3Types;
+using sofa::defaulttype::Vec3Types;
+using sofa::defaulttype::Vec6Types;
+using sofa::component::statecontainer::MechanicalObject;
+using Cosserat::mapping::BaseCosseratMapping;
+using Cosserat::mapping::DiscreteCosseratMapping;
+using Cosserat::type::Transform;
+using Cosserat::type::TangentTransform;
+using sofa::type::Mat4x4;
+using sofa::type::Mat6x6;
+using sofa::type::Vec6;
+
+/// Gives access to the protected kernels of the mapping
+template <class In1>
+class KernelsMapping : public DiscreteCosseratMapping<In1, Rigid3Types, Rigid3Types>
+{
+public:
+    SOFA_CLASS(SOFA_TEMPLATE(KernelsMapping, In1), SOFA_TEMPLATE3(DiscreteCosseratMapping, In1, Rigid3Types, Rigid3Types));
+    using Base = BaseCosseratMapping<In1, Rigid3Types, Rigid3Types>;
+
+    using Base::computeExponentialSE3;
+    using Base::computeTangExpImplementation;
+    using Base::computeAdjoint;
+    using Base::computeCoAdjoint;
+    using Base::computeLogarithm;
+};
+
+template <class In1> typename In1::Coord testStrain();
+template <> Vec3Types::Coord testStrain<Vec3Types>() { return Vec3Types::Coord(0.1, -0.4, 0.7); }
+template <> Vec6Types::Coord testStrain<Vec6Types>() { return Vec6Types::Coord(0.1, -0.4, 0.7, 1.05, 0.02, -0.03); }
+
+const double sectionLength = 0.5;
+
+template <class In1>
+void BM_ExponentialSE3(benchmark::State &state)
+{
+    auto mapping = sofa::core::objectmodel::New<KernelsMapping<In1>>();
+    const auto strain = testStrain<In1>();
+    Transform transform;
+    for (auto _ : state)
+    {
+        mapping->computeExponentialSE3(sectionLength, strain, transform);
+        benchmark::DoNotOptimize(transform);
+    }
+}
+
+template <class In1>
+void BM_TangExp(benchmark::State &state)
+{
+    auto mapping = sofa::core::objectmodel::New<KernelsMapping<In1>>();
+    Vec6 strain;
+    const auto coord = testStrain<In1>();
+    for (unsigned int i = 0; i < coord.size(); ++i)
+        strain[i] = coord[i];
+    double x = sectionLength;
+    Mat6x6 tangent;
+    for (auto _ : state)
+    {
+        mapping->computeTangExpImplementation(x, strain, tangent);
+        benchmark::DoNotOptimize(tangent);
+    }
+}
+
+template <class In1>
+void BM_Adjoint(benchmark::State &state)
+{
+    auto mapping = sofa::core::objectmodel::New<KernelsMapping<In1>>();
+    Transform transform;
+    mapping->computeExponentialSE3(sectionLength, testStrain<In1>(), transform);
+    TangentTransform adjoint;
+    for (auto _ : state)
+    {
+        mapping->computeAdjoint(transform, adjoint);
+        benchmark::DoNotOptimize(adjoint);
+    }
+}
+
+template <class In1>
+void BM_CoAdjoint(benchmark::State &state)
+{
+    auto mapping = sofa::core::objectmodel::New<KernelsMapping<In1>>();
+    Transform transform;
+    mapping->computeExponentialSE3(sectionLength, testStrain<In1>(), transform);
+    Mat6x6 coAdjoint;
+    for (auto _ : state)
+    {
+        mapping->computeCoAdjoint(transform, coAdjoint);
+        benchmark::DoNotOptimize(coAdjoint);
+    }
+}
+
+template <class In1>
+void BM_Logarithm(benchmark::State &state)
+{
+    auto mapping = sofa::core::objectmodel::New<KernelsMapping<In1>>();
+    Transform transform;
+    mapping->computeExponentialSE3(sectionLength, testStrain<In1>(), transform);
+    const Mat4x4 matrix = mapping->convertTransformToMatrix4x4(transform);
+    for (auto _ : state)
+        benchmark::DoNotOptimize(mapping->computeLogarithm(sectionLength, matrix));
+}
+
+template <class In1>
+void BM_PiecewiseLogmap(benchmark::State &state)
+{
+    auto mapping = sofa::core::objectmodel::New<KernelsMapping<In1>>();
+    Transform transform;
+    mapping->computeExponentialSE3(sectionLength, testStrain<In1>(), transform);
+    const Mat4x4 matrix = mapping->convertTransformToMatrix4x4(transform);
+    Eigen::Matrix4d g;
+    for (unsigned int i = 0; i < 4; ++i)
+        for (unsigned int j = 0; j < 4; ++j)
+            g(i, j) = matrix[i][j];
+    for (auto _ : state)
+        benchmark::DoNotOptimize(mapping->piecewiseLogmap(g));
+}
+
+/// Rod of nbSections sections and nbFrames frames: strains, rigid base, frames and the mapping, initialized
+template <class In1>
+struct MappingScene
+{
+    using Mapping = DiscreteCosseratMapping<In1, Rigid3Types, Rigid3Types>;
+
+    sofa::simulation::Node::SPtr root;
+    Mapping *mapping{nullptr};
+    MechanicalObject<In1> *strains{nullptr};
+    MechanicalObject<Rigid3Types> *base{nullptr};
+    MechanicalObject<Rigid3Types> *frames{nullptr};
+
+    MappingScene(unsigned int nbSections, unsigned int nbFrames)
+    {
+        using sofa::simpleapi::createObject;
+        const double length = sectionLength * nbSections;
+        std::ostringstream strainsPosition, curvAbsSection, curvAbsFrames, framesPosition;
+        const auto strain = testStrain<In1>();
+        for (unsigned int s = 0; s < nbSections; ++s)
+            strainsPosition << strain << " ";
+        for (unsigned int s = 0; s <= nbSections; ++s)
+            curvAbsSection << s * sectionLength << " ";
+        for (unsigned int f = 0; f <= nbFrames; ++f)
+        {
+            curvAbsFrames << f * length / nbFrames << " ";
+            framesPosition << f * length / nbFrames << " 0 0 0 0 0 1 ";
+        }
+
+        root = sofa::simulation::getSimulation()->createNewGraph("root");
+        const std::string strainTemplate = std::is_same_v<In1, Vec3Types> ? "Vec3d" : "Vec6d";
+        strains = dynamic_cast<MechanicalObject<In1> *>(createObject(root, "MechanicalObject",
+            {{"name", "strains"}, {"template", strainTemplate}, {"position", strainsPosition.str()}}).get());
+        base = dynamic_cast<MechanicalObject<Rigid3Types> *>(createObject(root, "MechanicalObject",
+            {{"name", "base"}, {"template", "Rigid3d"}, {"position", "0 0 0 0 0 0 1"}}).get());
+        frames = dynamic_cast<MechanicalObject<Rigid3Types> *>(createObject(root, "MechanicalObject",
+            {{"name", "frames"}, {"template", "Rigid3d"}, {"position", framesPosition.str()}}).get());
+        mapping = dynamic_cast<Mapping *>(createObject(root, "DiscreteCosseratMapping",
+            {{"template", strainTemplate + ",Rigid3d,Rigid3d"}, {"input1", "@strains"}, {"input2", "@base"},
+             {"output", "@frames"}, {"curv_abs_input", curvAbsSection.str()},
+             {"curv_abs_output", curvAbsFrames.str()}}).get());
+        sofa::simulation::node::initRoot(root.get());
+
+        // Non null velocities and forces, so that applyJ and applyJT do the same work as in a simulation
+        auto strainVelocities = strains->writeVelocities();
+        for (auto &velocity : strainVelocities)
+            velocity = strain;
+        auto framesForces = frames->writeForces();
+        framesForces.resize(nbFrames + 1);
+        for (auto &force : framesForces)
+            force = Rigid3Types::Deriv(sofa::type::Vec3(0.0, 1.0, 0.0), sofa::type::Vec3(0.0, 0.0, 0.1));
+    }
+
+    ~MappingScene()
+    {
+        sofa::simulation::node::unload(root);
+    }
+};
+
+template <class In1>
+void BM_Apply(benchmark::State &state)
+{
+    MappingScene<In1> scene(state.range(0), state.range(1));
+    using Mapping = typename MappingScene<In1>::Mapping;
+    const sofa::type::vector<typename Mapping::OutDataVecCoord *> out{
+        scene.frames->write(sofa::core::VecCoordId::position())};
+    const sofa::type::vector<const typename Mapping::In1DataVecCoord *> in1{
+        scene.strains->read(sofa::core::ConstVecCoordId::position())};
+    const sofa::type::vector<const typename Mapping::In2DataVecCoord *> in2{
+        scene.base->read(sofa::core::ConstVecCoordId::position())};
+    for (auto _ : state)
+        scene.mapping->apply(sofa::core::mechanicalparams::defaultInstance(), out, in1, in2);
+    state.SetItemsProcessed(state.iterations() * state.range(1));
+}
+
+template <class In1>
+void BM_ApplyJ(benchmark::State &state)
+{
+    MappingScene<In1> scene(state.range(0), state.range(1));
+    using Mapping = typename MappingScene<In1>::Mapping;
+    const sofa::type::vector<typename Mapping::OutDataVecDeriv *> out{
+        scene.frames->write(sofa::core::VecDerivId::velocity())};
+    const sofa::type::vector<const typename Mapping::In1DataVecDeriv *> in1{
+        scene.strains->read(sofa::core::ConstVecDerivId::velocity())};
+    const sofa::type::vector<const typename Mapping::In2DataVecDeriv *> in2{
+        scene.base->read(sofa::core::ConstVecDerivId::velocity())};
+    for (auto _ : state)
+        scene.mapping->applyJ(sofa::core::mechanicalparams::defaultInstance(), out, in1, in2);
+    state.SetItemsProcessed(state.iterations() * state.range(1));
+}
+
+template <class In1>
+void BM_ApplyJT(benchmark::State &state)
+{
+    MappingScene<In1> scene(state.range(0), state.range(1));
+    using Mapping = typename MappingScene<In1>::Mapping;
+    const sofa::type::vector<typename Mapping::In1DataVecDeriv *> out1{
+        scene.strains->write(sofa::core::VecDerivId::force())};
+    const sofa::type::vector<typename Mapping::In2DataVecDeriv *> out2{
+        scene.base->write(sofa::core::VecDerivId::force())};
+    const sofa::type::vector<const typename Mapping::OutDataVecDeriv *> in{
+        scene.frames->read(sofa::core::ConstVecDerivId::force())};
+    for (auto _ : state)
+        scene.mapping->applyJT(sofa::core::mechanicalparams::defaultInstance(), out1, out2, in);
+    state.SetItemsProcessed(state.iterations() * state.range(1));
+}
+
+// {number of sections, number of frames}
+void sweepSizes(benchmark::internal::Benchmark *benchmark)
+{
+    for (const auto &sizes : std::vector<std::pair<int, int>>{{6, 12}, {24, 48}, {96, 192}, {24, 384}, {384, 768}})
+        benchmark->Args({sizes.first, sizes.second});
+    benchmark->ArgNames({"sections", "frames"})->Unit(benchmark::kMicrosecond);
+}
+
+} // namespace
+
+BENCHMARK_TEMPLATE(BM_ExponentialSE3, Vec3Types);
+BENCHMARK_TEMPLATE(BM_ExponentialSE3, Vec6Types);
+BENCHMARK_TEMPLATE(BM_TangExp, Vec3Types);
+BENCHMARK_TEMPLATE(BM_TangExp, Vec6Types);
+BENCHMARK_TEMPLATE(BM_Adjoint, Vec3Types);
+BENCHMARK_TEMPLATE(BM_Adjoint, Vec6Types);
+BENCHMARK_TEMPLATE(BM_CoAdjoint, Vec3Types);
+BENCHMARK_TEMPLATE(BM_CoAdjoint, Vec6Types);
+BENCHMARK_TEMPLATE(BM_Logarithm, Vec3Types);
+BENCHMARK_TEMPLATE(BM_Logarithm, Vec6Types);
+BENCHMARK_TEMPLATE(BM_PiecewiseLogmap, Vec3Types);
+BENCHMARK_TEMPLATE(BM_PiecewiseLogmap, Vec6Types);
+
+BENCHMARK_TEMPLATE(BM_Apply, Vec3Types)->Apply(sweepSizes);
+BENCHMARK_TEMPLATE(BM_Apply, Vec6Types)->Apply(sweepSizes);
+BENCHMARK_TEMPLATE(BM_ApplyJ, Vec3Types)->Apply(sweepSizes);
+BENCHMARK_TEMPLATE(BM_ApplyJ, Vec6Types)->Apply(sweepSizes);
+BENCHMARK_TEMPLATE(BM_ApplyJT, Vec3Types)->Apply(sweepSizes);
+BENCHMARK_TEMPLATE(BM_ApplyJT, Vec6Types)->Apply(sweepSizes);
+
+int main(int argc, char **argv)
+{
+    sofa::simulation::graph::init();
+    sofa::simpleapi::importPlugin("Sofa.Component.StateContainer");
+    sofa::simpleapi::importPlugin("Cosserat");
+
+    benchmark::Initialize(&argc, argv);
+    if (benchmark::ReportUnrecognizedArguments(argc, argv))
+        return 1;
+    benchmark::RunSpecifiedBenchmarks();
+    benchmark::Shutdown();
+    return 0;
+}
@@ -0,0 +1,283 @@
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/CosseratKinematics.h>
+
+#include <gtest/gtest.h>
+#include <sofa/testing/NumericTest.h>
+
+#include <cmath>
+
+using namespace Cosserat::kinematics;
+
+namespace {
+
+struct CosseratKinematicsTest : public sofa::testing::NumericTest<>
+{
+    FramesDistribution distribution;
+    vector<double> curvAbsSection{0.0, 1.0, 2.0, 3.0};
+    vector<double> curvAbsFrames{0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0};
+
+    void SetUp() override
+    {
+        computeFramesDistribution(curvAbsSection, curvAbsFrames, distribution);
+    }
+};
+
+TEST_F(CosseratKinematicsTest, framesDistribution)
+{
+    const vector<unsigned int> indices{1, 1, 1, 2, 2, 3, 3};
+    ASSERT_EQ(distribution.indices.size(), curvAbsFrames.size());
+    EXPECT_EQ(distribution.beamLength.size(), curvAbsSection.size() - 1);
+    for (size_t i = 0; i < indices.size(); ++i)
+    {
+        EXPECT_EQ(distribution.indices[i], indices[i]) << "frame " << i;
+        EXPECT_NEAR(distribution.framesLength[i],
+                    curvAbsFrames[i] - curvAbsSection[indices[i] - 1], 1e-12) << "frame " << i;
+    }
+}
+
+TEST_F(CosseratKinematicsTest, sparseFramesMatchDenseFrames)
+{
+    // Frames sparser than the sections (tip only, or skipping sections) must get the same section, length,
+    // pose and jacobian as the same abscissas among dense frames
+    const vector<Vec6> strains{Vec6(0.1, -0.3, 0.5, 0.02, 0, 0), Vec6(-0.2, 0.4, 0.1, 0, 0.01, 0),
+                               Vec6(0.3, 0.2, -0.6, 0, 0, -0.03)};
+    const Transform base(Vec3(0.1, 0.2, 0.3), sofa::type::Quat<double>(0.0, 0.0, std::sin(0.2), std::cos(0.2)));
+    const size_t nbCols = 6 + 3 * 6;
+
+    vector<Transform> denseFrames;
+    computeFramesPoses(base, strains, distribution, denseFrames);
+
+    // Sparse abscissas and the index of the same abscissa among curvAbsFrames
+    const vector<vector<std::pair<double, unsigned int>>> cases{
+        {{3.0, 6}}, {{2.5, 5}}, {{0.0, 0}, {3.0, 6}}, {{0.5, 1}, {2.5, 5}, {3.0, 6}}, {{3.0, 6}, {3.0, 6}}};
+    for (const auto &frames : cases)
+    {
+        vector<double> sparseAbs;
+        vector<unsigned int> denseIndices, sparseIndices;
+        for (const auto &[curvAbs, dense] : frames)
+        {
+            sparseIndices.push_back(static_cast<unsigned int>(sparseAbs.size()));
+            sparseAbs.push_back(curvAbs);
+            denseIndices.push_back(dense);
+        }
+
+        FramesDistribution sparse;
+        computeFramesDistribution(curvAbsSection, sparseAbs, sparse);
+        ASSERT_EQ(sparse.indices.size(), sparseAbs.size());
+
+        vector<Transform> sparseFrames;
+        computeFramesPoses(base, strains, sparse, sparseFrames);
+
+        vector<double> denseJ(6 * nbCols * frames.size()), sparseJ(6 * nbCols * frames.size());
+        computeFramesJacobians(base, strains, 6, distribution, denseIndices, denseJ.data());
+        computeFramesJacobians(base, strains, 6, sparse, sparseIndices, sparseJ.data());
+
+        for (size_t i = 0; i < frames.size(); ++i)
+        {
+            const unsigned int dense = denseIndices[i];
+            EXPECT_EQ(sparse.indices[i], distribution.indices[dense]) << "abscissa " << sparseAbs[i];
+            EXPECT_NEAR(sparse.framesLength[i], distribution.framesLength[dense], 1e-12) << "abscissa " << sparseAbs[i];
+            EXPECT_LT((sparseFrames[i].getOrigin() - denseFrames[dense].getOrigin()).norm(), 1e-12);
+            for (unsigned int k = 0; k < 4; ++k)
+                EXPECT_NEAR(sparseFrames[i].getOrientation()[k], denseFrames[dense].getOrientation()[k], 1e-12);
+        }
+        for (size_t k = 0; k < sparseJ.size(); ++k)
+            EXPECT_NEAR(sparseJ[k], denseJ[k], 1e-12) << "entry " << k;
+    }
+}
+
+TEST_F(CosseratKinematicsTest, straightRod)
+{
+    vector<Vec6> strains(3, Vec6());
+    vector<Transform> frames;
+    computeFramesPoses(Transform::identity(), strains, distribution, frames);
+
+    ASSERT_EQ(frames.size(), curvAbsFrames.size());
+    for (size_t i = 0; i < frames.size(); ++i)
+    {
+        EXPECT_NEAR(frames[i].getOrigin()[0], curvAbsFrames[i], 1e-12);
+        EXPECT_NEAR(frames[i].getOrigin()[1], 0.0, 1e-12);
+        EXPECT_NEAR(frames[i].getOrigin()[2], 0.0, 1e-12);
+    }
+}
+
+TEST_F(CosseratKinematicsTest, constantCurvatureIsACircle)
+{
+    const double k = 0.7;
+    vector<Vec6> strains(3, Vec6(0, 0, k, 0, 0, 0));
+    vector<Transform> frames;
+    computeFramesPoses(Transform::identity(), strains, distribution, frames);
+
+    for (size_t i = 0; i < frames.size(); ++i)
+    {
+        const double s = curvAbsFrames[i];
+        EXPECT_NEAR(frames[i].getOrigin()[0], std::sin(k * s) / k, 1e-9) << "frame " << i;
+        EXPECT_NEAR(frames[i].getOrigin()[1], (1.0 - std::cos(k * s)) / k, 1e-9) << "frame " << i;
+    }
+}
+
+TEST_F(CosseratKinematicsTest, tangExpOfZeroStrain)
+{
+    // T(x) = x Id + x^2 / 2 ad(e4), e4 being the reference elongation along x
+    Mat6x6 expected;
+    for (unsigned int i = 0; i < 6; ++i)
+        expected[i][i] = 0.5;
+    expected[4][2] = -0.125;
+    expected[5][1] = 0.125;
+
+    Mat6x6 TgX;
+    computeTangExp(0.5, Vec6(), TgX);
+    for (unsigned int i = 0; i < 6; ++i)
+        for (unsigned int j = 0; j < 6; ++j)
+            EXPECT_NEAR(TgX[i][j], expected[i][j], 1e-12) << i << ", " << j;
+}
+
+TEST_F(CosseratKinematicsTest, nearZeroCurvatureIsContinuous)
+{
+    // Close to a null curvature, across the switch between the series and the closed form (x theta = 0.1
+    // between theta = 0.19995 and its neighbour) and with the closed form
+    for (const double theta : {1e-12, 1e-8, 1e-4, 0.19995, 0.3})
+    {
+        const Vec3 direction(0.3, -0.8, 0.52);
+        const Vec6 strain(theta * direction[0], theta * direction[1], theta * direction[2], 0.01, 0.02, -0.03);
+        const Vec6 neighbour(1.0001 * strain[0], 1.0001 * strain[1], 1.0001 * strain[2], 0.01, 0.02, -0.03);
+
+        Transform g, gNeighbour;
+        computeExponentialSE3(0.5, strain, g);
+        computeExponentialSE3(0.5, neighbour, gNeighbour);
+        EXPECT_LT((g.getOrigin() - gNeighbour.getOrigin()).norm(), 1e-4 * theta + 1e-14) << "theta " << theta;
+
+        Mat6x6 TgX, TgXNeighbour;
+        computeTangExp(0.5, strain, TgX);
+        computeTangExp(0.5, neighbour, TgXNeighbour);
+        for (unsigned int i = 0; i < 6; ++i)
+            for (unsigned int j = 0; j < 6; ++j)
+                EXPECT_NEAR(TgX[i][j], TgXNeighbour[i][j], 1e-4 * theta + 1e-14) << "theta " << theta;
+    }
+}
+
+TEST_F(CosseratKinematicsTest, jacobianOfTheBaseVelocity)
+{
+    // For a straight rod a base translation moves every frame by the same amount
+    vector<Vec6> strains(3, Vec6());
+    const vector<unsigned int> frameIndices{6};
+    const size_t nbCols = 6 + 3 * 3;
+    vector<double> J(6 * nbCols);
+    computeFramesJacobians(Transform::identity(), strains, 3, distribution, frameIndices, J.data());
+
+    for (unsigned int r = 0; r < 3; ++r)
+        for (unsigned int c = 0; c < 3; ++c)
+            EXPECT_NEAR(J[r * nbCols + c], r == c ? 1.0 : 0.0, 1e-12);
+}
+
+TEST_F(CosseratKinematicsTest, magnusOfAConstantStrain)
+{
+    const Vec6 strain(0.1, -0.4, 0.7, 0.05, 0.0, -0.02);
+    for (auto interpolation : {StrainInterpolation::Magnus2, StrainInterpolation::Magnus4})
+    {
+        const Vec6 integrated = computeMagnusStrain(0.6, 1.0, strain, strain, interpolation);
+        for (unsigned int k = 0; k < 6; ++k)
+            EXPECT_NEAR(integrated[k], strain[k], 1e-12);
+    }
+}
+
+TEST_F(CosseratKinematicsTest, magnusOfALinearStrain)
+{
+    // Reference: product of many piecewise constant exponentials along the section
+    const Vec6 begin(0.0, 0.2, 0.5, 0.0, 0.0, 0.0);
+    const Vec6 end(0.3, -0.4, 1.5, 0.0, 0.0, 0.0);
+    const double length = 1.0;
+    const unsigned int nbSteps = 2000;
+    Transform reference = Transform::identity();
+    for (unsigned int n = 0; n < nbSteps; ++n)
+    {
+        const double s = (n + 0.5) * length / nbSteps;
+        Transform step;
+        computeExponentialSE3(length / nbSteps, begin + (end - begin) * (s / length), step);
+        reference = reference * step;
+    }
+
+    Transform pcs, magnus2, magnus4;
+    computeExponentialSE3(length, begin, pcs);
+    computeExponentialSE3(length, computeMagnusStrain(length, length, begin, end, StrainInterpolation::Magnus2), magnus2);
+    computeExponentialSE3(length, computeMagnusStrain(length, length, begin, end, StrainInterpolation::Magnus4), magnus4);
+
+    const double errorPcs = (pcs.getOrigin() - reference.getOrigin()).norm();
+    const double error2 = (magnus2.getOrigin() - reference.getOrigin()).norm();
+    const double error4 = (magnus4.getOrigin() - reference.getOrigin()).norm();
+    EXPECT_LT(error2, errorPcs);
+    EXPECT_LT(error4, 0.1 * error2);
+}
+
+TEST_F(CosseratKinematicsTest, nodesStrain)
+{
+    const vector<Vec6> strains{Vec6(1, 0, 0, 0, 0, 0), Vec6(3, 0, 0, 0, 0, 0)};
+    vector<Vec6> nodesStrain;
+    computeNodesStrain(strains, {1.0, 3.0}, nodesStrain);
+    ASSERT_EQ(nodesStrain.size(), 3u);
+    EXPECT_NEAR(nodesStrain[0][0], 1.0, 1e-12);
+    EXPECT_NEAR(nodesStrain[1][0], 1.5, 1e-12);
+    EXPECT_NEAR(nodesStrain[2][0], 3.0, 1e-12);
+}
+
+TEST_F(CosseratKinematicsTest, framesComplianceMatchesTheJacobians)
+{
+    const vector<Vec6> strains{Vec6(0.1, -0.3, 0.5, 0, 0, 0), Vec6(-0.2, 0.4, 0.1, 0, 0, 0), Vec6(0.3, 0.2, -0.6, 0, 0, 0)};
+    const Transform base(Vec3(0.1, 0.2, 0.3), sofa::type::Quat<double>(0.0, 0.0, std::sin(0.2), std::cos(0.2)));
+    const size_t nbFrames = curvAbsFrames.size();
+
+    vector<Transform> sectionsExp(3), framesExp(nbFrames);
+    vector<Mat6x6> sectionsTang(3), framesTang(nbFrames);
+    vector<Mat3x3> compliance(3);
+    for (size_t s = 0; s < 3; ++s)
+    {
+        computeExponentialSE3(distribution.beamLength[s], strains[s], sectionsExp[s]);
+        computeTangExp(distribution.beamLength[s], strains[s], sectionsTang[s]);
+        compliance[s] = Mat3x3(Vec3(1.0 / (s + 1), 0.1, 0.0), Vec3(0.1, 0.5, 0.0), Vec3(0.0, 0.0, 2.0));
+    }
+    for (size_t f = 0; f < nbFrames; ++f)
+    {
+        const unsigned int section = distribution.indices[f] - 1;
+        computeExponentialSE3(distribution.framesLength[f], strains[section], framesExp[f]);
+        computeTangExp(distribution.framesLength[f], strains[section], framesTang[f]);
+    }
+
+    const vector<vector<FrameConstraintEntry>> rows{
+        {{6, Vec6(1, 0, 0, 0, 0, 0)}},
+        {{3, Vec6(0, 1, 0, 0, 0.5, 0)}},
+        {{1, Vec6(0, 0, 1, 0, 0, 0)}, {5, Vec6(0, -1, 0, 0, 0, 0)}},
+        {{4, Vec6(0, 0, 0, 0, 0, 1)}}};
+    vector<double> W(rows.size() * rows.size());
+    computeFramesCompliance(base, sectionsExp, sectionsTang, distribution.indices, framesExp, framesTang,
+                            compliance, rows, W.data());
+
+    // Reference: W = J C J^t with the jacobians of the frames
+    vector<unsigned int> frameIndices(nbFrames);
+    for (unsigned int f = 0; f < nbFrames; ++f)
+        frameIndices[f] = f;
+    const size_t nbCols = 6 + 3 * 3;
+    vector<double> J(nbFrames * 6 * nbCols);
+    computeFramesJacobians(base, strains, 3, distribution, frameIndices, J.data());
+
+    vector<vector<double>> strainRows(rows.size(), vector<double>(9, 0.0));
+    for (size_t r = 0; r < rows.size(); ++r)
+        for (const auto &entry : rows[r])
+            for (unsigned int k = 0; k < 6; ++k)
+                for (unsigned int c = 0; c < 9; ++c)
+                    strainRows[r][c] += entry.direction[k] * J[(entry.frame * 6 + k) * nbCols + 6 + c];
+
+    for (size_t r1 = 0; r1 < rows.size(); ++r1)
+    {
+        for (size_t r2 = 0; r2 < rows.size(); ++r2)
+        {
+            double expected = 0.0;
+            for (unsigned int s = 0; s < 3; ++s)
+                for (unsigned int i = 0; i < 3; ++i)
+                    for (unsigned int j = 0; j < 3; ++j)
+                        expected += strainRows[r1][3 * s + i] * compliance[s][i][j] * strainRows[r2][3 * s + j];
+            EXPECT_NEAR(W[r1 * rows.size() + r2], expected, 1e-10) << "rows " << r1 << ", " << r2;
+        }
+    }
+}
+
+} // namespace
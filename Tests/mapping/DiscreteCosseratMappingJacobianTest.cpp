@@ -0,0 +1,88 @@
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/DiscreteCosseratMapping.h>
+
+#include "MappingJacobianHarness.h"
+
+#include <gtest/gtest.h>
+#include <sofa/simpleapi/SimpleApi.h>
+#include <sofa/testing/BaseTest.h>
+
+#include <iostream>
+#include <random>
+#include <string>
+
+using sofa::defaulttype::Rigid3Types;
+using sofa::defaulttype::Vec3Types;
+using sofa::defaulttype::Vec6Types;
+using Cosserat::mapping::DiscreteCosseratMapping;
+using Cosserat::testing::JacobianErrors;
+using Cosserat::testing::MappingJacobianHarness;
+
+namespace {
+
+template <class In1>
+struct DiscreteCosseratMappingJacobianTest : public sofa::testing::BaseTest
+{
+    using Harness = MappingJacobianHarness<DiscreteCosseratMapping<In1, Rigid3Types, Rigid3Types>>;
+
+    // Sections of different lengths, several frames per section, frames on the nodes
+    const sofa::type::vector<double> curvAbsSection{0.0, 0.3, 0.5, 0.9, 1.2, 1.5};
+    const sofa::type::vector<double> curvAbsFrames{0.0, 0.1, 0.3, 0.35, 0.5, 0.7, 0.9, 1.0, 1.2, 1.3, 1.4, 1.5};
+
+    void SetUp() override
+    {
+        sofa::simpleapi::importPlugin("Sofa.Component.StateContainer");
+        sofa::simpleapi::importPlugin("Cosserat");
+    }
+
+    /// Largest errors over nbConfigurations random configurations with angular strains of norm curvature
+    JacobianErrors checkRandomConfigurations(double curvature, const std::string &interpolation = "constant",
+                                             unsigned int nbConfigurations = 10)
+    {
+        Harness harness(curvAbsSection, curvAbsFrames, "DiscreteCosseratMapping",
+                        {{"strainInterpolation", interpolation}});
+        EXPECT_TRUE(harness.isValid());
+        if (!harness.isValid())
+            return {};
+
+        std::mt19937 generator(42);
+        JacobianErrors errors;
+        for (unsigned int c = 0; c < nbConfigurations; ++c)
+        {
+            const auto strains = harness.randomStrains(generator, curvature);
+            const auto base = harness.randomBase(generator);
+            errors.keepMax(harness.check(strains, base, generator));
+        }
+        std::cout << interpolation << ", curvature " << curvature << ": " << errors << std::endl;
+        return errors;
+    }
+};
+
+using StrainTypes = ::testing::Types<Vec3Types, Vec6Types>;
+TYPED_TEST_SUITE(DiscreteCosseratMappingJacobianTest, StrainTypes);
+
+TYPED_TEST(DiscreteCosseratMappingJacobianTest, consistency)
+{
+    for (const double curvature : {3.0, 1.0, 0.1, 1e-3, 1e-8, 0.0})
+    {
+        const JacobianErrors errors = this->checkRandomConfigurations(curvature);
+        EXPECT_LT(errors.applyJ, 1e-6) << "curvature " << curvature;
+        EXPECT_LT(errors.applyJT, 1e-10) << "curvature " << curvature;
+        EXPECT_LT(errors.constraintJT, 1e-10) << "curvature " << curvature;
+    }
+}
+
+TYPED_TEST(DiscreteCosseratMappingJacobianTest, consistencyWithMagnusInterpolation)
+{
+    // The integrated strain of a section depends on the strains of its neighbours
+    for (const std::string interpolation : {"magnus2", "magnus4"})
+        for (const double curvature : {3.0, 0.1, 0.0})
+        {
+            const JacobianErrors errors = this->checkRandomConfigurations(curvature, interpolation);
+            EXPECT_LT(errors.applyJ, 1e-6) << interpolation << ", curvature " << curvature;
+            EXPECT_LT(errors.applyJT, 1e-10) << interpolation << ", curvature " << curvature;
+            EXPECT_LT(errors.constraintJT, 1e-10) << interpolation << ", curvature " << curvature;
+        }
+}
+
+} // namespace
@@ -0,0 +1,98 @@
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/DiscreteDynamicCosseratMapping.h>
+
+#include "MappingJacobianHarness.h"
+
+#include <gtest/gtest.h>
+#include <sofa/simpleapi/SimpleApi.h>
+#include <sofa/testing/BaseTest.h>
+
+#include <algorithm>
+#include <iostream>
+#include <random>
+
+using sofa::defaulttype::Rigid3Types;
+using sofa::defaulttype::Vec3Types;
+using Cosserat::mapping::DiscreteDynamicCosseratMapping;
+using Cosserat::testing::MappingJacobianHarness;
+
+namespace {
+
+struct DiscreteDynamicCosseratMappingTest : public sofa::testing::BaseTest
+{
+    using Harness = MappingJacobianHarness<DiscreteDynamicCosseratMapping<Vec3Types, Rigid3Types, Rigid3Types>>;
+
+    // Sections of different lengths, several frames per section, frames on the nodes
+    const sofa::type::vector<double> curvAbsSection{0.0, 0.3, 0.5, 0.9, 1.2, 1.5};
+    const sofa::type::vector<double> curvAbsFrames{0.0, 0.1, 0.3, 0.35, 0.5, 0.7, 0.9, 1.0, 1.2, 1.3, 1.4, 1.5};
+
+    void SetUp() override
+    {
+        sofa::simpleapi::importPlugin("Sofa.Component.StateContainer");
+        sofa::simpleapi::importPlugin("Sofa.Component.Mass");
+        sofa::simpleapi::importPlugin("Cosserat");
+    }
+};
+
+TEST_F(DiscreteDynamicCosseratMappingTest, accelerationBiasMatchesFiniteDifferences)
+{
+    // The inertial wrenches, and the bias accelerations they use, are only computed with a mass on the frames
+    Harness harness(curvAbsSection, curvAbsFrames, "DiscreteDynamicCosseratMapping", {{"frameMass", "@framesMass"}},
+                    {{"totalMass", "1.2"}});
+    ASSERT_TRUE(harness.isValid());
+
+    std::mt19937 generator(42);
+    for (const double curvature : {3.0, 0.1, 0.0})
+    {
+        double error = 0.0;
+        for (unsigned int c = 0; c < 10; ++c)
+        {
+            const auto strains = harness.randomStrains(generator, curvature);
+            const auto base = harness.randomBase(generator);
+            error = std::max(error, harness.checkAccelerationBias(strains, base, generator));
+        }
+        std::cout << "curvature " << curvature << ": acceleration bias " << error << std::endl;
+        EXPECT_LT(error, 1e-6) << "curvature " << curvature;
+    }
+}
+
+TEST_F(DiscreteDynamicCosseratMappingTest, inertialWrenchesFollowTheMassOfTheFrames)
+{
+    // The mass is read from the UniformMass of the frames, found in their node without the link
+    Harness light(curvAbsSection, curvAbsFrames, "DiscreteDynamicCosseratMapping", {}, {{"totalMass", "1.2"}});
+    Harness heavy(curvAbsSection, curvAbsFrames, "DiscreteDynamicCosseratMapping", {}, {{"totalMass", "3.6"}});
+    ASSERT_TRUE(light.isValid());
+    ASSERT_TRUE(heavy.isValid());
+
+    std::mt19937 generator(42);
+    const auto strains = light.randomStrains(generator, 2.0);
+    const auto base = light.randomBase(generator);
+    std::normal_distribution<double> normal;
+    Harness::In1VecDeriv strainsVelocity(curvAbsSection.size() - 1);
+    for (auto &velocity : strainsVelocity)
+        for (auto &value : velocity)
+            value = normal(generator);
+    Harness::In2Deriv baseVelocity;
+    for (unsigned int k = 0; k < 6; ++k)
+        baseVelocity[k] = normal(generator);
+
+    for (auto *harness : {&light, &heavy})
+    {
+        harness->setConfiguration(strains, base);
+        harness->applyJToVelocities(strainsVelocity, baseVelocity);
+    }
+    const auto &lightWrench = light.mapping()->getFramesInertialWrench();
+    const auto &heavyWrench = heavy.mapping()->getFramesInertialWrench();
+    ASSERT_EQ(lightWrench.size(), curvAbsFrames.size());
+    ASSERT_EQ(heavyWrench.size(), curvAbsFrames.size());
+    double norm = 0.0;
+    for (size_t f = 0; f < lightWrench.size(); ++f)
+    {
+        norm = std::max(norm, lightWrench[f].norm());
+        for (unsigned int k = 0; k < 6; ++k)
+            EXPECT_NEAR(heavyWrench[f][k], 3.0 * lightWrench[f][k], 1e-10 * std::max(1.0, std::abs(heavyWrench[f][k])));
+    }
+    EXPECT_GT(norm, 0.0);
+}
+
+} // namespace
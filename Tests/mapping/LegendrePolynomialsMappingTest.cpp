@@ -0,0 +1,205 @@
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/LegendrePolynomialsMapping.h>
+
+#include <gtest/gtest.h>
+#include <sofa/component/statecontainer/MechanicalObject.h>
+#include <sofa/core/ConstraintParams.h>
+#include <sofa/core/MechanicalParams.h>
+#include <sofa/simpleapi/SimpleApi.h>
+#include <sofa/simulation/Node.h>
+#include <sofa/simulation/Simulation.h>
+#include <sofa/testing/BaseTest.h>
+
+#include <algorithm>
+#include <cmath>
+#include <random>
+#include <sstream>
+
+using sofa::defaulttype::Vec3Types;
+using sofa::component::mapping::LegendrePolynomialsMapping;
+using sofa::component::statecontainer::MechanicalObject;
+
+namespace {
+
+struct LegendrePolynomialsMappingTest : public sofa::testing::BaseTest
+{
+    using Mapping = LegendrePolynomialsMapping<Vec3Types, Vec3Types>;
+    using VecCoord = Vec3Types::VecCoord;
+    using VecDeriv = Vec3Types::VecDeriv;
+    using MatrixDeriv = Vec3Types::MatrixDeriv;
+
+    static constexpr unsigned int order = 5;
+    const sofa::type::vector<double> curvAbs{0.0, 0.1, 0.35, 0.5, 0.8, 1.0};
+    const size_t nbSections = curvAbs.size() - 1;
+
+    sofa::simulation::Node::SPtr root;
+    MechanicalObject<Vec3Types> *coefficients{nullptr};
+    Mapping *mapping{nullptr};
+    std::mt19937 generator{42};
+    std::normal_distribution<double> normal;
+
+    void SetUp() override
+    {
+        using sofa::simpleapi::createObject;
+        sofa::simpleapi::importPlugin("Sofa.Component.StateContainer");
+        sofa::simpleapi::importPlugin("Cosserat");
+
+        std::ostringstream abscissa, position;
+        for (const double x : curvAbs)
+            abscissa << x << " ";
+        for (unsigned int n = 0; n < order; ++n)
+            position << "0 0 0 ";
+
+        root = sofa::simulation::getSimulation()->createNewGraph("root");
+        coefficients = dynamic_cast<MechanicalObject<Vec3Types> *>(createObject(root, "MechanicalObject",
+            {{"name", "coefficients"}, {"template", "Vec3d"}, {"position", position.str()}}).get());
+        createObject(root, "MechanicalObject", {{"name", "strains"}, {"template", "Vec3d"}});
+        mapping = dynamic_cast<Mapping *>(createObject(root, "LegendrePolynomialsMapping",
+            {{"template", "Vec3d,Vec3d"}, {"input", "@coefficients"}, {"output", "@strains"},
+             {"order", std::to_string(order)}, {"curvAbscissa", abscissa.str()}}).get());
+        sofa::simulation::node::initRoot(root.get());
+    }
+
+    void TearDown() override
+    {
+        sofa::simulation::node::unload(root);
+    }
+
+    template <class VecType>
+    VecType random(size_t size)
+    {
+        VecType result(size);
+        for (auto &value : result)
+            for (unsigned int k = 0; k < 3; ++k)
+                value[k] = normal(generator);
+        return result;
+    }
+
+    VecDeriv applyJ(const VecDeriv &velocity)
+    {
+        sofa::Data<VecDeriv> in, out;
+        in.setValue(velocity);
+        mapping->applyJ(sofa::core::mechanicalparams::defaultInstance(), out, in);
+        return out.getValue();
+    }
+
+    VecDeriv applyJT(const VecDeriv &force)
+    {
+        sofa::Data<VecDeriv> in, out;
+        in.setValue(force);
+        out.setValue(VecDeriv(order));
+        mapping->applyJT(sofa::core::mechanicalparams::defaultInstance(), out, in);
+        return out.getValue();
+    }
+
+    /// Closed form of the Legendre polynomial of degree n <= 4
+    static double legendre(unsigned int n, double x)
+    {
+        switch (n)
+        {
+        case 0: return 1.0;
+        case 1: return x;
+        case 2: return 0.5 * (3 * x * x - 1);
+        case 3: return 0.5 * (5 * x * x * x - 3 * x);
+        default: return (35 * x * x * x * x - 30 * x * x + 3) / 8;
+        }
+    }
+};
+
+TEST_F(LegendrePolynomialsMappingTest, basisMatchesClosedForm)
+{
+    ASSERT_NE(mapping, nullptr);
+    const auto &basis = mapping->getMatOfCoeffs();
+    ASSERT_EQ(static_cast<size_t>(basis.rows()), nbSections);
+    ASSERT_EQ(static_cast<unsigned int>(basis.cols()), order);
+    for (size_t i = 0; i < nbSections; ++i)
+        for (unsigned int n = 0; n < order; ++n)
+        {
+            // The strain of a section is the one at its end
+            EXPECT_NEAR(basis(i, n), legendre(n, curvAbs[i + 1]), 1e-14) << "P_" << n << " in section " << i;
+            EXPECT_NEAR(mapping->legendrePoly(n, curvAbs[i + 1]), legendre(n, curvAbs[i + 1]), 1e-14);
+        }
+}
+
+TEST_F(LegendrePolynomialsMappingTest, applyIsTheBasisProduct)
+{
+    ASSERT_NE(mapping, nullptr);
+    const VecCoord in = random<VecCoord>(order);
+    sofa::Data<VecCoord> dIn, dOut;
+    dIn.setValue(in);
+    mapping->apply(sofa::core::mechanicalparams::defaultInstance(), dOut, dIn);
+    const VecCoord &out = dOut.getValue();
+    ASSERT_EQ(out.size(), nbSections);
+    for (size_t i = 0; i < nbSections; ++i)
+    {
+        sofa::type::Vec3 expected;
+        for (unsigned int n = 0; n < order; ++n)
+            expected += in[n] * legendre(n, curvAbs[i + 1]);
+        for (unsigned int k = 0; k < 3; ++k)
+            EXPECT_NEAR(out[i][k], expected[k], 1e-12) << "section " << i;
+    }
+
+    // The mapping is linear, applyJ is apply
+    const VecDeriv velocity = applyJ(in);
+    for (size_t i = 0; i < nbSections; ++i)
+        for (unsigned int k = 0; k < 3; ++k)
+            EXPECT_NEAR(velocity[i][k], out[i][k], 1e-14);
+}
+
+TEST_F(LegendrePolynomialsMappingTest, applyJTIsTheTransposeOfApplyJ)
+{
+    ASSERT_NE(mapping, nullptr);
+    for (unsigned int d = 0; d < 4; ++d)
+    {
+        // <J v, f> = <v, J^T f>
+        const VecDeriv velocity = random<VecDeriv>(order);
+        const VecDeriv force = random<VecDeriv>(nbSections);
+        const VecDeriv outVelocity = applyJ(velocity);
+        const VecDeriv inForce = applyJT(force);
+        double work = 0.0, dualWork = 0.0;
+        for (size_t i = 0; i < nbSections; ++i)
+            work += outVelocity[i] * force[i];
+        for (unsigned int n = 0; n < order; ++n)
+            dualWork += velocity[n] * inForce[n];
+        EXPECT_NEAR(work, dualWork, 1e-12 * std::max(1.0, std::abs(work)));
+    }
+}
+
+TEST_F(LegendrePolynomialsMappingTest, constraintApplyJTMatchesForceApplyJT)
+{
+    ASSERT_NE(mapping, nullptr);
+    // Row 0 on one section, row 1 on two sections (the same one twice) and one more
+    MatrixDeriv constraints;
+    std::vector<VecDeriv> rowsForce(2, VecDeriv(nbSections));
+    const std::vector<std::vector<size_t>> rowSections{{2}, {0, 4, 4}};
+    for (unsigned int r = 0; r < 2; ++r)
+    {
+        auto row = constraints.writeLine(r);
+        for (const size_t section : rowSections[r])
+        {
+            Vec3Types::Deriv direction(normal(generator), normal(generator), normal(generator));
+            row.addCol(section, direction);
+            rowsForce[r][section] += direction;
+        }
+    }
+
+    sofa::Data<MatrixDeriv> dIn, dOut;
+    dIn.setValue(constraints);
+    mapping->applyJT(sofa::core::constraintparams::defaultInstance(), dOut, dIn);
+    const MatrixDeriv &out = dOut.getValue();
+
+    for (unsigned int r = 0; r < 2; ++r)
+    {
+        const VecDeriv expected = applyJT(rowsForce[r]);
+        VecDeriv row(order);
+        for (auto rowIt = out.begin(); rowIt != out.end(); ++rowIt)
+            if (rowIt.index() == r)
+                for (auto colIt = rowIt.begin(); colIt != rowIt.end(); ++colIt)
+                    row[colIt.index()] += colIt.val();
+        for (unsigned int n = 0; n < order; ++n)
+            for (unsigned int k = 0; k < 3; ++k)
+                EXPECT_NEAR(row[n][k], expected[n][k], 1e-12) << "row " << r << ", order " << n;
+    }
+}
+
+} // namespace
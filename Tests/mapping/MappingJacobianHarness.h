@@ -0,0 +1,454 @@
+#pragma once
+
+#include <Cosserat/config.h>
+
+#include <sofa/component/statecontainer/MechanicalObject.h>
+#include <sofa/core/ConstraintParams.h>
+#include <sofa/core/MechanicalParams.h>
+#include <sofa/simpleapi/SimpleApi.h>
+#include <sofa/simulation/Node.h>
+#include <sofa/simulation/Simulation.h>
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <map>
+#include <ostream>
+#include <random>
+#include <sstream>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace Cosserat::testing
+{
+
+/// Largest relative errors found by MappingJacobianHarness::check
+struct JacobianErrors
+{
+    double applyJ{0.0};       ///< applyJ against the central differences of apply
+    double applyJT{0.0};      ///< <J v, f> against <v, J^T f>, applyJT (forces) being the adjoint of applyJ
+    double constraintJT{0.0}; ///< rows of applyJT (constraints) against applyJT (forces) of the same rows
+
+    void keepMax(const JacobianErrors &other)
+    {
+        applyJ = std::max(applyJ, other.applyJ);
+        applyJT = std::max(applyJT, other.applyJT);
+        constraintJT = std::max(constraintJT, other.constraintJT);
+    }
+};
+
+inline std::ostream &operator<<(std::ostream &out, const JacobianErrors &errors)
+{
+    return out << "applyJ " << errors.applyJ << ", applyJT " << errors.applyJT << ", constraint applyJT "
+               << errors.constraintJT;
+}
+
+/// Consistency checks of the Jacobian of a Cosserat mapping (strains and rigid base to rigid frames) with its apply,
+/// to validate a new implementation of the kernels of DiscreteCosseratMapping:
+///  - applyJ against the central differences of apply, for random velocities of the strains and of the base
+///  - applyJT (forces) against applyJ, <J v, f> = <v, J^T f> for random velocities v and forces f
+///  - applyJT (constraints) against applyJT (forces), row by row, for random constraint rows on the frames
+///  - with checkAccelerationBias, the bias accelerations of the frames computed by a dynamic mapping against the
+///    central differences of the velocities of the frames
+///
+/// The harness builds a rod (strains, base, frames and the mapping given by its type name, with optional extra
+/// attributes) in its own graph, the first frame must be at the curvilinear abscissa 0. With framesMassAttributes,
+/// a UniformMass named framesMass is added on the frames. The Cosserat plugin must be loaded, and Sofa.Component.Mass
+/// for the mass.
+template <class TMapping>
+class MappingJacobianHarness
+{
+public:
+    using Mapping = TMapping;
+    using In1 = typename Mapping::In1;
+    using In2 = typename Mapping::In2;
+    using Out = typename Mapping::Out;
+    using In1VecCoord = typename In1::VecCoord;
+    using In1VecDeriv = typename In1::VecDeriv;
+    using In1MatrixDeriv = typename In1::MatrixDeriv;
+    using In2Coord = typename In2::Coord;
+    using In2Deriv = typename In2::Deriv;
+    using In2VecCoord = typename In2::VecCoord;
+    using In2VecDeriv = typename In2::VecDeriv;
+    using In2MatrixDeriv = typename In2::MatrixDeriv;
+    using OutVecCoord = typename Out::VecCoord;
+    using OutVecDeriv = typename Out::VecDeriv;
+    using OutMatrixDeriv = typename Out::MatrixDeriv;
+    using Vec3 = sofa::type::Vec3;
+    using Quat = sofa::type::Quat<SReal>;
+
+    MappingJacobianHarness(const sofa::type::vector<double> &curvAbsSection,
+                           const sofa::type::vector<double> &curvAbsFrames,
+                           const std::string &mappingType = "DiscreteCosseratMapping",
+                           const std::map<std::string, std::string> &mappingAttributes = {},
+                           const std::map<std::string, std::string> &framesMassAttributes = {})
+        : m_nbSections(curvAbsSection.size() - 1), m_nbFrames(curvAbsFrames.size())
+    {
+        using sofa::simpleapi::createObject;
+        using sofa::component::statecontainer::MechanicalObject;
+
+        std::ostringstream strainsPosition, sections, frames, framesPosition;
+        for (size_t s = 0; s < m_nbSections; ++s)
+            strainsPosition << typename In1::Coord() << " ";
+        for (const double abscissa : curvAbsSection)
+            sections << abscissa << " ";
+        for (const double abscissa : curvAbsFrames)
+        {
+            frames << abscissa << " ";
+            framesPosition << abscissa << " 0 0 0 0 0 1 ";
+        }
+
+        m_root = sofa::simulation::getSimulation()->createNewGraph("root");
+        m_strains = dynamic_cast<MechanicalObject<In1> *>(createObject(m_root, "MechanicalObject",
+            {{"name", "strains"}, {"template", In1::Name()}, {"position", strainsPosition.str()}}).get());
+        m_base = dynamic_cast<MechanicalObject<In2> *>(createObject(m_root, "MechanicalObject",
+            {{"name", "base"}, {"template", In2::Name()}, {"position", "0 0 0 0 0 0 1"}}).get());
+        m_frames = dynamic_cast<MechanicalObject<Out> *>(createObject(m_root, "MechanicalObject",
+            {{"name", "frames"}, {"template", Out::Name()}, {"position", framesPosition.str()}}).get());
+        if (!framesMassAttributes.empty())
+        {
+            std::map<std::string, std::string> massAttributes = framesMassAttributes;
+            massAttributes.insert({{"name", "framesMass"}, {"template", Out::Name()}, {"mstate", "@frames"}});
+            createObject(m_root, "UniformMass", massAttributes);
+        }
+        std::map<std::string, std::string> attributes = mappingAttributes;
+        attributes.insert({{"template", std::string(In1::Name()) + "," + In2::Name() + "," + Out::Name()},
+                           {"input1", "@strains"}, {"input2", "@base"}, {"output", "@frames"},
+                           {"curv_abs_input", sections.str()}, {"curv_abs_output", frames.str()}});
+        m_mapping = dynamic_cast<Mapping *>(createObject(m_root, mappingType, attributes).get());
+        sofa::simulation::node::initRoot(m_root.get());
+    }
+
+    ~MappingJacobianHarness()
+    {
+        sofa::simulation::node::unload(m_root);
+    }
+
+    /// false if the scene could not be built, e.g. if mappingType is not registered with these templates
+    bool isValid() const
+    {
+        return m_strains && m_base && m_frames && m_mapping;
+    }
+
+    Mapping *mapping() const
+    {
+        return m_mapping;
+    }
+
+    /// Sets the strains and the base of the rod and maps the frames (applyJ and applyJT use this configuration)
+    void setConfiguration(const In1VecCoord &strains, const In2Coord &base)
+    {
+        m_strains->write(sofa::core::VecCoordId::position())->setValue(strains);
+        In2VecCoord basePosition(1, base);
+        m_base->write(sofa::core::VecCoordId::position())->setValue(basePosition);
+        m_mapping->apply(sofa::core::mechanicalparams::defaultInstance(),
+                         {m_frames->write(sofa::core::VecCoordId::position())},
+                         {m_strains->read(sofa::core::ConstVecCoordId::position())},
+                         {m_base->read(sofa::core::ConstVecCoordId::position())});
+    }
+
+    /// Frames of a configuration, the configuration set with setConfiguration must be restored afterwards
+    OutVecCoord apply(const In1VecCoord &strains, const In2Coord &base)
+    {
+        sofa::Data<In1VecCoord> in1;
+        sofa::Data<In2VecCoord> in2;
+        sofa::Data<OutVecCoord> out;
+        in1.setValue(strains);
+        in2.setValue(In2VecCoord(1, base));
+        m_mapping->apply(sofa::core::mechanicalparams::defaultInstance(), {&out}, {&in1}, {&in2});
+        return out.getValue();
+    }
+
+    OutVecDeriv applyJ(const In1VecDeriv &strainsVelocity, const In2Deriv &baseVelocity)
+    {
+        sofa::Data<In1VecDeriv> in1;
+        sofa::Data<In2VecDeriv> in2;
+        sofa::Data<OutVecDeriv> out;
+        in1.setValue(strainsVelocity);
+        in2.setValue(In2VecDeriv(1, baseVelocity));
+        m_mapping->applyJ(sofa::core::mechanicalparams::defaultInstance(), {&out}, {&in1}, {&in2});
+        return out.getValue();
+    }
+
+    /// applyJ on the velocities of the mechanical objects, set to these velocities, as during a time step (a dynamic
+    /// mapping then computes its velocity dependent terms)
+    OutVecDeriv applyJToVelocities(const In1VecDeriv &strainsVelocity, const In2Deriv &baseVelocity)
+    {
+        m_strains->write(sofa::core::VecDerivId::velocity())->setValue(strainsVelocity);
+        m_base->write(sofa::core::VecDerivId::velocity())->setValue(In2VecDeriv(1, baseVelocity));
+        m_mapping->applyJ(sofa::core::mechanicalparams::defaultInstance(),
+                          {m_frames->write(sofa::core::VecDerivId::velocity())},
+                          {m_strains->read(sofa::core::ConstVecDerivId::velocity())},
+                          {m_base->read(sofa::core::ConstVecDerivId::velocity())});
+        return m_frames->read(sofa::core::ConstVecDerivId::velocity())->getValue();
+    }
+
+    std::pair<In1VecDeriv, In2Deriv> applyJT(const OutVecDeriv &framesForce)
+    {
+        sofa::Data<In1VecDeriv> out1;
+        sofa::Data<In2VecDeriv> out2;
+        sofa::Data<OutVecDeriv> in;
+        out1.setValue(In1VecDeriv(m_nbSections));
+        out2.setValue(In2VecDeriv(1));
+        in.setValue(framesForce);
+        m_mapping->applyJT(sofa::core::mechanicalparams::defaultInstance(), {&out1}, {&out2}, {&in});
+        return {out1.getValue(), out2.getValue()[0]};
+    }
+
+    std::pair<In1MatrixDeriv, In2MatrixDeriv> applyJT(const OutMatrixDeriv &framesConstraints)
+    {
+        sofa::Data<In1MatrixDeriv> out1;
+        sofa::Data<In2MatrixDeriv> out2;
+        sofa::Data<OutMatrixDeriv> in;
+        in.setValue(framesConstraints);
+        m_mapping->applyJT(sofa::core::constraintparams::defaultInstance(), {&out1}, {&out2}, {&in});
+        return {out1.getValue(), out2.getValue()};
+    }
+
+    /// Runs the three checks around the configuration (strains, base) with nbDirections random velocities, forces
+    /// and constraint rows, step being the step of the central differences
+    template <class Generator>
+    JacobianErrors check(const In1VecCoord &strains, const In2Coord &base, Generator &generator,
+                         unsigned int nbDirections = 4, double step = 1e-6)
+    {
+        std::normal_distribution<double> normal;
+        JacobianErrors errors;
+        for (unsigned int d = 0; d < nbDirections; ++d)
+        {
+            const auto [strainsVelocity, baseVelocity] = randomVelocity(generator);
+
+            // applyJ against the central differences of apply
+            const OutVecCoord plus = apply(displaced(strains, strainsVelocity, step),
+                                           displaced(base, baseVelocity, step));
+            const OutVecCoord minus = apply(displaced(strains, strainsVelocity, -step),
+                                            displaced(base, baseVelocity, -step));
+            setConfiguration(strains, base);
+            const OutVecDeriv framesVelocity = applyJ(strainsVelocity, baseVelocity);
+            double difference = 0.0, norm = 0.0;
+            for (size_t f = 0; f < m_nbFrames; ++f)
+            {
+                const auto centralDifference = rigidVelocity(minus[f], plus[f], 2.0 * step);
+                for (unsigned int k = 0; k < 6; ++k)
+                {
+                    difference = std::max(difference, std::abs(framesVelocity[f][k] - centralDifference[k]));
+                    norm = std::max(norm, std::abs(framesVelocity[f][k]));
+                }
+            }
+            errors.applyJ = std::max(errors.applyJ, difference / std::max(norm, 1.0));
+
+            // applyJT (forces) is the adjoint of applyJ
+            OutVecDeriv framesForce(m_nbFrames);
+            for (auto &force : framesForce)
+                for (unsigned int k = 0; k < 6; ++k)
+                    force[k] = normal(generator);
+            const auto [strainsForce, baseForce] = applyJT(framesForce);
+            double work = 0.0, dualWork = 0.0, scale = 0.0;
+            for (size_t f = 0; f < m_nbFrames; ++f)
+                for (unsigned int k = 0; k < 6; ++k)
+                {
+                    work += framesVelocity[f][k] * framesForce[f][k];
+                    scale += std::abs(framesVelocity[f][k] * framesForce[f][k]);
+                }
+            for (size_t s = 0; s < m_nbSections; ++s)
+                dualWork += strainsVelocity[s] * strainsForce[s];
+            for (unsigned int k = 0; k < In2::deriv_total_size; ++k)
+                dualWork += baseVelocity[k] * baseForce[k];
+            errors.applyJT = std::max(errors.applyJT, std::abs(work - dualWork) / std::max(scale, 1.0));
+
+            // applyJT (constraints) against applyJT (forces): one row on one frame, one on two frames
+            std::uniform_int_distribution<size_t> frame(0, m_nbFrames - 1);
+            OutMatrixDeriv constraints;
+            std::vector<OutVecDeriv> rowsForce(2, OutVecDeriv(m_nbFrames));
+            for (unsigned int r = 0; r < 2; ++r)
+            {
+                auto row = constraints.writeLine(r);
+                for (unsigned int c = 0; c <= r; ++c)
+                {
+                    const size_t index = frame(generator);
+                    typename Out::Deriv direction;
+                    for (unsigned int k = 0; k < 6; ++k)
+                        direction[k] = normal(generator);
+                    row.addCol(index, direction);
+                    rowsForce[r][index] += direction;
+                }
+            }
+            const auto [strainsConstraints, baseConstraints] = applyJT(constraints);
+            for (unsigned int r = 0; r < 2; ++r)
+            {
+                const auto [expectedStrains, expectedBase] = applyJT(rowsForce[r]);
+                In1VecDeriv rowStrains(m_nbSections);
+                In2VecDeriv rowBase(1);
+                addRow(strainsConstraints, r, rowStrains);
+                addRow(baseConstraints, r, rowBase);
+
+                double rowDifference = 0.0, rowNorm = 0.0;
+                for (size_t s = 0; s < m_nbSections; ++s)
+                    for (unsigned int k = 0; k < In1::deriv_total_size; ++k)
+                    {
+                        rowDifference = std::max(rowDifference, std::abs(rowStrains[s][k] - expectedStrains[s][k]));
+                        rowNorm = std::max(rowNorm, std::abs(expectedStrains[s][k]));
+                    }
+                for (unsigned int k = 0; k < In2::deriv_total_size; ++k)
+                {
+                    rowDifference = std::max(rowDifference, std::abs(rowBase[0][k] - expectedBase[k]));
+                    rowNorm = std::max(rowNorm, std::abs(expectedBase[k]));
+                }
+                errors.constraintJT = std::max(errors.constraintJT, rowDifference / std::max(rowNorm, 1.0));
+            }
+        }
+        setConfiguration(strains, base);
+        return errors;
+    }
+
+    /// Largest relative error of the bias accelerations of the frames (J_dot q_dot in their local frames, [w, v])
+    /// computed by the mapping, against the central differences of the local velocities of the frames along
+    /// nbDirections random velocities, the strains moving at constant rate and the base at constant velocity. The
+    /// mapping must compute them in applyJ (getFramesAccelerationBias), e.g. DiscreteDynamicCosseratMapping with
+    /// a mass on the frames.
+    template <class Generator>
+    double checkAccelerationBias(const In1VecCoord &strains, const In2Coord &base, Generator &generator,
+                                 unsigned int nbDirections = 4, double step = 1e-5)
+    {
+        double error = 0.0;
+        for (unsigned int d = 0; d < nbDirections; ++d)
+        {
+            const auto [strainsVelocity, baseVelocity] = randomVelocity(generator);
+            const auto plus = localVelocities(displaced(strains, strainsVelocity, step),
+                                              displaced(base, baseVelocity, step), strainsVelocity, baseVelocity);
+            const auto minus = localVelocities(displaced(strains, strainsVelocity, -step),
+                                               displaced(base, baseVelocity, -step), strainsVelocity, baseVelocity);
+
+            setConfiguration(strains, base);
+            applyJToVelocities(strainsVelocity, baseVelocity);
+            const auto &bias = m_mapping->getFramesAccelerationBias();
+            if (bias.size() != m_nbFrames)
+                return std::numeric_limits<double>::infinity();
+
+            double difference = 0.0, norm = 0.0;
+            for (size_t f = 0; f < m_nbFrames; ++f)
+                for (unsigned int k = 0; k < 6; ++k)
+                {
+                    difference = std::max(difference, std::abs(bias[f][k] - (plus[f][k] - minus[f][k]) / (2.0 * step)));
+                    norm = std::max(norm, std::abs(bias[f][k]));
+                }
+            error = std::max(error, difference / std::max(norm, 1.0));
+        }
+        setConfiguration(strains, base);
+        return error;
+    }
+
+    /// Random strains, the angular strains are of norm curvature (a null curvature for 0) and the linear strains,
+    /// if any, of norm stretch
+    template <class Generator>
+    In1VecCoord randomStrains(Generator &generator, double curvature, double stretch = 0.05) const
+    {
+        std::normal_distribution<double> normal;
+        In1VecCoord strains(m_nbSections);
+        for (auto &strain : strains)
+        {
+            Vec3 angular(normal(generator), normal(generator), normal(generator));
+            angular *= curvature / angular.norm();
+            for (unsigned int k = 0; k < 3; ++k)
+                strain[k] = angular[k];
+            if constexpr (In1::Coord::static_size == 6)
+            {
+                Vec3 linear(normal(generator), normal(generator), normal(generator));
+                linear *= stretch / linear.norm();
+                for (unsigned int k = 0; k < 3; ++k)
+                    strain[k + 3] = linear[k];
+            }
+        }
+        return strains;
+    }
+
+    /// Random pose of the base
+    template <class Generator>
+    In2Coord randomBase(Generator &generator) const
+    {
+        std::normal_distribution<double> normal;
+        const Vec3 rotation(normal(generator), normal(generator), normal(generator));
+        return In2Coord(Vec3(normal(generator), normal(generator), normal(generator)),
+                        Quat::createFromRotationVector(rotation));
+    }
+
+protected:
+    template <class Generator>
+    std::pair<In1VecDeriv, In2Deriv> randomVelocity(Generator &generator) const
+    {
+        std::normal_distribution<double> normal;
+        In1VecDeriv strainsVelocity(m_nbSections);
+        for (auto &velocity : strainsVelocity)
+            for (auto &value : velocity)
+                value = normal(generator);
+        In2Deriv baseVelocity;
+        for (unsigned int k = 0; k < In2::deriv_total_size; ++k)
+            baseVelocity[k] = normal(generator);
+        return {strainsVelocity, baseVelocity};
+    }
+
+    /// Velocities [w, v] of the frames in their local frames, for a configuration and velocities of the rod
+    std::vector<sofa::type::Vec6> localVelocities(const In1VecCoord &strains, const In2Coord &base,
+                                                  const In1VecDeriv &strainsVelocity, const In2Deriv &baseVelocity)
+    {
+        setConfiguration(strains, base);
+        const OutVecDeriv velocities = applyJ(strainsVelocity, baseVelocity);
+        const OutVecCoord &frames = m_frames->read(sofa::core::ConstVecCoordId::position())->getValue();
+        std::vector<sofa::type::Vec6> result(m_nbFrames);
+        for (size_t f = 0; f < m_nbFrames; ++f)
+        {
+            const Quat &orientation = frames[f].getOrientation();
+            result[f] = sofa::type::Vec6(orientation.inverseRotate(velocities[f].getVOrientation()),
+                                         orientation.inverseRotate(velocities[f].getVCenter()));
+        }
+        return result;
+    }
+
+    static In1VecCoord displaced(const In1VecCoord &strains, const In1VecDeriv &velocity, double step)
+    {
+        In1VecCoord result = strains;
+        for (size_t s = 0; s < result.size(); ++s)
+            result[s] += velocity[s] * step;
+        return result;
+    }
+
+    /// Base moved by the rigid velocity during step, the angular velocity being in the global frame
+    static In2Coord displaced(const In2Coord &base, const In2Deriv &velocity, double step)
+    {
+        In2Coord result = base;
+        result.getCenter() += velocity.getVCenter() * step;
+        result.getOrientation() = Quat::createFromRotationVector(velocity.getVOrientation() * step)
+                                  * base.getOrientation();
+        return result;
+    }
+
+    /// Rigid velocity [v, w] (global frame) going from a to b during time
+    static sofa::type::Vec6 rigidVelocity(const typename Out::Coord &a, const typename Out::Coord &b, double time)
+    {
+        const Vec3 linear = (b.getCenter() - a.getCenter()) / time;
+        const Vec3 angular = (b.getOrientation() * a.getOrientation().inverse()).quatToRotationVector() / time;
+        return sofa::type::Vec6(linear, angular);
+    }
+
+    template <class MatrixDeriv, class VecDeriv>
+    static void addRow(const MatrixDeriv &matrix, unsigned int rowIndex, VecDeriv &row)
+    {
+        for (auto rowIt = matrix.begin(); rowIt != matrix.end(); ++rowIt)
+        {
+            if (rowIt.index() != rowIndex)
+                continue;
+            for (auto colIt = rowIt.begin(); colIt != rowIt.end(); ++colIt)
+                row[colIt.index()] += colIt.val();
+        }
+    }
+
+    size_t m_nbSections;
+    size_t m_nbFrames;
+    sofa::simulation::Node::SPtr m_root;
+    sofa::component::statecontainer::MechanicalObject<In1> *m_strains{nullptr};
+    sofa::component::statecontainer::MechanicalObject<In2> *m_base{nullptr};
+    sofa::component::statecontainer::MechanicalObject<Out> *m_frames{nullptr};
+    Mapping *m_mapping{nullptr};
+};
+
+} // namespace Cosserat::testing
@@ -0,0 +1,160 @@
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/StrainBasisMapping.h>
+
+#include <gtest/gtest.h>
+#include <sofa/simpleapi/SimpleApi.h>
+#include <sofa/simulation/Node.h>
+#include <sofa/simulation/Simulation.h>
+#include <sofa/testing/NumericTest.h>
+
+#include <cmath>
+#include <map>
+#include <sstream>
+#include <string>
+
+using sofa::defaulttype::Vec3Types;
+using sofa::component::mapping::StrainBasisMapping;
+
+namespace {
+
+struct StrainBasisMappingTest : public sofa::testing::NumericTest<>
+{
+    using Mapping = StrainBasisMapping<Vec3Types, Vec3Types>;
+
+    static constexpr unsigned int order = 5;
+    static constexpr unsigned int nbGaussPoints = 3;
+    const sofa::type::vector<double> curvAbs{0.0, 0.2, 0.45, 0.7, 1.0};
+    const size_t nbSections = curvAbs.size() - 1;
+
+    sofa::simulation::Node::SPtr root;
+
+    void TearDown() override
+    {
+        if (root)
+            sofa::simulation::node::unload(root);
+    }
+
+    Mapping *createMapping(std::map<std::string, std::string> arguments,
+                           const sofa::type::vector<sofa::type::vector<double>> &customBasis = {})
+    {
+        using sofa::simpleapi::createObject;
+        sofa::simpleapi::importPlugin("Sofa.Component.StateContainer");
+        sofa::simpleapi::importPlugin("Cosserat");
+
+        std::ostringstream abscissa, position;
+        for (const double x : curvAbs)
+            abscissa << x << " ";
+        for (unsigned int n = 0; n < order; ++n)
+            position << "0 0 0 ";
+
+        root = sofa::simulation::getSimulation()->createNewGraph("root");
+        createObject(root, "MechanicalObject", {{"name", "coefficients"}, {"template", "Vec3d"}, {"position", position.str()}});
+        createObject(root, "MechanicalObject", {{"name", "strains"}, {"template", "Vec3d"}});
+        arguments.insert({{"template", "Vec3d,Vec3d"}, {"input", "@coefficients"}, {"output", "@strains"},
+                          {"order", std::to_string(order)}, {"curvAbscissa", abscissa.str()},
+                          {"nbGaussPoints", std::to_string(nbGaussPoints)}});
+        auto *mapping = dynamic_cast<Mapping *>(createObject(root, "StrainBasisMapping", arguments).get());
+        if (mapping && !customBasis.empty())
+            mapping->d_customBasis.setValue(customBasis);
+        sofa::simulation::node::initRoot(root.get());
+        return mapping;
+    }
+
+    /// Closed forms of the Legendre polynomials of degree n <= 4 and of their derivatives
+    static double legendre(unsigned int n, double x)
+    {
+        switch (n)
+        {
+        case 0: return 1.0;
+        case 1: return x;
+        case 2: return 0.5 * (3 * x * x - 1);
+        case 3: return 0.5 * (5 * x * x * x - 3 * x);
+        default: return (35 * x * x * x * x - 30 * x * x + 3) / 8;
+        }
+    }
+
+    static double legendreDerivative(unsigned int n, double x)
+    {
+        switch (n)
+        {
+        case 0: return 0.0;
+        case 1: return 1.0;
+        case 2: return 3 * x;
+        case 3: return 0.5 * (15 * x * x - 3);
+        default: return (140 * x * x * x - 60 * x) / 8;
+        }
+    }
+};
+
+TEST_F(StrainBasisMappingTest, legendreDerivativesAtTheSectionEnds)
+{
+    const Mapping *mapping = createMapping({{"basisType", "legendre"}});
+    ASSERT_NE(mapping, nullptr);
+    const auto &derivatives = mapping->getBasisDerivatives();
+    ASSERT_EQ(static_cast<size_t>(derivatives.rows()), nbSections);
+    ASSERT_EQ(static_cast<unsigned int>(derivatives.cols()), order);
+    for (size_t i = 0; i < nbSections; ++i)
+        for (unsigned int n = 0; n < order; ++n)
+            EXPECT_NEAR(derivatives(i, n), legendreDerivative(n, curvAbs[i + 1]), 1e-13) << "P_" << n << "' in section " << i;
+}
+
+TEST_F(StrainBasisMappingTest, legendreAtTheGaussPoints)
+{
+    Mapping *mapping = createMapping({{"basisType", "legendre"}});
+    ASSERT_NE(mapping, nullptr);
+    const auto &abscissa = mapping->d_gaussAbscissa.getValue();
+    const auto &weights = mapping->d_gaussWeights.getValue();
+    const auto &basis = mapping->getGaussBasis();
+    const auto &derivatives = mapping->getGaussBasisDerivatives();
+    ASSERT_EQ(abscissa.size(), nbSections * nbGaussPoints);
+    ASSERT_EQ(weights.size(), abscissa.size());
+    ASSERT_EQ(static_cast<size_t>(basis.rows()), abscissa.size());
+    ASSERT_EQ(static_cast<size_t>(derivatives.rows()), abscissa.size());
+
+    for (size_t i = 0; i < nbSections; ++i)
+        for (unsigned int k = 0; k < nbGaussPoints; ++k)
+        {
+            const size_t row = i * nbGaussPoints + k;
+            EXPECT_GT(abscissa[row], curvAbs[i]);
+            EXPECT_LT(abscissa[row], curvAbs[i + 1]);
+            for (unsigned int n = 0; n < order; ++n)
+            {
+                EXPECT_NEAR(basis(row, n), legendre(n, abscissa[row]), 1e-13) << "P_" << n << " at Gauss point " << row;
+                EXPECT_NEAR(derivatives(row, n), legendreDerivative(n, abscissa[row]), 1e-13) << "P_" << n << "' at Gauss point " << row;
+            }
+        }
+
+    // The rule is exact up to degree 5 on each section: int_0^1 P_2 P_3 = 1/8 and int_0^1 P_3' P_2 = 1
+    double product = 0, derivativeProduct = 0;
+    for (size_t row = 0; row < abscissa.size(); ++row)
+    {
+        product += weights[row] * basis(row, 2) * basis(row, 3);
+        derivativeProduct += weights[row] * derivatives(row, 3) * basis(row, 2);
+    }
+    EXPECT_NEAR(product, 0.125, 1e-12);
+    EXPECT_NEAR(derivativeProduct, 1.0, 1e-12);
+}
+
+TEST_F(StrainBasisMappingTest, customDerivativesAreTheSlopesOfTheTable)
+{
+    // Two basis functions per abscissa, the other ones are set to zero
+    const sofa::type::vector<double> first{0.0, 1.0, 0.5, 2.0, 2.0}, second{1.0, -1.0, 0.0, 3.0, 1.0};
+    sofa::type::vector<sofa::type::vector<double>> table;
+    for (size_t i = 0; i < curvAbs.size(); ++i)
+        table.push_back({first[i], second[i], 0.0, 0.0, 0.0});
+
+    const Mapping *mapping = createMapping({{"basisType", "custom"}}, table);
+    ASSERT_NE(mapping, nullptr);
+    const auto &derivatives = mapping->getBasisDerivatives();
+    const auto &gaussDerivatives = mapping->getGaussBasisDerivatives();
+    for (size_t i = 0; i < nbSections; ++i)
+    {
+        const double length = curvAbs[i + 1] - curvAbs[i];
+        EXPECT_NEAR(derivatives(i, 0), (first[i + 1] - first[i]) / length, 1e-12);
+        EXPECT_NEAR(derivatives(i, 1), (second[i + 1] - second[i]) / length, 1e-12);
+        for (unsigned int k = 0; k < nbGaussPoints; ++k)
+            EXPECT_NEAR(gaussDerivatives(i * nbGaussPoints + k, 0), derivatives(i, 0), 1e-12);
+    }
+}
+
+} // namespace
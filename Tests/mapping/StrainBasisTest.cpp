@@ -0,0 +1,76 @@
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/StrainBasis.h>
+
+#include <gtest/gtest.h>
+#include <sofa/testing/NumericTest.h>
+
+#include <cmath>
+
+using namespace Cosserat::basis;
+
+namespace {
+
+struct StrainBasisTest : public sofa::testing::NumericTest<>
+{
+    static constexpr unsigned int nbFunctions = 5;
+    double values[nbFunctions];
+    double derivatives[nbFunctions];
+};
+
+TEST_F(StrainBasisTest, legendre)
+{
+    const double x = 0.3;
+    evaluateLegendre(nbFunctions, x, values, derivatives);
+    EXPECT_NEAR(values[2], 0.5 * (3 * x * x - 1), 1e-14);
+    EXPECT_NEAR(values[3], 0.5 * (5 * x * x * x - 3 * x), 1e-14);
+    EXPECT_NEAR(derivatives[3], 0.5 * (15 * x * x - 3), 1e-14);
+    EXPECT_NEAR(derivatives[4], (140 * x * x * x - 60 * x) / 8, 1e-14);
+}
+
+TEST_F(StrainBasisTest, chebyshev)
+{
+    const double x = 0.3;
+    evaluateChebyshev(nbFunctions, x, values, derivatives);
+    for (unsigned int n = 0; n < nbFunctions; n++)
+        EXPECT_NEAR(values[n], std::cos(n * std::acos(x)), 1e-14) << "T_" << n;
+    EXPECT_NEAR(derivatives[3], 12 * x * x - 3, 1e-14);
+}
+
+TEST_F(StrainBasisTest, bSplinePartitionOfUnity)
+{
+    for (double x : {0.0, 0.1, 0.5, 0.72, 1.0})
+    {
+        evaluateBSpline(nbFunctions, 3, x, values, derivatives);
+        double sum = 0, derivativesSum = 0;
+        for (unsigned int n = 0; n < nbFunctions; n++)
+        {
+            EXPECT_GE(values[n], 0.0);
+            sum += values[n];
+            derivativesSum += derivatives[n];
+        }
+        EXPECT_NEAR(sum, 1.0, 1e-14) << "x = " << x;
+        EXPECT_NEAR(derivativesSum, 0.0, 1e-12) << "x = " << x;
+    }
+
+    // Clamped: interpolates the first and last coefficients
+    evaluateBSpline(nbFunctions, 3, 0.0, values, derivatives);
+    EXPECT_NEAR(values[0], 1.0, 1e-14);
+    evaluateBSpline(nbFunctions, 3, 1.0, values, derivatives);
+    EXPECT_NEAR(values[nbFunctions - 1], 1.0, 1e-14);
+}
+
+TEST_F(StrainBasisTest, gaussLegendreIsExact)
+{
+    vector<double> points, weights;
+    gaussLegendreRule(3, 1.0, 3.0, points, weights);
+    ASSERT_EQ(points.size(), 3u);
+
+    // Exact up to degree 5: int_1^3 x^5 dx = (3^6 - 1) / 6
+    double integral = 0;
+    for (unsigned int k = 0; k < 3; k++)
+        integral += weights[k] * std::pow(points[k], 5);
+    EXPECT_NEAR(integral, (729.0 - 1.0) / 6.0, 1e-10);
+    EXPECT_LT(points[0], points[1]);
+}
+
+} // namespace
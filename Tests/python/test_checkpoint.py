@@ -0,0 +1,133 @@
+"""Tests of useful.checkpoint on a small scene, they need SofaPython3 and the Cosserat plugin: python -m pytest
+Tests/python"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "examples", "python3"))
+
+from useful.checkpoint import checkpoint, restore  # noqa: E402
+
+try:
+    import Sofa
+    import Sofa.Core
+    import Sofa.Simulation
+except ImportError:
+    Sofa = None
+
+plugins = ["Sofa.Component.StateContainer", "Sofa.Component.Topology.Container.Dynamic",
+           "Sofa.Component.ODESolver.Backward", "Sofa.Component.LinearSolver.Iterative", "Sofa.Component.Mass",
+           "Sofa.Component.Mapping.Linear", "Sofa.Component.Constraint.Projective", "Sofa.Component.AnimationLoop",
+           "Cosserat"]
+
+
+def createScene(root):
+    """A chain of points falling under gravity, a point set growing at its tip and the states mapped on both."""
+    root.addObject("RequiredPlugin", pluginName=plugins)
+    root.addObject("DefaultAnimationLoop")
+    root.gravity.value = [0, -9.81, 0]
+    root.dt.value = 0.01
+
+    beam = root.addChild("beam")
+    beam.addObject("EulerImplicitSolver", rayleighStiffness=0.1, rayleighMass=0.1)
+    beam.addObject("CGLinearSolver", iterations=100, tolerance=1e-12, threshold=1e-12)
+    beam.addObject("EdgeSetTopologyContainer", edges=[[i, i + 1] for i in range(4)])
+    beam.addObject("MechanicalObject", name="state", template="Vec3d",
+                   position=[[x, 0, 0] for x in np.linspace(0, 1, 5)])
+    beam.addObject("UniformMass", totalMass=0.5)
+    beam.addObject("FixedProjectiveConstraint", indices=[0])
+    beam.addObject("MeshSpringForceField", stiffness=1e3)
+
+    tip = beam.addChild("tip")
+    tip.addObject("MechanicalObject", name="state", template="Vec3d")
+    tip.addObject("IdentityMapping", input="@../state", output="@state")
+
+    points = root.addChild("points")
+    points.addObject("PointSetTopologyContainer", points=[])
+    points.addObject("PointSetTopologyModifier")
+    points.addObject("MechanicalObject", name="state", template="Vec3d", position=[])
+    points.addObject("PointsManager", name="pointsManager", beamPath="/beam/tip/state")
+
+    # Mapped on the point set, its number of elements follows the number of points
+    stats = points.addChild("stats")
+    stats.addObject("MechanicalObject", name="state", template="Vec3d")
+    stats.addObject("IdentityMapping", input="@../state", output="@state")
+
+
+@unittest.skipIf(Sofa is None, "SofaPython3 is not installed")
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Sofa.Core.Node("root")
+        createScene(self.root)
+        Sofa.Simulation.init(self.root)
+        self.addCleanup(Sofa.Simulation.unload, self.root)
+
+    def states(self):
+        states = {}
+        for path in ["beam", "beam/tip", "points", "points/stats"]:
+            node = self.root
+            for name in path.split("/"):
+                node = node.getChild(name)
+            states[path] = node.getObject("state").position.array().copy()
+        return states
+
+    def animate(self, steps):
+        for _ in range(steps):
+            Sofa.Simulation.animate(self.root, self.root.dt.value)
+
+    def assertStatesEqual(self, states, expected):
+        for path in expected:
+            np.testing.assert_allclose(states[path], expected[path], atol=1e-12, err_msg=path)
+
+    def test_restoreWithAnotherNumberOfPoints(self):
+        pointsManager = self.root.points.pointsManager
+        self.animate(3)
+        pointsManager.addNewPointToState()
+        pointsManager.addNewPointToState()
+        self.animate(2)
+
+        blob = checkpoint(self.root)
+        saved = self.states()
+        self.animate(1)
+        stepped = self.states()
+
+        # More points and other positions, including the ones of the mapped states
+        pointsManager.addNewPointToState()
+        self.animate(4)
+        self.assertEqual(len(self.root.points.stats.state.position), 3)
+
+        restore(self.root, blob)
+        self.assertEqual(pointsManager.getNbActivePoints(), 2)
+        self.assertStatesEqual(self.states(), saved)
+
+        self.animate(1)
+        self.assertStatesEqual(self.states(), stepped)
+
+        # Fewer points than in the checkpoint
+        pointsManager.removeLastPointfromState()
+        pointsManager.removeLastPointfromState()
+        self.animate(1)
+        restore(self.root, blob)
+        self.animate(1)
+        self.assertStatesEqual(self.states(), stepped)
+
+    def test_mappedStatesAreNotSaved(self):
+        self.root.points.pointsManager.addNewPointToState()
+        self.animate(1)
+        blob = checkpoint(self.root)
+
+        # The mapped state of the point set is recomputed, the one of the beam too
+        for state in [self.root.points.stats.state, self.root.beam.tip.state]:
+            state.position.value = np.zeros_like(state.position.array())
+        restore(self.root, blob)
+        np.testing.assert_allclose(self.root.beam.tip.state.position.array(), self.root.beam.state.position.array())
+        np.testing.assert_allclose(self.root.points.stats.state.position.array(),
+                                   self.root.points.state.position.array())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests of CosseratBase.clone, they need SofaPython3 and the Cosserat plugin: python -m pytest Tests/python"""
+
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "examples", "python3"))
+
+try:
+    import Sofa
+    import Sofa.Core
+    import Sofa.Simulation
+    from cosserat.CosseratBase import CosseratBase
+    from useful.params import Parameters, BeamGeometryParameters, BeamPhysicsParameters
+    from useful.plugins import addObject
+except ImportError:
+    Sofa = None
+
+nbRods = 20
+
+
+def createSolverNode(root):
+    root.gravity.value = [0, -9.81, 0]
+    root.dt.value = 0.01
+    addObject(root, "DefaultAnimationLoop")
+    solverNode = root.addChild("solverNode")
+    addObject(solverNode, "EulerImplicitSolver", rayleighStiffness=0.2, rayleighMass=0.1)
+    addObject(solverNode, "SparseLDLSolver", template="CompressedRowSparseMatrixd")
+    return solverNode
+
+
+def framesPositions(rod):
+    return rod.cosseratFrame.getObject("FramesMO").position.array().copy()
+
+
+@unittest.skipIf(Sofa is None, "SofaPython3 is not installed")
+class CloneTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Sofa.Core.Node("root")
+        self.solverNode = createSolverNode(self.root)
+        self.addCleanup(Sofa.Simulation.unload, self.root)
+
+    def build(self, name, params=None, **kwargs):
+        params = params or Parameters(beamGeoParams=BeamGeometryParameters(init_pos=[0, 0, 0]))
+        return self.solverNode.addChild(CosseratBase(parent=self.solverNode, params=params, name=name, **kwargs))
+
+    def test_cloneIsTheBuiltRod(self):
+        rod = self.build("rod")
+        built = self.build("built", translation=[0.0, 5.0, 0.0])
+        clone = rod.clone(self.solverNode, "clone", translation=[0.0, 5.0, 0.0])
+        cloneOfClone = clone.clone(self.solverNode, "cloneOfClone")
+
+        # Same API as the prefab
+        self.assertEqual(clone.name.value, "clone")
+        clone.addCollisionModel()
+        clone.addSlidingPoints()
+        np.testing.assert_allclose(clone.frames3D, rod.frames3D)
+
+        Sofa.Simulation.init(self.root)
+        for _ in range(5):
+            Sofa.Simulation.animate(self.root, self.root.dt.value)
+        np.testing.assert_allclose(framesPositions(clone), framesPositions(built), atol=1e-10)
+        # The overrides are kept by the clones of a clone
+        np.testing.assert_allclose(framesPositions(cloneOfClone), framesPositions(built), atol=1e-10)
+
+    def test_overridesWithoutEffectAreRejected(self):
+        rod = self.build("rod")
+        with self.assertRaises(ValueError):
+            rod.clone(self.solverNode, "clone", length=2.0)
+
+        params = Parameters(beamGeoParams=BeamGeometryParameters(init_pos=[0, 0, 0]),
+                            beamPhysicsParams=BeamPhysicsParameters(useInertia=True))
+        inertial = self.build("inertial", params)
+        for key, value in [("radius", 0.3), ("youngModulus", 2e6), ("poissonRatio", 0.3)]:
+            with self.assertRaises(ValueError, msg=key):
+                inertial.clone(self.solverNode, "clone" + key, **{key: value})
+        inertial.clone(self.solverNode, "moved", translation=[0.0, 5.0, 0.0], beamMass=0.5)
+
+    def test_cloneIsFasterThanConstruction(self):
+        rod = self.build("rod")
+
+        start = time.perf_counter()
+        for i in range(nbRods):
+            self.build(f"built{i}", translation=[0.0, float(i), 0.0])
+        buildTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(nbRods):
+            rod.clone(self.solverNode, f"clone{i}", translation=[0.0, float(i), 0.0])
+        cloneTime = time.perf_counter() - start
+
+        print(f"{nbRods} rods: construction {buildTime * 1e3:.1f} ms, clone {cloneTime * 1e3:.1f} ms")
+        self.assertLess(cloneTime, buildTime)
+
+
+if __name__ == "__main__":
+    unittest.main()
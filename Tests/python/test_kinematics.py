@@ -0,0 +1,77 @@
+"""Tests of useful.kinematics against scipy.linalg.expm and logm, they do not need SOFA: python -m pytest Tests/python"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "examples", "python3"))
+
+from useful.kinematics import ad, exp_se3, log_se3, piecewise_logmap, tang_exp, xi_hat  # noqa: E402
+
+try:
+    from scipy.linalg import expm, logm
+except ImportError:
+    expm = logm = None
+
+# Curvatures around the switches between the closed forms and the series
+curvatures = [0.0, 1e-8, 1e-7, 1e-6, 1e-3, 0.05, 0.1428, 0.1429, 1.0, 4.0]
+
+
+def strain(curvature, linear=(0.1, -0.05, 0.02)):
+    axis = np.array([0.3, -0.5, 0.8])
+    return np.concatenate([curvature * axis / np.linalg.norm(axis), linear])
+
+
+@unittest.skipIf(expm is None, "scipy is not installed")
+class KinematicsTest(unittest.TestCase):
+    x = 0.7
+
+    def test_expSE3MatchesExpm(self):
+        for curvature in curvatures:
+            k = strain(curvature)
+            np.testing.assert_allclose(exp_se3(self.x, k), expm(self.x * xi_hat(k)), rtol=0, atol=1e-14,
+                                       err_msg=f"curvature {curvature}")
+
+    def test_tangExpMatchesExpm(self):
+        # int_0^x exp(s A) ds is the upper right block of expm(x [[A, I], [0, 0]])
+        for curvature in curvatures:
+            k = strain(curvature)
+            block = np.zeros((12, 12))
+            block[:6, :6] = ad(k + np.array([0.0, 0.0, 0.0, 1.0, 0.0, 0.0]))
+            block[:6, 6:] = np.eye(6)
+            np.testing.assert_allclose(tang_exp(self.x, k), expm(self.x * block)[:6, 6:], rtol=0, atol=1e-13,
+                                       err_msg=f"curvature {curvature}")
+
+    def test_logSE3MatchesLogm(self):
+        for curvature in curvatures:
+            g = expm(self.x * xi_hat(strain(curvature)))
+            expected = np.real(logm(g))
+            twist = log_se3(g)
+            np.testing.assert_allclose(twist[:3], [expected[2, 1], expected[0, 2], expected[1, 0]], rtol=0,
+                                       atol=1e-12, err_msg=f"curvature {curvature}")
+            np.testing.assert_allclose(twist[3:], expected[:3, 3], rtol=0, atol=1e-12,
+                                       err_msg=f"curvature {curvature}")
+
+    def test_piecewiseLogmapInvertsExpm(self):
+        for curvature in curvatures:
+            k = strain(curvature)
+            expected = k + np.array([0.0, 0.0, 0.0, 1.0, 0.0, 0.0])
+            result = piecewise_logmap(self.x, expm(self.x * xi_hat(k)))
+            # Relative to the curvature too, the small curvatures must not be lost in the cancellation
+            np.testing.assert_allclose(result[:3], expected[:3], rtol=1e-9, atol=1e-15,
+                                       err_msg=f"curvature {curvature}")
+            np.testing.assert_allclose(result[3:], expected[3:], rtol=0, atol=1e-14,
+                                       err_msg=f"curvature {curvature}")
+
+    def test_batchedPiecewiseLogmap(self):
+        strains = np.stack([strain(curvature) for curvature in curvatures])
+        lengths = np.linspace(0.1, 0.7, len(curvatures))  # rotations below pi, where the logarithm is unique
+        g = exp_se3(lengths, strains)
+        expected = strains + np.array([0.0, 0.0, 0.0, 1.0, 0.0, 0.0])
+        np.testing.assert_allclose(piecewise_logmap(lengths, g), expected, rtol=0, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
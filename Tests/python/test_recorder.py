@@ -0,0 +1,53 @@
+"""Tests of useful.recorder, they do not need SOFA: python -m pytest Tests/python"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "examples", "python3"))
+
+from useful.recorder import TrajectoryReader, TrajectoryWriter  # noqa: E402
+
+
+class TrajectoryRecorderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_liveReadOfWrappedRing(self):
+        # The index is written when the ring is full (4 samples), the 2 next samples are only in the write head
+        writer = TrajectoryWriter(self.directory.name, ringSize=4, indexInterval=100)
+        for step in range(4):
+            writer.append(0.1 * step, {"step": np.array([step])})
+        reader = TrajectoryReader(self.directory.name)
+        for step in range(4, 6):
+            writer.append(0.1 * step, {"step": np.array([step])})
+
+        self.assertEqual(len(reader), 4)
+        np.testing.assert_array_equal(reader.read("step")[:, 0], [2, 3, 4, 5])
+        np.testing.assert_allclose(reader.read("time"), [0.2, 0.3, 0.4, 0.5])
+        np.testing.assert_array_equal(reader.read("step", start=-1)[:, 0], [5])
+        writer.close()
+
+    def test_liveReadInAppendMode(self):
+        writer = TrajectoryWriter(self.directory.name, chunkSize=4, indexInterval=100)
+        for step in range(4):
+            writer.append(0.1 * step, {"step": np.array([step])})
+        reader = TrajectoryReader(self.directory.name)
+        for step in range(4, 6):
+            writer.append(0.1 * step, {"step": np.array([step])})
+
+        # The second chunk is not in the index read, until the reader is reloaded
+        np.testing.assert_array_equal(reader.read("step")[:, 0], [0, 1, 2, 3])
+        writer.flush()
+        reader.reload()
+        np.testing.assert_array_equal(reader.read("step")[:, 0], [0, 1, 2, 3, 4, 5])
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
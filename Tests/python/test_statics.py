@@ -0,0 +1,97 @@
+"""Tests of useful.statics, they do not need SOFA: python -m pytest Tests/python"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "examples", "python3"))
+
+from useful.statics import StaticSolver, frames_jacobians, load_stiffness  # noqa: E402
+
+
+class StaticSolverTest(unittest.TestCase):
+    length = 1.0
+    bending = 2.0  # EI
+    nb_sections = 20
+
+    def setUp(self):
+        self.curv_abs_section = np.linspace(0.0, self.length, self.nb_sections + 1)
+        self.curv_abs_frames = np.linspace(0.0, self.length, 2 * self.nb_sections + 1)
+        self.stiffness = np.diag([1.5, self.bending, self.bending])
+
+    def tip_load(self, load):
+        forces = np.zeros((len(self.curv_abs_frames), 6))
+        forces[-1] = load
+        return forces
+
+    def test_tipMomentGivesConstantCurvature(self):
+        moment = 3.0
+        for geometric_stiffness in (True, False):
+            solver = StaticSolver(self.curv_abs_section, self.curv_abs_frames, self.stiffness,
+                                  geometric_stiffness=geometric_stiffness)
+            result = solver.solve(self.tip_load([0, 0, 0, 0, 0, moment]), tolerance=1e-12)
+            self.assertTrue(result.converged)
+            curvature = moment / self.bending
+            np.testing.assert_allclose(result.strains, np.tile([0.0, 0.0, curvature], (self.nb_sections, 1)),
+                                       atol=1e-10)
+            # The tip is on the circle of radius 1 / curvature
+            tip = result.frames[-1, :3, 3]
+            np.testing.assert_allclose(tip, [np.sin(curvature * self.length) / curvature,
+                                             (1.0 - np.cos(curvature * self.length)) / curvature, 0.0], atol=1e-10)
+
+    def test_smallDeflectionOfATipForce(self):
+        force = -1e-4
+        solver = StaticSolver(self.curv_abs_section, self.curv_abs_frames, self.stiffness)
+        result = solver.solve(self.tip_load([0, force, 0, 0, 0, 0]), tolerance=1e-12)
+        self.assertTrue(result.converged)
+        # Euler-Bernoulli cantilever, the strain being constant in each section
+        expected = force * self.length ** 3 / (3.0 * self.bending)
+        self.assertAlmostEqual(result.frames[-1, 1, 3] / expected, 1.0, delta=1e-3)
+
+    def test_geometricStiffnessConverges(self):
+        load = self.tip_load([0.5, -2.0, 1.0, 0.3, 0.0, 0.5])
+        exact = StaticSolver(self.curv_abs_section, self.curv_abs_frames, self.stiffness).solve(load)
+        beam = StaticSolver(self.curv_abs_section, self.curv_abs_frames, self.stiffness,
+                            geometric_stiffness=False).solve(load)
+        self.assertTrue(exact.converged)
+        self.assertTrue(beam.converged)
+        self.assertLessEqual(exact.iterations, 4)
+        self.assertLess(exact.iterations, beam.iterations)
+        np.testing.assert_allclose(exact.strains, beam.strains, atol=1e-6)
+
+
+class LoadStiffnessTest(unittest.TestCase):
+
+    def check(self, strain_size, curv_abs_section, curv_abs_frames, seed):
+        rng = np.random.default_rng(seed)
+        strains = rng.normal(size=(len(curv_abs_section) - 1, strain_size))
+        rotation = rng.normal(size=4)
+        base = np.concatenate([rng.normal(size=3), rotation / np.linalg.norm(rotation)])
+        forces = rng.normal(size=(len(curv_abs_frames), 6))
+
+        def load(x):
+            jacobians = frames_jacobians(base, x, curv_abs_section, curv_abs_frames)[:, :, 6:]
+            return np.einsum('fij,fi->j', jacobians, forces)
+
+        stiffness = load_stiffness(base, strains, curv_abs_section, curv_abs_frames, forces)
+        step = 1e-6
+        differences = np.zeros_like(stiffness)
+        for c in range(strains.size):
+            shift = np.zeros(strains.size)
+            shift[c] = step
+            shift = shift.reshape(strains.shape)
+            differences[:, c] = (load(strains + shift) - load(strains - shift)) / (2.0 * step)
+        np.testing.assert_allclose(stiffness, differences, atol=1e-8 * max(1.0, np.abs(differences).max()))
+
+    def test_angularStrains(self):
+        # Frames on the nodes and inside the sections, sections of different lengths
+        self.check(3, [0.0, 0.2, 0.5, 0.6, 1.0], [0.0, 0.1, 0.2, 0.3, 0.55, 0.6, 0.9, 1.0], seed=0)
+
+    def test_fullStrains(self):
+        self.check(6, [0.0, 0.3, 0.5, 1.1], [0.0, 0.3, 0.4, 0.5, 0.8, 1.1], seed=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
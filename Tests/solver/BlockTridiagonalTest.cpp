@@ -0,0 +1,74 @@
+#include <Cosserat/config.h>
+#include <Cosserat/solver/BlockTridiagonal.h>
+
+#include <gtest/gtest.h>
+#include <sofa/testing/NumericTest.h>
+
+#include <cstdlib>
+
+using namespace Cosserat::solver;
+
+namespace {
+
+struct BlockTridiagonalTest : public sofa::testing::NumericTest<>
+{
+    using Matrix = BlockTridiagonalFactorization::Matrix;
+
+    /// Fills a random diagonally dominant chain system in the factorization and returns it as a dense matrix
+    Matrix fillChain(BlockTridiagonalFactorization &factorization, unsigned int nbBlocks,
+                     unsigned int borderSize, bool borderFirst)
+    {
+        const unsigned int blockSize = 3;
+        factorization.setStructure(blockSize, nbBlocks, borderSize, borderFirst);
+        const unsigned int n = factorization.size();
+        const unsigned int chainBegin = borderFirst ? borderSize : 0;
+        const unsigned int borderBegin = borderFirst ? 0 : blockSize * nbBlocks;
+
+        Matrix A = Matrix::Zero(n, n);
+        srand(7);
+        for (unsigned int r = 0; r < n; r++)
+        {
+            for (unsigned int c = 0; c < n; c++)
+            {
+                const bool border = (r >= borderBegin && r < borderBegin + borderSize) ||
+                                    (c >= borderBegin && c < borderBegin + borderSize);
+                const int distance = int((r - chainBegin) / blockSize) - int((c - chainBegin) / blockSize);
+                if (!border && std::abs(distance) > 1)
+                    continue;
+                A(r, c) = double(rand()) / RAND_MAX - 0.5 + (r == c ? 2.0 * n : 0.0);
+                EXPECT_TRUE(factorization.add(r, c, A(r, c)));
+            }
+        }
+        return A;
+    }
+};
+
+TEST_F(BlockTridiagonalTest, solveMatchesDense)
+{
+    for (bool borderFirst : {true, false})
+    {
+        for (unsigned int borderSize : {0u, 6u})
+        {
+            BlockTridiagonalFactorization factorization;
+            const Matrix A = fillChain(factorization, 20, borderSize, borderFirst);
+            ASSERT_TRUE(factorization.factorize());
+
+            const Matrix B = Matrix::Random(A.rows(), 4);
+            Matrix X = B;
+            factorization.solve(X);
+            EXPECT_LT((A * X - B).norm(), 1e-10) << "borderSize " << borderSize << " borderFirst " << borderFirst;
+        }
+    }
+}
+
+TEST_F(BlockTridiagonalTest, entryOutsideOfTheChain)
+{
+    BlockTridiagonalFactorization factorization;
+    factorization.setStructure(3, 4, 6, true);
+    EXPECT_TRUE(factorization.add(0, 17, 1.0));  // border
+    EXPECT_TRUE(factorization.add(6, 11, 1.0));  // blocks 0 and 1
+    EXPECT_FALSE(factorization.add(6, 12, 1.0)); // blocks 0 and 2
+    EXPECT_FALSE(factorization.add(18, 0, 1.0)); // outside of the system
+}
+
+} // namespace
@@ -12,7 +12,9 @@ __date__ = "Jan, 17 2022"
 import Sofa
 from cosserat.cosseratObject import Cosserat
 from cosserat.nonLinearCosserat import NonLinearCosserat as nonCosserat
-from cosserat.usefulFunctions import buildEdges, pluginList, BuildCosseratGeometry
+from cosserat.usefulFunctions import buildEdges, BuildCosseratGeometry
+from useful.header import addHeader
+from useful.plugins import addObject
 from math import sqrt
 
 # @todo ================ Unit: N, m, Kg, Pa  ================
@@ -69,20 +71,17 @@ class ForceController(Sofa.Core.Controller):
 
 
 def createScene(rootNode):
-    rootNode.addObject('RequiredPlugin', name='plugins', pluginName=[pluginList])
-    rootNode.addObject('VisualStyle', displayFlags='showVisualModels showBehaviorModels hideCollisionModels '
-                                                   'hideBoundingCollisionModels hideForceFields '
-                                                   'hideInteractionForceFields hideWireframe showMechanicalMappings')
+    addHeader(rootNode, lazyPlugins=True)
     rootNode.dt.value = deltaT
     rootNode.gravity.value = [0., 0., 0.]
-    rootNode.addObject('Camera', position="-35 0 280", lookAt="0 0 0")
-    rootNode.addObject('DefaultAnimationLoop')
+    addObject(rootNode, 'Camera', position="-35 0 280", lookAt="0 0 0")
+    addObject(rootNode, 'DefaultAnimationLoop')
 
 
     solverNode = rootNode.addChild('solverNode')
-    solverNode.addObject('EulerImplicitSolver', rayleighStiffness=rayleighStiffness, rayleighMass='0.',
-                         firstOrder=firstOrder)
-    solverNode.addObject('SparseLDLSolver', name='solver', template="CompressedRowSparseMatrixd")
+    addObject(solverNode, 'EulerImplicitSolver', rayleighStiffness=rayleighStiffness, rayleighMass='0.',
+              firstOrder=firstOrder)
+    addObject(solverNode, 'SparseLDLSolver', name='solver', template="CompressedRowSparseMatrixd")
 
     needCollisionModel = 0  # use this if the collision model if the beam will interact with another object
     nonLinearCosserat = solverNode.addChild(
@@ -95,10 +94,11 @@ def createScene(rootNode):
 
     beamFrame = nonLinearCosserat.cosseratFrame
 
-    constForce = beamFrame.addObject('ConstantForceField', name='constForce', showArrowSize=1.e-8,
+    constForce = addObject(beamFrame, 'ConstantForceField', name='constForce', showArrowSize=1.e-8,
                         indices=nonLinearConfig['nbFramesF'], force=F1)
 
-    nonLinearCosserat = solverNode.addObject(
+    nonLinearCosserat = addObject(
+        solverNode,
         ForceController(parent=solverNode, cosseratFrames=beamFrame.FramesMO, forceNode=constForce))
 
     return rootNode
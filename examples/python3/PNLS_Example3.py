@@ -12,7 +12,9 @@ __date__ = "Jan, 17 2022"
 import Sofa
 from cosserat.cosseratObject import Cosserat
 from cosserat.nonLinearCosserat import NonLinearCosserat as nonCosserat
-from cosserat.usefulFunctions import buildEdges, pluginList, BuildCosseratGeometry
+from cosserat.usefulFunctions import buildEdges, BuildCosseratGeometry
+from useful.header import addHeader
+from useful.plugins import addObject
 from math import sqrt
 from splib3.numerics import Quat
 from math import pi
@@ -91,18 +93,14 @@ class ForceController(Sofa.Core.Controller):
 
 
 def createScene(rootNode):
-    rootNode.addObject('RequiredPlugin', name='plugins', pluginName=[pluginList])
-    rootNode.addObject('VisualStyle', displayFlags='showVisualModels showBehaviorModels hideCollisionModels '
-                                                   'hideBoundingCollisionModels hideForceFields '
-                                                   'hideInteractionForceFields hideWireframe showMechanicalMappings')
+    addHeader(rootNode, lazyPlugins=True)
     rootNode.dt.value = 0.02
     rootNode.gravity.value = [0., 0., 0.]
-    rootNode.addObject('BackgroundSetting', color='1 1 1')
 
     solverNode = rootNode.addChild('solverNode')
-    solverNode.addObject('EulerImplicitSolver', rayleighStiffness=0, rayleighMass='0.',
-                         firstOrder=firstOrder)
-    solverNode.addObject('SparseLDLSolver', name='solver', template="CompressedRowSparseMatrixd")
+    addObject(solverNode, 'EulerImplicitSolver', rayleighStiffness=0, rayleighMass='0.',
+              firstOrder=firstOrder)
+    addObject(solverNode, 'SparseLDLSolver', name='solver', template="CompressedRowSparseMatrixd")
 
     needCollisionModel = 0  # use this if the collision model if the beam will interact with another object
     nonLinearCosserat = solverNode.addChild(
@@ -114,19 +112,20 @@ def createScene(rootNode):
 
     # @todo attach the end effector of the beam with a control point
     EndEffectorColler = rootNode.addChild('EndEffectorController')
-    controlMo = EndEffectorColler.addObject('MechanicalObject', template='Rigid3d', name="controlEndEffector",
+    controlMo = addObject(EndEffectorColler, 'MechanicalObject', template='Rigid3d', name="controlEndEffector",
                             showObjectScale=0.3, position=[length, 0, 0, 0, 0, 0, 1], showObject=True)
 
-    beamFrame.addObject('RestShapeSpringsForceField', name='spring',
-                        stiffness=1e8, angularStiffness=1e8, external_points=0,
-                        external_rest_shape=controlMo.getLinkPath(), points=nbFrames, template="Rigid3d")
+    addObject(beamFrame, 'RestShapeSpringsForceField', name='spring',
+              stiffness=1e8, angularStiffness=1e8, external_points=0,
+              external_rest_shape=controlMo.getLinkPath(), points=nbFrames, template="Rigid3d")
 
     cosseratNode = nonLinearCosserat.legendreControlPointsNode
    
-    constForce = beamFrame.addObject('ConstantForceField', name='constForce', showArrowSize=1.e-9,
+    constForce = addObject(beamFrame, 'ConstantForceField', name='constForce', showArrowSize=1.e-9,
                         indices=nonLinearConfig['nbFramesF'], force=F1)
 
-    nonLinearCosserat = solverNode.addObject(
+    nonLinearCosserat = addObject(
+        solverNode,
         ForceController(parent=solverNode, cosseratFrames=beamFrame.FramesMO, controller=controlMo))
 
     return rootNode
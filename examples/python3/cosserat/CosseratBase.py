@@ -14,9 +14,141 @@ from useful.utils import addEdgeCollision, addPointsCollision
 from useful.header import addHeader, addVisual, addSolverNode
 from useful.params import Parameters, BeamGeometryParameters
 from useful.geometry import CosseratGeometry, generate_edge_list
+from useful.plugins import addObject
 
 
-class CosseratBase(Sofa.Prefab):
+class CosseratRod:
+    """Components added on a built rod, common to CosseratBase and to its clones (CosseratClone).
+
+    They need the frames node (cosseratFrame) and the initial positions of the frames (frames3D). The rod records
+    the steps building its subtree in _recipe, clone() replays them under another node.
+    """
+
+    # Parameters which can be overridden by clone(): (path of the node, name of the data) they are given to
+    cloneParameters = {
+        "translation": [("rigidBase", "translation")],
+        "rotation": [("rigidBase", "rotation")],
+        "youngModulus": [("cosseratCoordinate", "youngModulus")],
+        "poissonRatio": [("cosseratCoordinate", "poissonRatio")],
+        "radius": [("cosseratCoordinate", "radius"), ("rigidBase/cosseratInSofaFrameNode", "radius")],
+        "beamMass": [("rigidBase/cosseratInSofaFrameNode", "totalMass")],
+    }
+
+    # Parameters of the stiffness, unused when it is given by the inertia parameters (GI, GA, EI, EA)
+    elasticParameters = ["youngModulus", "poissonRatio", "radius"]
+
+    def addCollisionModel(self):
+        tab_edges = generate_edge_list(self.frames3D)
+        return addEdgeCollision(self.cosseratFrame, self.frames3D, tab_edges)
+
+    def _addPointCollisionModel(self, nodeName="CollisionPoints"):
+        tab_edges = generate_edge_list(self.frames3D)
+        return addPointsCollision(
+            self.cosseratFrame, self.frames3D, tab_edges, nodeName
+        )
+
+    def addSlidingPoints(self):
+        slidingPoint = self.cosseratFrame.addChild("slidingPoint")
+        slidingPoint.addObject(
+            "MechanicalObject",
+            name="slidingPointMO",
+            position=self.frames3D,
+            showObject="0",
+            showIndices="0",
+        )
+        slidingPoint.addObject("IdentityMapping")
+        return slidingPoint
+
+    def addSlidingPointsWithContainer(self):
+        slidingPoint = self.cosseratFrame.addChild("slidingPoint")
+        slidingPoint.addObject("PointSetTopologyContainer")
+        slidingPoint.addObject("PointSetTopologyModifier")
+        slidingPoint.addObject(
+            "MechanicalObject",
+            name="slidingPointMO",
+            position=self.frames3D,
+            showObject="1",
+            showIndices="0",
+        )
+        slidingPoint.addObject("IdentityMapping")
+        return slidingPoint
+
+    _addSlidingPoints = addSlidingPoints
+    _addSlidingPointsWithContainer = addSlidingPointsWithContainer
+
+    @staticmethod
+    def _getNode(root, path):
+        node = root
+        for name in filter(None, path.split("/")):
+            node = node.getChild(name)
+        return node
+
+    @staticmethod
+    def _createObject(root, path, typeName, kwargs, links):
+        # links: name of the link -> path of the linked object from the root of the rod
+        data = dict(kwargs)
+        for key, target in links.items():
+            nodePath, _, objectName = target.rpartition("/")
+            data[key] = CosseratRod._getNode(root, nodePath).getObject(objectName).getLinkPath()
+        return addObject(CosseratRod._getNode(root, path), typeName, **data)
+
+    def clone(self, parent, name, **overrides):
+        """Re-creates this rod in a new node `name` of parent and returns it as a CosseratClone.
+
+        The recorded components are added again with the same, already computed, values (geometry arrays,
+        stiffness parameters...), the links between them point to the components of the new node. overrides are
+        keys of cloneParameters, e.g. clone(parent, "rod2", translation=[0, 5, 0], youngModulus=2e6, radius=0.3),
+        an override without effect on this rod raises a ValueError. The components added after the construction
+        (collision models, sliding points...) are not cloned, they can be added on the clone.
+        """
+        recorded = {(step[1], key) for step in self._recipe if step[0] == "object" for key in step[3]}
+        values = {}
+        for key, value in overrides.items():
+            if self.useInertiaParams and key in self.elasticParameters:
+                raise ValueError(f"{key} has no effect on this rod, its stiffness is given by the inertia "
+                                 f"parameters (GI, GA, EI, EA)")
+            targets = [target for target in self.cloneParameters.get(key, []) if target in recorded]
+            if not targets:
+                raise ValueError(f"{key} cannot be overridden on this rod, possible parameters: "
+                                 f"{[name for name, t in self.cloneParameters.items() if set(t) & recorded]}")
+            for target in targets:
+                values[target] = value
+
+        node = parent.addChild(name)
+        recipe = []
+        for step in self._recipe:
+            if step[0] == "child":
+                self._getNode(node, step[1]).addChild(step[2])
+            elif step[0] == "parent":
+                self._getNode(node, step[1]).addChild(self._getNode(node, step[2]))
+            else:
+                _, path, typeName, kwargs, links = step
+                kwargs = {key: values.get((path, key), value) for key, value in kwargs.items()}
+                self._createObject(node, path, typeName, kwargs, links)
+                step = ("object", path, typeName, kwargs, links)
+            recipe.append(step)
+        return CosseratClone(node, recipe, self.frames3D, self.useInertiaParams)
+
+
+class CosseratClone(CosseratRod):
+    """Rod created by clone(), with the nodes and the methods of a CosseratBase (cosseratFrame, frames3D,
+    addCollisionModel, addSlidingPoints, clone...). The other attributes are the ones of its node (name, getChild,
+    getObject...)."""
+
+    def __init__(self, node, recipe, frames3D, useInertiaParams):
+        self.node = node
+        self._recipe = recipe
+        self.frames3D = frames3D
+        self.useInertiaParams = useInertiaParams
+        self.rigidBaseNode = node.getChild("rigidBase")
+        self.cosseratCoordinateNode = node.getChild("cosseratCoordinate")
+        self.cosseratFrame = self.rigidBaseNode.getChild("cosseratInSofaFrameNode")
+
+    def __getattr__(self, name):
+        return getattr(self.node, name)
+
+
+class CosseratBase(Sofa.Prefab, CosseratRod):
     """
     CosseratBase model prefab class. It is a prefab class that allow to create a cosserat beam/rod in Sofa.
            Structure:
@@ -31,6 +163,9 @@ class CosseratBase(Sofa.Prefab):
             }
             params
 
+    The subtree built by the constructor is recorded, clone() re-creates it under another node with a few
+    overridden parameters (base pose, Young modulus, radius...) without building a new prefab, see
+    CosseratRod.clone().
     """
 
     prefabParameters = [
@@ -64,6 +199,7 @@ class CosseratBase(Sofa.Prefab):
 
     def __init__(self, *args, **kwargs):
         Sofa.Prefab.__init__(self, *args, **kwargs)
+        self._recipe = []
         self.params = kwargs.get(
             "params", Parameters()
         )  # Use the Parameters class with default values
@@ -89,6 +225,7 @@ class CosseratBase(Sofa.Prefab):
 
         self.rigidBaseNode = self._addRigidBaseNode()
 
+        # The geometry is made of numpy arrays, given as is to the Data of the components
         cosserat_geometry = CosseratGeometry(beamGeometryParams)
         self.frames3D = cosserat_geometry.cable_positionF
 
@@ -104,50 +241,15 @@ class CosseratBase(Sofa.Prefab):
     def init(self):
         pass
 
-    def addCollisionModel(self):
-        tab_edges = generate_edge_list(self.frames3D)
-        return addEdgeCollision(self.cosseratFrame, self.frames3D, tab_edges)
-
-    def _addPointCollisionModel(self, nodeName="CollisionPoints"):
-        tab_edges = generate_edge_list(self.frames3D)
-        return addPointsCollision(
-            self.cosseratFrame, self.frames3D, tab_edges, nodeName
-        )
-
-    def _addSlidingPoints(self):
-        slidingPoint = self.cosseratFrame.addChild("slidingPoint")
-        slidingPoint.addObject(
-            "MechanicalObject",
-            name="slidingPointMO",
-            position=self.frames3D,
-            showObject="0",
-            showIndices="0",
-        )
-        slidingPoint.addObject("IdentityMapping")
-        return slidingPoint
-
-    def _addSlidingPointsWithContainer(self):
-        slidingPoint = self.cosseratFrame.addChild("slidingPoint")
-        slidingPoint.addObject("PointSetTopologyContainer")
-        slidingPoint.addObject("PointSetTopologyModifier")
-        slidingPoint.addObject(
-            "MechanicalObject",
-            name="slidingPointMO",
-            position=self.frames3D,
-            showObject="1",
-            showIndices="0",
-        )
-        slidingPoint.addObject("IdentityMapping")
-        return slidingPoint
-
     def _addRigidBaseNode(self):
-        rigidBaseNode = self.addChild("rigidBase")
+        rigidBaseNode = self._addChild("", "rigidBase")
         trans = list(self.translation.value)
         rot = list(self.rotation.value)
         # To be improved with classes in top
-        positions = [[self.params.beamGeoParams.init_pos] + [0.0, 0.0, 0.0, 1.0]]
+        positions = [list(self.params.beamGeoParams.init_pos) + [0.0, 0.0, 0.0, 1.0]]
 
-        rigidBaseNodeMo = rigidBaseNode.addObject(
+        rigidBaseNodeMo = self._addObject(
+            "rigidBase",
             "MechanicalObject",
             template="Rigid3d",
             name="RigidBaseMO",
@@ -164,7 +266,8 @@ class CosseratBase(Sofa.Prefab):
         # to a control object in order to be able to drive it.
         if int(self.attachingToLink.value):
             print("Adding the rest shape to the base")
-            rigidBaseNode.addObject(
+            self._addObject(
+                "rigidBase",
                 "RestShapeSpringsForceField",
                 name="spring",
                 stiffness=1e8,
@@ -177,8 +280,9 @@ class CosseratBase(Sofa.Prefab):
         return rigidBaseNode
 
     def _addCosseratCoordinate(self, bendingStates, listOfSectionsLength):
-        cosseratCoordinateNode = self.addChild("cosseratCoordinate")
-        cosseratCoordinateNode.addObject(
+        cosseratCoordinateNode = self._addChild("", "cosseratCoordinate")
+        self._addObject(
+            "cosseratCoordinate",
             "MechanicalObject",
             template="Vec3d",
             name="cosseratCoordinateMO",
@@ -187,7 +291,8 @@ class CosseratBase(Sofa.Prefab):
         )
 
         if self.useInertiaParams is False:
-            cosseratCoordinateNode.addObject(
+            self._addObject(
+                "cosseratCoordinate",
                 "BeamHookeLawForceField",
                 crossSectionShape=self.params.beamPhysicsParams.beamShape,
                 length=listOfSectionsLength,
@@ -212,7 +317,8 @@ class CosseratBase(Sofa.Prefab):
         GI = self.params.beamPhysicsParams.GI
         EA = self.params.beamPhysicsParams.EA
         EI = self.params.beamPhysicsParams.EI
-        cosseratCoordinateNode.addObject(
+        self._addObject(
+            "cosseratCoordinate",
             "BeamHookeLawForceField",
             crossSectionShape=self.params.beamPhysicsParams.beamShape,
             length=listOfSectionsLength,
@@ -222,15 +328,17 @@ class CosseratBase(Sofa.Prefab):
             GA=GA,
             EI=EI,
             EA=EA,
-            rayleighStiffness=self.rayleighStiffness.value,
+            rayleighStiffness=self.params.simuParams.rayleighStiffness,
             lengthY=self.params.beamPhysicsParams.length_Y,
             lengthZ=self.params.beamPhysicsParams.length_Z,
         )
 
     def _addCosseratFrame(self, framesF, curv_abs_inputS, curv_abs_outputF):
-        cosseratInSofaFrameNode = self.rigidBaseNode.addChild("cosseratInSofaFrameNode")
-        self.cosseratCoordinateNode.addChild(cosseratInSofaFrameNode)
-        framesMO = cosseratInSofaFrameNode.addObject(
+        framePath = "rigidBase/cosseratInSofaFrameNode"
+        cosseratInSofaFrameNode = self._addChild("rigidBase", "cosseratInSofaFrameNode")
+        self._addParent("cosseratCoordinate", framePath)
+        self._addObject(
+            framePath,
             "MechanicalObject",
             template="Rigid3d",
             name="FramesMO",
@@ -240,23 +348,39 @@ class CosseratBase(Sofa.Prefab):
             showObjectScale=1.8,  # Todo: remove this hard code
         )
 
-        cosseratInSofaFrameNode.addObject(
-            "UniformMass", totalMass=self.beamMass, showAxisSizeFactor="0"
+        self._addObject(
+            framePath, "UniformMass", totalMass=self.beamMass, showAxisSizeFactor="0"
         )
 
-        cosseratInSofaFrameNode.addObject(
+        self._addObject(
+            framePath,
             "DiscreteCosseratMapping",
             curv_abs_input=curv_abs_inputS,
             curv_abs_output=curv_abs_outputF,
             name="cosseratMapping",
-            input1=self.cosseratCoordinateNode.cosseratCoordinateMO.getLinkPath(),
-            input2=self.rigidBaseNode.RigidBaseMO.getLinkPath(),
-            output=framesMO.getLinkPath(),
+            links={
+                "input1": "cosseratCoordinate/cosseratCoordinateMO",
+                "input2": "rigidBase/RigidBaseMO",
+                "output": framePath + "/FramesMO",
+            },
             debug=0,
             radius=self.radius,
         )
         return cosseratInSofaFrameNode
 
+    def _addChild(self, parentPath, name):
+        self._recipe.append(("child", parentPath, name))
+        return self._getNode(self, parentPath).addChild(name)
+
+    def _addParent(self, parentPath, path):
+        self._recipe.append(("parent", parentPath, path))
+        self._getNode(self, parentPath).addChild(self._getNode(self, path))
+
+    def _addObject(self, path, typeName, links=None, **kwargs):
+        links = links or {}
+        self._recipe.append(("object", path, typeName, kwargs, links))
+        return self._createObject(self, path, typeName, kwargs, links)
+
 
 Params = Parameters(beamGeoParams=BeamGeometryParameters(init_pos=[0, 0, 0]))
 
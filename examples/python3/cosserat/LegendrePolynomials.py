@@ -10,28 +10,48 @@ __version__ = "1.0.0"
 __copyright__ = "(c) 2021,Inria"
 __date__ = "Nov 18 2021"
 
-import matplotlib
-import matplotlib.pyplot as plt
+from functools import lru_cache
+
 import numpy as np
 
-# matplotlib.use('Agg')
+
+@lru_cache(maxsize=32)
+def _legendreTable(order, abscissa):
+    x = np.asarray(abscissa, dtype=float)
+    table = np.empty((order, x.size))
+    if order > 0:
+        table[0] = 1.0
+    if order > 1:
+        table[1] = x
+    # Bonnet's recurrence: n P_n = (2n - 1) x P_{n-1} - (n - 1) P_{n-2}
+    for n in range(2, order):
+        table[n] = ((2 * n - 1) * x * table[n - 1] - (n - 1) * table[n - 2]) / n
+    table.setflags(write=False)
+    return table
+
+
+def legendreTable(order, x):
+    """Returns the (order, len(x)) table of the Legendre polynomials P_0 ... P_{order-1} at the abscissa x.
+
+    The table is filled in one pass with the three-term recurrence and memoized per (order, x),
+    the returned array is read-only and shared between callers."""
+    abscissa = tuple(float(v) for v in np.atleast_1d(x))
+    return _legendreTable(int(order), abscissa)
 
 
 def legendrePoly(n, x):
-    if n == 0:
-        return 1
-    elif n == 1:
-        return x
-    else:
-        return (((2 * n) - 1) * x * legendrePoly(n - 1, x) - (n - 1) * legendrePoly(n - 2, x)) / float(n)
+    if np.isscalar(x):
+        return legendreTable(n + 1, [x])[n, 0]
+    return legendreTable(n + 1, x)[n]
 
 
 def drawLegendre():
+    import matplotlib.pyplot as plt
+
     x = np.linspace(0, 1, 100)
-    # print(f'x = {x}')
+    table = legendreTable(5, x)
     for i in range(1, 5):
-        # print(f"LX : {legendrePoly(i, x)}")
-        plt.plot(x, legendrePoly(i, x), label="Legendre" + str(i))
+        plt.plot(x, table[i], label="Legendre" + str(i))
 
     plt.legend(loc="best")
     plt.xlabel("X")
@@ -43,8 +63,7 @@ def buildMState(sizeAbscissa=6, polyDegree=5):
     x = np.linspace(0.0, 1, sizeAbscissa)
     print(f'x = {x}')
     vectorPoly = []
-    for i in range(1, polyDegree):
-        poly = legendrePoly(i, x)
+    for poly in legendreTable(polyDegree, x)[1:]:
         print(f'==> {poly}')
         for p in poly:
             vectorPoly.append([p, 0., 0.])
@@ -52,8 +71,6 @@ def buildMState(sizeAbscissa=6, polyDegree=5):
     print(f'vectorPoly:{vectorPoly}')
 
 
-# buildMState(sizeAbscissa=3, polyDegree=4)
-# for i in range(4):
-#     print(f'===> {legendrePoly(i, 0.99)}')
-
-drawLegendre()
\ No newline at end of file
+if __name__ == '__main__':
+    # buildMState(sizeAbscissa=3, polyDegree=4)
+    drawLegendre()
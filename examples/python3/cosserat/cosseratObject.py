@@ -10,7 +10,9 @@ __copyright__ = "(c) 2021,Inria"
 __date__ = "October, 26 2021"
 
 import Sofa
-from cosserat.usefulFunctions import buildEdges, pluginList, BuildCosseratGeometry
+from cosserat.usefulFunctions import buildEdges, BuildCosseratGeometry
+from useful.header import addHeader
+from useful.plugins import addObject
 from useful.utils import addEdgeCollision, addPointsCollision
 
 cosserat_config = {
@@ -21,26 +23,10 @@ cosserat_config = {
     "buildCollisionModel": 1,
     "beamMass": 0.22,
 }
-<<<<<<< HEAD
 
 
 class Cosserat(Sofa.Prefab):
     """Cosserat beam prefab class. It is a prefab class that allow to create a cosserat beam in Sofa.
-=======
-
-
-# @dataclass
-
-
-class Cosserat(Sofa.Prefab):
-    """ActuatedArm is a reusable sofa model of a S90 servo motor and the tripod actuation arm.
-    Parameters:
-        -parent:        node where the ServoArm will be attached
-         - translation the position in space of the structure
-         - eulerRotation the orientation of the structure
-         - attachingTo (MechanicalObject)    a rest shape force field will constraint the object
-                                          to follow arm position
->>>>>>> master
     Structure:
     Node : {
          name : 'Cosserat'
@@ -53,12 +39,7 @@ class Cosserat(Sofa.Prefab):
     """
 
     prefabParameters = [
-<<<<<<< HEAD
-        {"name": "name", "type": "string",
-            "help": "Node name", "default": "Cosserat"},
-=======
         {"name": "name", "type": "string", "help": "Node name", "default": "Cosserat"},
->>>>>>> master
         {
             "name": "position",
             "type": "Rigid3d::VecCoord",
@@ -186,40 +167,44 @@ class Cosserat(Sofa.Prefab):
 
     def addSlidingPoints(self):
         slidingPoint = self.cosseratFrame.addChild("slidingPoint")
-        slidingPoint.addObject(
+        addObject(
+            slidingPoint,
             "MechanicalObject",
             name="slidingPointMO",
             position=self.frames3D,
             showObject="0",
             showIndices="0",
         )
-        slidingPoint.addObject("IdentityMapping")
+        addObject(slidingPoint, "IdentityMapping")
         return slidingPoint
 
     def addSlidingPointsWithContainer(self):
         slidingPoint = self.cosseratFrame.addChild("slidingPoint")
-        slidingPoint.addObject("PointSetTopologyContainer")
-        slidingPoint.addObject("PointSetTopologyModifier")
-        slidingPoint.addObject(
+        addObject(slidingPoint, "PointSetTopologyContainer")
+        addObject(slidingPoint, "PointSetTopologyModifier")
+        addObject(
+            slidingPoint,
             "MechanicalObject",
             name="slidingPointMO",
             position=self.frames3D,
             showObject="1",
             showIndices="0",
         )
-        slidingPoint.addObject("IdentityMapping")
+        addObject(slidingPoint, "IdentityMapping")
         return slidingPoint
 
     def addSolverNode(self):
         solverNode = self.parent
         # solverNode = self.addChild('solverNode')
-        solverNode.addObject(
+        addObject(
+            solverNode,
             "EulerImplicitSolver", rayleighStiffness="0.2", rayleighMass="0.1"
         )
-        solverNode.addObject(
+        addObject(
+            solverNode,
             "SparseLDLSolver", name="solver", template="CompressedRowSparseMatrixd"
         )
-        solverNode.addObject("GenericConstraintCorrection")
+        addObject(solverNode, "GenericConstraintCorrection")
         return solverNode
 
     def addRigidBaseNode(self):
@@ -231,7 +216,8 @@ class Cosserat(Sofa.Prefab):
         # @todo converter
         positions = [list(pos) for pos in self.position.value]
 
-        rigidBaseNode.addObject(
+        addObject(
+            rigidBaseNode,
             "MechanicalObject",
             template="Rigid3d",
             name="RigidBaseMO",
@@ -246,7 +232,8 @@ class Cosserat(Sofa.Prefab):
         # to a control object in order to be able to drive it.
         if int(self.attachingToLink.value):
             print("Adding the rest shape to the base")
-            rigidBaseNode.addObject(
+            addObject(
+                rigidBaseNode,
                 "RestShapeSpringsForceField",
                 name="spring",
                 stiffness=1e8,
@@ -260,7 +247,8 @@ class Cosserat(Sofa.Prefab):
 
     def addCosseratCoordinate(self, bendingStates, listOfSectionsLength):
         cosseratCoordinateNode = self.addChild("cosseratCoordinate")
-        cosseratCoordinateNode.addObject(
+        addObject(
+            cosseratCoordinateNode,
             "MechanicalObject",
             template="Vec3d",
             name="cosseratCoordinateMO",
@@ -269,7 +257,8 @@ class Cosserat(Sofa.Prefab):
         )
 
         if self.useInertiaParams is False:
-            cosseratCoordinateNode.addObject(
+            addObject(
+                cosseratCoordinateNode,
                 "BeamHookeLawForceField",
                 crossSectionShape=self.shape.value,
                 length=listOfSectionsLength,
@@ -295,7 +284,8 @@ class Cosserat(Sofa.Prefab):
         EA = self.inertialParams["EA"]
         EI = self.inertialParams["EI"]
         print(f"{GA}")
-        cosseratCoordinateNode.addObject(
+        addObject(
+            cosseratCoordinateNode,
             "BeamHookeLawForceField",
             crossSectionShape=self.shape.value,
             length=listOfSectionsLength,
@@ -313,8 +303,9 @@ class Cosserat(Sofa.Prefab):
     def addCosseratFrame(self, framesF, curv_abs_inputS, curv_abs_outputF):
         cosseratInSofaFrameNode = self.rigidBaseNode.addChild(
             "cosseratInSofaFrameNode")
-       self.cosseratCoordinateNode.addChild(cosseratInSofaFrameNode)
-        framesMO = cosseratInSofaFrameNode.addObject(
+        self.cosseratCoordinateNode.addChild(cosseratInSofaFrameNode)
+        framesMO = addObject(
+            cosseratInSofaFrameNode,
             "MechanicalObject",
             template="Rigid3d",
             name="FramesMO",
@@ -323,11 +314,13 @@ class Cosserat(Sofa.Prefab):
             showObjectScale=0.001,
         )
         if self.beamMass != 0.0:
-            cosseratInSofaFrameNode.addObject(
+            addObject(
+                cosseratInSofaFrameNode,
                 "UniformMass", totalMass=self.beamMass, showAxisSizeFactor="0"
             )
 
-        cosseratInSofaFrameNode.addObject(
+        addObject(
+            cosseratInSofaFrameNode,
             "DiscreteCosseratMapping",
             curv_abs_input=curv_abs_inputS,
             curv_abs_output=curv_abs_outputF,
@@ -342,36 +335,24 @@ class Cosserat(Sofa.Prefab):
 
 
 def createScene(rootNode):
-    rootNode.addObject(
-        "RequiredPlugin",
-        name="plugins",
-        pluginName=[
-            pluginList,
-            ["SofaEngine", "SofaLoader", "SofaSimpleFem", "SofaExporter"],
-        ],
-    )
-    rootNode.addObject(
-        "VisualStyle",
-        displayFlags="showVisualModels showBehaviorModels hideCollisionModels "
-        "hideBoundingCollisionModels hideForceFields "
-        "hideInteractionForceFields hideWireframe showMechanicalMappings",
-    )
+    addHeader(rootNode, lazyPlugins=True)
     rootNode.findData("dt").value = 0.01
     rootNode.findData("gravity").value = [0.0, -9.81, 0.0]
-    rootNode.addObject("BackgroundSetting", color="0 0.168627 0.211765")
-    rootNode.addObject("FreeMotionAnimationLoop")
-    rootNode.addObject("GenericConstraintSolver",
-                       tolerance=1e-5, maxIterations=5e2)
-    rootNode.addObject("Camera", position="-35 0 280", lookAt="0 0 0")
+    addObject(rootNode, "FreeMotionAnimationLoop")
+    addObject(rootNode, "GenericConstraintSolver",
+              tolerance=1e-5, maxIterations=5e2)
+    addObject(rootNode, "Camera", position="-35 0 280", lookAt="0 0 0")
 
     solverNode = rootNode.addChild("solverNode")
-    solverNode.addObject(
+    addObject(
+        solverNode,
         "EulerImplicitSolver", rayleighStiffness="0.2", rayleighMass="0.1"
     )
-    solverNode.addObject(
+    addObject(
+        solverNode,
         "SparseLDLSolver", name="solver", template="CompressedRowSparseMatrixd"
     )
-    solverNode.addObject("GenericConstraintCorrection")
+    addObject(solverNode, "GenericConstraintCorrection")
 
     cosserat = solverNode.addChild(
         Cosserat(
@@ -388,7 +369,8 @@ def createScene(rootNode):
     # Attach a force at the beam tip,
     # we can attach this force to a non-mechanical node to control the beam in order to be able to drive it.
     beamFrame = cosserat.cosseratFrame
-    beamFrame.addObject(
+    addObject(
+        beamFrame,
         "ConstantForceField",
         name="constForce",
         showArrowSize=1.0e-2,
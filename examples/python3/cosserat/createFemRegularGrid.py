@@ -11,38 +11,40 @@ __version__ = "1.0.0"
 __copyright__ = "(c) 2021,Inria"
 __date__ = "March 16 2021"
 
+from useful.plugins import addObject
+
 
 def createFemCube(parentNode):
     FemNode = parentNode.addChild("FemNode")
-    FemNode.addObject('VisualStyle', displayFlags='showBehaviorModels hideCollisionModels hideBoundingCollisionModels '
-                                                  'showForceFields hideInteractionForceFields showWireframe')
+    addObject(FemNode, 'VisualStyle', displayFlags='showBehaviorModels hideCollisionModels hideBoundingCollisionModels '
+                                          'showForceFields hideInteractionForceFields showWireframe')
     gelVolume = FemNode.addChild("gelVolume")
-    gelVolume.addObject("RegularGridTopology", name="HexaTop", n="6 6 6", min="40 -16 -10", max="100 20 10")
-    gelVolume.addObject("TetrahedronSetTopologyContainer", name="Container", position="@HexaTop.position")
-    gelVolume.addObject("TetrahedronSetTopologyModifier", name="Modifier")
-    gelVolume.addObject("Hexa2TetraTopologicalMapping", input="@HexaTop", output="@Container", swapping="false")
+    addObject(gelVolume, "RegularGridTopology", name="HexaTop", n="6 6 6", min="40 -16 -10", max="100 20 10")
+    addObject(gelVolume, "TetrahedronSetTopologyContainer", name="Container", position="@HexaTop.position")
+    addObject(gelVolume, "TetrahedronSetTopologyModifier", name="Modifier")
+    addObject(gelVolume, "Hexa2TetraTopologicalMapping", input="@HexaTop", output="@Container", swapping="false")
 
     GelSurface = FemNode.addChild("GelSurface")
-    GelSurface.addObject("TriangleSetTopologyContainer", name="Container", position="@../GelVolume/HexaTop.position")
+    addObject(GelSurface, "TriangleSetTopologyContainer", name="Container", position="@../GelVolume/HexaTop.position")
 
     gelNode = FemNode.addChild("gelNode")
-    gelNode.addObject("EulerImplicitSolver", rayleighMass="0.1", rayleighStiffness="0.1")
-    gelNode.addObject('SparseLDLSolver', name='preconditioner', template="CompressedRowSparseMatrixMat3x3d")
-    gelNode.addObject('TetrahedronSetTopologyContainer', src="@../gelVolume/Container", name='container')
-    gelNode.addObject('MechanicalObject', name='tetras', template='Vec3d')
-    gelNode.addObject('TetrahedronFEMForceField', template='Vec3d', name='FEM', method='large',
-                      poissonRatio='0.45', youngModulus='100')
-    gelNode.addObject('BoxROI', name='ROI1', box='40 -17 -10 100 -14 10', drawBoxes='true')
-    gelNode.addObject('RestShapeSpringsForceField', points='@ROI1.indices', stiffness='1e12')
+    addObject(gelNode, "EulerImplicitSolver", rayleighMass="0.1", rayleighStiffness="0.1")
+    addObject(gelNode, 'SparseLDLSolver', name='preconditioner', template="CompressedRowSparseMatrixMat3x3d")
+    addObject(gelNode, 'TetrahedronSetTopologyContainer', src="@../gelVolume/Container", name='container')
+    addObject(gelNode, 'MechanicalObject', name='tetras', template='Vec3d')
+    addObject(gelNode, 'TetrahedronFEMForceField', template='Vec3d', name='FEM', method='large',
+              poissonRatio='0.45', youngModulus='100')
+    addObject(gelNode, 'BoxROI', name='ROI1', box='40 -17 -10 100 -14 10', drawBoxes='true')
+    addObject(gelNode, 'RestShapeSpringsForceField', points='@ROI1.indices', stiffness='1e12')
 
     surfaceNode = gelNode.addChild("surfaceNode")
-    surfaceNode.addObject('TriangleSetTopologyContainer', name="surfContainer", src="@../../GelSurface/Container")
-    surfaceNode.addObject('MechanicalObject', name='msSurface')
-    surfaceNode.addObject('TriangleCollisionModel', name='surface')
-    surfaceNode.addObject('LineCollisionModel', name='line')
-    surfaceNode.addObject('BarycentricMapping')
+    addObject(surfaceNode, 'TriangleSetTopologyContainer', name="surfContainer", src="@../../GelSurface/Container")
+    addObject(surfaceNode, 'MechanicalObject', name='msSurface')
+    addObject(surfaceNode, 'TriangleCollisionModel', name='surface')
+    addObject(surfaceNode, 'LineCollisionModel', name='line')
+    addObject(surfaceNode, 'BarycentricMapping')
 
-    gelNode.addObject('LinearSolverConstraintCorrection')
+    addObject(gelNode, 'LinearSolverConstraintCorrection')
 
     return FemNode
 
@@ -51,41 +53,41 @@ def createFemCubeWithParams(parentNode, geometry):
     FemNode = parentNode.addChild("FemNode")
 
     gelVolume = FemNode.addChild("gelVolume")
-    gelVolume.addObject("RegularGridTopology", name="HexaTop", n=geometry.mesh, min=geometry.minVol,
-                        max=geometry.maxVol)
-    cont = gelVolume.addObject("TetrahedronSetTopologyContainer", name="TetraContainer", position="@HexaTop.position")
-    gelVolume.addObject("TetrahedronSetTopologyModifier", name="Modifier")
-    gelVolume.addObject("Hexa2TetraTopologicalMapping", input="@HexaTop", output="@TetraContainer", swapping="false")
+    addObject(gelVolume, "RegularGridTopology", name="HexaTop", n=geometry.mesh, min=geometry.minVol,
+              max=geometry.maxVol)
+    cont = addObject(gelVolume, "TetrahedronSetTopologyContainer", name="TetraContainer", position="@HexaTop.position")
+    addObject(gelVolume, "TetrahedronSetTopologyModifier", name="Modifier")
+    addObject(gelVolume, "Hexa2TetraTopologicalMapping", input="@HexaTop", output="@TetraContainer", swapping="false")
 
     GelSurface = FemNode.addChild("GelSurface")
-    GelSurface.addObject("TriangleSetTopologyContainer", name="triangleContainer",
-                         position="@../gelVolume/HexaTop.position")
-    GelSurface.addObject("TriangleSetTopologyModifier", name="Modifier")
-    GelSurface.addObject("Tetra2TriangleTopologicalMapping", input="@../gelVolume/TetraContainer",
-                         output="@triangleContainer", flipNormals="false")
+    addObject(GelSurface, "TriangleSetTopologyContainer", name="triangleContainer",
+              position="@../gelVolume/HexaTop.position")
+    addObject(GelSurface, "TriangleSetTopologyModifier", name="Modifier")
+    addObject(GelSurface, "Tetra2TriangleTopologicalMapping", input="@../gelVolume/TetraContainer",
+              output="@triangleContainer", flipNormals="false")
 
     gelNode = FemNode.addChild("gelNode")
-    gelNode.addObject("EulerImplicitSolver", rayleighMass=geometry.rayleigh, rayleighStiffness=geometry.rayleigh)
-    gelNode.addObject('SparseLDLSolver', name='precond', template="CompressedRowSparseMatrixMat3x3d")
-    gelNode.addObject('TetrahedronSetTopologyContainer', src="@../gelVolume/TetraContainer", name='container')
-    gelNode.addObject('MechanicalObject', name='tetras', template='Vec3d')
-    gelNode.addObject('TetrahedronFEMForceField', template='Vec3d', name='FEM', method='large',
-                      poissonRatio=geometry.poissonRatio, youngModulus=geometry.youngModulus)
-    gelNode.addObject('BoxROI', name='ROI1', box=geometry.box, drawBoxes='true')
-    gelNode.addObject('RestShapeSpringsForceField', points='@ROI1.indices', stiffness='1e12')
+    addObject(gelNode, "EulerImplicitSolver", rayleighMass=geometry.rayleigh, rayleighStiffness=geometry.rayleigh)
+    addObject(gelNode, 'SparseLDLSolver', name='precond', template="CompressedRowSparseMatrixMat3x3d")
+    addObject(gelNode, 'TetrahedronSetTopologyContainer', src="@../gelVolume/TetraContainer", name='container')
+    addObject(gelNode, 'MechanicalObject', name='tetras', template='Vec3d')
+    addObject(gelNode, 'TetrahedronFEMForceField', template='Vec3d', name='FEM', method='large',
+              poissonRatio=geometry.poissonRatio, youngModulus=geometry.youngModulus)
+    addObject(gelNode, 'BoxROI', name='ROI1', box=geometry.box, drawBoxes='true')
+    addObject(gelNode, 'RestShapeSpringsForceField', points='@ROI1.indices', stiffness='1e12')
 
     surfaceNode = gelNode.addChild("surfaceNode")
-    surfaceNode.addObject('TriangleSetTopologyContainer', name="surfContainer",
-                          src="@../../GelSurface/triangleContainer")
-    surfaceNode.addObject('MechanicalObject', name='msSurface')
-    surfaceNode.addObject('TriangleCollisionModel', name='surface')
-    surfaceNode.addObject('LineCollisionModel', name='line')
-    surfaceNode.addObject('BarycentricMapping')
+    addObject(surfaceNode, 'TriangleSetTopologyContainer', name="surfContainer",
+              src="@../../GelSurface/triangleContainer")
+    addObject(surfaceNode, 'MechanicalObject', name='msSurface')
+    addObject(surfaceNode, 'TriangleCollisionModel', name='surface')
+    addObject(surfaceNode, 'LineCollisionModel', name='line')
+    addObject(surfaceNode, 'BarycentricMapping')
     visu = surfaceNode.addChild("visu")
 
-    visu.addObject("OglModel", name="Visual", src="@../surfContainer",  color="0.0 0.1 0.9 0.40" )
-    visu.addObject("BarycentricMapping", input="@..", output="@Visual")
+    addObject(visu, "OglModel", name="Visual", src="@../surfContainer",  color="0.0 0.1 0.9 0.40" )
+    addObject(visu, "BarycentricMapping", input="@..", output="@Visual")
 
-    gelNode.addObject('LinearSolverConstraintCorrection')
+    addObject(gelNode, 'LinearSolverConstraintCorrection')
 
     return FemNode
@@ -10,11 +10,14 @@ import numpy as np
 import Sofa
 import Cosserat
 from cosserat.needle.params import ConstraintsParams
-from cosserat.utils import computePositiveAlongXDistanceBetweenPoints, computeNegativeAlongXDistanceBetweenPoints
+from useful.utils import computePositiveAlongXDistanceBetweenPoints, computeNegativeAlongXDistanceBetweenPoints
 
 
 class Animation(Sofa.Core.Controller):
     def __init__(self, *args, **kwargs):
+        # When False, the insertion is handled by the NeedleInsertionController component and
+        # this controller only handles the keyboard
+        self.insertionLogic = kwargs.pop('insertionLogic', True)
         Sofa.Core.Controller.__init__(self, *args, **kwargs)
         self.rigidBaseMO = args[0].rigidBaseNode.RigidBaseMO
         self.rateAngularDeformMO = args[0].cosseratCoordinateNode.cosseratCoordinateMO
@@ -25,7 +28,7 @@ class Animation(Sofa.Core.Controller):
         self.contactListener = args[1]
         self.generic = args[2]
         self.entryPoint = []
-        self.threshold = 3.
+        self.threshold = ConstraintsParams.entryForce
 
         self.constraintPointsNode = args[3]
         self.pointManager = self.constraintPointsNode.pointsManager
@@ -43,6 +46,8 @@ class Animation(Sofa.Core.Controller):
         return
 
     def onAnimateEndEvent(self, event):
+        if not self.insertionLogic:
+            return
         if self.contactListener.getContactPoints() and not self.inside:
             # @Info: check if the contact force is large enough to go through the tissue
             if self.generic.constraintForces and self.generic.constraintForces[0] > self.threshold:
@@ -66,7 +71,8 @@ class Animation(Sofa.Core.Controller):
             if self.inside:
                 # @info 1. check if the needle reached the distance to create/remove a constraint point
                 slidingPos = self.needleSlidingState.position.array()
-                constraintPos = self.constraintPts.position.array()
+                # With a points pool only the first active points are meaningful
+                constraintPos = self.constraintPts.position.array()[:self.pointManager.getNbActivePoints()]
                 
                 # Add constraint point when going forwards
                 if computePositiveAlongXDistanceBetweenPoints(slidingPos, constraintPos) > ConstraintsParams.constraintDistance:
@@ -63,5 +63,7 @@ class NeedleParameters:
 @dataclass
 class ConstraintsParams:
     constraintDistance: float = 1.3  # distance between two constraint points
-    entryForce: float = 0.3  # The required force to penetrate the volume
+    entryForce: float = 3.0  # The required force to penetrate the volume
+    poolSize: int = 0  # Number of preallocated constraint points, 0 means points are added through the topology
+    useNativeController: bool = True  # Use the C++ NeedleInsertionController instead of the python insertion logic
 
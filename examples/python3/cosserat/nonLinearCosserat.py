@@ -10,8 +10,12 @@ __copyright__ = "(c) 2021,Inria"
 __date__ = "October, 26 2021"
 
 from dataclasses import dataclass
+import numpy as np
 import Sofa
-from cosserat.usefulFunctions import buildEdges, pluginList, BuildCosseratGeometry
+from cosserat.usefulFunctions import buildEdges, BuildCosseratGeometry
+from useful.header import addHeader
+from useful.plugins import addObject
+from cosserat.LegendrePolynomials import legendreTable
 
 linearConfig = {'init_pos': [0., 0., 0.], 'tot_length': 1, 'nbSectionS': 15,
                 'nbFramesF': 30, 'buildCollisionModel': 1, 'beamMass': 0.22}
@@ -23,13 +27,13 @@ nonLinearConfig = {'init_pos': [0., 0., 0.], 'tot_length': 1, 'nbSectionS': 8,
 # @dataclass
 def addEdgeCollision(parentNode, position3D, edges):
     collisInstrumentCombined = parentNode.addChild('collisInstrumentCombined')
-    collisInstrumentCombined.addObject('EdgeSetTopologyContainer', name="collisEdgeSet", position=position3D,
-                                       edges=edges)
-    collisInstrumentCombined.addObject('EdgeSetTopologyModifier', name="collisEdgeModifier")
-    collisInstrumentCombined.addObject('MechanicalObject', name="CollisionDOFs")
-    collisInstrumentCombined.addObject('LineCollisionModel', bothSide="1", group='2')
-    collisInstrumentCombined.addObject('PointCollisionModel', bothSide="1", group='2')
-    collisInstrumentCombined.addObject('IdentityMapping', name="mapping")
+    addObject(collisInstrumentCombined, 'EdgeSetTopologyContainer', name="collisEdgeSet", position=position3D,
+              edges=edges)
+    addObject(collisInstrumentCombined, 'EdgeSetTopologyModifier', name="collisEdgeModifier")
+    addObject(collisInstrumentCombined, 'MechanicalObject', name="CollisionDOFs")
+    addObject(collisInstrumentCombined, 'LineCollisionModel', bothSide="1", group='2')
+    addObject(collisInstrumentCombined, 'PointCollisionModel', bothSide="1", group='2')
+    addObject(collisInstrumentCombined, 'IdentityMapping', name="mapping")
     return collisInstrumentCombined
 
 
@@ -77,6 +81,10 @@ class NonLinearCosserat(Sofa.Prefab):
         self.parent = kwargs['parent']
         self.legendreControlPos = kwargs['legendreControlPoints']
         self.polynomOrder = kwargs['order']
+        # 'legendre' keeps the LegendrePolynomialsMapping, 'chebyshev', 'bspline' and 'custom' use the StrainBasisMapping
+        self.basisType = kwargs.get('basisType', 'legendre')
+        self.splineDegree = kwargs.get('splineDegree', 3)
+        self.customBasis = kwargs.get('customBasis', None)
         self.useInertiaParams = False
         self.totalLength = self.cosseratGeometry['tot_length']
         if self.parent.hasObject("EulerImplicitSolver") is False:
@@ -105,9 +113,9 @@ class NonLinearCosserat(Sofa.Prefab):
 
     def addSolverNode(self):
         solverNode = self.addChild('solverNode')
-        solverNode.addObject('EulerImplicitSolver', rayleighStiffness="0.2", rayleighMass='0.1')
-        solverNode.addObject('SparseLDLSolver', name='solver', template="CompressedRowSparseMatrixd")
-        solverNode.addObject('GenericConstraintCorrection')
+        addObject(solverNode, 'EulerImplicitSolver', rayleighStiffness="0.2", rayleighMass='0.1')
+        addObject(solverNode, 'SparseLDLSolver', name='solver', template="CompressedRowSparseMatrixd")
+        addObject(solverNode, 'GenericConstraintCorrection')
         return solverNode
 
     def addRigidBaseNode(self):
@@ -119,72 +127,86 @@ class NonLinearCosserat(Sofa.Prefab):
         for pos in self.position.value:
             _pos = [p for p in pos]
             positions.append(_pos)
-        rigidBaseNode.addObject('MechanicalObject', template='Rigid3d', name="RigidBaseMO",
-                                showObjectScale=0.2, translation=trans,
-                                position=positions, rotation=rot, showObject=int(self.showObject.value))
+        addObject(rigidBaseNode, 'MechanicalObject', template='Rigid3d', name="RigidBaseMO",
+                  showObjectScale=0.2, translation=trans,
+                  position=positions, rotation=rot, showObject=int(self.showObject.value))
         # one can choose to set this to false and directly attach the beam base
         # to a control object in order to be able to drive it.
         if int(self.attachingToLink.value):
-            rigidBaseNode.addObject('RestShapeSpringsForceField', name='spring',
-                                    stiffness=1e14, angularStiffness=1.e14, external_points=0,
-                                    mstate="@RigidBaseMO", points=0, template="Rigid3d")
+            addObject(rigidBaseNode, 'RestShapeSpringsForceField', name='spring',
+                      stiffness=1e14, angularStiffness=1.e14, external_points=0,
+                      mstate="@RigidBaseMO", points=0, template="Rigid3d")
         return rigidBaseNode
 
     def addLegendrePolynomialsNode(self):
         legendreControlPointsNode = self.solverNode.addChild('legendreControlPointsNode')
         # legendreControlPointsNode.addObject('EulerImplicitSolver', rayleighStiffness="0.2", rayleighMass='0.1')
         # legendreControlPointsNode.addObject('CGLinearSolver', tolerance=1.e-12, iterations=1, threshold=1.e-18)
-        legendreControlPointsNode.addObject('MechanicalObject',
-                                            template='Vec3d', name='legendreControlPointsMO',
-                                            position=self.legendreControlPos, rest_position=self.legendreControlPos,
-                                            showIndices=0)
+        addObject(legendreControlPointsNode, 'MechanicalObject',
+                  template='Vec3d', name='legendreControlPointsMO',
+                  position=self.legendreControlPos, rest_position=self.legendreControlPos,
+                  showIndices=0)
         return legendreControlPointsNode
 
     def addCosseratCoordinate(self, positionS, longeurS, curv_abs_inputS):
         cosseratCoordinateNode = self.legendreControlPointsNode.addChild('cosseratCoordinate')
-        positionXi = [[0., 0., 0.] for _ in range(len(curv_abs_inputS) - 1)]
-        cosseratCoordinateNode.addObject('MechanicalObject',
-                                         template='Vec3d', name='cosseratCoordinateMO', position=positionXi,
-                                         showIndices=0)
+        localCurv = [x/self.totalLength for x in curv_abs_inputS]
+        if self.basisType == 'legendre':
+            # Same basis as the LegendrePolynomialsMapping: one row per order, evaluated at the end of each section
+            legendreCoeffs = legendreTable(self.polynomOrder, localCurv[1:])
+            controlPoints = np.asarray(self.legendreControlPos, dtype=float)
+            positionXi = (legendreCoeffs[:len(controlPoints)].T @ controlPoints).tolist()
+        else:
+            # Computed by the StrainBasisMapping at init
+            positionXi = [[0., 0., 0.] for _ in range(len(curv_abs_inputS) - 1)]
+        addObject(cosseratCoordinateNode, 'MechanicalObject',
+                  template='Vec3d', name='cosseratCoordinateMO', position=positionXi,
+                  showIndices=0)
         if self.useInertiaParams is False:
-            cosseratCoordinateNode.addObject('BeamHookeLawForceField', crossSectionShape=self.shape.value,
-                                             length=longeurS, radius=self.radius.value,
-                                             youngModulus=self.youngModulus.value, poissonRatio=self.poissonRatio.value,
-                                             rayleighStiffness=self.rayleighStiffness.value,
-                                             lengthY=self.length_Y.value, lengthZ=self.length_Z.value)
+            addObject(cosseratCoordinateNode, 'BeamHookeLawForceField', crossSectionShape=self.shape.value,
+                      length=longeurS, radius=self.radius.value,
+                      youngModulus=self.youngModulus.value, poissonRatio=self.poissonRatio.value,
+                      rayleighStiffness=self.rayleighStiffness.value,
+                      lengthY=self.length_Y.value, lengthZ=self.length_Z.value)
         else:
             GA = self.inertialParams['GA']
             GI = self.inertialParams['GI']
             EA = self.inertialParams['EA']
             EI = self.inertialParams['EI']
             print(f'{GA}')
-            cosseratCoordinateNode.addObject('BeamHookeLawForceField', crossSectionShape=self.shape.value,
-                                             length=longeurS, radius=self.radius.value, useInertiaParams=True,
-                                             GI=GI, GA=GA, EI=EI, EA=EA, rayleighStiffness=self.rayleighStiffness.value,
-                                             lengthY=self.length_Y.value, lengthZ=self.length_Z.value)
+            addObject(cosseratCoordinateNode, 'BeamHookeLawForceField', crossSectionShape=self.shape.value,
+                      length=longeurS, radius=self.radius.value, useInertiaParams=True,
+                      GI=GI, GA=GA, EI=EI, EA=EA, rayleighStiffness=self.rayleighStiffness.value,
+                      lengthY=self.length_Y.value, lengthZ=self.length_Z.value)
         print(f'==========> curv_abs_inputS: {curv_abs_inputS}')
-        localCurv = [x/self.totalLength for x in curv_abs_inputS]
         print(f'==========> localCurv: {localCurv}')
         controlPointsAbs = [k * (1. / self.polynomOrder) for k in range(1, self.polynomOrder)]
         controlPointsAbs.append(1.0)
-        cosseratCoordinateNode.addObject('LegendrePolynomialsMapping', curvAbscissa=localCurv, order=self.polynomOrder,
-                                         controlPointsAbs=controlPointsAbs, applyRestPosition=True)
+        if self.basisType == 'legendre':
+            addObject(cosseratCoordinateNode, 'LegendrePolynomialsMapping', curvAbscissa=localCurv, order=self.polynomOrder,
+                      controlPointsAbs=controlPointsAbs, applyRestPosition=True)
+        else:
+            basisParams = {'basisType': self.basisType, 'splineDegree': self.splineDegree}
+            if self.customBasis is not None:
+                basisParams['customBasis'] = self.customBasis
+            addObject(cosseratCoordinateNode, 'StrainBasisMapping', curvAbscissa=localCurv, order=self.polynomOrder,
+                      controlPointsAbs=controlPointsAbs, applyRestPosition=True, **basisParams)
         return cosseratCoordinateNode
 
     def addCosseratFrame(self, framesF, curv_abs_inputS, curv_abs_outputF):
 
         cosseratInSofaFrameNode = self.rigidBaseNode.addChild('cosseratInSofaFrameNode')
         self.cosseratCoordinateNode.addChild(cosseratInSofaFrameNode)
-        framesMO = cosseratInSofaFrameNode.addObject('MechanicalObject', template='Rigid3d',
-                                                     name="FramesMO", position=framesF,
-                                                     showObject=int(self.showObject.value), showObjectScale=0.05)
+        framesMO = addObject(cosseratInSofaFrameNode, 'MechanicalObject', template='Rigid3d',
+                             name="FramesMO", position=framesF,
+                             showObject=int(self.showObject.value), showObjectScale=0.05)
         if self.beamMass != 0.:
-            cosseratInSofaFrameNode.addObject('UniformMass', totalMass=self.beamMass, showAxisSizeFactor='0')
-        cosseratInSofaFrameNode.addObject('DiscreteCosseratMapping', curv_abs_input=curv_abs_inputS,
-                                          curv_abs_output=curv_abs_outputF, name='cosseratMapping',
-                                          input1=self.cosseratCoordinateNode.cosseratCoordinateMO.getLinkPath(),
-                                          input2=self.rigidBaseNode.RigidBaseMO.getLinkPath(),
-                                          output=framesMO.getLinkPath(), debug=0, radius=self.radius)
+            addObject(cosseratInSofaFrameNode, 'UniformMass', totalMass=self.beamMass, showAxisSizeFactor='0')
+        addObject(cosseratInSofaFrameNode, 'DiscreteCosseratMapping', curv_abs_input=curv_abs_inputS,
+                  curv_abs_output=curv_abs_outputF, name='cosseratMapping',
+                  input1=self.cosseratCoordinateNode.cosseratCoordinateMO.getLinkPath(),
+                  input2=self.rigidBaseNode.RigidBaseMO.getLinkPath(),
+                  output=framesMO.getLinkPath(), debug=0, radius=self.radius)
         return cosseratInSofaFrameNode
 
 
@@ -192,23 +214,17 @@ initialStrain = [[0., 0., 0], [0., 0., 0], [0., 0., 0]]
 
 
 def createScene(rootNode):
-    rootNode.addObject('RequiredPlugin', name='plugins', pluginName=[pluginList,
-                                                                     ['SofaEngine', 'SofaLoader', 'SofaSimpleFem',
-                                                                      'SofaExporter']])
-    rootNode.addObject('VisualStyle', displayFlags='showVisualModels showBehaviorModels hideCollisionModels '
-                                                   'hideBoundingCollisionModels hireForceFields '
-                                                   'hideInteractionForceFields hideWireframe')
+    addHeader(rootNode, lazyPlugins=True)
     rootNode.findData('dt').value = 0.01
     # rootNode.findData('gravity').value = [0., -9.81, 0.]
     rootNode.findData('gravity').value = [0., 0., 0.]
-    rootNode.addObject('BackgroundSetting', color='0 0.168627 0.211765')
     # rootNode.addObject('FreeMotionAnimationLoop')
     # rootNode.addObject('GenericConstraintSolver', tolerance=1e-5, maxIterations=5e2)
-    rootNode.addObject('Camera', position="-35 0 280", lookAt="0 0 0")
+    addObject(rootNode, 'Camera', position="-35 0 280", lookAt="0 0 0")
 
     solverNode = rootNode.addChild('solverNode')
-    solverNode.addObject('EulerImplicitSolver', rayleighStiffness="0.2", rayleighMass='0.1')
-    solverNode.addObject('SparseLDLSolver', name='solver', template="CompressedRowSparseMatrixd")
+    addObject(solverNode, 'EulerImplicitSolver', rayleighStiffness="0.2", rayleighMass='0.1')
+    addObject(solverNode, 'SparseLDLSolver', name='solver', template="CompressedRowSparseMatrixd")
     # solverNode.addObject('SparseLUSolver', name='solver', template="CompressedRowSparseMatrixd")
     # solverNode.addObject('CGLinearSolver', tolerance=1.e-12, iterations=1000, threshold=1.e-18)
 
@@ -218,7 +234,7 @@ def createScene(rootNode):
                           name="cosserat", radius=0.1, legendreControlPoints=initialStrain, order=3))
 
     beamFrame = nonLinearCosserat.cosseratFrame
-    beamFrame.addObject('ConstantForceField', name='constForce', showArrowSize=1.e-8, indices=12,
-                        force=[0., 0., 0., 0., 0., 450.])
+    addObject(beamFrame, 'ConstantForceField', name='constForce', showArrowSize=1.e-8, indices=12,
+              force=[0., 0., 0., 0., 0., 450.])
 
     return rootNode
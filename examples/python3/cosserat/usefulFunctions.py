@@ -18,6 +18,8 @@ import Sofa
 import numpy as np
 import math
 from splib3.numerics import Quat
+from useful.geometry import compute_frames, compute_sections
+from useful.plugins import componentPlugins, pluginsOf
 
 # from stlib3.scene import MainScene
 
@@ -69,35 +71,9 @@ rateLength = [
 draw_cylinder = 1
 add_collision_point = 1
 
-pluginList = [
-    "Cosserat",
-    "Sofa.Component.AnimationLoop",
-    "Sofa.Component.LinearSolver.Iterative",
-    "Sofa.Component.LinearSolver.Direct",
-    "Sofa.Component.StateContainer",
-    "Sofa.Component.SolidMechanics.FEM.Elastic",
-    "Sofa.Component.SolidMechanics.Spring",
-    "Sofa.Component.MechanicalLoad",
-    "Sofa.Component.Mass",
-    "Sofa.Component.Topology.Container.Dynamic",
-    "Sofa.Component.Topology.Container.Grid",
-    "Sofa.Component.ODESolver.Backward",
-    "Sofa.Component.Mapping.Linear",
-    "Sofa.Component.Mapping.NonLinear",
-    "Sofa.Component.Topology.Mapping",
-    "Sofa.Component.Collision.Geometry",
-    "Sofa.Component.Collision.Detection.Algorithm",
-    "Sofa.Component.Collision.Detection.Intersection",
-    "Sofa.Component.Collision.Response.Contact",
-    "Sofa.Component.Constraint.Lagrangian.Correction",
-    "Sofa.Component.Constraint.Lagrangian.Solver",
-    "Sofa.Component.Engine.Select",
-    "Sofa.GL.Component.Rendering3D",
-    "Sofa.Component.Setting",
-    "Sofa.Component.SceneUtility",
-    "Sofa.Component.IO.Mesh",
-    "Sofa.Component.Visual",
-]
+# Plugins of the components known by useful.plugins, for the scenes loading them upfront with a RequiredPlugin (the
+# shipped examples load them lazily, see useful.header.addHeader(lazyPlugins=True)). SoftRobots.Inverse is optional.
+pluginList = [name for name in pluginsOf(list(componentPlugins)) if name != "SoftRobots.Inverse"]
 
 
 PRig = 0.38  # poison ratio for the rigid part of the beam
@@ -524,37 +500,9 @@ class CosseratGeometry:
 def generate_cosserat_geometry(beamGeoParams):
     x, y, z = beamGeoParams.init_pos
     total_length = beamGeoParams.beamLength
-    nb_sections = beamGeoParams.nbSection
-    nb_frames = beamGeoParams.nbFrames
-
-    length_s = total_length / nb_sections
-
-    position_s = []
-    sectionLengthList = []
-    temp = x
-    curv_abs_input_s = [x]
-
-    for i in range(nb_sections):
-        position_s.append([0, 0, 0])
-        sectionLengthList.append((((i + 1) * length_s) - i * length_s))
-        temp += sectionLengthList[i]
-        curv_abs_input_s.append(temp)
-    curv_abs_input_s[nb_sections] = total_length + x
-
-    length_f = total_length / nb_frames
-    frames_f = []
-    curv_abs_output_f = []
-    cable_position_f = []
-
-    for i in range(nb_frames):
-        sol = i * length_f
-        frames_f.append([sol + x, y, z, 0, 0, 0, 1])
-        cable_position_f.append([sol + x, y, z])
-        curv_abs_output_f.append(sol + x)
-
-    frames_f.append([total_length + x, y, z, 0, 0, 0, 1])
-    cable_position_f.append([total_length + x, y, z])
-    curv_abs_output_f.append(total_length + x)
+
+    position_s, curv_abs_input_s, sectionLengthList = compute_sections(x, total_length, beamGeoParams.nbSection)
+    frames_f, curv_abs_output_f, cable_position_f = compute_frames((x, y, z), total_length, beamGeoParams.nbFrames)
 
     return CosseratGeometry(
         position_s,
@@ -568,42 +516,16 @@ def generate_cosserat_geometry(beamGeoParams):
 
 def BuildCosseratGeometry(config):
     # Define: the number of section, the total length and the length of each beam.
+    # Every output is a numpy array, see useful.geometry.compute_sections and compute_frames
 
     [x, y, z] = config["init_pos"]
     totalLength = config["tot_length"]
-    nbSection = config["nbSectionS"]
-    nbFrames = config["nbFramesF"]
-
-    lengthS = totalLength / nbSection
-    # Define: the length of each beam in a list, the positions of each beam
-    # (flexion, torsion), the abs of each section
-    positionS = []
-    longeurS = []
-    temp = x
-    curv_abs_inputS = [x]
-    for i in range(nbSection):
-        positionS.append([0, 0, 0])
-        longeurS.append((((i + 1) * lengthS) - i * lengthS))
-        temp += longeurS[i]
-        curv_abs_inputS.append(temp)
-    curv_abs_inputS[nbSection] = totalLength + x
-
-    # ###############################################
-    # Define: the number of frame and the length between each frame.
+
+    # Define: the length of each beam, the positions of each beam (flexion, torsion), the abs of each section
+    positionS, curv_abs_inputS, longeurS = compute_sections(x, totalLength, config["nbSectionS"])
+
     # Define: the abs of each frame and the position of each frame.
-    lengthF = totalLength / nbFrames
-    framesF = []
-    curv_abs_outputF = []
-    cable_positionF = []
-    for i in range(nbFrames):
-        sol = i * lengthF
-        framesF.append([sol + x, y, z, 0, 0, 0, 1])
-        cable_positionF.append([sol + x, y, z])
-        curv_abs_outputF.append(sol + x)
-
-    framesF.append([totalLength + x, y, z, 0, 0, 0, 1])
-    cable_positionF.append([totalLength + x, y, z])
-    curv_abs_outputF.append(totalLength + x)
+    framesF, curv_abs_outputF, cable_positionF = compute_frames([x, y, z], totalLength, config["nbFramesF"])
 
     return [
         positionS,
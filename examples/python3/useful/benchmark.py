@@ -0,0 +1,215 @@
+"""Headless benchmark of the example scenes.
+
+Each scene is loaded in its own process (so that the peak memory and the loaded plugins are the ones of the scene),
+initialized and animated a fixed number of steps without GUI. For each scene the results store the wall time of
+every step, the mean time of the AdvancedTimer labels per step and the peak resident memory. The results are written
+to a JSON file and can be compared to a baseline (a previous results file) with tolerances on the step time and the
+memory, the process returns 1 when a scene is slower, bigger or fails when it did not in the baseline.
+
+Usage (from examples/python3, SOFA and SofaPython3 in the environment):
+    python3 -m useful.benchmark --steps 200 --output results.json
+    python3 -m useful.benchmark --baseline baseline.json --time-tolerance 0.15 --output results.json
+    python3 -m useful.benchmark --scenes PCS_Example1.py ../../docs/testScene/tuto_3.py
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+_here = os.path.dirname(os.path.abspath(__file__))
+_examples = os.path.dirname(_here)
+_repository = os.path.dirname(os.path.dirname(_examples))
+
+# Scenes benchmarked by default, relative to the root of the repository
+defaultScenes = [
+    "examples/python3/PCS_Example1.py",
+    "examples/python3/PCS_Example2.py",
+    "examples/python3/PNLS_Example1.py",
+    "examples/python3/PNLS_Example2.py",
+    "examples/python3/PNLS_Example3.py",
+    "examples/python3/NeedleInsertion.py",
+    "examples/python3/CosseratBeamFallingUnderTheEffectOfGravity.py",
+    "docs/testScene/tuto_1.py",
+    "docs/testScene/tuto_2.py",
+    "docs/testScene/tuto_3.py",
+    "docs/testScene/tuto_4.py",
+    "docs/testScene/tuto_5.py",
+]
+
+_timerId = "Animate"
+
+
+def _flattenTimer(records):
+    """Mean time (ms) per step of each label of the AdvancedTimer records, nested labels are joined with '/'."""
+    totals = {}
+
+    def visit(record, prefix):
+        for label, value in record.items():
+            if not isinstance(value, dict):
+                continue
+            name = f"{prefix}/{label}" if prefix else label
+            if "total_time" in value:
+                totals[name] = totals.get(name, 0.0) + float(value["total_time"])
+            visit(value, name)
+
+    steps = [record for record in records.values() if isinstance(record, dict)] \
+        if isinstance(records, dict) else list(records)
+    for record in steps:
+        visit(record, "")
+    return {name: total / max(len(steps), 1) for name, total in sorted(totals.items())}
+
+
+def runScene(scenePath, steps):
+    """Loads, initializes and animates a scene in this process, returns its measures."""
+    import Sofa
+    import Sofa.Simulation
+    import Sofa.Timer
+
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(scenePath))[0], scenePath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    start = time.perf_counter()
+    root = Sofa.Core.Node("root")
+    module.createScene(root)
+    Sofa.Simulation.init(root)
+    initTime = time.perf_counter() - start
+
+    Sofa.Timer.clear()
+    Sofa.Timer.setEnabled(_timerId, True)
+    Sofa.Timer.setInterval(_timerId, 1)
+    Sofa.Timer.setOutputType(_timerId, "json")
+
+    stepTimes, timerRecords = [], []
+    for _ in range(steps):
+        Sofa.Timer.begin(_timerId)
+        start = time.perf_counter()
+        Sofa.Simulation.animate(root, root.dt.value)
+        stepTimes.append(time.perf_counter() - start)
+        records = Sofa.Timer.getRecords(_timerId)
+        Sofa.Timer.end(_timerId)
+        if records:
+            timerRecords.append(records)
+
+    timer = {}
+    for records in timerRecords:
+        for name, value in _flattenTimer(records).items():
+            timer[name] = timer.get(name, 0.0) + value / len(timerRecords)
+
+    Sofa.Simulation.unload(root)
+    times = np.asarray(stepTimes)
+    return {
+        "status": "ok",
+        "steps": steps,
+        "initTime": initTime,
+        "stepTimes": stepTimes,
+        "meanStepTime": float(times.mean()) if steps else 0.0,
+        "medianStepTime": float(np.median(times)) if steps else 0.0,
+        "p95StepTime": float(np.percentile(times, 95)) if steps else 0.0,
+        "timer": timer,
+        # ru_maxrss is in kB on Linux
+        "peakMemoryMB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    }
+
+
+def benchmarkScene(scenePath, steps, timeout=None):
+    """Runs runScene in a new process, returns its measures or {"status": "error", ...} if the scene failed."""
+    scenePath = os.path.abspath(scenePath)
+    env = dict(os.environ)
+    paths = [_examples, os.path.dirname(scenePath), os.path.join(_repository, "docs", "testScene")]
+    env["PYTHONPATH"] = os.pathsep.join(paths + [env["PYTHONPATH"]] if env.get("PYTHONPATH") else paths)
+    command = [sys.executable, "-m", "useful.benchmark", "--worker", scenePath, "--steps", str(steps)]
+    try:
+        process = subprocess.run(command, cwd=os.path.dirname(scenePath), env=env, capture_output=True, text=True,
+                                 timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"status": "error", "error": f"timeout after {timeout} s"}
+
+    # The scenes print on stdout, the measures are on the last line
+    lines = process.stdout.strip().splitlines()
+    if process.returncode != 0 or not lines:
+        return {"status": "error", "error": process.stderr.strip().splitlines()[-20:]}
+    try:
+        return json.loads(lines[-1])
+    except json.JSONDecodeError:
+        return {"status": "error", "error": lines[-20:]}
+
+
+def runBenchmarks(scenes=None, steps=100, timeout=None):
+    results = {"steps": steps, "python": sys.version.split()[0], "scenes": {}}
+    for scene in scenes or [os.path.join(_repository, path) for path in defaultScenes]:
+        name = os.path.relpath(os.path.abspath(scene), _repository)
+        print(f"[benchmark] {name} ...", flush=True)
+        results["scenes"][name] = benchmarkScene(scene, steps, timeout)
+        measures = results["scenes"][name]
+        if measures["status"] == "ok":
+            print(f"[benchmark]     median step {measures['medianStepTime'] * 1e3:.3f} ms, "
+                  f"peak memory {measures['peakMemoryMB']:.1f} MB", flush=True)
+        else:
+            print(f"[benchmark]     failed: {measures['error']}", flush=True)
+    return results
+
+
+def compareToBaseline(results, baseline, timeTolerance=0.1, memoryTolerance=0.1):
+    """Regressions of results with respect to baseline, as a list of messages.
+
+    A scene regresses when its median step time is more than (1 + timeTolerance) times the one of the baseline, its
+    peak memory more than (1 + memoryTolerance) times the one of the baseline, or when it fails while it ran in the
+    baseline. The scenes missing from the baseline are not compared."""
+    regressions = []
+    for name, measures in results["scenes"].items():
+        reference = baseline.get("scenes", {}).get(name)
+        if reference is None or reference.get("status") != "ok":
+            continue
+        if measures.get("status") != "ok":
+            regressions.append(f"{name}: fails ({measures.get('error')})")
+            continue
+        for key, tolerance, unit, scale in [("medianStepTime", timeTolerance, "ms", 1e3),
+                                            ("peakMemoryMB", memoryTolerance, "MB", 1.0)]:
+            if measures[key] > (1.0 + tolerance) * reference[key]:
+                regressions.append(f"{name}: {key} {measures[key] * scale:.3f} {unit} > "
+                                   f"{reference[key] * scale:.3f} {unit} (+{tolerance:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", nargs="+", help="scene files, the shipped examples by default")
+    parser.add_argument("--steps", type=int, default=100, help="number of animation steps per scene")
+    parser.add_argument("--timeout", type=float, default=None, help="time limit (s) per scene")
+    parser.add_argument("--output", default="benchmark.json", help="JSON file of the results")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument("--time-tolerance", type=float, default=0.1, help="relative tolerance on the step time")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="relative tolerance on the peak memory")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(runScene(args.worker, args.steps)))
+        return 0
+
+    results = runBenchmarks(args.scenes, args.steps, args.timeout)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"[benchmark] results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compareToBaseline(results, json.load(file), args.time_tolerance, args.memory_tolerance)
+        for regression in regressions:
+            print(f"[benchmark] REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("[benchmark] no regression with respect to the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""Binary checkpoint and in-place restore of the state of a scene.
+
+checkpoint(root) serializes into one bytes blob the simulation time and, for the components of the graph listed in
+checkpointData, the Data holding their state: the state vectors of the independent MechanicalObjects, the curvilinear
+abscissas of the DiscreteCosseratMappings (which recompute their frames when they change), the constraint forces of
+the constraint solver and the number of active points of the PointsManagers. restore(root, blob) writes them back into
+the same graph, without rebuilding it, so that many runs can start from the same mid-simulation state (e.g. after the
+insertion of a needle).
+
+The states written by a mapping are not saved, restore recomputes them from the restored independent states. Their
+number of elements can thus change between a checkpoint and its restoration (the states following a point set, e.g.
+the distanceStats of NeedleInsertion.py) and the transient nodes of the contact responses are ignored. The states of
+the point sets are saved even if they are mapped, their positions are the ones their mapping binds.
+
+The blob is made of a magic number, the length of a JSON header and the header, describing each saved Data (path of
+its component, name, dtype, shape and offset), followed by the raw bytes of the arrays.
+
+Usage:
+    from useful.checkpoint import checkpoint, restore
+
+    state = checkpoint(rootNode)         # or saveCheckpoint(rootNode, "inserted.ckpt")
+    for branch in range(100):
+        restore(rootNode, state)         # or loadCheckpoint(rootNode, "inserted.ckpt")
+        ...                              # animate the branch
+"""
+
+import json
+import struct
+
+import numpy as np
+
+_magic = b"COSCKPT1"
+
+# Data saved for each component type
+checkpointData = {
+    "MechanicalObject": ["position", "velocity", "force", "externalForce", "derivX", "free_position",
+                         "free_velocity", "rest_position", "reset_position", "reset_velocity"],
+    "DiscreteCosseratMapping": ["curv_abs_input", "curv_abs_output"],
+    "GenericConstraintSolver": ["constraintForces"],
+}
+
+# Data whose number of elements changes during a simulation, the other ones must keep the shape of the scene
+_resizableData = {"constraintForces"}
+
+# Components whose number of points is restored before their state, with get/setNbActivePoints
+_pointSets = ["PointsManager"]
+
+# Links of a mapping to the states it reads and writes
+_mappingInputs = ["input", "input1", "input2"]
+_mappingOutputs = ["output"]
+
+
+def _objects(root):
+    """(path, object) of the components under root, in the order of the graph."""
+    nodes, visited = [root], set()
+    while nodes:
+        node = nodes.pop(0)
+        if node.getPathName() in visited:
+            continue
+        visited.add(node.getPathName())
+        for obj in node.objects:
+            yield obj.getPathName(), obj
+        nodes += list(node.children)
+
+
+def _isMapping(obj):
+    return obj.getClassName().endswith("Mapping")
+
+
+def _linkedPaths(obj, linkNames):
+    """Paths of the components linked by obj through the links linkNames."""
+    paths = set()
+    for linkName in linkNames:
+        link = obj.findLink(linkName)
+        if link is None:
+            continue
+        for index in range(link.getSize()):
+            linked = link.getLinkedBase(index)
+            if linked is not None:
+                paths.add(linked.getPathName())
+    return paths
+
+
+def _mappedStates(objects):
+    """Paths of the states written by the mappings of objects."""
+    return set().union(*[_linkedPaths(obj, _mappingOutputs) for obj in objects.values() if _isMapping(obj)])
+
+
+def _sortedMappings(objects):
+    """Mappings of objects, each one after the mappings writing its inputs."""
+    mappings = {path: obj for path, obj in objects.items() if _isMapping(obj)}
+    writers = {}
+    for path, obj in mappings.items():
+        for state in _linkedPaths(obj, _mappingOutputs):
+            writers.setdefault(state, set()).add(path)
+
+    ordered, done = [], set()
+
+    def visit(path, visiting):
+        if path in done or path in visiting:
+            return
+        visiting.add(path)
+        for state in _linkedPaths(mappings[path], _mappingInputs):
+            for writer in writers.get(state, ()):
+                visit(writer, visiting)
+        done.add(path)
+        ordered.append(mappings[path])
+
+    for path in mappings:
+        visit(path, set())
+    return ordered
+
+
+def checkpoint(root):
+    """Blob (bytes) of the state of the scene under root."""
+    objects = dict(_objects(root))
+    pointSetNodes = {obj.getContext().getPathName() for obj in objects.values() if obj.getClassName() in _pointSets}
+    mapped = _mappedStates(objects)
+
+    entries, arrays, offset = [], [], 0
+    pointSets = {}
+    for path, obj in objects.items():
+        typeName = obj.getClassName()
+        if typeName in _pointSets:
+            pointSets[path] = int(obj.getNbActivePoints())
+        if path in mapped and obj.getContext().getPathName() not in pointSetNodes:
+            continue
+        for name in checkpointData.get(typeName, []):
+            data = obj.findData(name)
+            if data is None:
+                continue
+            array = np.ascontiguousarray(data.value)
+            if array.dtype.kind not in "biuf":
+                continue
+            entries.append({"path": path, "data": name, "dtype": array.dtype.str, "shape": list(array.shape),
+                            "offset": offset})
+            arrays.append(array)
+            offset += array.nbytes
+
+    header = json.dumps({"time": float(root.time.value), "pointSets": pointSets, "entries": entries}).encode()
+    return b"".join([_magic, struct.pack("<Q", len(header)), header] + [array.tobytes() for array in arrays])
+
+
+def _readHeader(blob):
+    if blob[:len(_magic)] != _magic:
+        raise ValueError("Not a checkpoint of useful.checkpoint")
+    start = len(_magic) + 8
+    (length,) = struct.unpack("<Q", blob[len(_magic):start])
+    return json.loads(blob[start:start + length]), start + length
+
+
+def _validate(header, dataStart, blob, objects):
+    """Errors of the entries of a checkpoint against the scene: missing components or Data, dtype or shape of the
+    Data of the scene (the number of elements may differ for the point sets and _resizableData), or truncated blob."""
+    missing = sorted(({entry["path"] for entry in header["entries"]} | set(header["pointSets"])) - set(objects))
+    if missing:
+        return [f"the components {missing} of the checkpoint are not in the scene"]
+
+    pointSetNodes = {objects[path].getContext().getPathName() for path in header["pointSets"]}
+    errors = []
+    for entry in header["entries"]:
+        name = f"{entry['path']}.{entry['data']}"
+        obj = objects[entry["path"]]
+        data = obj.findData(entry["data"])
+        if data is None:
+            errors.append(f"{name} is not in the scene")
+            continue
+        live = np.asarray(data.value)
+        dtype, shape = np.dtype(entry["dtype"]), tuple(entry["shape"])
+        if dtype != live.dtype:
+            errors.append(f"{name} has the dtype {live.dtype} in the scene and {dtype} in the checkpoint")
+        resizable = entry["data"] in _resizableData or obj.getContext().getPathName() in pointSetNodes
+        if shape != live.shape and not (resizable and len(shape) == live.ndim and shape[1:] == live.shape[1:]):
+            errors.append(f"{name} has the shape {live.shape} in the scene and {shape} in the checkpoint")
+        if dataStart + entry["offset"] + dtype.itemsize * int(np.prod(shape, dtype=np.int64)) > len(blob):
+            errors.append(f"{name} is truncated in the checkpoint")
+    return errors
+
+
+def restore(root, blob):
+    """Writes back into the scene under root the state saved in blob by checkpoint, then recomputes the mapped states.
+
+    Every entry of the checkpoint is checked against the scene first (same component paths, Data of the same dtype
+    and shape), if one does not match a ValueError is raised and the scene is not modified. The contacts of the scene
+    are kept until the next collision detection, which replaces them."""
+    header, dataStart = _readHeader(blob)
+    objects = dict(_objects(root))
+    errors = _validate(header, dataStart, blob, objects)
+    if errors:
+        raise ValueError("The checkpoint does not match the scene: " + "; ".join(errors))
+
+    root.time.value = header["time"]
+
+    # The sizes of the point sets first, their positions are then restored with the other states
+    for path, nbPoints in header["pointSets"].items():
+        objects[path].setNbActivePoints(nbPoints)
+
+    for entry in header["entries"]:
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        start = dataStart + entry["offset"]
+        array = np.frombuffer(blob, dtype=dtype, count=count, offset=start).reshape(entry["shape"])
+        objects[entry["path"]].findData(entry["data"]).value = array.copy()
+
+    # The mappings of the point sets bind their points at the restored positions
+    for path in header["pointSets"]:
+        for obj in objects[path].getContext().objects:
+            if _isMapping(obj):
+                obj.reinit()
+
+    # The mappings apply their restored inputs to their outputs when initialized, the inputs of a mapping are
+    # recomputed before it
+    for mapping in _sortedMappings(objects):
+        mapping.init()
+
+
+def saveCheckpoint(root, path):
+    """Writes checkpoint(root) into a file."""
+    with open(path, "wb") as file:
+        file.write(checkpoint(root))
+
+
+def loadCheckpoint(root, path):
+    """Restores the checkpoint saved in a file by saveCheckpoint."""
+    with open(path, "rb") as file:
+        restore(root, file.read())
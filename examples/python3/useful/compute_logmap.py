@@ -26,9 +26,6 @@ def piecewise_logmap1(curv_abs, g_x):
                                      ((t5 - t1) * np.identity(4) - (t0 * t2 + 2 * t5 - t1 - t3) * g_x +
                                       (2 * t0 * t2 + t5 - t1 - t3) * gp2 - (t0 * t2 - t1) * gp3))
 
-    print('-----------------------------------')
-    print(f'The xi_hat matrix is: \n {xi_hat}')
-    print('-----------------------------------')
     xci = np.array([xi_hat[2, 1], xi_hat[0, 2], xi_hat[1, 0], xi_hat[0, 3], xi_hat[1, 3], xi_hat[2, 3]])
 
     return xci
@@ -1,7 +1,31 @@
 #
+from functools import lru_cache
 from typing import List
+
+import numpy as np
+
 from useful.params import BeamGeometryParameters
 
+def compute_sections(x0, total_length, nb_sections):
+    """Rest strains (nb_sections, 3), curvilinear abscissa of the nodes (nb_sections + 1) and length of the
+    sections (nb_sections) of a beam cut in equal sections, as numpy arrays."""
+    curv_abs_input_s = np.linspace(x0, x0 + total_length, nb_sections + 1)
+    return np.zeros((nb_sections, 3)), curv_abs_input_s, np.full(nb_sections, total_length / nb_sections)
+
+
+def compute_frames(init_pos, total_length, nb_frames):
+    """Rigid poses (nb_frames + 1, 7), curvilinear abscissa (nb_frames + 1) and positions (nb_frames + 1, 3)
+    of frames equally spaced along a straight beam starting at init_pos and oriented along x."""
+    x, y, z = init_pos
+    curv_abs_output_f = np.linspace(x, x + total_length, nb_frames + 1)
+    frames_f = np.zeros((nb_frames + 1, 7))
+    frames_f[:, 0] = curv_abs_output_f
+    frames_f[:, 1] = y
+    frames_f[:, 2] = z
+    frames_f[:, 6] = 1.0
+    return frames_f, curv_abs_output_f, frames_f[:, :3].copy()
+
+
 def calculate_beam_parameters(beamGeoParams):
     # Data validation checks for beamGeoParams attributes
     if not all(hasattr(beamGeoParams, attr) for attr in ['init_pos', 'beamLength', 'nbSection']):
@@ -17,20 +41,7 @@ def calculate_beam_parameters(beamGeoParams):
     if not isinstance(nb_sections, int) or nb_sections <= 0:
         raise ValueError("nbSection in beamGeoParams must be a positive integer.")
 
-    length_s = total_length / nb_sections
-    bendingState = []
-    listOfSectionsLength = []
-    temp = x
-    curv_abs_input_s = [x]
-
-    for i in range(nb_sections):
-        bendingState.append([0, 0, 0])
-        listOfSectionsLength.append((((i + 1) * length_s) - i * length_s))
-        temp += listOfSectionsLength[i]
-        curv_abs_input_s.append(temp)
-    curv_abs_input_s[nb_sections] = total_length + x
-
-    return bendingState, curv_abs_input_s, listOfSectionsLength
+    return compute_sections(x, total_length, nb_sections)
 
 
 def calculate_frame_parameters(beamGeoParams):
@@ -48,23 +59,7 @@ def calculate_frame_parameters(beamGeoParams):
     if not isinstance(nb_frames, int) or nb_frames <= 0:
         raise ValueError("nbFrames in beamGeoParams must be a positive integer.")
 
-    length_f = total_length / nb_frames
-    frames_f = []
-    curv_abs_output_f = []
-    cable_position_f = []
-
-    # @Todo: improve this for
-    for i in range(nb_frames):
-        sol = i * length_f
-        frames_f.append([sol + x, y, z, 0, 0, 0, 1])
-        cable_position_f.append([sol + x, y, z])
-        curv_abs_output_f.append(sol + x)
-
-    frames_f.append([total_length + x, y, z, 0, 0, 0, 1])
-    cable_position_f.append([total_length + x, y, z])
-    curv_abs_output_f.append(total_length + x)
-
-    return frames_f, curv_abs_output_f, cable_position_f
+    return compute_frames((x, y, z), total_length, nb_frames)
 
 
 def generate_edge_list(cable3DPos: List[List[float]]) -> List[int]:
@@ -81,11 +76,39 @@ def generate_edge_list(cable3DPos: List[List[float]]) -> List[int]:
     return [i for i in range(number_of_points - 1) for _ in range(2)]
 
 
+def geometry_key(beamGeoParams):
+    """Hashable key of the parameters which define the rest geometry of a beam."""
+    return (beamGeoParams.beamLength, beamGeoParams.nbSection, beamGeoParams.nbFrames,
+            tuple(beamGeoParams.init_pos))
+
+
+@lru_cache(maxsize=64)
+def _cachedGeometry(key):
+    beamLength, nbSection, nbFrames, init_pos = key
+    params = BeamGeometryParameters(beamLength=beamLength, nbSection=nbSection, nbFrames=nbFrames,
+                                    init_pos=list(init_pos))
+    arrays = calculate_beam_parameters(params) + calculate_frame_parameters(params)
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+def invalidate_geometry_cache():
+    """Empties the cache of the geometries built by CosseratGeometry."""
+    _cachedGeometry.cache_clear()
+
+
 class CosseratGeometry:
+    """Rest geometry of a straight beam, every attribute is a numpy array which can be given as is to the
+    Data of the MechanicalObjects, the BeamHookeLawForceField and the DiscreteCosseratMapping.
+
+    The arrays are memoized per geometry_key(beamGeoParams), so identical beams share them: they are read-only,
+    copy them before modifying them."""
+
     def __init__(self, beamGeoParams):
         # Data validation checks for beamGeoParams
         if not isinstance(beamGeoParams, BeamGeometryParameters):
             raise ValueError("beamGeoParams must be an instance of BeamGeoParams.")
 
-        self.bendingState, self.curv_abs_inputS, self.sectionsLengthList = calculate_beam_parameters(beamGeoParams)
-        self.framesF, self.curv_abs_outputF, self.cable_positionF = calculate_frame_parameters(beamGeoParams)
+        (self.bendingState, self.curv_abs_inputS, self.sectionsLengthList,
+         self.framesF, self.curv_abs_outputF, self.cable_positionF) = _cachedGeometry(geometry_key(beamGeoParams))
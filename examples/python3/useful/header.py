@@ -16,8 +16,11 @@ from stlib3.physics.deformable import ElasticMaterialObject
 from stlib3.physics.constraints import FixedBox
 import os
 
+from useful.plugins import requirePlugins
 
-def addHeader(parentNode, multithreading=False, inverse=False, isConstrained=False, isContact=False):
+
+def addHeader(parentNode, multithreading=False, inverse=False, isConstrained=False, isContact=False,
+              lazyPlugins=False):
     """
     Adds to rootNode the default headers for a simulation with contact. Also adds and returns three nodes:
         - Settings
@@ -30,6 +33,9 @@ def addHeader(parentNode, multithreading=False, inverse=False, isConstrained=Fal
         isConstrained:
         parentNode:
         multithreading:
+        lazyPlugins: if True the default list of plugins is not loaded, only the plugins of the components added
+            by the functions of this module and of the prefabs are, when they are added
+            (see useful.plugins.printPluginLoadTimes)
 
     Usage:
         addHeader(rootNode)
@@ -38,30 +44,33 @@ def addHeader(parentNode, multithreading=False, inverse=False, isConstrained=Fal
         the three SOFA nodes {settings, modelling, simulation}
     """
     settings = parentNode.addChild('Settings')
-    settings.addObject('RequiredPlugin', pluginName=[
-        "Cosserat", "Sofa.Component.AnimationLoop",  # Needed to use components FreeMotionAnimationLoop
-        "Sofa.Component.Collision.Detection.Algorithm",
-        "Sofa.Component.Collision.Detection.Intersection",  # Needed to use components LocalMinDistance
-        "Sofa.Component.Collision.Response.Contact",  # Needed to use components RuleBasedContactManager
-        "Sofa.Component.Constraint.Lagrangian.Correction",  # Needed to use components GenericConstraintCorrection
-        "Sofa.Component.Constraint.Lagrangian.Solver",  # Needed to use components GenericConstraintSolver
-        "Sofa.Component.Constraint.Projective",  # Needed to use components FixedConstraint
-        "Sofa.Component.IO.Mesh",  # Needed to use components MeshOBJLoader, MeshSTLLoader
-        "Sofa.Component.Mass", 'Sofa.Component.LinearSolver.Direct',
-        "Sofa.Component.Setting",  # Needed to use components BackgroundSetting
-        "Sofa.Component.SolidMechanics.Spring",  # Needed to use components RestShapeSpringsForceField
-        "Sofa.Component.Topology.Container.Constant",  # Needed to use components MeshTopology
-        "Sofa.Component.Topology.Container.Dynamic", "Sofa.Component.Playback",
-        "Sofa.Component.Playback", "Sofa.Component.Visual",  # Needed to use components VisualStyle
-        "Sofa.Component.Topology.Container.Grid",  # Needed to use components RegularGridTopology
-        "Sofa.Component.Topology.Mapping",  # Needed to use components Edge2QuadTopologicalMapping
-        "Sofa.GL.Component.Rendering3D",  # Needed to use components OglGrid, OglModel
-        "Sofa.GUI.Component", "Sofa.Component.Collision.Geometry", "Sofa.Component.LinearSolver.Direct",
-        "Sofa.Component.Mapping.Linear", "Sofa.Component.MechanicalLoad",
-        'Sofa.Component.Engine.Select', 'Sofa.Component.SolidMechanics.FEM.Elastic',
-        "Sofa.Component.StateContainer", 'Sofa.Component.ODESolver.Backward',
-        'Sofa.Component.SolidMechanics.FEM.HyperElastic'
-    ])
+    if lazyPlugins:
+        requirePlugins('BackgroundSetting', 'VisualStyle')
+    else:
+        settings.addObject('RequiredPlugin', pluginName=[
+            "Cosserat", "Sofa.Component.AnimationLoop",  # Needed to use components FreeMotionAnimationLoop
+            "Sofa.Component.Collision.Detection.Algorithm",
+            "Sofa.Component.Collision.Detection.Intersection",  # Needed to use components LocalMinDistance
+            "Sofa.Component.Collision.Response.Contact",  # Needed to use components RuleBasedContactManager
+            "Sofa.Component.Constraint.Lagrangian.Correction",  # Needed to use components GenericConstraintCorrection
+            "Sofa.Component.Constraint.Lagrangian.Solver",  # Needed to use components GenericConstraintSolver
+            "Sofa.Component.Constraint.Projective",  # Needed to use components FixedConstraint
+            "Sofa.Component.IO.Mesh",  # Needed to use components MeshOBJLoader, MeshSTLLoader
+            "Sofa.Component.Mass", 'Sofa.Component.LinearSolver.Direct',
+            "Sofa.Component.Setting",  # Needed to use components BackgroundSetting
+            "Sofa.Component.SolidMechanics.Spring",  # Needed to use components RestShapeSpringsForceField
+            "Sofa.Component.Topology.Container.Constant",  # Needed to use components MeshTopology
+            "Sofa.Component.Topology.Container.Dynamic", "Sofa.Component.Playback",
+            "Sofa.Component.Visual",  # Needed to use components VisualStyle
+            "Sofa.Component.Topology.Container.Grid",  # Needed to use components RegularGridTopology
+            "Sofa.Component.Topology.Mapping",  # Needed to use components Edge2QuadTopologicalMapping
+            "Sofa.GL.Component.Rendering3D",  # Needed to use components OglGrid, OglModel
+            "Sofa.GUI.Component", "Sofa.Component.Collision.Geometry",
+            "Sofa.Component.Mapping.Linear", "Sofa.Component.MechanicalLoad",
+            'Sofa.Component.Engine.Select', 'Sofa.Component.SolidMechanics.FEM.Elastic',
+            "Sofa.Component.StateContainer", 'Sofa.Component.ODESolver.Backward',
+            'Sofa.Component.SolidMechanics.FEM.HyperElastic'
+        ])
 
     settings.addObject('BackgroundSetting', color=[1, 1, 1, 1])
     # settings.addObject('AttachBodyButtonSetting', stiffness=1e6)
@@ -70,6 +79,7 @@ def addHeader(parentNode, multithreading=False, inverse=False, isConstrained=Fal
                                                      'hideBoundingCollisionModels hideForceFields '
                                                      'hideInteractionForceFields hideWireframe showMechanicalMappings')
     if isConstrained:
+        requirePlugins('FreeMotionAnimationLoop', 'QPInverseProblemSolver' if inverse else 'GenericConstraintSolver')
         parentNode.addObject('FreeMotionAnimationLoop', parallelCollisionDetectionAndFreeMotion=multithreading,
                              parallelODESolving=multithreading)
         if inverse:
@@ -86,6 +96,8 @@ def addHeader(parentNode, multithreading=False, inverse=False, isConstrained=Fal
 
 # components needed for contact modeling
 def contactHeader(parentNode):
+    requirePlugins('CollisionPipeline', 'RuleBasedContactManager', 'BruteForceBroadPhase', 'BVHNarrowPhase',
+                   'LocalMinDistance')
     parentNode.addObject('CollisionPipeline')
     parentNode.addObject("DefaultVisualManagerLoop")
     parentNode.addObject('RuleBasedContactManager', responseParams='mu=0.8', response='FrictionContactConstraint')
@@ -103,6 +115,7 @@ def addVisual(node):
     Usage:
         addVisual(node)
     """
+    requirePlugins('VisualStyle')
     node.addObject('VisualStyle', displayFlags='showVisualModels showBehaviorModels hideCollisionModels '
                                                'hideBoundingCollisionModels hideForceFields '
                                                'hideInteractionForceFields hideWireframe showMechanicalMappings')
@@ -128,6 +141,9 @@ def addSolverNode(node, name='solverNode', template='CompressedRowSparseMatrixd'
     Usage:
         addSolversNode(node)
     """
+    requirePlugins('EulerImplicitSolver', 'CGLinearSolver' if iterative else 'SparseLDLSolver')
+    if isConstrained:
+        requirePlugins('GenericConstraintCorrection')
     solverNode = node.addChild(name)
     solverNode.addObject('EulerImplicitSolver', firstOrder=firstOrder, rayleighStiffness=rayleighStiffness,
                          rayleighMass=rayleighMass)
@@ -0,0 +1,318 @@
+"""Vectorized Cosserat (PCS) kinematics on stacks of matrices.
+
+These are the numpy counterparts of the functions used by BaseCosseratMapping
+(see src/Cosserat/mapping/CosseratKinematics.cpp). Every function works on the
+last axes of its inputs and broadcasts over the leading ones, e.g. strains of
+shape (nbFrames, 6) or (nbSteps, nbSections, 3) and transforms of shape (..., 4, 4).
+
+Conventions are the ones of the C++ code:
+  - a strain is [k_x, k_y, k_z, q_x, q_y, q_z]; a strain of size 3 is [k, 0, 0, 0],
+  - the reference configuration is a straight rod along x, i.e. the linear
+    part of the twist is [1 + q_x, q_y, q_z],
+  - a twist is [w, v] (angular first), adjoint = [[R, 0], [u~ R, R]].
+"""
+import numpy as np
+
+_EPS = np.finfo(float).eps
+
+
+def to_strain6(strain):
+    """Returns the strains as (..., 6), a (..., 3) strain is completed with zeros."""
+    strain = np.asarray(strain, dtype=float)
+    if strain.shape[-1] == 6:
+        return strain
+    if strain.shape[-1] == 3:
+        return np.concatenate([strain, np.zeros(strain.shape[:-1] + (3,))], axis=-1)
+    raise ValueError(f"The last dimension of the strain must be 3 or 6, got {strain.shape[-1]}")
+
+
+def tilde(u):
+    """Skew-symmetric matrices (..., 3, 3) of the vectors u (..., 3)."""
+    u = np.asarray(u, dtype=float)
+    t = np.zeros(u.shape[:-1] + (3, 3))
+    t[..., 0, 1] = -u[..., 2]
+    t[..., 0, 2] = u[..., 1]
+    t[..., 1, 2] = -u[..., 0]
+    t[..., 1, 0] = u[..., 2]
+    t[..., 2, 0] = -u[..., 1]
+    t[..., 2, 1] = u[..., 0]
+    return t
+
+
+def xi_hat(strain):
+    """The (..., 4, 4) se(3) matrices of the strains, including the reference elongation along x."""
+    k = to_strain6(strain)
+    xi = np.zeros(k.shape[:-1] + (4, 4))
+    xi[..., :3, :3] = tilde(k[..., :3])
+    xi[..., :3, 3] = k[..., 3:]
+    xi[..., 0, 3] += 1.0
+    return xi
+
+
+def exp_se3(x, strain):
+    """g(x) = exp(x * Xi) as (..., 4, 4), same as BaseCosseratMapping::computeExponentialSE3.
+
+    x broadcasts against the batch shape of strain."""
+    xi = xi_hat(strain)
+    x = np.asarray(x, dtype=float)[..., None, None]
+    theta = np.linalg.norm(to_strain6(strain)[..., :3], axis=-1)[..., None, None]
+    x, theta = np.broadcast_arrays(x, theta)
+
+    # Taylor series below x * theta = 0.1, the closed form cancels out for small angles
+    small = x * theta < 0.1
+    safe_theta = np.where(small, 1.0, theta)
+    u2 = (x * theta) ** 2
+    scalar1 = np.where(small, x ** 2 * (1.0 / 2.0 - u2 / 24.0 + u2 ** 2 / 720.0 - u2 ** 3 / 40320.0),
+                       (1.0 - np.cos(x * safe_theta)) / safe_theta ** 2)
+    scalar2 = np.where(small, x ** 3 * (1.0 / 6.0 - u2 / 120.0 + u2 ** 2 / 5040.0 - u2 ** 3 / 362880.0),
+                       (x * safe_theta - np.sin(x * safe_theta)) / safe_theta ** 3)
+
+    xi2 = xi @ xi
+    return np.eye(4) + x * xi + scalar1 * xi2 + scalar2 * (xi2 @ xi)
+
+
+def compute_theta(x, g_x):
+    """Rotation angle per unit length of the transforms (..., 4, 4), 0 when x is null.
+
+    The angle is atan2(sin, cos) with the sine taken from the antisymmetric part, arccos of the trace loses half of
+    the digits for small angles."""
+    g_x = np.asarray(g_x, dtype=float)
+    x = np.asarray(x, dtype=float)
+    cos_angle = np.trace(g_x[..., :3, :3], axis1=-2, axis2=-1) / 2.0 - 0.5
+    sin_angle = 0.5 * np.linalg.norm(np.stack([g_x[..., 2, 1] - g_x[..., 1, 2],
+                                               g_x[..., 0, 2] - g_x[..., 2, 0],
+                                               g_x[..., 1, 0] - g_x[..., 0, 1]], axis=-1), axis=-1)
+    safe_x = np.where(x <= _EPS, 1.0, x)
+    return np.where(x <= _EPS, 0.0, np.arctan2(sin_angle, cos_angle) / safe_x)
+
+
+def piecewise_logmap(x, g_x):
+    """Strains (..., 6) such that exp(x * Xi) = g_x, the vectorized version of
+    compute_logmap.piecewise_logmap1 (and BaseCosseratMapping::piecewiseLogmap for x = 1).
+
+    Computed as log_se3(g_x) / x, whose series near a null curvature keep the full precision, where the polynomial
+    in g_x of compute_logmap cancels out. The returned linear part includes the reference elongation,
+    i.e. xi[..., 3] = 1 + q_x."""
+    g_x = np.asarray(g_x, dtype=float)
+    x = np.broadcast_to(np.asarray(x, dtype=float), g_x.shape[:-2])
+    return log_se3(g_x) / x[..., None]
+
+
+def _build_adjoint(a, b):
+    adj = np.zeros(a.shape[:-2] + (6, 6))
+    adj[..., :3, :3] = a
+    adj[..., 3:, 3:] = a
+    adj[..., 3:, :3] = b
+    return adj
+
+
+def adjoint(g):
+    """Adjoint matrices (..., 6, 6) of the transforms (..., 4, 4): [[R, 0], [u~ R, R]]."""
+    g = np.asarray(g, dtype=float)
+    rot = g[..., :3, :3]
+    return _build_adjoint(rot, tilde(g[..., :3, 3]) @ rot)
+
+
+def co_adjoint(g):
+    """Co-adjoint matrices (..., 6, 6) of the transforms (..., 4, 4): [[R, u~ R], [0, R]]."""
+    g = np.asarray(g, dtype=float)
+    rot = g[..., :3, :3]
+    co_adj = np.zeros(g.shape[:-2] + (6, 6))
+    co_adj[..., :3, :3] = rot
+    co_adj[..., 3:, 3:] = rot
+    co_adj[..., :3, 3:] = tilde(g[..., :3, 3]) @ rot
+    return co_adj
+
+
+def ad(eta):
+    """Adjoint matrices (..., 6, 6) of the twists eta (..., 6) = [w, v]: [[w~, 0], [v~, w~]]."""
+    eta = np.asarray(eta, dtype=float)
+    return _build_adjoint(tilde(eta[..., :3]), tilde(eta[..., 3:]))
+
+
+def _tang_exp_terms(x, strain):
+    """ad(Xi) (..., 6, 6), x and theta (..., 1, 1) broadcast together and the four scalars of tang_exp."""
+    k = to_strain6(strain)
+    ad_xi = ad(k + np.array([0.0, 0.0, 0.0, 1.0, 0.0, 0.0]))
+    x = np.asarray(x, dtype=float)[..., None, None]
+    theta = np.linalg.norm(k[..., :3], axis=-1)[..., None, None]
+    x, theta = np.broadcast_arrays(x, theta)
+
+    small = x * theta < 0.1
+    th = np.where(small, 1.0, theta)
+    xt = x * th
+    cos_xt, sin_xt = np.cos(xt), np.sin(xt)
+    t2, t4, t6 = theta ** 2, theta ** 4, theta ** 6
+
+    scalar1 = np.where(small, x ** 2 / 2.0 - x ** 6 * t4 / 720.0 + x ** 8 * t6 / 20160.0,
+                       (4.0 - 4.0 * cos_xt - xt * sin_xt) / (2.0 * th ** 2))
+    scalar2 = np.where(small, x ** 3 / 6.0 - x ** 7 * t4 / 5040.0 + x ** 9 * t6 / 181440.0,
+                       (4.0 * xt + xt * cos_xt - 5.0 * sin_xt) / (2.0 * th ** 3))
+    scalar3 = np.where(small, x ** 4 / 24.0 - x ** 6 * t2 / 360.0 + x ** 8 * t4 / 13440.0 - x ** 10 * t6 / 907200.0,
+                       (2.0 - 2.0 * cos_xt - xt * sin_xt) / (2.0 * th ** 4))
+    scalar4 = np.where(small, x ** 5 / 120.0 - x ** 7 * t2 / 2520.0 + x ** 9 * t4 / 120960.0
+                       - x ** 11 * t6 / 9979200.0,
+                       (2.0 * xt + xt * cos_xt - 3.0 * sin_xt) / (2.0 * th ** 5))
+    return ad_xi, x, theta, (scalar1, scalar2, scalar3, scalar4)
+
+
+def tang_exp(x, strain):
+    """Tangent exponential (..., 6, 6), same as BaseCosseratMapping::computeTangExp.
+
+    As in xi_hat, ad is built from the strain including the reference elongation along x. Below x * theta = 0.1
+    the scalars are computed with their Taylor series, the closed form cancels out for small angles."""
+    ad_xi, x, _, (scalar1, scalar2, scalar3, scalar4) = _tang_exp_terms(x, strain)
+    ad2 = ad_xi @ ad_xi
+    ad3 = ad2 @ ad_xi
+    return x * np.eye(6) + scalar1 * ad_xi + scalar2 * ad2 + scalar3 * ad3 + scalar4 * (ad3 @ ad_xi)
+
+
+# Taylor coefficients in u^2 of 5 u sin u - u^2 cos u - 8 + 8 cos u (from u^6) and of
+# 15 sin u - 8 u - 7 u cos u - u^2 sin u (from u^7), the numerators of the derivatives of the scalars of tang_exp
+_factorial = np.cumprod([1.0] + list(range(1, 40)))
+_series_a = np.array([(-1) ** (k - 1) * (5.0 / _factorial[2 * k - 1] - 1.0 / _factorial[2 * k - 2] - 8.0 / _factorial[2 * k])
+                      for k in range(3, 19)])
+_series_b = np.array([(-1) ** k * (15.0 / _factorial[2 * k + 1] - 7.0 / _factorial[2 * k] + 1.0 / _factorial[2 * k - 1])
+                      for k in range(3, 19)])
+
+
+def tang_exp_derivatives(x, strain, size=6):
+    """Derivatives (..., size, 6, 6) of tang_exp(x, strain) with respect to the first size components of the strain.
+
+    With u = x * theta, the scalars of tang_exp are x^(i+1) f_i(u) and their derivative along the angular strain k
+    is x^(i+3) g_i(u) k with g_i = f_i' / u, the derivatives of the powers of ad(Xi) follow from the product rule.
+    Below u = 2 the g_i are computed with their Taylor series, the closed forms cancel out up to the order 7."""
+    ad_xi, x, theta, scalars = _tang_exp_terms(x, strain)
+    k = to_strain6(strain)
+    u = x * theta
+
+    small = u < 2.0
+    us = np.where(small, 1.0, u)
+    cos_u, sin_u = np.cos(us), np.sin(us)
+    closed_a = 5.0 * us * sin_u - us ** 2 * cos_u - 8.0 + 8.0 * cos_u
+    closed_b = 15.0 * sin_u - 8.0 * us - 7.0 * us * cos_u - us ** 2 * sin_u
+    u2 = np.where(small, u ** 2, 0.0)
+    series_a = np.polynomial.polynomial.polyval(u2, _series_a) / 2.0
+    series_b = np.polynomial.polynomial.polyval(u2, _series_b) / 2.0
+    g = (np.where(small, u2 * series_a, closed_a / (2.0 * us ** 4)),
+         np.where(small, u2 * series_b, closed_b / (2.0 * us ** 5)),
+         np.where(small, series_a, closed_a / (2.0 * us ** 6)),
+         np.where(small, series_b, closed_b / (2.0 * us ** 7)))
+
+    basis = ad(np.eye(6)[:size])
+    powers = [np.broadcast_to(np.eye(6), ad_xi.shape), ad_xi]
+    for _ in range(3):
+        powers.append(powers[-1] @ ad_xi)
+    powers = [p[..., None, :, :] for p in powers]
+
+    derivatives = np.zeros(ad_xi.shape[:-2] + (size, 6, 6))
+    for i in range(1, 5):
+        # d(ad^i) = sum_j ad^j E ad^(i-1-j)
+        d_power = sum(powers[j] @ basis @ powers[i - 1 - j] for j in range(i))
+        d_scalar = x[..., None] ** (i + 3) * g[i - 1][..., None] * _angular(k, size)[..., None, None]
+        derivatives += scalars[i - 1][..., None] * d_power + d_scalar * powers[i]
+    return derivatives
+
+
+def _angular(strain, size):
+    """Angular components of the strains (..., 6) as (..., size), zero for the linear ones."""
+    angular = np.zeros(strain.shape[:-1] + (size,))
+    angular[..., :min(size, 3)] = strain[..., :min(size, 3)]
+    return angular
+
+
+def pose_to_matrix(pose):
+    """Homogeneous matrices (..., 4, 4) of SOFA rigid poses (..., 7) [x, y, z, qx, qy, qz, qw]."""
+    pose = np.asarray(pose, dtype=float)
+    qx, qy, qz, qw = (pose[..., i] for i in range(3, 7))
+    g = np.zeros(pose.shape[:-1] + (4, 4))
+    g[..., 0, 0] = 1.0 - 2.0 * (qy * qy + qz * qz)
+    g[..., 0, 1] = 2.0 * (qx * qy - qz * qw)
+    g[..., 0, 2] = 2.0 * (qx * qz + qy * qw)
+    g[..., 1, 0] = 2.0 * (qx * qy + qz * qw)
+    g[..., 1, 1] = 1.0 - 2.0 * (qx * qx + qz * qz)
+    g[..., 1, 2] = 2.0 * (qy * qz - qx * qw)
+    g[..., 2, 0] = 2.0 * (qx * qz - qy * qw)
+    g[..., 2, 1] = 2.0 * (qy * qz + qx * qw)
+    g[..., 2, 2] = 1.0 - 2.0 * (qx * qx + qy * qy)
+    g[..., :3, 3] = pose[..., :3]
+    g[..., 3, 3] = 1.0
+    return g
+
+
+def inverse_se3(g):
+    """Inverses (..., 4, 4) of the rigid transforms g (..., 4, 4)."""
+    g = np.asarray(g, dtype=float)
+    rot_t = np.swapaxes(g[..., :3, :3], -1, -2)
+    inv = np.zeros(g.shape)
+    inv[..., :3, :3] = rot_t
+    inv[..., :3, 3] = -(rot_t @ g[..., :3, 3, None])[..., 0]
+    inv[..., 3, 3] = 1.0
+    return inv
+
+
+def log_so3(rot):
+    """Rotation vectors (..., 3) of the rotation matrices (..., 3, 3).
+
+    Closed form, with a Taylor expansion for small angles and an extraction from the
+    symmetric part for angles close to pi, where sin(theta) vanishes."""
+    rot = np.asarray(rot, dtype=float)
+    cos_theta = np.clip((np.trace(rot, axis1=-2, axis2=-1) - 1.0) / 2.0, -1.0, 1.0)
+    vee = 0.5 * np.stack([rot[..., 2, 1] - rot[..., 1, 2],
+                          rot[..., 0, 2] - rot[..., 2, 0],
+                          rot[..., 1, 0] - rot[..., 0, 1]], axis=-1)  # sin(theta) * axis
+    theta = np.arctan2(np.linalg.norm(vee, axis=-1), cos_theta)
+
+    # theta / sin(theta), 1 + theta^2 / 6 + 7 theta^4 / 360 for small angles
+    small = theta < 1e-4
+    sin_theta = np.where(small, 1.0, np.sin(theta))
+    factor = np.where(small, 1.0 + theta ** 2 / 6.0 + 7.0 * theta ** 4 / 360.0, theta / sin_theta)
+    omega = factor[..., None] * vee
+
+    near_pi = theta > np.pi - 1e-3
+    if np.any(near_pi):
+        # (R + R^T) / 2 - cos(theta) I = (1 - cos(theta)) a a^T, use the column of the largest diagonal term
+        sym = 0.5 * (rot[near_pi] + np.swapaxes(rot[near_pi], -1, -2))
+        sym -= cos_theta[near_pi][..., None, None] * np.eye(3)
+        sym /= (1.0 - cos_theta[near_pi])[..., None, None]
+        col = np.argmax(np.diagonal(sym, axis1=-2, axis2=-1), axis=-1)
+        axis = np.take_along_axis(sym, col[..., None, None], axis=-1)[..., 0]
+        axis /= np.linalg.norm(axis, axis=-1, keepdims=True)
+        # the sign is given by the antisymmetric part when it is not null
+        sign = np.where(np.sum(axis * vee[near_pi], axis=-1) < 0.0, -1.0, 1.0)
+        omega[near_pi] = (sign * theta[near_pi])[..., None] * axis
+    return omega
+
+
+def log_se3(g):
+    """Closed-form logarithm of the rigid transforms g (..., 4, 4), returns the twists (..., 6) = [w, v].
+
+    Unlike piecewise_logmap the result is the raw twist of g, it keeps the reference
+    elongation. For matrices which are not rigid transforms use logm.logm."""
+    g = np.asarray(g, dtype=float)
+    omega = log_so3(g[..., :3, :3])
+    theta = np.linalg.norm(omega, axis=-1)[..., None, None]
+    w_hat = tilde(omega)
+
+    # V^-1 = I - W / 2 + c W^2, c = (1 - theta sin(theta) / (2 (1 - cos(theta)))) / theta^2, whose closed form
+    # cancels out for small angles
+    small = theta < 0.1
+    th = np.where(small, 1.0, theta)
+    t2 = theta ** 2
+    c = np.where(small, 1.0 / 12.0 + t2 / 720.0 + t2 ** 2 / 30240.0 + t2 ** 3 / 1209600.0,
+                 (1.0 - th * np.sin(th) / (2.0 * (1.0 - np.cos(th)))) / th ** 2)
+    v_inv = np.eye(3) - 0.5 * w_hat + c * (w_hat @ w_hat)
+    v = (v_inv @ g[..., :3, 3, None])[..., 0]
+    return np.concatenate([omega, v], axis=-1)
+
+
+def strains_from_frames(frames, lengths):
+    """Strains (..., n - 1, 6) of the sections between consecutive frames (..., n, 4, 4).
+
+    lengths (..., n - 1) are the lengths of the sections, the reference elongation is
+    removed from the result, so a straight rod along x gives null strains."""
+    frames = np.asarray(frames, dtype=float)
+    relative = inverse_se3(frames[..., :-1, :, :]) @ frames[..., 1:, :, :]
+    strains = log_se3(relative) / np.asarray(lengths, dtype=float)[..., None]
+    strains[..., 3] -= 1.0
+    return strains
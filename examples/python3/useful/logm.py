@@ -1,9 +1,11 @@
 import numpy as np
 import scipy.linalg
 
-debuge = True 
+# Set to True to trace the steps of logm
+debuge = False
 
 def logm(A):
+    """General matrix logarithm (Schur-Pade), for rigid transforms use kinematics.log_se3 instead."""
     
     if debuge==True :
         print("In the logm function")
@@ -34,16 +36,19 @@ def logm(A):
         print("In the logm function 2.3")
         print(f'schur_input is : \n{schur_input}')
         print(f'T is : \n {T}')
-    print("In the logm function 2.3..0")    
+    if debuge==True :
+        print("In the logm function 2.3..0")
     if not schur_input:
-        print("In the logm function 2.3..1")
+        if debuge==True :
+            print("In the logm function 2.3..1")
         Q, T = scipy.linalg.schur(A, output='full')
         if debuge==True :
             print("In the logm function 2.3..2")
             print(f'Q is : \n{Q}')
             print(f'T is : \n {T}')
     else:
-        print("In the logm function 2.3..1")
+        if debuge==True :
+            print("In the logm function 2.3..1")
         Q = np.eye(A.shape[0], dtype=A.dtype)
         if debuge==True :
             print("In the logm function 2.3..2")
@@ -0,0 +1,154 @@
+"""Lazy loading of the SOFA plugins needed by a scene.
+
+Instead of loading a fixed list of plugins, the plugin of a component is loaded the first time a component of
+this type is added with addObject(node, typeName, ...). The time spent loading each plugin is kept in
+pluginLoadTimes, requiredPlugins(root) lists the plugins of the components of an existing graph (e.g. to write the
+RequiredPlugin of a saved scene).
+
+Usage:
+    from useful.plugins import addObject, printPluginLoadTimes, requirePlugins
+
+    addObject(node, 'EulerImplicitSolver', rayleighStiffness=0.1)   # loads Sofa.Component.ODESolver.Backward
+    requirePlugins('MechanicalObject', 'UniformMass')                # before node.addObject(...) calls
+    printPluginLoadTimes()
+"""
+
+import time
+
+# Plugin registering each component, None for the components of the SOFA core
+componentPlugins = {
+    # Cosserat
+    **{name: "Cosserat" for name in [
+        "BeamHookeLawForceField", "BeamHookeLawForceFieldRigid", "BlockTridiagonalSolver",
+        "CosseratActuatorConstraint", "CosseratConstraintCorrection", "CosseratInternalActuation",
+        "CosseratNeedleSlidingConstraint", "CosseratSlidingConstraint", "DifferenceMultiMapping",
+        "DiscreteCosseratMapping", "DiscreteDynamicCosseratMapping", "DrawTrianglesComponent",
+        "LegendrePolynomialsMapping", "MyUniformVelocityDampingForceField", "NeedleInsertionController",
+        "PointsManager", "ProjectionEngine", "QPSlidingConstraint", "RigidDistanceMapping", "StrainBasisMapping",
+        "TemperatureState"]},
+    # SOFA core
+    "DefaultAnimationLoop": None,
+    "DefaultVisualManagerLoop": None,
+    "RequiredPlugin": None,
+    # SOFA components
+    "FreeMotionAnimationLoop": "Sofa.Component.AnimationLoop",
+    "CollisionPipeline": "Sofa.Component.Collision.Detection.Algorithm",
+    "BruteForceBroadPhase": "Sofa.Component.Collision.Detection.Algorithm",
+    "BVHNarrowPhase": "Sofa.Component.Collision.Detection.Algorithm",
+    "LocalMinDistance": "Sofa.Component.Collision.Detection.Intersection",
+    "MinProximityIntersection": "Sofa.Component.Collision.Detection.Intersection",
+    "LineCollisionModel": "Sofa.Component.Collision.Geometry",
+    "PointCollisionModel": "Sofa.Component.Collision.Geometry",
+    "SphereCollisionModel": "Sofa.Component.Collision.Geometry",
+    "TriangleCollisionModel": "Sofa.Component.Collision.Geometry",
+    "RuleBasedContactManager": "Sofa.Component.Collision.Response.Contact",
+    "CollisionResponse": "Sofa.Component.Collision.Response.Contact",
+    "ContactListener": "Sofa.Component.Collision.Response.Contact",
+    "GenericConstraintCorrection": "Sofa.Component.Constraint.Lagrangian.Correction",
+    "LinearSolverConstraintCorrection": "Sofa.Component.Constraint.Lagrangian.Correction",
+    "UncoupledConstraintCorrection": "Sofa.Component.Constraint.Lagrangian.Correction",
+    "GenericConstraintSolver": "Sofa.Component.Constraint.Lagrangian.Solver",
+    "FixedConstraint": "Sofa.Component.Constraint.Projective",
+    "PartialFixedConstraint": "Sofa.Component.Constraint.Projective",
+    "BoxROI": "Sofa.Component.Engine.Select",
+    "MeshOBJLoader": "Sofa.Component.IO.Mesh",
+    "MeshSTLLoader": "Sofa.Component.IO.Mesh",
+    "MeshVTKLoader": "Sofa.Component.IO.Mesh",
+    "SparseLDLSolver": "Sofa.Component.LinearSolver.Direct",
+    "SparseLUSolver": "Sofa.Component.LinearSolver.Direct",
+    "CGLinearSolver": "Sofa.Component.LinearSolver.Iterative",
+    "IdentityMapping": "Sofa.Component.Mapping.Linear",
+    "BarycentricMapping": "Sofa.Component.Mapping.Linear",
+    "SubsetMultiMapping": "Sofa.Component.Mapping.Linear",
+    "RigidMapping": "Sofa.Component.Mapping.NonLinear",
+    "UniformMass": "Sofa.Component.Mass",
+    "DiagonalMass": "Sofa.Component.Mass",
+    "ConstantForceField": "Sofa.Component.MechanicalLoad",
+    "EulerImplicitSolver": "Sofa.Component.ODESolver.Backward",
+    "ReadState": "Sofa.Component.Playback",
+    "WriteState": "Sofa.Component.Playback",
+    "BackgroundSetting": "Sofa.Component.Setting",
+    "TetrahedronFEMForceField": "Sofa.Component.SolidMechanics.FEM.Elastic",
+    "RestShapeSpringsForceField": "Sofa.Component.SolidMechanics.Spring",
+    "SpringForceField": "Sofa.Component.SolidMechanics.Spring",
+    "StiffSpringForceField": "Sofa.Component.SolidMechanics.Spring",
+    "MechanicalObject": "Sofa.Component.StateContainer",
+    "MeshTopology": "Sofa.Component.Topology.Container.Constant",
+    "EdgeSetTopologyContainer": "Sofa.Component.Topology.Container.Dynamic",
+    "EdgeSetTopologyModifier": "Sofa.Component.Topology.Container.Dynamic",
+    "PointSetTopologyContainer": "Sofa.Component.Topology.Container.Dynamic",
+    "PointSetTopologyModifier": "Sofa.Component.Topology.Container.Dynamic",
+    "TetrahedronSetTopologyModifier": "Sofa.Component.Topology.Container.Dynamic",
+    "TetrahedronSetTopologyContainer": "Sofa.Component.Topology.Container.Dynamic",
+    "TriangleSetTopologyContainer": "Sofa.Component.Topology.Container.Dynamic",
+    "TriangleSetTopologyModifier": "Sofa.Component.Topology.Container.Dynamic",
+    "RegularGridTopology": "Sofa.Component.Topology.Container.Grid",
+    "Edge2QuadTopologicalMapping": "Sofa.Component.Topology.Mapping",
+    "Hexa2TetraTopologicalMapping": "Sofa.Component.Topology.Mapping",
+    "Tetra2TriangleTopologicalMapping": "Sofa.Component.Topology.Mapping",
+    "VisualStyle": "Sofa.Component.Visual",
+    "Camera": "Sofa.Component.Visual",
+    "OglModel": "Sofa.GL.Component.Rendering3D",
+    "OglSceneFrame": "Sofa.GL.Component.Rendering3D",
+    "QPInverseProblemSolver": "SoftRobots.Inverse",
+}
+
+# Time (s) spent loading each plugin, in loading order
+pluginLoadTimes = {}
+
+
+def loadPlugin(pluginName):
+    """Loads a plugin if it is not loaded yet, returns the time spent loading it (0 if it was already loaded)."""
+    if pluginName is None or pluginName in pluginLoadTimes:
+        return 0.0
+    import SofaRuntime
+
+    start = time.perf_counter()
+    SofaRuntime.importPlugin(pluginName)
+    pluginLoadTimes[pluginName] = time.perf_counter() - start
+    return pluginLoadTimes[pluginName]
+
+
+def pluginsOf(typeNames):
+    """Plugins (without duplicates, in the order of typeNames) registering the given components.
+
+    Raises a ValueError for a component missing from componentPlugins."""
+    unknown = [name for name in typeNames if name not in componentPlugins]
+    if unknown:
+        raise ValueError(f"Unknown plugin for the components {unknown}, add them to useful.plugins.componentPlugins")
+    plugins = [componentPlugins[name] for name in typeNames if componentPlugins[name] is not None]
+    return list(dict.fromkeys(plugins))
+
+
+def requirePlugins(*typeNames):
+    """Loads the plugins of the given components which are not loaded yet."""
+    for pluginName in pluginsOf(typeNames):
+        loadPlugin(pluginName)
+
+
+def addObject(node, typeName, **kwargs):
+    """node.addObject(typeName, **kwargs), the plugin of typeName is loaded first if needed."""
+    if typeName in componentPlugins:
+        loadPlugin(componentPlugins[typeName])
+    return node.addObject(typeName, **kwargs)
+
+
+def requiredPlugins(root):
+    """Plugins of the components in the graph under root, e.g. for the RequiredPlugin of a saved scene."""
+    typeNames, visited, nodes = [], set(), [root]
+    while nodes:
+        node = nodes.pop()
+        if node.getPathName() in visited:
+            continue
+        visited.add(node.getPathName())
+        typeNames += [obj.getClassName() for obj in node.objects if obj.getClassName() in componentPlugins]
+        nodes += list(node.children)
+    return pluginsOf(typeNames)
+
+
+def printPluginLoadTimes():
+    """Prints the time spent loading each plugin, the slowest first."""
+    total = sum(pluginLoadTimes.values())
+    print(f"[plugins] {len(pluginLoadTimes)} plugins loaded in {total * 1e3:.1f} ms")
+    for name, duration in sorted(pluginLoadTimes.items(), key=lambda item: -item[1]):
+        print(f"[plugins]   {name:<55} {duration * 1e3:8.1f} ms")
@@ -0,0 +1,335 @@
+"""Streaming recording of state vectors into memory-mapped .npy files.
+
+Instead of keeping the states in Python lists (whose memory grows with the simulation), TrajectoryRecorder writes
+every decimation-th step the value of selected Data (frames, strains, base pose, constraint forces...) into
+preallocated memory-mapped .npy files, so that the memory used does not depend on the length of the run:
+  - in append mode the samples are written in chunks of chunkSize samples, a new file is added when a chunk is full;
+  - in ring mode (ringSize given) only the last ringSize samples are kept, in a single file.
+A small JSON index (index.json) describes the channels, their files and the number of samples, it is rewritten every
+indexInterval samples and when the recorder is closed. The number of samples appended (the write head) is also kept in
+a memory-mapped counter (head.npy) updated at every sample, so that TrajectoryReader reads a recording in the right
+order even while it is written, e.g. after the ring has wrapped since the last index.
+
+Channels of variable size (e.g. the constraint forces) are preallocated with maxRows rows along their first
+dimension, padded with NaN, and the number of rows of each sample is recorded.
+
+Usage:
+    from useful.recorder import TrajectoryReader, TrajectoryRecorder, cosseratChannels
+
+    channels = cosseratChannels(rod)
+    channels["lambda"] = solverNode.GenericConstraintSolver.constraintForces   # computeConstraintForces=True
+    rootNode.addObject(TrajectoryRecorder(name="recorder", directory="run0", channels=channels, decimation=10,
+                                          ringSize=100000, maxRows={"lambda": 64}))
+
+    trajectory = TrajectoryReader("run0")
+    frames = trajectory.read("frames", start=-100)   # (100, nbFrames, 7), the last 100 samples
+"""
+
+import atexit
+import json
+import os
+
+import numpy as np
+
+_indexName = "index.json"
+_headName = "head.npy"
+_format = "cosserat-trajectory"
+
+
+class _Channel:
+    """Memory-mapped files of one channel, one file per chunk"""
+
+    def __init__(self, directory, name, shape, dtype, variable, chunks=None, rows=None):
+        self.directory = directory
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.variable = variable
+        self.chunks = list(chunks or [])
+        self.rows = list(rows or [])
+        self.chunk = None
+        self.array = None
+        self.rowsArray = None
+
+    def description(self):
+        return {"shape": list(self.shape), "dtype": self.dtype.str, "variable": self.variable,
+                "chunks": self.chunks, "rows": self.rows}
+
+    def open(self, chunk, capacity):
+        """Memory maps the file of the chunk, creating it if needed."""
+        if chunk == self.chunk:
+            return
+        self.flush()
+        self.chunks.append(f"{self.name}.{chunk:05d}.npy")
+        self.array = np.lib.format.open_memmap(os.path.join(self.directory, self.chunks[-1]), mode="w+",
+                                               dtype=self.dtype, shape=(capacity,) + self.shape)
+        if self.variable:
+            self.rows.append(f"{self.name}.rows.{chunk:05d}.npy")
+            self.rowsArray = np.lib.format.open_memmap(os.path.join(self.directory, self.rows[-1]), mode="w+",
+                                                       dtype=np.int32, shape=(capacity,))
+        self.chunk = chunk
+
+    def write(self, position, value):
+        value = np.asarray(value, dtype=self.dtype)
+        if not self.variable:
+            if value.shape != self.shape:
+                raise ValueError(f"Channel {self.name}: a sample of shape {value.shape} does not fit in "
+                                 f"{self.shape}, give its maximum number of rows in maxRows")
+            self.array[position] = value
+            return
+        value = value.reshape((-1,) + self.shape[1:]) if value.size else np.zeros((0,) + self.shape[1:])
+        if value.shape[0] > self.shape[0] or value.shape[1:] != self.shape[1:]:
+            raise ValueError(f"Channel {self.name}: a sample of shape {value.shape} does not fit in {self.shape}")
+        self.array[position, :value.shape[0]] = value
+        if self.dtype.kind in "fc":
+            self.array[position, value.shape[0]:] = np.nan
+        self.rowsArray[position] = value.shape[0]
+
+    def flush(self):
+        if self.array is not None:
+            self.array.flush()
+        if self.rowsArray is not None:
+            self.rowsArray.flush()
+
+    def close(self):
+        self.flush()
+        self.chunk, self.array, self.rowsArray = None, None, None
+
+
+class TrajectoryWriter:
+    """Appends samples (a value per channel) into memory-mapped .npy files, see the module documentation.
+
+    Args:
+        directory: directory of the recording, created if needed, a previous recording in it is overwritten
+        ringSize: if given, only the last ringSize samples are kept (ring mode), otherwise all (append mode)
+        chunkSize: number of samples per file in append mode
+        indexInterval: the index is rewritten every indexInterval samples
+        maxRows: {channel name: maximum number of rows} for the channels whose size varies
+        metadata: JSON serializable dictionary stored in the index
+    """
+
+    def __init__(self, directory, ringSize=None, chunkSize=1024, indexInterval=100, maxRows=None, metadata=None):
+        if ringSize is not None and ringSize <= 0:
+            raise ValueError(f"ringSize must be positive, got {ringSize}")
+        if chunkSize <= 0:
+            raise ValueError(f"chunkSize must be positive, got {chunkSize}")
+        self.directory = directory
+        self.ringSize = ringSize
+        self.capacity = ringSize if ringSize is not None else chunkSize
+        self.indexInterval = max(int(indexInterval), 1)
+        self.maxRows = dict(maxRows or {})
+        self.metadata = dict(metadata or {})
+        self.channels = {}
+        self.count = 0
+        self.closed = False
+        os.makedirs(directory, exist_ok=True)
+        self.head = np.lib.format.open_memmap(os.path.join(directory, _headName), mode="w+", dtype=np.int64,
+                                              shape=(1,))
+        self.writeIndex()
+
+    def _createChannel(self, name, value):
+        value = np.asarray(value)
+        dtype = value.dtype if value.dtype.kind in "biu" else np.float64
+        variable = name in self.maxRows
+        shape = value.shape
+        if variable:
+            shape = (self.maxRows[name],) + (value.shape[1:] if value.ndim > 1 else ())
+        self.channels[name] = _Channel(self.directory, name, shape, dtype, variable)
+
+    def append(self, time, values):
+        """Appends a sample, values is a dictionary {channel name: array}. The channels are created by the first
+        sample and all the samples must have the same channels."""
+        if self.closed:
+            raise RuntimeError(f"The recording {self.directory} is closed")
+        values = dict(values, time=time)
+        if not self.channels:
+            for name, value in values.items():
+                self._createChannel(name, value)
+        elif values.keys() != self.channels.keys():
+            raise ValueError(f"The channels {sorted(values)} differ from the recorded ones {sorted(self.channels)}")
+
+        if self.ringSize is not None:
+            chunk, position = 0, self.count % self.ringSize
+        else:
+            chunk, position = divmod(self.count, self.capacity)
+        for name, channel in self.channels.items():
+            channel.open(chunk, self.capacity)
+            channel.write(position, values[name])
+        self.count += 1
+        # Moved once the sample is written, a reader never sees a sample being written as the most recent one
+        self.head[0] = self.count
+        if self.count % self.indexInterval == 0 or position == self.capacity - 1:
+            self.flush()
+
+    def writeIndex(self):
+        index = {"format": _format, "version": 1, "mode": "ring" if self.ringSize is not None else "append",
+                 "capacity": self.capacity, "count": self.count, "metadata": self.metadata,
+                 "channels": {name: channel.description() for name, channel in self.channels.items()}}
+        # Written next to the index then renamed, a reader never sees a partial index
+        path = os.path.join(self.directory, _indexName)
+        with open(path + ".tmp", "w") as file:
+            json.dump(index, file, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def flush(self):
+        """Writes the samples to the files then the index."""
+        for channel in self.channels.values():
+            channel.flush()
+        self.head.flush()
+        self.writeIndex()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        for channel in self.channels.values():
+            channel.close()
+        self.closed = True
+
+
+class TrajectoryReader:
+    """Reads a recording of TrajectoryWriter, the samples are numbered from the oldest one kept (0) to the most
+    recent one (len - 1). The files are memory mapped, only the samples read are loaded. The number of samples is
+    read from the write head of the writer, the samples appended since the last reload are seen as long as their
+    files are in the index."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.reload()
+
+    def reload(self):
+        """Reads the index again, e.g. to see the samples written since by a running simulation."""
+        with open(os.path.join(self.directory, _indexName)) as file:
+            index = json.load(file)
+        if index.get("format") != _format:
+            raise ValueError(f"{self.directory} is not a trajectory recording")
+        self.mode = index["mode"]
+        self.capacity = index["capacity"]
+        self.metadata = index["metadata"]
+        self.channels = {name: _Channel(self.directory, name, description["shape"], description["dtype"],
+                                        description["variable"], description["chunks"], description["rows"])
+                         for name, description in index["channels"].items()}
+        self._indexCount = index["count"]
+        headPath = os.path.join(self.directory, _headName)
+        self._head = np.load(headPath, mmap_mode="r") if os.path.exists(headPath) else None
+        self._arrays = {}
+
+    @property
+    def names(self):
+        return list(self.channels)
+
+    @property
+    def count(self):
+        """Number of samples appended, kept or not, up to the files listed in the index."""
+        if not self.channels:
+            return 0
+        count = self._indexCount if self._head is None else int(self._head[0])
+        if self.mode == "append":
+            count = min(count, len(next(iter(self.channels.values())).chunks) * self.capacity)
+        return count
+
+    def _length(self, count):
+        return min(count, self.capacity) if self.mode == "ring" else count
+
+    def __len__(self):
+        return self._length(self.count)
+
+    def _array(self, name, chunk, rows=False):
+        key = (name, chunk, rows)
+        if key not in self._arrays:
+            channel = self.channels[name]
+            files = channel.rows if rows else channel.chunks
+            self._arrays[key] = np.load(os.path.join(self.directory, files[chunk]), mmap_mode="r")
+        return self._arrays[key]
+
+    def _locate(self, indices, count):
+        """(chunk, position in the chunk) of the samples, count samples having been appended"""
+        if self.mode == "ring":
+            oldest = max(count - self.capacity, 0)
+            return np.zeros_like(indices), (oldest + indices) % self.capacity
+        return np.divmod(indices, self.capacity)
+
+    def _gather(self, name, start, stop, rows):
+        # The write head is read once, the samples are located consistently while the writer appends
+        count = self.count
+        indices = np.arange(self._length(count))[slice(start, stop)]
+        channel = self.channels[name]
+        shape = () if rows else channel.shape
+        result = np.empty((len(indices),) + shape, dtype=np.int32 if rows else channel.dtype)
+        chunks, positions = self._locate(indices, count)
+        for chunk in np.unique(chunks):
+            selected = chunks == chunk
+            result[selected] = self._array(name, int(chunk), rows)[positions[selected]]
+        return result
+
+    def read(self, name, start=None, stop=None):
+        """Samples [start, stop) of a channel as an array (python slice semantic), the variable channels are padded
+        with NaN (see rows)."""
+        if name not in self.channels:
+            raise KeyError(f"No channel {name} in {self.directory}, the channels are {self.names}")
+        return self._gather(name, start, stop, rows=False)
+
+    def rows(self, name, start=None, stop=None):
+        """Number of rows of the samples [start, stop) of a variable channel."""
+        if not self.channels[name].variable:
+            raise ValueError(f"The channel {name} does not have a variable size")
+        return self._gather(name, start, stop, rows=True)
+
+    def sample(self, index):
+        """{channel name: value} of a sample, the variable channels are trimmed to their number of rows."""
+        index = index + len(self) if index < 0 else index
+        if not 0 <= index < len(self):
+            raise IndexError(f"Sample {index} out of the {len(self)} samples of {self.directory}")
+        values = {}
+        for name, channel in self.channels.items():
+            value = self.read(name, index, index + 1)[0]
+            values[name] = value[:self.rows(name, index, index + 1)[0]] if channel.variable else value
+        return values
+
+
+def cosseratChannels(rod):
+    """Channels of the frames, the strains and the base pose of a CosseratBase rod."""
+    return {"frames": rod.cosseratFrame.FramesMO.position,
+            "strains": rod.cosseratCoordinateNode.cosseratCoordinateMO.position,
+            "base": rod.rigidBaseNode.RigidBaseMO.position}
+
+
+try:
+    import Sofa.Core
+except ImportError:  # TrajectoryWriter and TrajectoryReader do not need SOFA
+    Sofa = None
+
+if Sofa is not None:
+    class TrajectoryRecorder(Sofa.Core.Controller):
+        """Records the values of Data every decimation steps (at the end of the steps) with a TrajectoryWriter.
+
+        Args:
+            directory: directory of the recording
+            channels: {channel name: Data, or function returning an array}
+            decimation: a sample is recorded every decimation steps, starting with the first step
+            ringSize, chunkSize, indexInterval, maxRows: see TrajectoryWriter
+        """
+
+        def __init__(self, *args, directory, channels, decimation=1, ringSize=None, chunkSize=1024,
+                     indexInterval=100, maxRows=None, **kwargs):
+            Sofa.Core.Controller.__init__(self, *args, **kwargs)
+            if decimation < 1:
+                raise ValueError(f"decimation must be at least 1, got {decimation}")
+            self.sources = dict(channels)
+            self.decimation = decimation
+            self.step = 0
+            self.writer = TrajectoryWriter(directory, ringSize=ringSize, chunkSize=chunkSize,
+                                           indexInterval=indexInterval, maxRows=maxRows,
+                                           metadata={"decimation": decimation})
+            atexit.register(self.writer.close)
+
+        def onAnimateEndEvent(self, event):
+            if self.step % self.decimation == 0 and not self.writer.closed:
+                values = {name: source() if callable(source) else source.value
+                          for name, source in self.sources.items()}
+                self.writer.append(self.getContext().time.value, values)
+            self.step += 1
+
+        def close(self):
+            """Writes the last samples and the index, the recorder does not record anymore."""
+            self.writer.close()
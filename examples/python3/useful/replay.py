@@ -0,0 +1,167 @@
+"""Replay of a recording of useful.recorder, without simulating.
+
+TrajectoryPlayer gives the value of the channels of a recording at any time, interpolated between the recorded
+samples: linearly, with a spherical interpolation of the orientations for the rigid channels (last dimension 7), or
+with the nearest sample. Only the two samples around the requested time are read from the memory-mapped files.
+
+TrajectoryReplay is a controller writing at the beginning of each step the recorded values into Data of the scene,
+e.g. FramesMO.position to redraw a run, or cosseratCoordinateMO.position for the mapping to rebuild the frames. The
+scene should have no solver acting on these states. The replay time advances timeScale times faster than the
+simulation time and can be moved with seek.
+
+Usage:
+    from useful.recorder import cosseratChannels
+    from useful.replay import TrajectoryReplay
+
+    targets = {"strains": cosseratChannels(rod)["strains"]}     # the mapping updates the frames
+    replay = rootNode.addObject(TrajectoryReplay(name="replay", directory="run0", targets=targets, timeScale=2.0))
+    replay.seek(1.5)                                              # continue from t = 1.5 s of the recording
+"""
+
+import numpy as np
+
+from useful.recorder import TrajectoryReader
+
+interpolations = ("linear", "nearest")
+
+
+def slerp(q0, q1, alpha):
+    """Spherical interpolation of quaternions (..., 4) [x, y, z, w], alpha in [0, 1]."""
+    q0 = np.asarray(q0, dtype=float)
+    q1 = np.asarray(q1, dtype=float)
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    # Shortest path
+    q1 = np.where(dot < 0.0, -q1, q1)
+    dot = np.abs(dot)
+    angle = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_angle = np.sin(angle)
+    close = sin_angle < 1e-6
+    safe = np.where(close, 1.0, sin_angle)
+    w0 = np.where(close, 1.0 - alpha, np.sin((1.0 - alpha) * angle) / safe)
+    w1 = np.where(close, alpha, np.sin(alpha * angle) / safe)
+    q = w0 * q0 + w1 * q1
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+class TrajectoryPlayer:
+    """Values of the channels of a recording at a given time.
+
+    Args:
+        recording: directory of the recording or a TrajectoryReader
+        interpolation: "linear" or "nearest"
+        rigidChannels: channels holding rigid poses [x, y, z, qx, qy, qz, qw], whose orientations are interpolated
+            with slerp. By default the channels whose last dimension is 7.
+    """
+
+    def __init__(self, recording, interpolation="linear", rigidChannels=None):
+        if interpolation not in interpolations:
+            raise ValueError(f"Unknown interpolation {interpolation}, expected one of {interpolations}")
+        self.reader = recording if isinstance(recording, TrajectoryReader) else TrajectoryReader(recording)
+        if len(self.reader) == 0:
+            raise ValueError(f"The recording {self.reader.directory} is empty")
+        self.interpolation = interpolation
+        self.rigidChannels = set(rigidChannels) if rigidChannels is not None else \
+            {name for name, channel in self.reader.channels.items() if channel.shape[-1:] == (7,)}
+        self.times = self.reader.read("time")
+
+    @property
+    def startTime(self):
+        return float(self.times[0])
+
+    @property
+    def endTime(self):
+        return float(self.times[-1])
+
+    def reload(self):
+        """Takes into account the samples recorded since, when the recording is still being written."""
+        self.reader.reload()
+        self.times = self.reader.read("time")
+
+    def locate(self, time):
+        """(index, alpha): the value at time is between the samples index and index + 1, alpha in [0, 1]. The time
+        is clamped to the recorded interval."""
+        if time <= self.times[0] or len(self.times) == 1:
+            return 0, 0.0
+        if time >= self.times[-1]:
+            return len(self.times) - 1, 0.0
+        index = int(np.searchsorted(self.times, time, side="right")) - 1
+        span = self.times[index + 1] - self.times[index]
+        return index, float((time - self.times[index]) / span) if span > 0 else 0.0
+
+    def valueAt(self, name, time):
+        """Value of a channel at time (clamped to the recorded interval)."""
+        index, alpha = self.locate(time)
+        channel = self.reader.channels[name]
+        if channel.variable or self.interpolation == "nearest" or alpha == 0.0:
+            # The channels of variable size are not interpolated
+            nearest = index + 1 if alpha >= 0.5 else index
+            value = self.reader.read(name, nearest, nearest + 1)[0]
+            return value[:self.reader.rows(name, nearest, nearest + 1)[0]] if channel.variable else value
+
+        before, after = self.reader.read(name, index, index + 2)
+        if name not in self.rigidChannels:
+            return (1.0 - alpha) * before + alpha * after
+        value = np.empty_like(before)
+        value[..., :3] = (1.0 - alpha) * before[..., :3] + alpha * after[..., :3]
+        value[..., 3:] = slerp(before[..., 3:], after[..., 3:], alpha)
+        return value
+
+
+try:
+    import Sofa.Core
+except ImportError:  # TrajectoryPlayer does not need SOFA
+    Sofa = None
+
+if Sofa is not None:
+    class TrajectoryReplay(Sofa.Core.Controller):
+        """Writes the recorded values into Data of the scene at the beginning of each step.
+
+        Args:
+            directory: directory of the recording
+            targets: {channel name: Data receiving its value}, e.g. {"frames": FramesMO.position}
+            timeScale: recorded seconds replayed per simulated second
+            startTime: time of the recording replayed at the first step, its beginning by default
+            loop: if True the replay starts again at the end of the recording, otherwise the last sample is kept
+            interpolation, rigidChannels: see TrajectoryPlayer
+        """
+
+        def __init__(self, *args, directory, targets, timeScale=1.0, startTime=None, loop=False,
+                     interpolation="linear", rigidChannels=None, **kwargs):
+            Sofa.Core.Controller.__init__(self, *args, **kwargs)
+            self.player = TrajectoryPlayer(directory, interpolation, rigidChannels)
+            unknown = [name for name in targets if name not in self.player.reader.channels]
+            if unknown:
+                raise ValueError(f"No channels {unknown} in {directory}, the channels are {self.player.reader.names}")
+            self.targets = dict(targets)
+            self.timeScale = timeScale
+            self.loop = loop
+            self._origin = self.player.startTime if startTime is None else startTime
+            self._simulationOrigin = None
+
+        @property
+        def replayTime(self):
+            """Time of the recording replayed at the current simulation time"""
+            if self._simulationOrigin is None:
+                return self._origin
+            time = self._origin + self.timeScale * (self.getContext().time.value - self._simulationOrigin)
+            duration = self.player.endTime - self.player.startTime
+            if self.loop and duration > 0.0 and time > self.player.endTime:
+                time = self.player.startTime + (time - self.player.startTime) % duration
+            return time
+
+        def seek(self, time):
+            """Replays from the given time of the recording at the next step."""
+            self._origin = time
+            self._simulationOrigin = None
+
+        def setTimeScale(self, timeScale):
+            """Changes the replay speed, without jumping in the recording."""
+            self.seek(self.replayTime)
+            self.timeScale = timeScale
+
+        def onAnimateBeginEvent(self, event):
+            if self._simulationOrigin is None:
+                self._simulationOrigin = self.getContext().time.value
+            time = self.replayTime
+            for name, data in self.targets.items():
+                data.value = self.player.valueAt(name, time)
@@ -0,0 +1,293 @@
+"""Static equilibrium of a Cosserat rod (PCS) with a fixed base, solved with Newton iterations.
+
+For the strains xi_s of the sections it solves
+
+    K_s L_s (xi_s - xi0_s) = sum_f J_f(xi)^T F_f
+
+i.e. the force of BeamHookeLawForceField balanced by the loads F_f applied on the frames and brought
+back to the strains with the transpose of the mapping Jacobian (DiscreteCosseratMapping::applyJT).
+The kinematics and the Jacobians follow the C++ code (see useful.kinematics and
+CosseratKinematics::computeFramesJacobians), so the equilibrium is the one a dynamic simulation
+settles to, without running the transient.
+
+Usage:
+    solver = StaticSolver(curv_abs_section, curv_abs_frames, section_stiffness(BeamPhysicsParameters()))
+    result = solver.solve(frame_forces)   # frame_forces: (nbFrames, 6) SOFA rigid forces [f, tau]
+    result = solver.solve(other_forces)   # warm-started from the previous equilibrium
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from useful.kinematics import adjoint, exp_se3, inverse_se3, pose_to_matrix, tang_exp, tang_exp_derivatives, tilde, \
+    to_strain6
+
+
+def section_stiffness(physics, strain_size=3):
+    """Stiffness matrix of a section (3x3 or 6x6), same values as BeamHookeLawForceField::reinit.
+
+    physics is a useful.params.BeamPhysicsParameters."""
+    if physics.useInertia:
+        diagonal = [physics.GI, physics.EI, physics.EI, physics.EA, physics.GA, physics.GA]
+    else:
+        if physics.beamShape == "rectangular":
+            ly, lz = physics.length_Y, physics.length_Z
+            iy, iz, area = ly * lz ** 3 / 12.0, lz * ly ** 3 / 12.0, ly * lz
+        else:
+            r = physics.beamRadius
+            iy = iz = np.pi * r ** 4 / 4.0
+            area = np.pi * r ** 2
+        young = physics.youngModulus
+        shear = young / (2.0 * (1.0 + physics.poissonRatio))
+        diagonal = [shear * (iy + iz), young * iy, young * iz, young * area, shear * area, shear * area]
+    return np.diag(diagonal[:strain_size])
+
+
+def frames_distribution(curv_abs_section, curv_abs_frames):
+    """1-based section index of each frame, distance of the frames to the beginning of their section and
+    length of the sections, same as kinematics::computeFramesDistribution."""
+    curv_abs_section = np.asarray(curv_abs_section, dtype=float)
+    curv_abs_frames = np.asarray(curv_abs_frames, dtype=float)
+    nb_sections = len(curv_abs_section) - 1
+    # A frame on a node belongs to the section before it, the first frame to the first section
+    indices = np.clip(np.searchsorted(curv_abs_section, curv_abs_frames, side='left'), 1, nb_sections)
+    frames_length = curv_abs_frames - curv_abs_section[indices - 1]
+    return indices, frames_length, np.diff(curv_abs_section)
+
+
+def _projector(g):
+    """Maps local twists [w, v] to SOFA rigid velocities [v, w] in the global frame."""
+    rot = g[..., :3, :3]
+    p = np.zeros(g.shape[:-2] + (6, 6))
+    p[..., :3, 3:] = rot
+    p[..., 3:, :3] = rot
+    return p
+
+
+def frames_poses(base, strains, curv_abs_section, curv_abs_frames):
+    """Homogeneous matrices (nbFrames, 4, 4) of the frames, base is a (4, 4) matrix or a (7,) pose."""
+    base = np.asarray(base, dtype=float)
+    base = pose_to_matrix(base) if base.shape == (7,) else base
+    strains = to_strain6(strains)
+    indices, frames_length, beam_length = frames_distribution(curv_abs_section, curv_abs_frames)
+
+    sections = exp_se3(beam_length, strains)
+    nodes = [base]
+    for g in sections:
+        nodes.append(nodes[-1] @ g)
+    nodes = np.array(nodes)
+    return nodes[indices - 1] @ exp_se3(frames_length, strains[indices - 1])
+
+
+def frames_jacobians(base, strains, curv_abs_section, curv_abs_frames):
+    """Jacobians (nbFrames, 6, 6 + nbSections * strainSize) of the frames SOFA velocities [v, w] with respect
+    to the base velocity and the strains, same layout as Cosserat.framesJacobians."""
+    base = np.asarray(base, dtype=float)
+    base = pose_to_matrix(base) if base.shape == (7,) else base
+    strain_size = np.shape(strains)[-1]
+    strains = to_strain6(strains)
+    nb_sections = len(strains)
+    indices, frames_length, beam_length = frames_distribution(curv_abs_section, curv_abs_frames)
+    nb_cols = 6 + nb_sections * strain_size
+
+    # nodes_j[j] (6, nbCols): local twist of the node j, same recursion as applyJ
+    #   eta_j = Ad(gX(L_{j-1})^-1) * (eta_{j-1} + T(L_{j-1}) * Xi_dot_{j-1})
+    sections = exp_se3(beam_length, strains)
+    ad_inv = adjoint(inverse_se3(sections))
+    tangents = tang_exp(beam_length, strains)
+    nodes = [base]
+    nodes_j = np.zeros((nb_sections + 1, 6, nb_cols))
+    nodes_j[0, :, :6] = _projector(inverse_se3(base))
+    for j in range(1, nb_sections + 1):
+        nodes.append(nodes[-1] @ sections[j - 1])
+        column = 6 + (j - 1) * strain_size
+        nodes_j[j, :, :column] = ad_inv[j - 1] @ nodes_j[j - 1, :, :column]
+        nodes_j[j, :, column:column + strain_size] = (ad_inv[j - 1] @ tangents[j - 1])[:, :strain_size]
+    nodes = np.array(nodes)
+
+    section = indices - 1
+    g_x = exp_se3(frames_length, strains[section])
+    proj_ad = _projector(nodes[section] @ g_x) @ adjoint(inverse_se3(g_x))
+    jacobians = proj_ad @ nodes_j[section]
+    own = (proj_ad @ tang_exp(frames_length, strains[section]))[..., :strain_size]
+    for f, s in enumerate(section):
+        column = 6 + s * strain_size
+        jacobians[f, :, column:column + strain_size] = own[f]
+    return jacobians
+
+
+def load_stiffness(base, strains, curv_abs_section, curv_abs_frames, frame_forces):
+    """Derivative (nbSections * strainSize, nbSections * strainSize) of J^T F with respect to the strains, F being
+    the (nbFrames, 6) SOFA rigid forces [f, tau] applied on the frames in the global frame (dead loads).
+
+    With G_s the pose of the beginning of the section s, the column of the strain s in the spatial velocity of a
+    frame after it is Ad(G_s) T_s, T_s being tang_exp over the section or up to the frame. The loads are summed as
+    spatial wrenches W_f = [tau + p_f x f, f] and J^T F is T_s^T Ad(G_s)^T (sum of the W_f after s). A variation of
+    the strain r moves G_s (s > r) and the frames after r rigidly, which changes their wrenches and the wrenches
+    seen from G_s linearly (operators L_f and K_f below), and changes T_r. The sums over the frames are accumulated
+    from the tip, so all the blocks follow from one backward pass."""
+    base = np.asarray(base, dtype=float)
+    base = pose_to_matrix(base) if base.shape == (7,) else base
+    strain_size = np.shape(strains)[-1]
+    strains = to_strain6(strains)
+    nb_sections = len(strains)
+    indices, frames_length, beam_length = frames_distribution(curv_abs_section, curv_abs_frames)
+    section = indices - 1
+    forces = np.asarray(frame_forces, dtype=float).reshape(len(section), 6)
+
+    sections = exp_se3(beam_length, strains)
+    nodes = [base]
+    for g in sections[:-1]:
+        nodes.append(nodes[-1] @ g)
+    nodes = np.array(nodes)
+    node_ad = adjoint(nodes)
+    positions = (nodes[section] @ exp_se3(frames_length, strains[section]))[:, :3, 3]
+
+    # Spatial wrenches of the loads and their variations for a spatial twist [w, v] of the frames: K_f for a
+    # motion of the frame and of the frame it is seen from, L_f for a motion of the frame only
+    force_tilde, torque_tilde, position_tilde = tilde(forces[:, :3]), tilde(forces[:, 3:]), tilde(positions)
+    wrenches = np.concatenate([forces[:, 3:] + np.cross(positions, forces[:, :3]), forces[:, :3]], axis=-1)
+    k_frames = np.zeros((len(section), 6, 6))
+    k_frames[:, :3, :3] = torque_tilde + position_tilde @ force_tilde
+    k_frames[:, 3:, :3] = force_tilde
+    l_frames = np.zeros((len(section), 6, 6))
+    l_frames[:, :3, :3] = force_tilde @ position_tilde
+    l_frames[:, :3, 3:] = -force_tilde
+
+    def after(values):
+        """Sums of the values of the frames of the sections after each section."""
+        per_section = np.zeros((nb_sections,) + values.shape[1:])
+        np.add.at(per_section, section, values)
+        return np.cumsum(per_section[::-1], axis=0)[::-1] - per_section
+
+    def per_section(values):
+        summed = np.zeros((nb_sections,) + values.shape[1:])
+        np.add.at(summed, section, values)
+        return summed
+
+    wrenches_after, k_after, l_after = after(wrenches), after(k_frames), after(l_frames)
+
+    # Rows (strain_size, 6) T^T Ad(G)^T and columns (6, strain_size) Ad(G) T, over the sections and up to the frames
+    tangents = tang_exp(beam_length, strains)
+    frames_tangents = tang_exp(frames_length, strains[section])
+    columns = (node_ad @ tangents)[..., :strain_size]
+    frames_columns = (node_ad[section] @ frames_tangents)[..., :strain_size]
+    rows = np.swapaxes(columns, -1, -2)
+    frames_rows = np.swapaxes(frames_columns, -1, -2)
+
+    # Variation of the wrenches after r (s < r) and variation seen from G_s (s > r), for a variation of the strain r
+    motions = l_after @ columns + per_section(l_frames @ frames_columns)
+    seen = rows @ k_after + per_section(frames_rows @ k_frames)
+
+    size = nb_sections * strain_size
+    block = np.arange(size) // strain_size
+    stiffness = np.where(block[:, None] < block[None, :],
+                         rows.reshape(size, 6) @ np.moveaxis(motions, 1, 0).reshape(6, size),
+                         seen.reshape(size, 6) @ np.moveaxis(columns, 1, 0).reshape(6, size))
+
+    # Same section: motion of the wrenches after r and of the frames of r, and variation of T_r
+    node_wrenches = np.einsum('sji,sj->si', node_ad, wrenches_after)
+    frames_node_wrenches = np.einsum('fji,fj->fi', node_ad[section], wrenches)
+    d_tangents = tang_exp_derivatives(beam_length, strains, strain_size)
+    d_frames_tangents = tang_exp_derivatives(frames_length, strains[section], strain_size)
+    diagonal = rows @ l_after @ columns + per_section(frames_rows @ l_frames @ frames_columns) \
+        + np.einsum('sdij,si->sjd', d_tangents, node_wrenches)[:, :strain_size] \
+        + per_section(np.einsum('fdij,fi->fjd', d_frames_tangents, frames_node_wrenches)[:, :strain_size])
+    for s in range(nb_sections):
+        stiffness[s * strain_size:(s + 1) * strain_size, s * strain_size:(s + 1) * strain_size] = diagonal[s]
+    return stiffness
+
+
+@dataclass
+class StaticResult:
+    """Outcome of StaticSolver.solve"""
+
+    strains: np.ndarray
+    frames: np.ndarray
+    converged: bool
+    iterations: int
+    residual: float
+
+
+class StaticSolver:
+    """Newton solver of the static equilibrium of a rod with a fixed base under dead frame loads.
+
+    Args:
+        curv_abs_section: curvilinear abscissa of the nodes (nbSections + 1), as curv_abs_input of the mapping
+        curv_abs_frames: curvilinear abscissa of the frames, as curv_abs_output of the mapping
+        stiffness: (s, s) stiffness of all sections or (nbSections, s, s), s = 3 (angular strain) or 6
+        rest_strains: (nbSections, s) rest strains, null by default
+        base: (4, 4) matrix or (7,) pose of the base, identity by default
+        geometric_stiffness: if True the derivative of J^T F with respect to the strains (the mapping geometric
+            stiffness, see load_stiffness) is added to the tangent, otherwise only the beam stiffness is used, which
+            needs more iterations
+    """
+
+    def __init__(self, curv_abs_section, curv_abs_frames, stiffness, rest_strains=None, base=None,
+                 geometric_stiffness=True):
+        self.curv_abs_section = np.asarray(curv_abs_section, dtype=float)
+        self.curv_abs_frames = np.asarray(curv_abs_frames, dtype=float)
+        self.nb_sections = len(self.curv_abs_section) - 1
+        stiffness = np.asarray(stiffness, dtype=float)
+        self.strain_size = stiffness.shape[-1]
+        stiffness = np.broadcast_to(stiffness, (self.nb_sections, self.strain_size, self.strain_size))
+        # BeamHookeLawForceField: f_s = -K_s L_s (xi_s - xi0_s)
+        self.stiffness = stiffness * np.diff(self.curv_abs_section)[:, None, None]
+        self.rest_strains = np.zeros((self.nb_sections, self.strain_size)) if rest_strains is None \
+            else np.asarray(rest_strains, dtype=float).reshape(self.nb_sections, self.strain_size)
+        self.base = np.eye(4) if base is None else np.asarray(base, dtype=float)
+        self.geometric_stiffness = geometric_stiffness
+        self.strains = self.rest_strains.copy()
+
+    def reset(self):
+        """Forgets the previous solution, the next solve starts from the rest strains."""
+        self.strains = self.rest_strains.copy()
+
+    def _strain_jacobians(self, strains):
+        jacobians = frames_jacobians(self.base, strains, self.curv_abs_section, self.curv_abs_frames)
+        return jacobians[:, :, 6:]
+
+    def _residual(self, strains, forces):
+        elastic = np.einsum('sij,sj->si', self.stiffness, strains - self.rest_strains).ravel()
+        external = np.einsum('fij,fi->j', self._strain_jacobians(strains), forces)
+        return elastic - external
+
+    def _tangent(self, strains, forces):
+        tangent = np.zeros((self.nb_sections * self.strain_size,) * 2)
+        for s in range(self.nb_sections):
+            block = slice(s * self.strain_size, (s + 1) * self.strain_size)
+            tangent[block, block] = self.stiffness[s]
+        if self.geometric_stiffness:
+            tangent -= load_stiffness(self.base, strains, self.curv_abs_section, self.curv_abs_frames, forces)
+        return tangent
+
+    def solve(self, frame_forces, tolerance=1e-8, max_iterations=50):
+        """Equilibrium strains under the (nbFrames, 6) SOFA rigid forces [f, tau] (global frame) applied on the
+        frames. The iterations start from the previous solution and stop when the norm of the residual is below
+        tolerance times the norm of the loads."""
+        forces = np.asarray(frame_forces, dtype=float).reshape(len(self.curv_abs_frames), 6)
+        strains = self.strains.copy()
+        residual = self._residual(strains, forces)
+        scale = max(np.linalg.norm(np.einsum('fij,fi->j', self._strain_jacobians(strains), forces)), 1.0)
+        norm = np.linalg.norm(residual)
+
+        iteration = 0
+        while norm > tolerance * scale and iteration < max_iterations:
+            iteration += 1
+            delta = np.linalg.solve(self._tangent(strains, forces), -residual).reshape(strains.shape)
+
+            # Backtracking on the norm of the residual
+            step = 1.0
+            while True:
+                candidate = strains + step * delta
+                candidate_residual = self._residual(candidate, forces)
+                candidate_norm = np.linalg.norm(candidate_residual)
+                if candidate_norm < norm or step < 1e-4:
+                    break
+                step *= 0.5
+            strains, residual, norm = candidate, candidate_residual, candidate_norm
+
+        self.strains = strains
+        frames = frames_poses(self.base, strains, self.curv_abs_section, self.curv_abs_frames)
+        return StaticResult(strains=strains, frames=frames, converged=bool(norm <= tolerance * scale),
+                            iterations=iteration, residual=float(norm))
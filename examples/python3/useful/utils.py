@@ -1,52 +1,53 @@
 import numpy as np
+from useful.plugins import addObject
 
 
 def addEdgeCollision(parentNode, position3D, edges):
     collisInstrumentCombined = parentNode.addChild('collisInstrumentCombined')
-    collisInstrumentCombined.addObject('EdgeSetTopologyContainer', name="collisEdgeSet", position=position3D,
-                                       edges=edges)
-    collisInstrumentCombined.addObject('EdgeSetTopologyModifier', name="collisEdgeModifier")
-    collisInstrumentCombined.addObject('MechanicalObject', name="CollisionDOFs")
-    collisInstrumentCombined.addObject('LineCollisionModel', bothSide="1", group='2')
-    collisInstrumentCombined.addObject('PointCollisionModel', group='2')
-    collisInstrumentCombined.addObject('IdentityMapping', name="mapping")
+    addObject(collisInstrumentCombined, 'EdgeSetTopologyContainer', name="collisEdgeSet", position=position3D,
+              edges=edges)
+    addObject(collisInstrumentCombined, 'EdgeSetTopologyModifier', name="collisEdgeModifier")
+    addObject(collisInstrumentCombined, 'MechanicalObject', name="CollisionDOFs")
+    addObject(collisInstrumentCombined, 'LineCollisionModel', bothSide="1", group='2')
+    addObject(collisInstrumentCombined, 'PointCollisionModel', group='2')
+    addObject(collisInstrumentCombined, 'IdentityMapping', name="mapping")
     return collisInstrumentCombined
 
 """@info: This function is used to build the beam collision node"""
 def addPointsCollision(parentNode, position3D, edges, nodeName):
     collisInstrumentCombined = parentNode.addChild(nodeName)
-    collisInstrumentCombined.addObject('EdgeSetTopologyContainer', name="beamContainer", position=position3D,
-                                       edges=edges)
-    collisInstrumentCombined.addObject('EdgeSetTopologyModifier', name="beamModifier")
-    collisInstrumentCombined.addObject('MechanicalObject', name="collisionStats", showObject=False, showIndices=False)
-    collisInstrumentCombined.addObject('PointCollisionModel', name="beamColMod", group='2')
+    addObject(collisInstrumentCombined, 'EdgeSetTopologyContainer', name="beamContainer", position=position3D,
+              edges=edges)
+    addObject(collisInstrumentCombined, 'EdgeSetTopologyModifier', name="beamModifier")
+    addObject(collisInstrumentCombined, 'MechanicalObject', name="collisionStats", showObject=False, showIndices=False)
+    addObject(collisInstrumentCombined, 'PointCollisionModel', name="beamColMod", group='2')
     # collisInstrumentCombined.addObject('IdentityMapping', name="beamMapping")
-    collisInstrumentCombined.addObject('RigidMapping', name="beamMapping")
+    addObject(collisInstrumentCombined, 'RigidMapping', name="beamMapping")
     return collisInstrumentCombined
 
 
  # """ @info: This function is used to build the constraint node"""
-def addConstraintPoint(parentNode, beamPath):
+def addConstraintPoint(parentNode, beamPath, poolSize=0):
     constraintPointsNode = parentNode.addChild('constraintPoints')
-    constraintPointsNode.addObject("PointSetTopologyContainer", name="constraintPtsContainer", listening="1")
-    constraintPointsNode.addObject("PointSetTopologyModifier", name="constraintPtsModifier", listening="1")
-    constraintPointsNode.addObject("MechanicalObject", template="Vec3d", showObject=True, showIndices=True,
-                                   name="constraintPointsMo", position=[], showObjectScale=0, listening="1")
+    addObject(constraintPointsNode, "PointSetTopologyContainer", name="constraintPtsContainer", listening="1")
+    addObject(constraintPointsNode, "PointSetTopologyModifier", name="constraintPtsModifier", listening="1")
+    addObject(constraintPointsNode, "MechanicalObject", template="Vec3d", showObject=True, showIndices=True,
+              name="constraintPointsMo", position=[], showObjectScale=0, listening="1")
 
     # print(f' ====> The beamTip tip is : {dir(beamPath)}')
-    constraintPointsNode.addObject('PointsManager', name="pointsManager", listening="1",
-                                   beamPath="/solverNode/needle/rigidBase/cosseratInSofaFrameNode/slidingPoint"
-                                            "/slidingPointMO")
+    addObject(constraintPointsNode, 'PointsManager', name="pointsManager", listening="1", poolSize=poolSize,
+              beamPath="/solverNode/needle/rigidBase/cosseratInSofaFrameNode/slidingPoint"
+                       "/slidingPointMO")
 
-    constraintPointsNode.addObject('BarycentricMapping', useRestPosition="false", listening="1")
+    addObject(constraintPointsNode, 'BarycentricMapping', useRestPosition="false", listening="1")
     return constraintPointsNode
 
 
 def addSlidingPoints(parenNode, frames3D):
     slidingPoint = parenNode.addChild('slidingPoint')
-    slidingPoint.addObject('MechanicalObject', name="slidingPointMO", position=frames3D,
-                           showObject=False, showIndices=False)
-    slidingPoint.addObject('IdentityMapping')
+    addObject(slidingPoint, 'MechanicalObject', name="slidingPointMO", position=frames3D,
+              showObject=False, showIndices=False)
+    addObject(slidingPoint, 'IdentityMapping')
     return slidingPoint
 
 
@@ -0,0 +1,146 @@
+/******************************************************************************
+*                 SOFA, Simulation Open-Framework Architecture                *
+*                    (c) 2021 INRIA, USTL, UJF, CNRS, MGH                     *
+*                                                                             *
+* This program is free software; you can redistribute it and/or modify it     *
+* under the terms of the GNU Lesser General Public License as published by    *
+* the Free Software Foundation; either version 2.1 of the License, or (at     *
+* your option) any later version.                                             *
+*                                                                             *
+* This program is distributed in the hope that it will be useful, but WITHOUT *
+* ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+* FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+* for more details.                                                           *
+*                                                                             *
+* You should have received a copy of the GNU Lesser General Public License    *
+* along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+*******************************************************************************
+* Contact information: contact@sofa-framework.org                             *
+******************************************************************************/
+#include <SofaPython3/PythonFactory.h>
+#include <SofaPython3/Sofa/Core/Binding_Base.h>
+#include "Binding_BaseCosseratMapping.h"
+#include <pybind11/numpy.h>
+#include <Cosserat/mapping/DiscreteCosseratMapping.h>
+#include <Cosserat/mapping/DiscreteDynamicCosseratMapping.h>
+
+namespace py {
+using namespace pybind11;
+}
+
+using namespace sofa::core::objectmodel;
+using sofa::defaulttype::Vec3Types;
+using sofa::defaulttype::Vec6Types;
+using sofa::defaulttype::Rigid3Types;
+
+namespace sofapython3 {
+
+namespace {
+
+using sofa::type::Mat6x6;
+using sofa::type::Vec6;
+
+// The views below expose the memory of the mapping vectors as is, this is only valid if the
+// types are tightly packed arrays of SReal. Transform is not: it stores the position of the parent
+// in the child frame (Featherstone's convention), see getFramesExponentialSE3Vectors.
+static_assert(sizeof(Mat6x6) == 36 * sizeof(SReal), "Mat6x6 is expected to be a row major 6x6 array");
+static_assert(sizeof(Vec6) == 6 * sizeof(SReal), "Vec6 is expected to be an array of 6 values");
+
+/// Returns a read-only numpy array of shape (size, innerShape...) on the memory of data, without copy.
+/// The array keeps owner (the python mapping object) alive. It is only valid as long as the underlying
+/// vector is not resized, i.e. until the mapping re-initializes its frames or the number of sections changes.
+template <class T>
+py::array readOnlyView(const sofa::type::vector<T> &data, const std::vector<py::ssize_t> &innerShape, py::handle owner)
+{
+    std::vector<py::ssize_t> shape{static_cast<py::ssize_t>(data.size())};
+    shape.insert(shape.end(), innerShape.begin(), innerShape.end());
+
+    std::vector<py::ssize_t> strides(shape.size());
+    py::ssize_t stride = sizeof(SReal);
+    for (size_t i = shape.size(); i-- > 1;)
+    {
+        strides[i] = stride;
+        stride *= shape[i];
+    }
+    strides[0] = sizeof(T);
+
+    py::array view(py::dtype::of<SReal>(), shape, strides, data.data(), owner);
+    reinterpret_cast<py::detail::PyArray_Proxy *>(view.ptr())->flags &= ~py::detail::npy_api::NPY_ARRAY_WRITEABLE_;
+    return view;
+}
+
+template <class TIn1>
+void addBaseCosseratMapping(py::module &m, const std::string &name)
+{
+    typedef Cosserat::mapping::BaseCosseratMapping<TIn1, Rigid3Types, Rigid3Types> BaseCosseratMapping;
+    py::class_<BaseCosseratMapping, Base, py_shared_ptr<BaseCosseratMapping>> c(m, name.c_str());
+
+    c.def("getFramesExponentialSE3Vectors", [](py::object self) {
+        // A copy: the memory of a Transform holds the parent position in the child frame, not its origin
+        auto &mapping = py::cast<BaseCosseratMapping &>(self);
+        const auto &transforms = mapping.m_framesExponentialSE3Vectors;
+        py::array_t<SReal> poses({static_cast<py::ssize_t>(transforms.size()), py::ssize_t(7)});
+        auto out = poses.mutable_unchecked<2>();
+        for (size_t i = 0; i < transforms.size(); ++i)
+        {
+            const auto &origin = transforms[i].getOrigin();
+            const auto &orientation = transforms[i].getOrientation();
+            for (py::ssize_t k = 0; k < 3; ++k)
+                out(i, k) = origin[k];
+            for (py::ssize_t k = 0; k < 4; ++k)
+                out(i, 3 + k) = orientation[k];
+        }
+        return poses;
+    }, "Local transforms of the frames (from their section start) as a (nbFrames, 7) copy [x, y, z, qx, qy, qz, qw].");
+
+    c.def("getNodesTangExpVectors", [](py::object self) {
+        auto &mapping = py::cast<BaseCosseratMapping &>(self);
+        return readOnlyView(mapping.m_nodesTangExpVectors, {6, 6}, self);
+    }, "Tangent exponential matrices of the nodes as (nbNodes, 6, 6).");
+
+    c.def("getFramesTangExpVectors", [](py::object self) {
+        auto &mapping = py::cast<BaseCosseratMapping &>(self);
+        return readOnlyView(mapping.m_framesTangExpVectors, {6, 6}, self);
+    }, "Tangent exponential matrices of the frames as (nbFrames, 6, 6).");
+
+    c.def("getNodesVelocityVectors", [](py::object self) {
+        auto &mapping = py::cast<BaseCosseratMapping &>(self);
+        return readOnlyView(mapping.m_nodesVelocityVectors, {6}, self);
+    }, "Velocities (twists) of the nodes in their local frame as (nbNodes, 6).");
+
+    c.def("getTotalBeamForceVectors", [](py::object self) {
+        auto &mapping = py::cast<BaseCosseratMapping &>(self);
+        return readOnlyView(mapping.m_totalBeamForceVectors, {6}, self);
+    }, "Wrenches accumulated along the beam by the last applyJT as (nbNodes, 6).");
+}
+
+/// The downcasting is registered per class name (whatever the template), so the concrete mappings are
+/// returned as the base binding matching their input template.
+py::object castToBaseCosseratMapping(Base *object)
+{
+    typedef Cosserat::mapping::BaseCosseratMapping<Vec3Types, Rigid3Types, Rigid3Types> BaseCosseratMapping3;
+    typedef Cosserat::mapping::BaseCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types> BaseCosseratMapping6;
+
+    if (auto mapping = dynamic_cast<BaseCosseratMapping3 *>(object))
+        return py::cast(mapping);
+    if (auto mapping = dynamic_cast<BaseCosseratMapping6 *>(object))
+        return py::cast(mapping);
+    return py::cast(object);
+}
+
+} // namespace
+
+void moduleAddBaseCosseratMapping(py::module &m)
+{
+    addBaseCosseratMapping<Vec3Types>(m, "BaseCosseratMapping3");
+    addBaseCosseratMapping<Vec6Types>(m, "BaseCosseratMapping6");
+
+    typedef Cosserat::mapping::DiscreteCosseratMapping<Vec3Types, Rigid3Types, Rigid3Types> DiscreteCosseratMapping3;
+    typedef Cosserat::mapping::DiscreteDynamicCosseratMapping<Vec3Types, Rigid3Types, Rigid3Types> DiscreteDynamicCosseratMapping3;
+
+    /// register the mappings in the downcasting subsystem
+    PythonFactory::registerType<DiscreteCosseratMapping3>(castToBaseCosseratMapping);
+    PythonFactory::registerType<DiscreteDynamicCosseratMapping3>(castToBaseCosseratMapping);
+}
+
+}  // namespace sofapython3
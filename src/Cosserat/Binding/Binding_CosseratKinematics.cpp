@@ -0,0 +1,247 @@
+/******************************************************************************
+*                 SOFA, Simulation Open-Framework Architecture                *
+*                    (c) 2021 INRIA, USTL, UJF, CNRS, MGH                     *
+*                                                                             *
+* This program is free software; you can redistribute it and/or modify it     *
+* under the terms of the GNU Lesser General Public License as published by    *
+* the Free Software Foundation; either version 2.1 of the License, or (at     *
+* your option) any later version.                                             *
+*                                                                             *
+* This program is distributed in the hope that it will be useful, but WITHOUT *
+* ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+* FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+* for more details.                                                           *
+*                                                                             *
+* You should have received a copy of the GNU Lesser General Public License    *
+* along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+*******************************************************************************
+* Contact information: contact@sofa-framework.org                             *
+******************************************************************************/
+#include "Binding_CosseratKinematics.h"
+#include <pybind11/numpy.h>
+#include <pybind11/stl.h>
+#include <Cosserat/mapping/CosseratKinematics.h>
+
+#include <algorithm>
+#include <exception>
+#include <optional>
+#include <string>
+#include <thread>
+
+namespace py {
+using namespace pybind11;
+}
+
+namespace sofapython3 {
+
+using namespace Cosserat::kinematics;
+
+namespace {
+
+typedef py::array_t<double, py::array::c_style | py::array::forcecast> DoubleArray;
+
+/// Run f(i) for i in [0, size) over nbThreads threads. To be called without the GIL.
+template <class F>
+void parallelFor(size_t size, unsigned int nbThreads, const F &f)
+{
+    if (nbThreads == 0)
+        nbThreads = std::max(1u, std::thread::hardware_concurrency());
+    nbThreads = static_cast<unsigned int>(std::min<size_t>(nbThreads, size));
+
+    if (nbThreads <= 1)
+    {
+        for (size_t i = 0; i < size; ++i)
+            f(i);
+        return;
+    }
+
+    std::vector<std::thread> threads;
+    std::vector<std::exception_ptr> errors(nbThreads);
+    const size_t chunk = (size + nbThreads - 1) / nbThreads;
+    for (unsigned int t = 0; t < nbThreads; ++t)
+    {
+        threads.emplace_back([&, t]() {
+            try
+            {
+                for (size_t i = t * chunk; i < std::min(size, (t + 1) * chunk); ++i)
+                    f(i);
+            }
+            catch (...)
+            {
+                errors[t] = std::current_exception();
+            }
+        });
+    }
+    for (auto &thread : threads)
+        thread.join();
+    for (auto &error : errors)
+        if (error)
+            std::rethrow_exception(error);
+}
+
+Transform toTransform(const double *pose)
+{
+    return Transform(Vec3(pose[0], pose[1], pose[2]),
+                     sofa::type::Quat<SReal>(pose[3], pose[4], pose[5], pose[6]));
+}
+
+void fromTransform(const Transform &frame, double *pose)
+{
+    const Vec3 &origin = frame.getOrigin();
+    const auto &orientation = frame.getOrientation();
+    for (unsigned int k = 0; k < 3; ++k)
+        pose[k] = origin[k];
+    for (unsigned int k = 0; k < 4; ++k)
+        pose[3 + k] = orientation[k];
+}
+
+/// Checks the shape of the strains (N, nbSections, 3|6) and returns the strain size
+py::ssize_t checkStrains(const DoubleArray &strains, size_t nbSections)
+{
+    if (strains.ndim() != 3)
+        throw py::value_error("strains must be of shape (N, nbSections, 3) or (N, nbSections, 6)");
+    const py::ssize_t strainSize = strains.shape(2);
+    if (strainSize != 3 && strainSize != 6)
+        throw py::value_error("the last dimension of strains must be 3 or 6");
+    if (static_cast<size_t>(strains.shape(1)) != nbSections)
+        throw py::value_error("strains must contain one strain per section, i.e. len(curv_abs_section) - 1");
+    return strainSize;
+}
+
+/// Checks the shape of the base poses, (7,) for one pose shared by all configurations, or (N, 7)
+bool checkBasePoses(const DoubleArray &basePoses, py::ssize_t nbConfigurations)
+{
+    if (basePoses.ndim() == 1 && basePoses.shape(0) == 7)
+        return false;
+    if (basePoses.ndim() == 2 && basePoses.shape(0) == nbConfigurations && basePoses.shape(1) == 7)
+        return true;
+    throw py::value_error("base_poses must be of shape (7,) or (N, 7) as [x, y, z, qx, qy, qz, qw]");
+}
+
+void checkDistribution(const vector<double> &curvAbsSection, const vector<double> &curvAbsFrames)
+{
+    if (curvAbsSection.size() < 2)
+        throw py::value_error("curv_abs_section must contain at least two abscissas");
+    if (curvAbsFrames.empty())
+        throw py::value_error("curv_abs_frames must not be empty");
+    if (curvAbsFrames.front() < curvAbsSection.front() || curvAbsFrames.back() > curvAbsSection.back())
+        throw py::value_error("curv_abs_frames must be in the range of curv_abs_section");
+}
+
+Vec6 readStrain(const double *strain, py::ssize_t strainSize)
+{
+    Vec6 k;
+    for (py::ssize_t u = 0; u < strainSize; ++u)
+        k[u] = strain[u];
+    return k;
+}
+
+DoubleArray forwardKinematics(const DoubleArray &strains, const vector<double> &curvAbsSection,
+                              const vector<double> &curvAbsFrames, const DoubleArray &basePoses,
+                              unsigned int nbThreads)
+{
+    checkDistribution(curvAbsSection, curvAbsFrames);
+    const size_t nbSections = curvAbsSection.size() - 1;
+    const py::ssize_t strainSize = checkStrains(strains, nbSections);
+    const py::ssize_t nbConfigurations = strains.shape(0);
+    const bool onePosePerConfiguration = checkBasePoses(basePoses, nbConfigurations);
+
+    FramesDistribution distribution;
+    computeFramesDistribution(curvAbsSection, curvAbsFrames, distribution);
+    const size_t nbFrames = curvAbsFrames.size();
+
+    DoubleArray frames({nbConfigurations, static_cast<py::ssize_t>(nbFrames), py::ssize_t(7)});
+
+    const double *strainsData = strains.data();
+    const double *posesData = basePoses.data();
+    double *framesData = frames.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallelFor(nbConfigurations, nbThreads, [&](size_t n) {
+            vector<Vec6> k(nbSections);
+            for (size_t j = 0; j < nbSections; ++j)
+                k[j] = readStrain(strainsData + (n * nbSections + j) * strainSize, strainSize);
+
+            const Transform base = toTransform(posesData + (onePosePerConfiguration ? 7 * n : 0));
+            vector<Transform> framesPoses;
+            computeFramesPoses(base, k, distribution, framesPoses);
+            for (size_t i = 0; i < nbFrames; ++i)
+                fromTransform(framesPoses[i], framesData + (n * nbFrames + i) * 7);
+        });
+    }
+    return frames;
+}
+
+DoubleArray framesJacobians(const DoubleArray &strains, const vector<double> &curvAbsSection,
+                            const vector<double> &curvAbsFrames, const DoubleArray &basePoses,
+                            const std::optional<vector<unsigned int>> &frameIndices, unsigned int nbThreads)
+{
+    checkDistribution(curvAbsSection, curvAbsFrames);
+    const size_t nbSections = curvAbsSection.size() - 1;
+    const py::ssize_t strainSize = checkStrains(strains, nbSections);
+    const py::ssize_t nbConfigurations = strains.shape(0);
+    const bool onePosePerConfiguration = checkBasePoses(basePoses, nbConfigurations);
+
+    FramesDistribution distribution;
+    computeFramesDistribution(curvAbsSection, curvAbsFrames, distribution);
+
+    vector<unsigned int> frames;
+    if (frameIndices)
+    {
+        frames = *frameIndices;
+        for (const auto i : frames)
+            if (i >= curvAbsFrames.size())
+                throw py::index_error("frame index " + std::to_string(i) + " out of range");
+    }
+    else
+    {
+        for (unsigned int i = 0; i < curvAbsFrames.size(); ++i)
+            frames.push_back(i);
+    }
+
+    const py::ssize_t nbCols = 6 + static_cast<py::ssize_t>(nbSections) * strainSize;
+    DoubleArray jacobians({nbConfigurations, static_cast<py::ssize_t>(frames.size()), py::ssize_t(6), nbCols});
+
+    const double *strainsData = strains.data();
+    const double *posesData = basePoses.data();
+    double *jacobiansData = jacobians.mutable_data();
+    const size_t jacobiansSize = frames.size() * 6 * nbCols;
+    {
+        py::gil_scoped_release release;
+        parallelFor(nbConfigurations, nbThreads, [&](size_t n) {
+            vector<Vec6> k(nbSections);
+            for (size_t j = 0; j < nbSections; ++j)
+                k[j] = readStrain(strainsData + (n * nbSections + j) * strainSize, strainSize);
+
+            const Transform base = toTransform(posesData + (onePosePerConfiguration ? 7 * n : 0));
+            computeFramesJacobians(base, k, strainSize, distribution, frames, jacobiansData + n * jacobiansSize);
+        });
+    }
+    return jacobians;
+}
+
+} // namespace
+
+void moduleAddCosseratKinematics(py::module &m)
+{
+    m.def("forwardKinematics", &forwardKinematics,
+          py::arg("strains"), py::arg("curv_abs_section"), py::arg("curv_abs_frames"),
+          py::arg("base_poses"), py::arg("nb_threads") = 0,
+          "Poses of the frames of a Cosserat rod for a batch of configurations, without scene.\n"
+          "strains: (N, nbSections, 3|6) strain of each section (angular only when the last dimension is 3).\n"
+          "curv_abs_section: the nbSections + 1 abscissas of the nodes (as curv_abs_input).\n"
+          "curv_abs_frames: the abscissas of the frames (as curv_abs_output).\n"
+          "base_poses: (7,) or (N, 7) pose [x, y, z, qx, qy, qz, qw] of the base.\n"
+          "nb_threads: number of threads, 0 means all the hardware threads.\n"
+          "Returns a (N, nbFrames, 7) array, same convention as the output of DiscreteCosseratMapping.");
+
+    m.def("framesJacobians", &framesJacobians,
+          py::arg("strains"), py::arg("curv_abs_section"), py::arg("curv_abs_frames"),
+          py::arg("base_poses"), py::arg("frame_indices") = py::none(), py::arg("nb_threads") = 0,
+          "Analytic jacobians of the frames velocities for a batch of configurations, without scene.\n"
+          "The arguments are the ones of forwardKinematics, frame_indices selects the frames (all by default).\n"
+          "Returns a (N, nbSelectedFrames, 6, 6 + nbSections * strainSize) array J such that the velocity\n"
+          "[v, w] of a frame (global frame, as DiscreteCosseratMapping.applyJ) is J @ [v_base, w_base, strains_dot].");
+}
+
+}  // namespace sofapython3
@@ -45,6 +45,8 @@ void moduleAddPointsManager(py::module& m) {
 
     c.def("addNewPointToState", &PointsManager::addNewPointToState);
     c.def("removeLastPointfromState", &PointsManager::removeLastPointfromState);
+    c.def("getNbActivePoints", &PointsManager::getNbActivePoints);
+    c.def("setNbActivePoints", &PointsManager::setNbActivePoints);
 }
 
 }  // namespace sofapython3
@@ -20,6 +20,8 @@
 
 #include <pybind11/pybind11.h>
 #include "Binding_PointsManager.h"
+#include "Binding_BaseCosseratMapping.h"
+#include "Binding_CosseratKinematics.h"
 
 
 namespace py { using namespace pybind11; }
@@ -30,6 +32,8 @@ namespace sofapython3
 PYBIND11_MODULE(Cosserat, m)
 {
     moduleAddPointsManager(m);
+    moduleAddBaseCosseratMapping(m);
+    moduleAddCosseratKinematics(m);
 }
 
 } // namespace sofapython3
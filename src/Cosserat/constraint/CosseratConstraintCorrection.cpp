@@ -0,0 +1,35 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#define SOFA_COSSERAT_CPP_CosseratConstraintCorrection
+#include <Cosserat/constraint/CosseratConstraintCorrection.inl>
+
+#include <sofa/core/ObjectFactory.h>
+
+namespace sofa::component::constraintset
+{
+    using namespace sofa::defaulttype;
+
+    // Register in the Factory
+    int CosseratConstraintCorrectionClass = core::RegisterObject("Constraint correction of a quasi-static Cosserat rod, with the compliance of the constraints on the frames built in O(N) from the chain")
+                                   .add< CosseratConstraintCorrection<Vec3Types> >(true);
+    template class SOFA_COSSERAT_API CosseratConstraintCorrection<Vec3Types>;
+} // namespace sofa::component::constraintset
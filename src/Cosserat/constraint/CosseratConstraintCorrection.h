@@ -0,0 +1,107 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/DiscreteCosseratMapping.h>
+#include <Cosserat/forcefield/BeamHookeLawForceField.h>
+
+#include <sofa/core/behavior/ConstraintCorrection.h>
+#include <sofa/core/behavior/OdeSolver.h>
+#include <sofa/core/objectmodel/Link.h>
+
+namespace sofa::component::constraintset
+{
+
+using sofa::core::objectmodel::BaseLink;
+using sofa::core::objectmodel::SingleLink;
+
+/*!
+ * \class CosseratConstraintCorrection
+ * @brief Constraint correction of a Cosserat rod with a fixed base, built from the structure of the chain
+ *
+ * The rod is considered quasi-static: the correction of the strains is dx = C f, C being the block diagonal
+ * compliance of the sections (inverse of the stiffness of BeamHookeLawForceField). The compliance of the
+ * constraints applied on the frames of the DiscreteCosseratMapping is computed with
+ * kinematics::computeFramesCompliance from the exponentials and tangent operators cached by the mapping,
+ * in O(N) plus O(1) per pair of constraint directions, instead of one solve per constraint row with
+ * GenericConstraintCorrection. Constraints acting directly on the strains are handled with J C J^t, as well as
+ * the constraints on the frames when the mapping interpolates the strains (strainInterpolation other than constant).
+ *
+ * The component is placed next to the state of the strains (cosseratCoordinate). The rigid base is not
+ * corrected, it must be fixed or driven.
+ */
+template<class DataTypes>
+class CosseratConstraintCorrection : public sofa::core::behavior::ConstraintCorrection<DataTypes>
+{
+public:
+    SOFA_CLASS(SOFA_TEMPLATE(CosseratConstraintCorrection, DataTypes),
+               SOFA_TEMPLATE(sofa::core::behavior::ConstraintCorrection, DataTypes));
+
+    typedef sofa::core::behavior::ConstraintCorrection<DataTypes> Inherit;
+    typedef typename DataTypes::VecCoord VecCoord;
+    typedef typename DataTypes::VecDeriv VecDeriv;
+    typedef typename DataTypes::Deriv Deriv;
+    typedef typename DataTypes::MatrixDeriv MatrixDeriv;
+    typedef sofa::defaulttype::Rigid3Types Rigid3Types;
+    typedef Cosserat::mapping::DiscreteCosseratMapping<DataTypes, Rigid3Types, Rigid3Types> Mapping;
+    typedef sofa::component::forcefield::BeamHookeLawForceField<DataTypes> HookeLaw;
+    typedef sofa::type::Mat<3, 3, SReal> Mat33;
+
+    SingleLink<CosseratConstraintCorrection<DataTypes>, Mapping, BaseLink::FLAG_STOREPATH | BaseLink::FLAG_STRONGLINK> l_mapping;
+    SingleLink<CosseratConstraintCorrection<DataTypes>, HookeLaw, BaseLink::FLAG_STOREPATH | BaseLink::FLAG_STRONGLINK> l_forceField;
+
+    void init() override;
+
+    void addComplianceInConstraintSpace(const sofa::core::ConstraintParams *cparams,
+                                        sofa::linearalgebra::BaseMatrix *W) override;
+    void getComplianceMatrix(sofa::linearalgebra::BaseMatrix *m) const override;
+
+    void computeMotionCorrection(const sofa::core::ConstraintParams *cparams, sofa::core::MultiVecDerivId dx,
+                                 sofa::core::MultiVecDerivId f) override;
+    void applyMotionCorrection(const sofa::core::ConstraintParams *cparams, Data<VecCoord> &x, Data<VecDeriv> &v,
+                               Data<VecDeriv> &dx, const Data<VecDeriv> &correction) override;
+    void applyPositionCorrection(const sofa::core::ConstraintParams *cparams, Data<VecCoord> &x,
+                                 Data<VecDeriv> &dx, const Data<VecDeriv> &correction) override;
+    void applyVelocityCorrection(const sofa::core::ConstraintParams *cparams, Data<VecDeriv> &v,
+                                 Data<VecDeriv> &dv, const Data<VecDeriv> &correction) override;
+    void applyPredictiveConstraintForce(const sofa::core::ConstraintParams *cparams, Data<VecDeriv> &f,
+                                        const sofa::linearalgebra::BaseVector *lambda) override;
+    void resetContactForce() override {}
+
+protected:
+    CosseratConstraintCorrection();
+
+    sofa::core::behavior::OdeSolver *m_odeSolver{nullptr};
+    /// Compliance of each section, updated in addComplianceInConstraintSpace
+    type::vector<Mat33> m_compliance;
+
+    void updateCompliance();
+    SReal getPositionFactor() const;
+    SReal getVelocityFactor() const;
+};
+
+#if !defined(SOFA_COSSERAT_CPP_CosseratConstraintCorrection)
+extern template class SOFA_COSSERAT_API CosseratConstraintCorrection<sofa::defaulttype::Vec3Types>;
+#endif
+
+} // namespace sofa::component::constraintset
@@ -0,0 +1,296 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+
+#include <Cosserat/constraint/CosseratConstraintCorrection.h>
+#include <Cosserat/mapping/CosseratKinematics.h>
+
+#include <sofa/core/ConstraintParams.h>
+#include <sofa/helper/accessor.h>
+
+#include <map>
+
+namespace sofa::component::constraintset
+{
+
+template<class DataTypes>
+CosseratConstraintCorrection<DataTypes>::CosseratConstraintCorrection()
+    : l_mapping(initLink("mapping", "link to the DiscreteCosseratMapping of the rod, searched in the children nodes by default"))
+    , l_forceField(initLink("forceField", "link to the BeamHookeLawForceField of the strains, searched in the node by default"))
+{
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::init()
+{
+    Inherit::init();
+    this->d_componentState.setValue(core::objectmodel::ComponentState::Invalid);
+
+    if (l_mapping.get() == nullptr)
+        l_mapping.set(this->getContext()->template get<Mapping>(core::objectmodel::BaseContext::SearchDown));
+    if (l_forceField.get() == nullptr)
+        l_forceField.set(this->getContext()->template get<HookeLaw>(core::objectmodel::BaseContext::Local));
+
+    if (l_mapping.get() == nullptr)
+    {
+        msg_error() << "Cannot find the DiscreteCosseratMapping, set the link mapping";
+        return;
+    }
+    if (l_forceField.get() == nullptr)
+    {
+        msg_error() << "Cannot find the BeamHookeLawForceField, set the link forceField";
+        return;
+    }
+
+    m_odeSolver = this->getContext()->template get<core::behavior::OdeSolver>();
+    if (m_odeSolver == nullptr)
+        msg_warning() << "No OdeSolver found, the corrections are not scaled by the integration factors";
+
+    this->d_componentState.setValue(core::objectmodel::ComponentState::Valid);
+}
+
+template<class DataTypes>
+SReal CosseratConstraintCorrection<DataTypes>::getPositionFactor() const
+{
+    return m_odeSolver ? m_odeSolver->getPositionIntegrationFactor() : 1.0;
+}
+
+template<class DataTypes>
+SReal CosseratConstraintCorrection<DataTypes>::getVelocityFactor() const
+{
+    return m_odeSolver ? m_odeSolver->getVelocityIntegrationFactor() : 1.0;
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::updateCompliance()
+{
+    const std::size_t nbSections = this->getMState()->getSize();
+    m_compliance.resize(nbSections);
+    for (std::size_t s = 0; s < nbSections; ++s)
+    {
+        if (!m_compliance[s].invert(l_forceField->getSectionStiffness(s)))
+        {
+            msg_error() << "The stiffness of the section " << s << " is singular";
+            m_compliance[s].clear();
+        }
+    }
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::addComplianceInConstraintSpace(const core::ConstraintParams *cparams,
+                                                                             linearalgebra::BaseMatrix *W)
+{
+    if (this->d_componentState.getValue() != core::objectmodel::ComponentState::Valid)
+        return;
+    updateCompliance();
+
+    // W is the displacement of the constraints for a unit force, scaled for the velocity constraints
+    SReal factor = 1.0;
+    if (cparams->constOrder() == core::ConstraintOrder::VEL || cparams->constOrder() == core::ConstraintOrder::ACC)
+        factor = getVelocityFactor() / getPositionFactor();
+
+    // Constraints applied on the frames of the mapping
+    using Cosserat::kinematics::FrameConstraintEntry;
+    Mapping *mapping = l_mapping.get();
+    const auto *frames = mapping->getToModels()[0];
+    const std::size_t nbSections = m_compliance.size();
+    const std::size_t nbFrames = frames->getSize();
+    // computeFramesCompliance assumes piecewise constant strains, with a Magnus interpolation the frame constraints
+    // are handled with the rows mapped on the strains
+    const bool cacheIsValid = mapping->getStrainInterpolation() == Cosserat::kinematics::StrainInterpolation::Constant &&
+                              mapping->m_nodesExponentialSE3Vectors.size() == nbSections + 1 &&
+                              mapping->m_nodesTangExpVectors.size() == nbSections + 1 &&
+                              mapping->m_framesExponentialSE3Vectors.size() == nbFrames &&
+                              mapping->m_framesTangExpVectors.size() == nbFrames &&
+                              mapping->m_indicesVectors.size() == nbFrames;
+
+    std::map<unsigned int, std::size_t> frameRowIds;
+    type::vector<unsigned int> frameRowIndices;
+    type::vector<type::vector<FrameConstraintEntry>> frameRows;
+    if (cacheIsValid)
+    {
+        const auto &framesConstraints = cparams->readJ(frames)->getValue();
+        for (auto rowIt = framesConstraints.begin(); rowIt != framesConstraints.end(); ++rowIt)
+        {
+            type::vector<FrameConstraintEntry> entries;
+            for (auto colIt = rowIt.begin(); colIt != rowIt.end(); ++colIt)
+            {
+                const auto &d = colIt.val();
+                entries.push_back({static_cast<unsigned int>(colIt.index()),
+                                   type::Vec6(d.getVCenter()[0], d.getVCenter()[1], d.getVCenter()[2],
+                                              d.getVOrientation()[0], d.getVOrientation()[1], d.getVOrientation()[2])});
+            }
+            frameRowIds[rowIt.index()] = frameRows.size();
+            frameRowIndices.push_back(rowIt.index());
+            frameRows.push_back(entries);
+        }
+    }
+
+    if (!frameRows.empty())
+    {
+        // The mapping caches have a leading identity (resp. null) entry for the base node
+        const auto &baseCoord = mapping->getFromModels2()[0]->read(core::ConstVecCoordId::position())->getValue()
+                                [mapping->d_baseIndex.getValue()];
+        const Cosserat::type::Transform base(baseCoord.getCenter(), baseCoord.getOrientation());
+        const type::vector<Cosserat::type::Transform> sectionsExponential(
+                mapping->m_nodesExponentialSE3Vectors.begin() + 1, mapping->m_nodesExponentialSE3Vectors.end());
+        const type::vector<type::Mat6x6> sectionsTangExp(mapping->m_nodesTangExpVectors.begin() + 1,
+                                                         mapping->m_nodesTangExpVectors.end());
+
+        const std::size_t nbRows = frameRows.size();
+        type::vector<double> compliance(nbRows * nbRows);
+        Cosserat::kinematics::computeFramesCompliance(base, sectionsExponential, sectionsTangExp,
+                                                      mapping->m_indicesVectors, mapping->m_framesExponentialSE3Vectors,
+                                                      mapping->m_framesTangExpVectors, m_compliance, frameRows, compliance.data());
+        for (std::size_t r1 = 0; r1 < nbRows; ++r1)
+            for (std::size_t r2 = 0; r2 < nbRows; ++r2)
+                W->add(frameRowIndices[r1], frameRowIndices[r2], factor * compliance[r1 * nbRows + r2]);
+    }
+
+    // Constraints acting directly on the strains: J C J^t with their rows of J
+    const MatrixDeriv &constraints = cparams->readJ(this->getMState())->getValue();
+    for (auto rowIt = constraints.begin(); rowIt != constraints.end(); ++rowIt)
+    {
+        if (frameRowIds.count(rowIt.index()))
+            continue;
+
+        VecDeriv displacement(nbSections, Deriv());
+        for (auto colIt = rowIt.begin(); colIt != rowIt.end(); ++colIt)
+            displacement[colIt.index()] += m_compliance[colIt.index()] * colIt.val();
+
+        for (auto rowIt2 = constraints.begin(); rowIt2 != constraints.end(); ++rowIt2)
+        {
+            SReal value = 0.0;
+            for (auto colIt = rowIt2.begin(); colIt != rowIt2.end(); ++colIt)
+                value += colIt.val() * displacement[colIt.index()];
+            W->add(rowIt.index(), rowIt2.index(), factor * value);
+            if (frameRowIds.count(rowIt2.index()))
+                W->add(rowIt2.index(), rowIt.index(), factor * value);
+        }
+    }
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::getComplianceMatrix(linearalgebra::BaseMatrix *m) const
+{
+    const std::size_t nbSections = m_compliance.size();
+    m->resize(3 * nbSections, 3 * nbSections);
+    for (std::size_t s = 0; s < nbSections; ++s)
+        for (unsigned int i = 0; i < 3; ++i)
+            for (unsigned int j = 0; j < 3; ++j)
+                m->set(3 * s + i, 3 * s + j, m_compliance[s][i][j]);
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::computeMotionCorrection(const core::ConstraintParams * /*cparams*/,
+                                                                      core::MultiVecDerivId dx,
+                                                                      core::MultiVecDerivId f)
+{
+    auto writeDx = sofa::helper::getWriteAccessor(*dx[this->getMState()].write());
+    const VecDeriv &force = f[this->getMState()].read()->getValue();
+
+    // applyMotionCorrection multiplies the correction by the position factor
+    const SReal positionFactor = getPositionFactor();
+    writeDx.resize(force.size());
+    for (std::size_t s = 0; s < force.size() && s < m_compliance.size(); ++s)
+        writeDx[s] = m_compliance[s] * force[s] / positionFactor;
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::applyMotionCorrection(const core::ConstraintParams *cparams,
+                                                                    Data<VecCoord> &x_d, Data<VecDeriv> &v_d,
+                                                                    Data<VecDeriv> &dx_d,
+                                                                    const Data<VecDeriv> &correction_d)
+{
+    auto x = sofa::helper::getWriteAccessor(x_d);
+    auto v = sofa::helper::getWriteAccessor(v_d);
+    auto dx = sofa::helper::getWriteAccessor(dx_d);
+    const VecDeriv &correction = correction_d.getValue();
+    const VecCoord &x_free = cparams->readX(this->getMState())->getValue();
+    const VecDeriv &v_free = cparams->readV(this->getMState())->getValue();
+
+    const SReal positionFactor = getPositionFactor();
+    const SReal velocityFactor = getVelocityFactor();
+    for (std::size_t i = 0; i < dx.size(); i++)
+    {
+        const Deriv dxi = correction[i] * positionFactor;
+        x[i] = x_free[i] + dxi;
+        v[i] = v_free[i] + correction[i] * velocityFactor;
+        dx[i] = dxi;
+    }
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::applyPositionCorrection(const core::ConstraintParams *cparams,
+                                                                      Data<VecCoord> &x_d, Data<VecDeriv> &dx_d,
+                                                                      const Data<VecDeriv> &correction_d)
+{
+    auto x = sofa::helper::getWriteAccessor(x_d);
+    auto dx = sofa::helper::getWriteAccessor(dx_d);
+    const VecDeriv &correction = correction_d.getValue();
+    const VecCoord &x_free = cparams->readX(this->getMState())->getValue();
+
+    const SReal positionFactor = getPositionFactor();
+    for (std::size_t i = 0; i < dx.size(); i++)
+    {
+        dx[i] = correction[i] * positionFactor;
+        x[i] = x_free[i] + dx[i];
+    }
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::applyVelocityCorrection(const core::ConstraintParams *cparams,
+                                                                      Data<VecDeriv> &v_d, Data<VecDeriv> &dv_d,
+                                                                      const Data<VecDeriv> &correction_d)
+{
+    auto v = sofa::helper::getWriteAccessor(v_d);
+    auto dv = sofa::helper::getWriteAccessor(dv_d);
+    const VecDeriv &correction = correction_d.getValue();
+    const VecDeriv &v_free = cparams->readV(this->getMState())->getValue();
+
+    const SReal velocityFactor = getVelocityFactor();
+    for (std::size_t i = 0; i < dv.size(); i++)
+    {
+        dv[i] = correction[i] * velocityFactor;
+        v[i] = v_free[i] + dv[i];
+    }
+}
+
+template<class DataTypes>
+void CosseratConstraintCorrection<DataTypes>::applyPredictiveConstraintForce(const core::ConstraintParams *cparams,
+                                                                             Data<VecDeriv> &f_d,
+                                                                             const linearalgebra::BaseVector *lambda)
+{
+    auto force = sofa::helper::getWriteAccessor(f_d);
+    const MatrixDeriv &constraints = cparams->readJ(this->getMState())->getValue();
+    force.resize(this->getMState()->getSize());
+    for (auto rowIt = constraints.begin(); rowIt != constraints.end(); ++rowIt)
+    {
+        const SReal value = lambda->element(rowIt.index());
+        if (value == 0.0)
+            continue;
+        for (auto colIt = rowIt.begin(); colIt != rowIt.end(); ++colIt)
+            force[colIt.index()] += colIt.val() * value;
+    }
+}
+
+} // namespace sofa::component::constraintset
@@ -123,6 +123,9 @@ namespace sofa::component::constraintset
         Data<unsigned int> d_valueIndex;
         Data<helper::OptionsGroup> d_valueType;
         Data<type::Vec<3, bool>> d_useDirections;
+        /// Activity mask of the constrained points (e.g. linked to PointsManager.activePoints),
+        /// inactive points do not create constraint lines. Empty means all points are active.
+        Data<type::vector<bool>> d_activePoints;
         // displacement = the constraint will impose the displacement provided in data d_inputValue[d_iputIndex]
         // force = the constraint will impose the force provided in data d_inputValue[d_iputIndex]
 
@@ -139,6 +142,11 @@ namespace sofa::component::constraintset
         using Constraint<DataTypes>::m_constraintIndex ;
 
         void internalInit();
+
+        bool isActive(const type::vector<bool> &mask, unsigned int i) const
+        {
+            return mask.empty() || (i < mask.size() && mask[i]);
+        }
     };
 
     // Declares template as extern to avoid the code generation of the template for
@@ -62,7 +62,10 @@ namespace sofa::component::constraintset
                              "displacement = the contstraint will impose the displacement provided in data value[valueIndex] \n"
                              "force = the contstraint will impose the force provided in data value[valueIndex] \n"
                              "If unspecified, the default value is displacement")),
-        d_useDirections(initData(&d_useDirections, type::Vec<3, bool>(0, 1, 1), "useDirections", "Directions to constrain.\n"))
+        d_useDirections(initData(&d_useDirections, type::Vec<3, bool>(0, 1, 1), "useDirections", "Directions to constrain.\n")),
+        d_activePoints(initData(&d_activePoints, "activePoints",
+                                "Activity mask of the points, inactive points are not constrained.\n"
+                                "If unspecified, all the points are constrained"))
   {}
 
   template <class DataTypes>
@@ -116,9 +119,12 @@ namespace sofa::component::constraintset
     m_constraintIndex.setValue(cIndex);
 
     type::Vec<3, bool> use = d_useDirections.getValue();
+    const type::vector<bool> &active = d_activePoints.getValue();
 
     for (unsigned int i = 0; i < positions.size(); i++)
     {
+      if (!isActive(active, i))
+        continue;
       if (use[1])
       {
         MatrixDerivRowIterator c_it = matrix.writeLine(cIndex++);
@@ -151,21 +157,21 @@ namespace sofa::component::constraintset
     //ReadAccessor<Data<VecCoord>> positions = this->mstate->readPositions();
     const VecCoord positions = x.getValue();
     type::Vec<3, bool> use = d_useDirections.getValue();
-    const auto& constraintIndex = sofa::helper::getReadAccessor(m_constraintIndex);
+    const type::vector<bool> &active = d_activePoints.getValue();
+    unsigned int line = m_constraintIndex.getValue();
 
+    // The lines follow the same order as in buildConstraintMatrix
     for (unsigned int i = 0; i < positions.size(); i++)
     {
-      if (use[0]){
-        Real dfree0 = positions[i][0];
-        resV->set(constraintIndex + 2 * i, dfree0);
-      }
+      if (!isActive(active, i))
+        continue;
       if (use[1]){
         Real dfree1 = positions[i][1];
-        resV->set(constraintIndex + 2 * i, dfree1);
+        resV->set(line++, dfree1);
       }
       if (use[2]){
         Real dfree2 = positions[i][2];
-        resV->set(constraintIndex + 2 * i + 1, dfree2);
+        resV->set(line++, dfree2);
       }
     }
   }
@@ -177,8 +183,11 @@ namespace sofa::component::constraintset
   {
     ReadAccessor<Data<VecCoord>> positions = this->mstate->readPositions();
     type::Vec<3, bool> use = d_useDirections.getValue();
+    const type::vector<bool> &active = d_activePoints.getValue();
     for (size_t i = 0; i < positions.size(); i++)
     {
+      if (!isActive(active, i))
+        continue;
       if (use[1])
         resTab[offset++] = new BilateralConstraintResolution();
       if (use[2])
@@ -0,0 +1,98 @@
+/******************************************************************************
+ *               SOFA, Simulation Open-Framework Architecture                  *
+ *                (c) 2020 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This library is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This library is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this library; if not, write to the Free Software Foundation,     *
+ * Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA.          *
+ *******************************************************************************
+ *                      Plugin Cosserat v1.0                                   *
+ *                                                                             *
+ * This plugin is also distributed under the GNU LGPL (Lesser General          *
+ * Public License) license with the same conditions than SOFA.                 *
+ *                                                                             *
+ * Contributors: Defrost team  (INRIA, University of Lille, CNRS,              *
+ *               Ecole Centrale de Lille)                                      *
+ *                                                                             *
+ * Contact information: https://project.inria.fr/softrobot/contact/            *
+ *                     adagolodjo@protonmail.com                               *
+ ******************************************************************************/
+#pragma once
+
+#include <Cosserat/config.h>
+#include <Cosserat/engine/PointsManager.h>
+#include <sofa/core/objectmodel/BaseObject.h>
+#include <sofa/core/objectmodel/BaseContext.h>
+#include <sofa/core/objectmodel/Link.h>
+#include <sofa/component/collision/response/contact/ContactListener.h>
+
+namespace sofa::core::behavior
+{
+
+    /**
+     * Handles the insertion of a needle in a volume at the end of each time step:
+     *  - while the needle is outside, the puncture happens when the normal contact force is larger than entryForce,
+     *    the contact point is stored as entry point, the needle collision node is deactivated and the first
+     *    constraint point is created,
+     *  - while the needle is inside, a constraint point is added (resp. removed) through the PointsManager each
+     *    time the needle tip moves forward (resp. backward) by more than constraintDistance along x. Removing the
+     *    last point takes the needle out of the volume and re-activates the collision node.
+     * This is the native version of the python controller cosserat/needle/needleController.py.
+     */
+    class SOFA_COSSERAT_API NeedleInsertionController : public sofa::core::objectmodel::BaseObject
+    {
+    public:
+        SOFA_CLASS(NeedleInsertionController, sofa::core::objectmodel::BaseObject);
+
+        typedef sofa::defaulttype::Vec3dTypes DataTypes;
+        typedef DataTypes::VecCoord VecCoord;
+        typedef DataTypes::Coord Coord;
+        typedef DataTypes::Real Real;
+        typedef type::Vec3 Vec3;
+        typedef sofa::component::collision::response::contact::ContactListener ContactListener;
+
+    public:
+        NeedleInsertionController();
+
+        /// Same parameters as the python ConstraintsParams
+        Data<Real> d_constraintDistance;
+        Data<Real> d_entryForce;
+
+        /// Outputs
+        Data<bool> d_inside;
+        Data<Vec3> d_entryPoint;
+        Data<Vec3> d_tipForce;
+
+        SingleLink<NeedleInsertionController, PointsManager, BaseLink::FLAG_STOREPATH | BaseLink::FLAG_STRONGLINK> l_pointsManager;
+        SingleLink<NeedleInsertionController, ContactListener, BaseLink::FLAG_STOREPATH | BaseLink::FLAG_STRONGLINK> l_contactListener;
+        SingleLink<NeedleInsertionController, core::objectmodel::BaseObject, BaseLink::FLAG_STOREPATH | BaseLink::FLAG_STRONGLINK> l_constraintSolver;
+        SingleLink<NeedleInsertionController, MechanicalState<DataTypes>, BaseLink::FLAG_STOREPATH | BaseLink::FLAG_STRONGLINK> l_slidingState;
+        SingleLink<NeedleInsertionController, core::objectmodel::BaseContext, BaseLink::FLAG_STOREPATH> l_needleCollisionNode;
+
+        void init() override;
+        void reset() override;
+        void handleEvent(sofa::core::objectmodel::Event *event) override;
+
+        /// One step of the insertion logic, called on AnimateEndEvent
+        void updateInsertion();
+
+    protected:
+        Data<type::vector<SReal>> *m_constraintForces;
+        Data<bool> *m_computeConstraintForces;
+
+        void puncture(const Vec3 &entryPoint, const type::vector<SReal> &forces);
+        void exitVolume();
+        void setCollisionActivated(bool activated);
+    };
+
+} // namespace sofa::core::behavior
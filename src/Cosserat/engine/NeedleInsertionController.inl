@@ -0,0 +1,199 @@
+/******************************************************************************
+ *               SOFA, Simulation Open-Framework Architecture                  *
+ *                (c) 2020 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This library is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This library is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this library; if not, write to the Free Software Foundation,     *
+ * Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA.          *
+ *******************************************************************************
+ *                      Plugin Cosserat v1.0                                   *
+ *                                                                             *
+ * This plugin is also distributed under the GNU LGPL (Lesser General          *
+ * Public License) license with the same conditions than SOFA.                 *
+ *                                                                             *
+ * Contributors: Defrost team  (INRIA, University of Lille, CNRS,              *
+ *               Ecole Centrale de Lille)                                      *
+ *                                                                             *
+ * Contact information: https://project.inria.fr/softrobot/contact/            *
+ *                     adagolodjo@protonmail.com                               *
+ ******************************************************************************/
+#pragma once
+
+#include "NeedleInsertionController.h"
+#include <sofa/simulation/AnimateEndEvent.h>
+
+namespace sofa::core::behavior
+{
+
+    NeedleInsertionController::NeedleInsertionController()
+        : d_constraintDistance(initData(&d_constraintDistance, Real(1.3), "constraintDistance",
+                                        "Distance along x between two constraint points")),
+          d_entryForce(initData(&d_entryForce, Real(3.0), "entryForce",
+                                "The normal contact force required to penetrate the volume")),
+          d_inside(initData(&d_inside, false, "inside", "True when the needle is inside the volume (output)")),
+          d_entryPoint(initData(&d_entryPoint, Vec3(0, 0, 0), "entryPoint", "The puncture point (output)")),
+          d_tipForce(initData(&d_tipForce, Vec3(0, 0, 0), "tipForce", "The contact force at puncture (output)")),
+          l_pointsManager(initLink("pointsManager", "link to the PointsManager of the constraint points")),
+          l_contactListener(initLink("contactListener", "link to the ContactListener between the needle and the volume")),
+          l_constraintSolver(initLink("constraintSolver", "link to the constraint solver, its data computeConstraintForces must be true")),
+          l_slidingState(initLink("slidingState", "link to the state of the points sliding on the needle, the last one is the tip")),
+          l_needleCollisionNode(initLink("needleCollisionNode", "link to the node of the needle collision model, deactivated during the insertion")),
+          m_constraintForces(nullptr), m_computeConstraintForces(nullptr)
+    {
+        d_inside.setReadOnly(true);
+        d_entryPoint.setReadOnly(true);
+        d_tipForce.setReadOnly(true);
+        this->f_listening.setValue(true);
+    }
+
+    void NeedleInsertionController::init()
+    {
+        Inherit1::init();
+        d_componentState.setValue(core::objectmodel::ComponentState::Invalid);
+
+        if (l_pointsManager.get() == nullptr)
+        {
+            msg_error() << "Cannot find the PointsManager, set the link pointsManager";
+            return;
+        }
+        if (l_contactListener.get() == nullptr)
+        {
+            msg_error() << "Cannot find the ContactListener, set the link contactListener";
+            return;
+        }
+        if (l_slidingState.get() == nullptr)
+        {
+            msg_error() << "Cannot find the sliding state, set the link slidingState";
+            return;
+        }
+        if (l_constraintSolver.get() == nullptr)
+        {
+            msg_error() << "Cannot find the constraint solver, set the link constraintSolver";
+            return;
+        }
+
+        m_constraintForces = dynamic_cast<Data<type::vector<SReal>> *>(l_constraintSolver->findData("constraintForces"));
+        m_computeConstraintForces = dynamic_cast<Data<bool> *>(l_constraintSolver->findData("computeConstraintForces"));
+        if (m_constraintForces == nullptr)
+        {
+            msg_error() << "The constraint solver " << l_constraintSolver->getName() << " does not provide constraintForces";
+            return;
+        }
+        if (m_computeConstraintForces && !m_computeConstraintForces->getValue())
+            msg_warning() << "computeConstraintForces is false in " << l_constraintSolver->getName() << ", it is activated.";
+        if (m_computeConstraintForces)
+            m_computeConstraintForces->setValue(true);
+
+        if (l_needleCollisionNode.get() == nullptr)
+            msg_warning() << "No needleCollisionNode given, the needle collision stays active during the insertion";
+
+        d_componentState.setValue(core::objectmodel::ComponentState::Valid);
+    }
+
+    void NeedleInsertionController::reset()
+    {
+        d_inside.setValue(false);
+        d_entryPoint.setValue(Vec3(0, 0, 0));
+        d_tipForce.setValue(Vec3(0, 0, 0));
+        setCollisionActivated(true);
+    }
+
+    void NeedleInsertionController::setCollisionActivated(bool activated)
+    {
+        if (l_needleCollisionNode.get())
+            l_needleCollisionNode->setActive(activated);
+    }
+
+    void NeedleInsertionController::puncture(const Vec3 &entryPoint, const type::vector<SReal> &forces)
+    {
+        // 1. Save the entry point and the contact force
+        d_entryPoint.setValue(entryPoint);
+        Vec3 tipForce(0, 0, 0);
+        for (unsigned int i = 0; i < 3 && i < forces.size(); i++)
+            tipForce[i] = forces[i];
+        d_tipForce.setValue(tipForce);
+
+        // 2. Deactivate the contact constraint
+        setCollisionActivated(false);
+
+        // 3. The entry point is the first constraint point in the volume
+        l_pointsManager->addNewPointToState();
+        d_inside.setValue(true);
+        msg_info() << "The needle entered the volume at " << entryPoint;
+    }
+
+    void NeedleInsertionController::exitVolume()
+    {
+        d_inside.setValue(false);
+        setCollisionActivated(true);
+        if (m_computeConstraintForces)
+            m_computeConstraintForces->setValue(true);
+        d_tipForce.setValue(Vec3(0, 0, 0));
+        l_pointsManager->removeLastPointfromState();
+        msg_info() << "The needle left the volume";
+    }
+
+    void NeedleInsertionController::updateInsertion()
+    {
+        if (d_componentState.getValue() != core::objectmodel::ComponentState::Valid)
+            return;
+
+        const bool inside = d_inside.getValue();
+        const auto contacts = l_contactListener->getContactPoints();
+
+        if (!contacts.empty() && !inside)
+        {
+            // Check if the contact force is large enough to go through the tissue
+            const type::vector<SReal> &forces = m_constraintForces->getValue();
+            if (!forces.empty() && forces[0] > d_entryForce.getValue())
+                puncture(std::get<1>(contacts[0]), forces);
+        }
+        else if (inside)
+        {
+            const helper::ReadAccessor<Data<VecCoord>> slidingPos = l_slidingState->readPositions();
+            const helper::ReadAccessor<Data<VecCoord>> constraintPos = l_pointsManager->getMstate()->readPositions();
+            const unsigned int nbActivePoints = l_pointsManager->getNbActivePoints();
+            if (slidingPos.empty() || nbActivePoints == 0 || constraintPos.size() < nbActivePoints)
+                return;
+
+            // Compare the needle tip with the last constraint point along x
+            const Coord &tip = slidingPos[slidingPos.size() - 1];
+            const Coord &last = constraintPos[nbActivePoints - 1];
+            const Real distance = (tip - last).norm();
+            const Real constraintDistance = d_constraintDistance.getValue();
+
+            if (tip[0] > last[0])
+            {
+                // Add a constraint point when going forwards
+                if (distance > constraintDistance)
+                    l_pointsManager->addNewPointToState();
+            }
+            else if (tip[0] < last[0] && distance > 0)
+            {
+                // If last constraint, remove the entry point and get out from the volume
+                if (nbActivePoints == 1)
+                    exitVolume();
+                // Remove the previous constraint point when going backwards
+                else if (distance > constraintDistance)
+                    l_pointsManager->removeLastPointfromState();
+            }
+        }
+    }
+
+    void NeedleInsertionController::handleEvent(sofa::core::objectmodel::Event *event)
+    {
+        if (simulation::AnimateEndEvent::checkEventType(event))
+            updateInsertion();
+    }
+
+} // namespace sofa::core::behavior
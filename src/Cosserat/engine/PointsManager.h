@@ -14,6 +14,7 @@
 #include <sofa/helper/AdvancedTimer.h>
 // #include <sofa/gl/template.h>
 #include <sofa/core/behavior/Constraint.h>
+#include <sofa/core/BaseMapping.h>
 
 typedef sofa::component::topology::container::dynamic::PointSetTopologyModifier PointSetTopologyModifier;
 
@@ -40,8 +41,14 @@ namespace sofa::core::behavior
         Data<type::Vec4f> d_color;
         Data<std::string> d_beamPath;
 
+        /// Pooled mode: when poolSize > 0 the state is allocated once at init with poolSize points
+        /// and adding/removing a point only toggles its entry in activePoints (no topology change).
+        Data<unsigned int> d_poolSize;
+        Data<type::vector<bool>> d_activePoints;
+
         PointSetTopologyModifier *m_modifier;
         core::behavior::MechanicalState<DataTypes> *m_beam;
+        core::BaseMapping *m_mapping;
 
         void init() override;
         void handleEvent(sofa::core::objectmodel::Event *event) override;
@@ -50,6 +57,12 @@ namespace sofa::core::behavior
         void addNewPointToState();
         void removeLastPointfromState();
 
+        bool isPooled() const { return d_poolSize.getValue() > 0; }
+        unsigned int getNbActivePoints();
+        /// Adds or removes the last points until nbPoints are active, e.g. to restore a checkpoint (the positions
+        /// of the added points are then set by the caller)
+        void setNbActivePoints(unsigned int nbPoints);
+
         topology::TopologyContainer *getTopology()
         {
             return dynamic_cast<topology::TopologyContainer *>(getContext()->getTopology());
@@ -59,6 +72,13 @@ namespace sofa::core::behavior
         {
             return dynamic_cast<sofa::core::behavior::MechanicalState<DataTypes> *>(getContext()->getMechanicalState());
         }
+
+    protected:
+        unsigned int m_nbActivePoints;
+
+        void allocatePool();
+        void activateNextPoint();
+        void deactivateLastPoint();
     };
 
 } // namespace sofa
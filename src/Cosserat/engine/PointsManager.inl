@@ -13,8 +13,15 @@ namespace sofa::core::behavior
         : d_beamTip(initData(&d_beamTip, "beamTip", "The beam tip")),
           d_radius(initData(&d_radius, double(1), "radius", "sphere radius")),
           d_color(initData(&d_color, type::Vec4f(1, 0, 0, 1), "color", "Default color is (1,0,0,1)")),
-          d_beamPath(initData(&d_beamPath, "beamPath", "path to beam state"))
+          d_beamPath(initData(&d_beamPath, "beamPath", "path to beam state")),
+          d_poolSize(initData(&d_poolSize, (unsigned int)0, "poolSize",
+                              "Number of points preallocated in the state. If 0 (default), points are added and removed \n"
+                              "through the topology modifier, otherwise they are taken from a fixed-size pool")),
+          d_activePoints(initData(&d_activePoints, "activePoints",
+                                  "Activity mask of the points of the pool (output). Empty when the pool is not used")),
+          m_modifier(nullptr), m_beam(nullptr), m_mapping(nullptr), m_nbActivePoints(0)
     {
+        d_activePoints.setReadOnly(true);
         this->f_listening.setValue(true);
     }
 
@@ -38,10 +45,137 @@ namespace sofa::core::behavior
             msg_error() << " Error cannot find the EdgeSetTopologyModifier";
             return;
         }
+
+        /// The mapping (if any) placing the points in the volume, it is re-bound when a pool point is activated
+        this->getContext()->get(m_mapping, core::objectmodel::BaseContext::Local);
+
+        if (isPooled())
+            allocatePool();
+    }
+
+    void PointsManager::allocatePool()
+    {
+        const unsigned int poolSize = d_poolSize.getValue();
+        unsigned nbPoints = this->getTopology()->getNbPoints();
+        if (nbPoints != 0)
+            msg_warning() << "The state already contains " << nbPoints << " points, they are replaced by the pool";
+
+        {
+            helper::WriteAccessor<Data<VecCoord>> x = *this->getMstate()->write(core::VecCoordId::position());
+            helper::WriteAccessor<Data<VecCoord>> xRest = *this->getMstate()->write(core::VecCoordId::restPosition());
+            helper::WriteAccessor<Data<VecCoord>> xfree = *this->getMstate()->write(core::VecCoordId::freePosition());
+            helper::WriteAccessor<Data<VecCoord>> xforce = *this->getMstate()->write(core::VecDerivId::force());
+
+            /// This is the only topological change of the pooled mode
+            if (nbPoints < poolSize)
+                m_modifier->addPoints(poolSize - nbPoints, true);
+
+            Vec3 pos(0, 0, 0);
+            const helper::ReadAccessor<Data<VecCoord>> &beam = m_beam->readPositions();
+            if (beam.size())
+                pos = beam[beam.size() - 1];
+
+            x.resize(poolSize);
+            xRest.resize(poolSize);
+            xfree.resize(poolSize);
+            xforce.resize(poolSize);
+            for (unsigned int i = 0; i < poolSize; i++)
+            {
+                x[i] = pos;
+                xRest[i] = pos;
+                xfree[i] = pos;
+                xforce[i] = Vec3(0, 0, 0);
+            }
+            m_modifier->notifyEndingEvent();
+        }
+
+        helper::WriteOnlyAccessor<Data<type::vector<bool>>> active = d_activePoints;
+        active.clear();
+        active.resize(poolSize, false);
+        m_nbActivePoints = 0;
+    }
+
+    unsigned int PointsManager::getNbActivePoints()
+    {
+        if (isPooled())
+            return m_nbActivePoints;
+        return this->getTopology()->getNbPoints();
+    }
+
+    void PointsManager::setNbActivePoints(unsigned int nbPoints)
+    {
+        if (isPooled())
+        {
+            if (nbPoints > d_poolSize.getValue())
+            {
+                msg_error() << "Cannot activate " << nbPoints << " points in a pool of " << d_poolSize.getValue();
+                return;
+            }
+            helper::WriteAccessor<Data<type::vector<bool>>> active = d_activePoints;
+            for (unsigned int i = 0; i < active.size(); i++)
+                active[i] = i < nbPoints;
+            m_nbActivePoints = nbPoints;
+            if (m_mapping)
+                m_mapping->reinit();
+            return;
+        }
+
+        while (getNbActivePoints() < nbPoints)
+            addNewPointToState();
+        while (getNbActivePoints() > nbPoints)
+            removeLastPointfromState();
+    }
+
+    void PointsManager::activateNextPoint()
+    {
+        if (m_nbActivePoints >= d_activePoints.getValue().size())
+        {
+            msg_warning() << "The pool of " << d_poolSize.getValue() << " points is full, increase poolSize";
+            return;
+        }
+
+        {
+            helper::WriteAccessor<Data<VecCoord>> x = *this->getMstate()->write(core::VecCoordId::position());
+            helper::WriteAccessor<Data<VecCoord>> xRest = *this->getMstate()->write(core::VecCoordId::restPosition());
+            helper::WriteAccessor<Data<VecCoord>> xfree = *this->getMstate()->write(core::VecCoordId::freePosition());
+            helper::WriteAccessor<Data<VecCoord>> xforce = *this->getMstate()->write(core::VecDerivId::force());
+            const helper::ReadAccessor<Data<VecCoord>> &beam = m_beam->readPositions();
+
+            Vec3 pos = beam[beam.size() - 1];
+            x[m_nbActivePoints] = pos;
+            xRest[m_nbActivePoints] = pos;
+            xfree[m_nbActivePoints] = pos;
+            xforce[m_nbActivePoints] = Vec3(0, 0, 0);
+        }
+        helper::WriteAccessor<Data<type::vector<bool>>> active = d_activePoints;
+        active[m_nbActivePoints] = true;
+        m_nbActivePoints++;
+
+        /// bind the point at its new position (e.g. barycentric coefficients in the volume)
+        if (m_mapping)
+            m_mapping->reinit();
+    }
+
+    void PointsManager::deactivateLastPoint()
+    {
+        if (m_nbActivePoints == 0)
+        {
+            msg_error() << "Error cannot remove the last point because there is no active point in the pool";
+            return;
+        }
+        m_nbActivePoints--;
+        helper::WriteAccessor<Data<type::vector<bool>>> active = d_activePoints;
+        active[m_nbActivePoints] = false;
     }
 
     void PointsManager::addNewPointToState()
     {
+        if (isPooled())
+        {
+            activateNextPoint();
+            return;
+        }
+
         helper::WriteAccessor<Data<VecCoord>> x = *this->getMstate()->write(core::VecCoordId::position());
         helper::WriteAccessor<Data<VecCoord>> xRest = *this->getMstate()->write(core::VecCoordId::restPosition());
         helper::WriteAccessor<Data<VecCoord>> xfree = *this->getMstate()->write(core::VecCoordId::freePosition());
@@ -74,6 +208,12 @@ namespace sofa::core::behavior
 
     void PointsManager::removeLastPointfromState()
     {
+        if (isPooled())
+        {
+            deactivateLastPoint();
+            return;
+        }
+
         helper::WriteAccessor<Data<VecCoord>> x = *this->getMstate()->write(core::VecCoordId::position());
         helper::WriteAccessor<Data<VecCoord>> xfree = *this->getMstate()->write(core::VecCoordId::freePosition());
         unsigned nbPoints = this->getTopology()->getNbPoints(); // do not take the last point because there is a bug
@@ -115,6 +115,8 @@ public :
     ////////////////////////////////////////////////////////////////////////////
 
     Real getRadius();
+    /// Bending and torsion stiffness K L of the section n, the block added by addKToMatrix (Vec3Types)
+    Mat33 getSectionStiffness(unsigned int n) const;
 
 protected:
     Data<helper::OptionsGroup>   d_crossSectionShape;
@@ -288,4 +288,13 @@ typename BeamHookeLawForceField<DataTypes>::Real BeamHookeLawForceField<DataType
     return d_radius.getValue();
 }
 
+template<typename DataTypes>
+typename BeamHookeLawForceField<DataTypes>::Mat33 BeamHookeLawForceField<DataTypes>::getSectionStiffness(unsigned int n) const
+{
+    const Real length = d_length.getValue()[n];
+    if (d_variantSections.getValue())
+        return m_K_sectionList[n] * length;
+    return m_K_section * length;
+}
+
 } // forcefield
@@ -22,8 +22,10 @@
 #pragma once
 #include <Cosserat/config.h>
 #include <Cosserat/types.h>
+#include <Cosserat/mapping/CosseratKinematics.h>
 
 #include <sofa/core/Multi2Mapping.h>
+#include <sofa/helper/OptionsGroup.h>
 
 namespace Cosserat::mapping
 {
@@ -108,6 +110,10 @@ public:
     vector<Vec6> m_nodesVelocityVectors;
     vector<Mat6x6> m_nodesTangExpVectors;
     vector<Mat6x6> m_framesTangExpVectors;
+    /// Derivatives of the strains used by the tangent operators with respect to the strains of the sections,
+    /// see kinematics::computeIntegratedStrainJacobian (computed with the tangent operators)
+    vector<kinematics::StrainJacobian> m_nodesStrainJacobians;
+    vector<kinematics::StrainJacobian> m_framesStrainJacobians;
     vector<Vec6> m_totalBeamForceVectors;
 
     vector<Mat6x6> m_nodeAdjointVectors;
@@ -134,6 +140,11 @@ public:
     // do dynamic meshing.
     void initializeFrames();
 
+    kinematics::StrainInterpolation getStrainInterpolation() const
+    {
+        return static_cast<kinematics::StrainInterpolation>(d_strainInterpolation.getValue().getSelectedId());
+    }
+
     double computeTheta(const double &x, const Mat4x4 &gX);
     void printMatrix(const Mat6x6 R);
 
@@ -176,6 +187,7 @@ protected:
     sofa::Data<vector<double>> d_curv_abs_section;
     sofa::Data<vector<double>> d_curv_abs_frames;
     sofa::Data<bool> d_debug;
+    sofa::Data<sofa::helper::OptionsGroup> d_strainInterpolation;
 
     using Inherit1::fromModels1;
     using Inherit1::fromModels2;
@@ -206,6 +218,35 @@ protected:
     void updateExponentialSE3(const vector<Coord1> &inDeform);
     void updateTangExpSE3(const vector<Coord1> &inDeform);
 
+    /// Strains of the sections as Vec6, and at the nodes when they are interpolated (see d_strainInterpolation)
+    void computeStrains(const vector<Coord1> &inDeform, vector<Vec6> &strains, vector<Vec6> &nodesStrain);
+    /// Strain to use over [0, x] of the given section, the strain of the section when it is constant
+    Vec6 getIntegratedStrain(const unsigned int section, const double x, const vector<Vec6> &strains,
+                             const vector<Vec6> &nodesStrain);
+
+    /// Velocity of the strain integrated by a frame or a node of the given section (see m_framesStrainJacobians),
+    /// from the velocities of the strains of the sections
+    Vec6 getIntegratedStrainVelocity(const unsigned int section, const kinematics::StrainJacobian &jacobian,
+                                     const vector<Deriv1> &strainsVelocity) const;
+    /// Calls addForce(s, f) with the force f on the strain of each section s for the wrench T^t F applied on the
+    /// strain integrated by a frame or a node of the given section
+    template <class AddForce>
+    void addIntegratedStrainForce(const unsigned int section, const kinematics::StrainJacobian &jacobian,
+                                  const Vec6 &wrench, AddForce addForce) const
+    {
+        // Sections section - 1, section and section + 1
+        for (unsigned int k = 0; k < 3; k++)
+        {
+            if (section + k < 1 || section + k > m_beamLengthVectors.size())
+                continue;
+            const Vec6 force = jacobian[k].multTranspose(wrench);
+            Deriv1 strainForce;
+            for (unsigned int i = 0; i < Deriv1::static_size; i++)
+                strainForce[i] = force[i];
+            addForce(section + k - 1, strainForce);
+        }
+    }
+
     void computeTangExp(double &x, const Coord1 &k, Mat6x6 &TgX);
     void computeTangExpImplementation(double &x, const Vec6 &k, Mat6x6 &TgX);
 
@@ -23,6 +23,7 @@
 
 #include <Cosserat/config.h>
 #include <Cosserat/mapping/BaseCosseratMapping.h>
+#include <Cosserat/mapping/CosseratKinematics.h>
 
 #include <sofa/core/Multi2Mapping.inl>
 #include <sofa/core/behavior/MechanicalState.h>
@@ -53,6 +54,9 @@ BaseCosseratMapping<TIn1, TIn2, TOut>::BaseCosseratMapping()
       d_curv_abs_frames(initData(&d_curv_abs_frames, "curv_abs_output",
                                  " need to be com....")),
       d_debug(initData(&d_debug, false, "debug", "printf for the debug")),
+      d_strainInterpolation(initData(&d_strainInterpolation, {"constant", "magnus2", "magnus4"}, "strainInterpolation",
+                                     "Strain inside a section: constant (PCS), or linear between the nodes and "
+                                     "integrated with a Magnus expansion of order 2 or 4")),
       m_indexInput(0) {}
 
 
@@ -111,39 +115,19 @@ void BaseCosseratMapping<TIn1, TIn2, TOut>::initializeFrames()
     msg_info()
             << " curv_abs_section " << curv_abs_section.size() << "; curv_abs_frames: " << curv_abs_frames.size();
 
-    m_indicesVectors.clear();
-    m_framesLengthVectors.clear();
-    m_beamLengthVectors.clear();
-    m_indicesVectorsDraw.clear();
+    kinematics::FramesDistribution distribution;
+    kinematics::computeFramesDistribution(curv_abs_section.ref(), curv_abs_frames.ref(), distribution);
 
-    size_t sz = curv_abs_frames.size();
-    size_t input_index = 1;
-    for (size_t i = 0; i < sz; ++i)
-    {
-        if (curv_abs_section[input_index] > curv_abs_frames[i])
-        {
-            m_indicesVectors.emplace_back(input_index);
-            m_indicesVectorsDraw.emplace_back(input_index); // maybe I shouldn't do this here !!!
-        } else if (curv_abs_section[input_index] == curv_abs_frames[i])
-        {
-            m_indicesVectors.emplace_back(input_index);
-            input_index++;
-            m_indicesVectorsDraw.emplace_back(input_index);
-        } else {
-            input_index++;
-            m_indicesVectors.emplace_back(input_index);
-            m_indicesVectorsDraw.emplace_back(input_index);
-        }
+    m_indicesVectors = distribution.indices;
+    m_framesLengthVectors = distribution.framesLength;
+    m_beamLengthVectors = distribution.beamLength;
 
-        // Fill the vector m_framesLengthVectors with the distance
-        // between frame(output) and the closest beam node toward the base
-        m_framesLengthVectors.emplace_back(
-                    curv_abs_frames[i] - curv_abs_section[m_indicesVectors.back() - 1]);
-    }
-
-    for (size_t j = 0; j < sz - 1; ++j)
+    // A frame placed exactly on a node is drawn with the next section
+    m_indicesVectorsDraw.clear();
+    for (size_t i = 0; i < curv_abs_frames.size(); ++i)
     {
-        m_beamLengthVectors.emplace_back(curv_abs_section[j + 1] - curv_abs_section[j]);
+        const unsigned int index = m_indicesVectors[i];
+        m_indicesVectorsDraw.emplace_back(curv_abs_section[index] == curv_abs_frames[i] ? index + 1 : index);
     }
 
     msg_info()
@@ -152,69 +136,49 @@ void BaseCosseratMapping<TIn1, TIn2, TOut>::initializeFrames()
             << "m_BeamLengthVectors : " << msgendl;
 }
 
-auto buildXiHat(const Vec3& strain_i) -> se3
-{
-    se3 Xi_hat;
-
-    Xi_hat[0][1] = -strain_i[2];
-    Xi_hat[0][2] =  strain_i[1];
-    Xi_hat[1][2] = -strain_i[0];
-
-    Xi_hat[1][0] = -Xi_hat(0, 1);
-    Xi_hat[2][0] = -Xi_hat(0, 2);
-    Xi_hat[2][1] = -Xi_hat(1, 2);
-
-    //@TODO:  Why this , if q = 0 ????
-    Xi_hat[0][3] = 1.0;
-    return Xi_hat;
-}
-
-auto buildXiHat(const Vec6& strain_i) -> se3
-{
-    se3 Xi = buildXiHat(Vec3(strain_i(0), strain_i(1), strain_i(2)));
-
-    for (unsigned int i = 0; i < 3; i++)
-      Xi[i][3] += strain_i(i + 3);
-
-    return Xi;
-}
-
 template <class TIn1, class TIn2, class TOut>
 void BaseCosseratMapping<TIn1, TIn2, TOut>::computeExponentialSE3(const double &curv_abs_x_n,
                                                                   const Coord1 &strain_n,
                                                                   Transform &g_X_n)
 {
-    const auto I4 = Mat4x4::Identity();
-
-    // Get the angular part of the strain
-    Vec3 k = Vec3(strain_n(0), strain_n(1), strain_n(2));
-    SReal theta = k.norm();
+    Vec6 strain;
+    for (unsigned int i = 0; i < Coord1::static_size; i++)
+        strain[i] = strain_n[i];
 
-    SE3 _g_X;
-    se3 Xi_hat_n = buildXiHat(strain_n);
+    kinematics::computeExponentialSE3(curv_abs_x_n, strain, g_X_n);
 
-    msg_info() << "matrix Xi : " << Xi_hat_n;
+    msg_info() << "x : " << curv_abs_x_n << "; g_X : " << g_X_n;
+}
 
-    if (theta <= std::numeric_limits<double>::epsilon()) {
-        _g_X = I4 + curv_abs_x_n * Xi_hat_n;
-    } else {
-        double scalar1 =
-                (1.0 - std::cos(curv_abs_x_n * theta)) / std::pow(theta, 2);
-        double scalar2 = (curv_abs_x_n * theta - std::sin(curv_abs_x_n * theta)) /
-                         std::pow(theta, 3);
-        _g_X = I4 + curv_abs_x_n * Xi_hat_n + scalar1 * Xi_hat_n * Xi_hat_n +
-               scalar2 * Xi_hat_n * Xi_hat_n * Xi_hat_n;
+template <class TIn1, class TIn2, class TOut>
+void BaseCosseratMapping<TIn1, TIn2, TOut>::computeStrains(const vector<Coord1> &inDeform,
+                                                           vector<Vec6> &strains,
+                                                           vector<Vec6> &nodesStrain)
+{
+    strains.resize(inDeform.size());
+    for (size_t j = 0; j < inDeform.size(); ++j)
+    {
+        strains[j] = Vec6();
+        for (unsigned int k = 0; k < Coord1::static_size; k++)
+            strains[j][k] = inDeform[j][k];
     }
 
-    msg_info() << "matrix _g_X : " << _g_X;
+    nodesStrain.clear();
+    if (getStrainInterpolation() != kinematics::StrainInterpolation::Constant)
+        kinematics::computeNodesStrain(strains, m_beamLengthVectors, nodesStrain);
+}
 
-    Mat3x3 M;
-    _g_X.getsub(0, 0, M); // get the rotation matrix
+template <class TIn1, class TIn2, class TOut>
+Vec6 BaseCosseratMapping<TIn1, TIn2, TOut>::getIntegratedStrain(const unsigned int section, const double x,
+                                                                const vector<Vec6> &strains,
+                                                                const vector<Vec6> &nodesStrain)
+{
+    const auto interpolation = getStrainInterpolation();
+    if (interpolation == kinematics::StrainInterpolation::Constant)
+        return strains[section];
 
-    // convert the rotation 3x3 matrix to a quaternion
-    Quat<SReal> R;
-    R.fromMatrix(M);
-    g_X_n = Transform(Vec3(_g_X(0, 3), _g_X(1, 3), _g_X(2, 3)), R);
+    return kinematics::computeMagnusStrain(x, m_beamLengthVectors[section], nodesStrain[section],
+                                           nodesStrain[section + 1], interpolation);
 }
 
 // Fill exponential vectors
@@ -230,17 +194,22 @@ void BaseCosseratMapping<TIn1, TIn2, TOut>::updateExponentialSE3(
 
     const unsigned int sz = curv_abs_frames.size();
 
+    vector<Vec6> strains, nodesStrain;
+    computeStrains(inDeform, strains, nodesStrain);
+
     // Compute exponential at each frame point
     for (size_t i = 0; i < sz; ++i)
     {
         Transform g_X_frame_i;
 
-        const Coord1 strain_n = inDeform[m_indicesVectors[i] - 1]; // Cosserat reduce coordinates (strain)
+        const unsigned int section = m_indicesVectors[i] - 1;
+        const Coord1 strain_n = inDeform[section]; // Cosserat reduce coordinates (strain)
 
         // the size varies from 1 to 6
         // The distance between the frame and the closest beam node toward the base
         const SReal curv_abs_x = m_framesLengthVectors[i];
-        computeExponentialSE3(curv_abs_x, strain_n, g_X_frame_i);
+        kinematics::computeExponentialSE3(curv_abs_x, getIntegratedStrain(section, curv_abs_x, strains, nodesStrain),
+                                          g_X_frame_i);
         m_framesExponentialSE3Vectors.push_back(g_X_frame_i);
 
         msg_info()
@@ -256,11 +225,11 @@ void BaseCosseratMapping<TIn1, TIn2, TOut>::updateExponentialSE3(
 
     for (unsigned int j = 0; j < inDeform.size(); ++j)
     {
-        Coord1 strain_n = inDeform[j];
         const SReal curv_abs_x = m_beamLengthVectors[j];
 
         Transform g_X_node_j;
-        computeExponentialSE3(curv_abs_x, strain_n, g_X_node_j);
+        kinematics::computeExponentialSE3(curv_abs_x, getIntegratedStrain(j, curv_abs_x, strains, nodesStrain),
+                                          g_X_node_j);
         m_nodesExponentialSE3Vectors.push_back(g_X_node_j);
 
         msg_info()
@@ -346,17 +315,26 @@ void BaseCosseratMapping<TIn1, TIn2, TOut>::updateTangExpSE3(
 
     unsigned int sz = curv_abs_frames.size();
     m_framesTangExpVectors.resize(sz);
+    m_framesStrainJacobians.resize(sz);
+
+    vector<Vec6> strains, nodesStrain;
+    computeStrains(inDeform, strains, nodesStrain);
+    const auto interpolation = getStrainInterpolation();
 
     // Compute tangExpo at frame points
     for (unsigned int i = 0; i < sz; i++)
     {
         TangentTransform temp;
 
-        Coord1 strain_frame_i = inDeform[m_indicesVectors[i] - 1];
+        const unsigned int section = m_indicesVectors[i] - 1;
+        Coord1 strain_frame_i = inDeform[section];
         double curv_abs_x_i = m_framesLengthVectors[i];
-        computeTangExp(curv_abs_x_i, strain_frame_i, temp);
+        computeTangExpImplementation(curv_abs_x_i, getIntegratedStrain(section, curv_abs_x_i, strains, nodesStrain),
+                                     temp);
 
         m_framesTangExpVectors[i] = temp;
+        kinematics::computeIntegratedStrainJacobian(section, curv_abs_x_i, nodesStrain, m_beamLengthVectors,
+                                                    interpolation, m_framesStrainJacobians[i]);
 
         msg_info()
                 <<  "x :" << curv_abs_x_i << "; k :" << strain_frame_i << msgendl
@@ -368,18 +346,42 @@ void BaseCosseratMapping<TIn1, TIn2, TOut>::updateTangExpSE3(
     TangentTransform tangExpO;
     tangExpO.clear();
     m_nodesTangExpVectors.push_back(tangExpO);
+    m_nodesStrainJacobians.assign(1, kinematics::StrainJacobian());
 
     for (size_t j = 1; j < curv_abs_section.size(); j++) {
-        Coord1 strain_node_i = inDeform[j - 1];
         double x = m_beamLengthVectors[j - 1];
         TangentTransform temp;
         temp.clear();
-        computeTangExp(x, strain_node_i, temp);
+        computeTangExpImplementation(x, getIntegratedStrain(j - 1, x, strains, nodesStrain), temp);
         m_nodesTangExpVectors.push_back(temp);
+
+        kinematics::StrainJacobian jacobian;
+        kinematics::computeIntegratedStrainJacobian(j - 1, x, nodesStrain, m_beamLengthVectors, interpolation,
+                                                    jacobian);
+        m_nodesStrainJacobians.push_back(jacobian);
     }
     msg_info() << "Node TangExpo : " << m_nodesTangExpVectors;
 }
 
+template <class TIn1, class TIn2, class TOut>
+Vec6 BaseCosseratMapping<TIn1, TIn2, TOut>::getIntegratedStrainVelocity(const unsigned int section,
+                                                                        const kinematics::StrainJacobian &jacobian,
+                                                                        const vector<Deriv1> &strainsVelocity) const
+{
+    Vec6 velocity;
+    for (unsigned int k = 0; k < 3; k++)
+    {
+        // Sections section - 1, section and section + 1
+        if (section + k < 1 || section + k > strainsVelocity.size())
+            continue;
+        Vec6 strainVelocity;
+        for (unsigned int i = 0; i < Deriv1::static_size; i++)
+            strainVelocity[i] = strainsVelocity[section + k - 1][i];
+        velocity += jacobian[k] * strainVelocity;
+    }
+    return velocity;
+}
+
 template <class TIn1, class TIn2, class TOut>
 void BaseCosseratMapping<TIn1, TIn2, TOut>::computeTangExp(double &curv_abs_n,
                                                            const Coord1 &strain_i,
@@ -396,37 +398,7 @@ void BaseCosseratMapping<TIn1, TIn2, TOut>::computeTangExpImplementation(double
                                                                          const Vec6 &strain_i,
                                                                          Mat6x6 &TgX)
 {
-    SReal theta = Vec3(strain_i(0), strain_i(1), strain_i(2)).norm();
-    Mat3x3 tilde_k = getTildeMatrix(Vec3(strain_i(0), strain_i(1), strain_i(2)));
-    Mat3x3 tilde_q = getTildeMatrix(Vec3(strain_i(3), strain_i(4), strain_i(5)));
-
-    Mat6x6 ad_Xi;
-    buildAdjoint(tilde_k, tilde_q, ad_Xi);
-
-    Mat6x6 Id6 = Mat6x6::Identity();
-    if (theta <= std::numeric_limits<double>::epsilon()) {
-        double scalar0 = std::pow(curv_abs_n, 2) / 2.0;
-        TgX = curv_abs_n * Id6 + scalar0 * ad_Xi;
-    } else {
-        double scalar1 = (4.0 - 4.0 * cos(curv_abs_n * theta) -
-                          curv_abs_n * theta * sin(curv_abs_n * theta)) /
-                         (2.0 * theta * theta);
-        double scalar2 = (4.0 * curv_abs_n * theta +
-                          curv_abs_n * theta * cos(curv_abs_n * theta) -
-                          5.0 * sin(curv_abs_n * theta)) /
-                         (2.0 * theta * theta * theta);
-        double scalar3 = (2.0 - 2.0 * cos(curv_abs_n * theta) -
-                          curv_abs_n * theta * sin(curv_abs_n * theta)) /
-                         (2.0 * theta * theta * theta * theta);
-        double scalar4 = (2.0 * curv_abs_n * theta +
-                          curv_abs_n * theta * cos(curv_abs_n * theta) -
-                          3.0 * sin(curv_abs_n * theta)) /
-                         (2.0 * theta * theta * theta * theta * theta);
-
-        TgX = curv_abs_n * Id6 + scalar1 * ad_Xi + scalar2 * ad_Xi * ad_Xi +
-              scalar3 * ad_Xi * ad_Xi * ad_Xi +
-              scalar4 * ad_Xi * ad_Xi * ad_Xi * ad_Xi;
-    }
+    kinematics::computeTangExp(curv_abs_n, strain_i, TgX);
 }
 
 template <class TIn1, class TIn2, class TOut>
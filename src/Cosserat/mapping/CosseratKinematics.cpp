@@ -0,0 +1,566 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#include <Cosserat/mapping/CosseratKinematics.h>
+
+#include <sofa/type/Mat.h>
+#include <sofa/type/Quat.h>
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+namespace Cosserat::kinematics
+{
+using sofa::type::Mat4x4;
+using sofa::type::Quat;
+
+namespace
+{
+Mat4x4 buildXiHat(const Vec6 &strain)
+{
+    Mat4x4 Xi_hat;
+
+    Xi_hat[0][1] = -strain[2];
+    Xi_hat[0][2] =  strain[1];
+    Xi_hat[1][2] = -strain[0];
+
+    Xi_hat[1][0] = -Xi_hat(0, 1);
+    Xi_hat[2][0] = -Xi_hat(0, 2);
+    Xi_hat[2][1] = -Xi_hat(1, 2);
+
+    // The reference configuration is a straight rod along x
+    Xi_hat[0][3] = 1.0 + strain[3];
+    Xi_hat[1][3] = strain[4];
+    Xi_hat[2][3] = strain[5];
+    return Xi_hat;
+}
+
+/// Weight of the section j in the strain of the inner node j, the section j-1 having 1 - weight
+double nodeWeight(const vector<double> &beamLength, const size_t j)
+{
+    // The node j is at a distance beamLength[j-1] / 2 of the middle of the section j-1
+    const double total = beamLength[j - 1] + beamLength[j];
+    return (total > 0.0) ? beamLength[j - 1] / total : 0.5;
+}
+
+Mat6x6 buildAd(const Vec6 &xi)
+{
+    Mat6x6 ad_xi;
+    buildAdjoint(getTildeMatrix(Vec3(xi[0], xi[1], xi[2])), getTildeMatrix(Vec3(xi[3], xi[4], xi[5])), ad_xi);
+    return ad_xi;
+}
+}
+
+Mat3x3 getTildeMatrix(const Vec3 &u)
+{
+    Mat3x3 tild;
+    tild[0][1] = -u[2];
+    tild[0][2] = u[1];
+    tild[1][2] = -u[0];
+
+    tild[1][0] = -tild[0][1];
+    tild[2][0] = -tild[0][2];
+    tild[2][1] = -tild[1][2];
+    return tild;
+}
+
+Mat3x3 extractRotMatrix(const Transform &frame)
+{
+    SReal R[4][4];
+    frame.getOrientation().buildRotationMatrix(R);
+    Mat3x3 mat;
+    for (unsigned int k = 0; k < 3; k++)
+        for (unsigned int i = 0; i < 3; i++)
+            mat[k][i] = R[k][i];
+    return mat;
+}
+
+void buildAdjoint(const Mat3x3 &A, const Mat3x3 &B, Mat6x6 &adjoint)
+{
+    adjoint.clear();
+    for (unsigned int i = 0; i < 3; ++i)
+    {
+        for (unsigned int j = 0; j < 3; ++j)
+        {
+            adjoint[i][j] = A[i][j];
+            adjoint[i + 3][j + 3] = A[i][j];
+            adjoint[i + 3][j] = B[i][j];
+        }
+    }
+}
+
+void buildCoAdjoint(const Mat3x3 &A, const Mat3x3 &B, Mat6x6 &coAdjoint)
+{
+    coAdjoint.clear();
+    for (unsigned int i = 0; i < 3; ++i)
+    {
+        for (unsigned int j = 0; j < 3; ++j)
+        {
+            coAdjoint[i][j] = A[i][j];
+            coAdjoint[i + 3][j + 3] = A[i][j];
+            coAdjoint[i][j + 3] = B[i][j];
+        }
+    }
+}
+
+void buildProjector(const Transform &T, Mat6x6 &P)
+{
+    P.clear();
+    const Mat3x3 R = extractRotMatrix(T);
+    for (unsigned int i = 0; i < 3; i++)
+    {
+        for (unsigned int j = 0; j < 3; j++)
+        {
+            P[i][j + 3] = R[i][j];
+            P[i + 3][j] = R[i][j];
+        }
+    }
+}
+
+void computeAdjoint(const Transform &frame, Mat6x6 &adjoint)
+{
+    const Mat3x3 R = extractRotMatrix(frame);
+    const Mat3x3 tilde_u_R = getTildeMatrix(frame.getOrigin()) * R;
+    buildAdjoint(R, tilde_u_R, adjoint);
+}
+
+void computeCoAdjoint(const Transform &frame, Mat6x6 &coAdjoint)
+{
+    const Mat3x3 R = extractRotMatrix(frame);
+    const Mat3x3 tilde_u_R = getTildeMatrix(frame.getOrigin()) * R;
+    buildCoAdjoint(R, tilde_u_R, coAdjoint);
+}
+
+void computeExponentialSE3(const double x, const Vec6 &strain, Transform &g_X)
+{
+    const Mat4x4 I4 = Mat4x4::Identity();
+
+    // Get the angular part of the strain
+    const SReal theta = Vec3(strain[0], strain[1], strain[2]).norm();
+    const Mat4x4 Xi_hat = buildXiHat(strain);
+
+    Mat4x4 _g_X;
+    if (theta <= std::numeric_limits<double>::epsilon())
+    {
+        _g_X = I4 + x * Xi_hat;
+    }
+    else
+    {
+        double scalar1, scalar2;
+        if (x * theta < 0.1)
+        {
+            // Taylor series, the closed form cancels out for small angles (see computeTangExp)
+            const double x2 = x * x;
+            const double x_theta2 = x2 * theta * theta;
+            scalar1 = x2 * (1.0 / 2.0 - x_theta2 / 24.0 + x_theta2 * x_theta2 / 720.0
+                            - x_theta2 * x_theta2 * x_theta2 / 40320.0);
+            scalar2 = x2 * x * (1.0 / 6.0 - x_theta2 / 120.0 + x_theta2 * x_theta2 / 5040.0
+                                - x_theta2 * x_theta2 * x_theta2 / 362880.0);
+        }
+        else
+        {
+            scalar1 = (1.0 - std::cos(x * theta)) / std::pow(theta, 2);
+            scalar2 = (x * theta - std::sin(x * theta)) / std::pow(theta, 3);
+        }
+        const Mat4x4 Xi_hat2 = Xi_hat * Xi_hat;
+        _g_X = I4 + x * Xi_hat + scalar1 * Xi_hat2 + scalar2 * Xi_hat2 * Xi_hat;
+    }
+
+    Mat3x3 M;
+    _g_X.getsub(0, 0, M); // get the rotation matrix
+
+    // convert the rotation 3x3 matrix to a quaternion
+    Quat<SReal> R;
+    R.fromMatrix(M);
+    g_X = Transform(Vec3(_g_X(0, 3), _g_X(1, 3), _g_X(2, 3)), R);
+}
+
+void computeTangExp(const double x, const Vec6 &strain, Mat6x6 &TgX)
+{
+    const SReal theta = Vec3(strain[0], strain[1], strain[2]).norm();
+    const Mat3x3 tilde_k = getTildeMatrix(Vec3(strain[0], strain[1], strain[2]));
+    // As in buildXiHat, the reference configuration is a straight rod along x
+    const Mat3x3 tilde_q = getTildeMatrix(Vec3(1.0 + strain[3], strain[4], strain[5]));
+
+    Mat6x6 ad_Xi;
+    buildAdjoint(tilde_k, tilde_q, ad_Xi);
+
+    const Mat6x6 Id6 = Mat6x6::Identity();
+    if (theta <= std::numeric_limits<double>::epsilon())
+    {
+        // ad_Xi^2 is null for a null angular strain
+        const double scalar0 = std::pow(x, 2) / 2.0;
+        TgX = x * Id6 + scalar0 * ad_Xi;
+        return;
+    }
+
+    const double x_theta = x * theta;
+    double scalar1, scalar2, scalar3, scalar4;
+    if (x_theta < 0.1)
+    {
+        // Taylor series, the closed form below cancels out for small angles
+        const double theta2 = theta * theta;
+        const double theta4 = theta2 * theta2;
+        const double theta6 = theta4 * theta2;
+        const double x2 = x * x;
+        const double x3 = x2 * x;
+        const double x4 = x2 * x2;
+        const double x5 = x4 * x;
+        const double x6 = x4 * x2;
+        const double x7 = x6 * x;
+        const double x8 = x4 * x4;
+        scalar1 = x2 / 2.0 - x6 * theta4 / 720.0 + x8 * theta6 / 20160.0;
+        scalar2 = x3 / 6.0 - x7 * theta4 / 5040.0 + x8 * x * theta6 / 181440.0;
+        scalar3 = x4 / 24.0 - x6 * theta2 / 360.0 + x8 * theta4 / 13440.0 - x8 * x2 * theta6 / 907200.0;
+        scalar4 = x5 / 120.0 - x7 * theta2 / 2520.0 + x8 * x * theta4 / 120960.0 - x8 * x3 * theta6 / 9979200.0;
+    }
+    else
+    {
+        const double cos_x_theta = std::cos(x_theta);
+        const double sin_x_theta = std::sin(x_theta);
+        const double theta2 = theta * theta;
+
+        scalar1 = (4.0 - 4.0 * cos_x_theta - x_theta * sin_x_theta) / (2.0 * theta2);
+        scalar2 = (4.0 * x_theta + x_theta * cos_x_theta - 5.0 * sin_x_theta) / (2.0 * theta2 * theta);
+        scalar3 = (2.0 - 2.0 * cos_x_theta - x_theta * sin_x_theta) / (2.0 * theta2 * theta2);
+        scalar4 = (2.0 * x_theta + x_theta * cos_x_theta - 3.0 * sin_x_theta) / (2.0 * theta2 * theta2 * theta);
+    }
+
+    const Mat6x6 ad_Xi2 = ad_Xi * ad_Xi;
+    const Mat6x6 ad_Xi3 = ad_Xi2 * ad_Xi;
+    TgX = x * Id6 + scalar1 * ad_Xi + scalar2 * ad_Xi2 + scalar3 * ad_Xi3 + scalar4 * ad_Xi3 * ad_Xi;
+}
+
+void computeNodesStrain(const vector<Vec6> &strains, const vector<double> &beamLength, vector<Vec6> &nodesStrain)
+{
+    const size_t nbSections = strains.size();
+    nodesStrain.resize(nbSections + 1);
+    if (nbSections == 0)
+        return;
+
+    nodesStrain[0] = strains[0];
+    nodesStrain[nbSections] = strains[nbSections - 1];
+    for (size_t j = 1; j < nbSections; j++)
+    {
+        const double t = nodeWeight(beamLength, j);
+        nodesStrain[j] = strains[j - 1] + (strains[j] - strains[j - 1]) * t;
+    }
+}
+
+Vec6 computeMagnusStrain(const double x, const double length, const Vec6 &strainBegin, const Vec6 &strainEnd,
+                         const StrainInterpolation interpolation)
+{
+    if (interpolation == StrainInterpolation::Constant || x <= 0.0 || length <= 0.0)
+        return strainBegin;
+
+    const auto strainAt = [&](const double s) { return strainBegin + (strainEnd - strainBegin) * (s / length); };
+
+    if (interpolation == StrainInterpolation::Magnus2)
+        return strainAt(0.5 * x);
+
+    // Fourth order: Omega = x/2 (Xi_1 + Xi_2) + sqrt(3)/12 x^2 [Xi_1, Xi_2], with the twists Xi_i taken at the
+    // two Gauss points and including the reference elongation (g' = g Xi, hence the sign of the commutator)
+    const double offset = std::sqrt(3.0) / 6.0;
+    const Vec6 reference(0, 0, 0, 1, 0, 0);
+    const Vec6 xi1 = strainAt((0.5 - offset) * x) + reference;
+    const Vec6 xi2 = strainAt((0.5 + offset) * x) + reference;
+
+    const Vec6 omega = (xi1 + xi2) * (0.5 * x) + (buildAd(xi1) * xi2) * (std::sqrt(3.0) / 12.0 * x * x);
+
+    return omega / x - reference;
+}
+
+void computeMagnusStrainDerivatives(const double x, const double length, const Vec6 &strainBegin,
+                                    const Vec6 &strainEnd, const StrainInterpolation interpolation,
+                                    Mat6x6 &dBegin, Mat6x6 &dEnd)
+{
+    const Mat6x6 Id6 = Mat6x6::Identity();
+    if (interpolation == StrainInterpolation::Constant || x <= 0.0 || length <= 0.0)
+    {
+        dBegin = Id6;
+        dEnd.clear();
+        return;
+    }
+
+    if (interpolation == StrainInterpolation::Magnus2)
+    {
+        const double a = 0.5 * x / length;
+        dBegin = (1.0 - a) * Id6;
+        dEnd = a * Id6;
+        return;
+    }
+
+    // d(Omega / x) = (dXi_1 + dXi_2) / 2 + sqrt(3)/12 x (ad(Xi_1) dXi_2 - ad(Xi_2) dXi_1), the Gauss points
+    // being at a1 and a2 (fractions of the section) between strainBegin and strainEnd
+    const double offset = std::sqrt(3.0) / 6.0;
+    const double a1 = (0.5 - offset) * x / length;
+    const double a2 = (0.5 + offset) * x / length;
+    const Vec6 reference(0, 0, 0, 1, 0, 0);
+    const Vec6 xi1 = strainBegin + (strainEnd - strainBegin) * a1 + reference;
+    const Vec6 xi2 = strainBegin + (strainEnd - strainBegin) * a2 + reference;
+
+    const double c = std::sqrt(3.0) / 12.0 * x;
+    const Mat6x6 d1 = 0.5 * Id6 - c * buildAd(xi2);
+    const Mat6x6 d2 = 0.5 * Id6 + c * buildAd(xi1);
+    dBegin = (1.0 - a1) * d1 + (1.0 - a2) * d2;
+    dEnd = a1 * d1 + a2 * d2;
+}
+
+void computeIntegratedStrainJacobian(const unsigned int section, const double x, const vector<Vec6> &nodesStrain,
+                                     const vector<double> &beamLength, const StrainInterpolation interpolation,
+                                     StrainJacobian &jacobian)
+{
+    for (auto &block : jacobian)
+        block.clear();
+    if (interpolation == StrainInterpolation::Constant)
+    {
+        jacobian[1] = Mat6x6::Identity();
+        return;
+    }
+
+    Mat6x6 dBegin, dEnd;
+    computeMagnusStrainDerivatives(x, beamLength[section], nodesStrain[section], nodesStrain[section + 1],
+                                   interpolation, dBegin, dEnd);
+
+    // The first (resp. last) node takes the strain of the first (resp. last) section
+    const size_t nbSections = beamLength.size();
+    const double tBegin = (section == 0) ? 1.0 : nodeWeight(beamLength, section);
+    const double tEnd = (section + 1 == nbSections) ? 0.0 : nodeWeight(beamLength, section + 1);
+    jacobian[0] = (1.0 - tBegin) * dBegin;
+    jacobian[1] = tBegin * dBegin + (1.0 - tEnd) * dEnd;
+    jacobian[2] = tEnd * dEnd;
+}
+
+void computeFramesDistribution(const vector<double> &curvAbsSection, const vector<double> &curvAbsFrames,
+                               FramesDistribution &distribution)
+{
+    distribution.indices.clear();
+    distribution.framesLength.clear();
+    distribution.beamLength.clear();
+
+    // For each frame, find the section to which it is attached: the first section whose end is not before the
+    // frame, a frame on a node belonging to the section before it (and a frame at the base to the first one).
+    if (curvAbsSection.size() < 2)
+        return;
+    const size_t nbSections = curvAbsSection.size() - 1;
+    for (const double curvAbsFrame : curvAbsFrames)
+    {
+        const size_t node = std::lower_bound(curvAbsSection.begin(), curvAbsSection.end(), curvAbsFrame)
+                            - curvAbsSection.begin();
+        distribution.indices.emplace_back(static_cast<unsigned int>(std::clamp<size_t>(node, 1, nbSections)));
+
+        // distance between the frame and the closest beam node toward the base
+        distribution.framesLength.emplace_back(curvAbsFrame - curvAbsSection[distribution.indices.back() - 1]);
+    }
+
+    for (size_t j = 0; j + 1 < curvAbsSection.size(); ++j)
+        distribution.beamLength.emplace_back(curvAbsSection[j + 1] - curvAbsSection[j]);
+}
+
+void computeFramesPoses(const Transform &base, const vector<Vec6> &strains,
+                        const FramesDistribution &distribution, vector<Transform> &frames)
+{
+    const size_t nbSections = strains.size();
+    const size_t nbFrames = distribution.indices.size();
+    frames.resize(nbFrames);
+
+    // nodes[j] = base * gX(L_0) * ... * gX(L_{j-1})
+    vector<Transform> nodes(nbSections + 1);
+    nodes[0] = base;
+    for (size_t j = 0; j < nbSections; ++j)
+    {
+        Transform g_X_node_j;
+        computeExponentialSE3(distribution.beamLength[j], strains[j], g_X_node_j);
+        nodes[j + 1] = nodes[j] * g_X_node_j;
+    }
+
+    for (size_t i = 0; i < nbFrames; ++i)
+    {
+        const unsigned int section = distribution.indices[i] - 1;
+        Transform g_X_frame_i;
+        computeExponentialSE3(distribution.framesLength[i], strains[section], g_X_frame_i);
+        frames[i] = nodes[section] * g_X_frame_i;
+    }
+}
+
+void computeFramesJacobians(const Transform &base, const vector<Vec6> &strains, const unsigned int strainSize,
+                            const FramesDistribution &distribution, const vector<unsigned int> &frameIndices,
+                            double *jacobians)
+{
+    const size_t nbSections = strains.size();
+    const size_t nbCols = 6 + nbSections * strainSize;
+
+    // The jacobians are stored by columns: nodesJ[j][c] is the velocity of the node j (local twist)
+    // for a unit velocity of the dof c. It follows the recursion of applyJ:
+    //   eta_0 = P(base^-1) * v_base
+    //   eta_j = Ad(gX(L_{j-1})^-1) * (eta_{j-1} + T(L_{j-1}) * Xi_dot_{j-1})
+    vector<vector<Vec6>> nodesJ(nbSections + 1, vector<Vec6>(nbCols, Vec6()));
+    vector<Transform> nodes(nbSections + 1);
+
+    Mat6x6 P;
+    buildProjector(base.inversed(), P);
+    for (unsigned int c = 0; c < 6; ++c)
+        nodesJ[0][c] = P.col(c);
+    nodes[0] = base;
+
+    for (size_t j = 1; j <= nbSections; ++j)
+    {
+        const Vec6 &strain = strains[j - 1];
+        const double length = distribution.beamLength[j - 1];
+
+        Transform g_X;
+        computeExponentialSE3(length, strain, g_X);
+        nodes[j] = nodes[j - 1] * g_X;
+
+        Mat6x6 Ad, TgX;
+        computeAdjoint(g_X.inversed(), Ad);
+        computeTangExp(length, strain, TgX);
+
+        // Only the columns of the dofs already involved (base and previous sections) are non zero
+        const size_t firstStrainCol = 6 + (j - 1) * strainSize;
+        for (size_t c = 0; c < firstStrainCol; ++c)
+            nodesJ[j][c] = Ad * nodesJ[j - 1][c];
+
+        const Mat6x6 AdTgX = Ad * TgX;
+        for (unsigned int u = 0; u < strainSize; ++u)
+            nodesJ[j][firstStrainCol + u] = AdTgX.col(u);
+    }
+
+    for (size_t f = 0; f < frameIndices.size(); ++f)
+    {
+        const unsigned int i = frameIndices[f];
+        const unsigned int section = distribution.indices[i] - 1;
+        const Vec6 &strain = strains[section];
+        const double length = distribution.framesLength[i];
+
+        Transform g_X;
+        computeExponentialSE3(length, strain, g_X);
+        const Transform frame = nodes[section] * g_X;
+
+        Mat6x6 Ad, TgX, Proj;
+        computeAdjoint(g_X.inversed(), Ad);
+        computeTangExp(length, strain, TgX);
+        buildProjector(frame, Proj);
+
+        const Mat6x6 ProjAd = Proj * Ad;
+        const Mat6x6 ProjAdTgX = ProjAd * TgX;
+        const size_t firstStrainCol = 6 + section * strainSize;
+
+        double *J = jacobians + f * 6 * nbCols;
+        for (size_t c = 0; c < nbCols; ++c)
+        {
+            Vec6 column;
+            if (c < firstStrainCol)
+                column = ProjAd * nodesJ[section][c];
+            else if (c < firstStrainCol + strainSize)
+                column = ProjAdTgX.col(c - firstStrainCol);
+
+            for (unsigned int r = 0; r < 6; ++r)
+                J[r * nbCols + c] = column[r];
+        }
+    }
+}
+
+void computeFramesCompliance(const Transform &base, const vector<Transform> &sectionsExponential,
+                             const vector<Mat6x6> &sectionsTangExp, const vector<unsigned int> &framesSection,
+                             const vector<Transform> &framesExponential, const vector<Mat6x6> &framesTangExp,
+                             const vector<Mat3x3> &sectionsCompliance,
+                             const vector<vector<FrameConstraintEntry>> &rows, double *W)
+{
+    using Mat6x3 = sofa::type::Mat<6, 3, double>;
+    const size_t nbSections = sectionsExponential.size();
+
+    // Spatial columns of the sections S_s = Ad(g_s) T(L_s) (angular part), g_s being the pose of the
+    // beginning of the section, and accumulated compliance Q_k = sum_{s < k} S_s C_s S_s^t
+    vector<Transform> nodes(nbSections + 1);
+    vector<Mat6x3> columns(nbSections);
+    vector<Mat6x6> accumulated(nbSections + 1);
+    nodes[0] = base;
+    accumulated[0].clear();
+    for (size_t s = 0; s < nbSections; ++s)
+    {
+        Mat6x6 Ad;
+        computeAdjoint(nodes[s], Ad);
+        const Mat6x6 AdTgX = Ad * sectionsTangExp[s];
+        for (unsigned int r = 0; r < 6; ++r)
+            for (unsigned int c = 0; c < 3; ++c)
+                columns[s][r][c] = AdTgX[r][c];
+        accumulated[s + 1] = accumulated[s] + columns[s] * sectionsCompliance[s] * columns[s].transposed();
+        nodes[s + 1] = nodes[s] * sectionsExponential[s];
+    }
+
+    // Each entry as a spatial wrench [p x f + tau, f], with its projection on the columns of its own
+    // section, which only spans [0, x] for the frame
+    struct Entry
+    {
+        unsigned int section;
+        Vec6 wrench;
+        Vec3 own;
+    };
+    vector<vector<Entry>> entries(rows.size());
+    for (size_t r = 0; r < rows.size(); ++r)
+    {
+        for (const FrameConstraintEntry &entry : rows[r])
+        {
+            const unsigned int section = framesSection[entry.frame] - 1;
+            const Vec3 position = (nodes[section] * framesExponential[entry.frame]).getOrigin();
+            const Vec3 force(entry.direction[0], entry.direction[1], entry.direction[2]);
+            const Vec3 torque(entry.direction[3], entry.direction[4], entry.direction[5]);
+            const Vec3 moment = sofa::type::cross(position, force) + torque;
+            const Vec6 wrench(moment[0], moment[1], moment[2], force[0], force[1], force[2]);
+
+            Mat6x6 Ad;
+            computeAdjoint(nodes[section], Ad);
+            const Mat6x6 AdTgX = Ad * framesTangExp[entry.frame];
+            Vec3 own;
+            for (unsigned int c = 0; c < 3; ++c)
+                for (unsigned int k = 0; k < 6; ++k)
+                    own[c] += AdTgX[k][c] * wrench[k];
+            entries[r].push_back({section, wrench, own});
+        }
+    }
+
+    // Both entries share the sections before the first of their sections, and its part up to the frame
+    auto pairCompliance = [&](const Entry &e1, const Entry &e2) {
+        if (e1.section > e2.section)
+            return e2.wrench * (accumulated[e2.section] * e1.wrench) +
+                   e2.own * (sectionsCompliance[e2.section] * columns[e2.section].multTranspose(e1.wrench));
+        const Vec3 other = (e1.section == e2.section) ? e2.own : columns[e1.section].multTranspose(e2.wrench);
+        return e1.wrench * (accumulated[e1.section] * e2.wrench) + e1.own * (sectionsCompliance[e1.section] * other);
+    };
+
+    const size_t nbRows = rows.size();
+    for (size_t r1 = 0; r1 < nbRows; ++r1)
+    {
+        for (size_t r2 = 0; r2 <= r1; ++r2)
+        {
+            double value = 0.0;
+            for (const Entry &e1 : entries[r1])
+                for (const Entry &e2 : entries[r2])
+                    value += pairCompliance(e1, e2);
+            W[r1 * nbRows + r2] = value;
+            W[r2 * nbRows + r1] = value;
+        }
+    }
+}
+
+} // namespace Cosserat::kinematics
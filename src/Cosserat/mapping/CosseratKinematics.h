@@ -0,0 +1,157 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+#include <Cosserat/config.h>
+#include <Cosserat/types.h>
+
+#include <sofa/type/Mat.h>
+#include <sofa/type/Vec.h>
+#include <sofa/type/vector.h>
+
+#include <array>
+
+/// Free functions implementing the piecewise constant strain (PCS) kinematics of a Cosserat rod.
+/// They do not depend on a scene and are used by BaseCosseratMapping as well as by the python
+/// module (batched evaluations). The strain is always given as a Vec6 [k_x, k_y, k_z, q_x, q_y, q_z],
+/// a Vec3 (angular) strain being [k, 0, 0, 0].
+namespace Cosserat::kinematics
+{
+using Cosserat::type::Transform;
+using sofa::type::Mat3x3;
+using sofa::type::Mat6x6;
+using sofa::type::Vec3;
+using sofa::type::Vec6;
+using sofa::type::vector;
+
+/// The distribution of the frames along the sections, see BaseCosseratMapping::initializeFrames
+struct SOFA_COSSERAT_API FramesDistribution
+{
+    vector<unsigned int> indices;   ///< 1-based index of the section of each frame
+    vector<double> framesLength;    ///< distance between each frame and the beginning of its section
+    vector<double> beamLength;      ///< length of each section
+};
+
+SOFA_COSSERAT_API Mat3x3 getTildeMatrix(const Vec3 &u);
+SOFA_COSSERAT_API Mat3x3 extractRotMatrix(const Transform &frame);
+SOFA_COSSERAT_API void buildAdjoint(const Mat3x3 &A, const Mat3x3 &B, Mat6x6 &adjoint);
+SOFA_COSSERAT_API void buildCoAdjoint(const Mat3x3 &A, const Mat3x3 &B, Mat6x6 &coAdjoint);
+
+/// Maps a local twist [w, v] to a SOFA rigid velocity [v, w] expressed in the global frame
+SOFA_COSSERAT_API void buildProjector(const Transform &T, Mat6x6 &P);
+
+/// Adjoint and co-adjoint representations of a transformation
+SOFA_COSSERAT_API void computeAdjoint(const Transform &frame, Mat6x6 &adjoint);
+SOFA_COSSERAT_API void computeCoAdjoint(const Transform &frame, Mat6x6 &coAdjoint);
+
+/// g(x) = exp(x * Xi) for a constant strain Xi
+SOFA_COSSERAT_API void computeExponentialSE3(const double x, const Vec6 &strain, Transform &g_X);
+
+/// Tangent operator of the exponential, T(x) = int_0^x exp(s ad_Xi) ds, the velocity of g(x) relative to g(0) being
+/// Ad(g(x)^-1) T(x) Xi_dot in the frame of g(x)
+SOFA_COSSERAT_API void computeTangExp(const double x, const Vec6 &strain, Mat6x6 &TgX);
+
+/// Strain model inside a section: piecewise constant (PCS), or linear between the nodes and
+/// integrated with a Magnus expansion of order 2 (one Gauss point) or 4 (two Gauss points)
+enum class StrainInterpolation : unsigned int
+{
+    Constant = 0,
+    Magnus2 = 1,
+    Magnus4 = 2
+};
+
+/// Strains at the nodes (the section boundaries), linearly interpolated between the middles of the
+/// sections, the first and last nodes take the strain of their section
+SOFA_COSSERAT_API void computeNodesStrain(const vector<Vec6> &strains, const vector<double> &beamLength,
+                                          vector<Vec6> &nodesStrain);
+
+/// Constant strain giving, with computeExponentialSE3(x, ., g), the Magnus approximation of the transform
+/// over [0, x] of a section of the given length whose strain varies linearly from strainBegin to strainEnd.
+/// It is also the strain used for the tangent operator over [0, x]. With StrainInterpolation::Constant,
+/// strainBegin is returned.
+SOFA_COSSERAT_API Vec6 computeMagnusStrain(const double x, const double length, const Vec6 &strainBegin,
+                                           const Vec6 &strainEnd, const StrainInterpolation interpolation);
+
+/// Derivatives of computeMagnusStrain with respect to strainBegin and strainEnd
+SOFA_COSSERAT_API void computeMagnusStrainDerivatives(const double x, const double length, const Vec6 &strainBegin,
+                                                      const Vec6 &strainEnd, const StrainInterpolation interpolation,
+                                                      Mat6x6 &dBegin, Mat6x6 &dEnd);
+
+/// Derivatives of the strain integrated over [0, x] of a section with respect to the strains of the sections
+/// section - 1, section and section + 1 (a null block for a section outside the rod): with a Magnus
+/// interpolation, the strains of the nodes of a section depend on its neighbours. With
+/// StrainInterpolation::Constant it is [0, Id, 0].
+using StrainJacobian = std::array<Mat6x6, 3>;
+SOFA_COSSERAT_API void computeIntegratedStrainJacobian(const unsigned int section, const double x,
+                                                       const vector<Vec6> &nodesStrain,
+                                                       const vector<double> &beamLength,
+                                                       const StrainInterpolation interpolation,
+                                                       StrainJacobian &jacobian);
+
+/// Fill the section index of each frame, and the local lengths, from the curvilinear abscissas
+SOFA_COSSERAT_API void computeFramesDistribution(const vector<double> &curvAbsSection,
+                                                 const vector<double> &curvAbsFrames,
+                                                 FramesDistribution &distribution);
+
+/// Poses of the frames for the given strains (one per section) and base pose, same as
+/// DiscreteCosseratMapping::apply but with a cumulative product over the sections.
+SOFA_COSSERAT_API void computeFramesPoses(const Transform &base, const vector<Vec6> &strains,
+                                          const FramesDistribution &distribution,
+                                          vector<Transform> &frames);
+
+/// Jacobians of the selected frames velocities with respect to the base velocity and the strains
+/// velocities, same as DiscreteCosseratMapping::applyJ. For each frame the 6 x (6 + nbSections * strainSize)
+/// matrix is written row-major in jacobians (which must hold frameIndices.size() of these matrices):
+///  - the rows are the SOFA rigid velocity [v, w] of the frame in the global frame,
+///  - the 6 first columns are the SOFA rigid velocity [v, w] of the base in the global frame,
+///  - then strainSize columns per section (3: angular strain, 6: angular and linear strains).
+SOFA_COSSERAT_API void computeFramesJacobians(const Transform &base, const vector<Vec6> &strains,
+                                              const unsigned int strainSize,
+                                              const FramesDistribution &distribution,
+                                              const vector<unsigned int> &frameIndices,
+                                              double *jacobians);
+
+/// A unit direction of a constraint applied on a frame, as a SOFA rigid force [f, tau] in the global frame
+struct SOFA_COSSERAT_API FrameConstraintEntry
+{
+    unsigned int frame;
+    Vec6 direction;
+};
+
+/// Compliance W = J C J^t of constraints applied on the frames, J being the jacobian of the frames with
+/// respect to the strains of the sections (the base is fixed) and C the block diagonal compliance of the
+/// sections (angular strain). Each row of W is a constraint made of one or several frame entries.
+/// The inputs are the ones cached by BaseCosseratMapping: exponential and tangent operator of each section
+/// over its length and of each frame over its distance to the beginning of its section (framesSection is
+/// 1-based). Written as spatial twists the columns of J do not depend on the frame, so the compliance of
+/// the first k sections is accumulated once in O(N) and each pair of entries costs O(1).
+/// W (rows.size() x rows.size(), row-major) is overwritten.
+SOFA_COSSERAT_API void computeFramesCompliance(const Transform &base,
+                                               const vector<Transform> &sectionsExponential,
+                                               const vector<Mat6x6> &sectionsTangExp,
+                                               const vector<unsigned int> &framesSection,
+                                               const vector<Transform> &framesExponential,
+                                               const vector<Mat6x6> &framesTangExp,
+                                               const vector<Mat3x3> &sectionsCompliance,
+                                               const vector<vector<FrameConstraintEntry>> &rows,
+                                               double *W);
+
+} // namespace Cosserat::kinematics
@@ -103,6 +103,7 @@ public:
     sofa::Data<sofa::type::Vec4f>             d_color;
     sofa::Data<bool>                          d_drawArrows;
     sofa::Data<bool>                          d_lastPointIsFixed;
+    sofa::Data<vector<bool>>                  d_activePoints;
 
 protected:   
     sofa::core::State<In1>* m_fromModel1;
@@ -160,6 +161,10 @@ public:
     }
 
 private:
+    bool isActive(const vector<bool> &mask, size_t i) const
+    {
+        return mask.empty() || (i < mask.size() && mask[i]);
+    }
 
     typedef struct {
         double fact;
@@ -49,6 +49,10 @@ DifferenceMultiMapping<TIn1, TIn2, TOut>::DifferenceMultiMapping()
     d_drawArrows(initData(&d_drawArrows, false, "drawArrows", "The color of the cable")),
     d_lastPointIsFixed(initData(&d_lastPointIsFixed, true, "lastPointIsFixed", "This select the last point as fixed of not,"
                                                                                "one.")),
+    d_activePoints(initData(&d_activePoints, "activePoints", "Activity mask of the input1 points (e.g. linked to "
+                                                             "PointsManager.activePoints), only used when lastPointIsFixed "
+                                                             "is false. Inactive points produce a null output and no "
+                                                             "contribution. If unspecified, all the points are active")),
     m_fromModel1(NULL), m_fromModel2(NULL), m_toModel(NULL)
 {
 }
@@ -131,6 +135,7 @@ void DifferenceMultiMapping<TIn1, TIn2, TOut>::computeProximity(const In1VecCoor
     size_t szFrom = from.size();
     size_t szDst = dst.size();
     vector<Rigid> direction = d_direction.getValue();
+    const vector<bool> &active = d_activePoints.getValue();
 
     /// get the last rigid direction, the main goal is to use it for the
     ///  3D bilateral constraint i.e the fix point of the cable in the robot structure
@@ -140,7 +145,14 @@ void DifferenceMultiMapping<TIn1, TIn2, TOut>::computeProximity(const In1VecCoor
     for (size_t i = 0; i < szFrom; i++)
     {
         Coord2 P = from[i];
-        Constraint constraint;
+        Constraint constraint{};
+
+        // inactive points (free slots of a points pool) keep a null constraint
+        if (!isActive(active, i))
+        {
+            m_constraints.push_back(constraint);
+            continue;
+        }
 
         // find the min distance between a from mstate point, and it's projection on each edge of the cable (destination mstate)
         Real min_dist = std::numeric_limits<Real>::max();
@@ -355,6 +367,7 @@ void DifferenceMultiMapping<TIn1, TIn2, TOut>::computeNeedleProximity(const In1V
     size_t szFrom = from.size();
     size_t szDst = dst.size();
     vector<Rigid> direction = d_direction.getValue();
+    const vector<bool> &active = d_activePoints.getValue();
 
     /// get the last rigid direction, the main goal is to use it for the
     ///  3D bilateral constraint i.e the fix point of the cable in the robot structure
@@ -364,7 +377,14 @@ void DifferenceMultiMapping<TIn1, TIn2, TOut>::computeNeedleProximity(const In1V
     for (size_t i = 0; i < szFrom; i++)
     {
         Coord2 P = from[i];
-        Constraint constraint;
+        Constraint constraint{};
+
+        // inactive points (free slots of a points pool) keep a null constraint
+        if (!isActive(active, i))
+        {
+            m_constraints.push_back(constraint);
+            continue;
+        }
 
         // find the min distance between a from mstate point, and it's projection on each edge of the cable (destination mstate)
         Real min_dist = std::numeric_limits<Real>::max();
@@ -648,8 +668,11 @@ void DifferenceMultiMapping<TIn1, TIn2, TOut>::applyJT(
     }
     else
     {
+        const vector<bool> &active = d_activePoints.getValue();
         for (size_t i = 0; i < sz; i++)
         {
+            if (!isActive(active, i))
+                continue;
             Constraint &c = m_constraints[i];
             int ei1 = c.eid;
             int ei2 = c.eid + 1;
@@ -682,6 +705,7 @@ void DifferenceMultiMapping<TIn1, TIn2, TOut>::applyJT(
     const OutMatrixDeriv &in = dataMatInConst[0]->getValue(); // input constraints defined on the mapped point
     const In1DataVecCoord *x1fromData = m_fromModel1->read(sofa::core::ConstVecCoordId::position());
     const In1VecCoord x1from = x1fromData->getValue();
+    const vector<bool> &active = d_activePoints.getValue();
 
     typename OutMatrixDeriv::RowConstIterator rowIt = in.begin();
     typename OutMatrixDeriv::RowConstIterator rowItEnd = in.end();
@@ -744,6 +768,11 @@ void DifferenceMultiMapping<TIn1, TIn2, TOut>::applyJT(
             while (colIt != colItEnd)
             {
                 int childIndex = colIt.index();
+                if (!isActive(active, childIndex))
+                {
+                    colIt++;
+                    continue;
+                }
                 Constraint c = m_constraints[childIndex];
                 const OutDeriv h = colIt.val();
                 int indexBeam = c.eid;
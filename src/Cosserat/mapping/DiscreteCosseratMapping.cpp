@@ -82,9 +82,8 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>:: applyJ(
         TangentTransform Adjoint;
         this->computeAdjoint(Trans, Adjoint);
 
-        Vec6 node_Xi_dot;
-        for (unsigned int u =0; u<6; u++)
-            node_Xi_dot(i) = in1_vel[i-1][u];
+        // Velocity of the strain of the section, which depends on its neighbours with a Magnus interpolation
+        Vec6 node_Xi_dot = this->getIntegratedStrainVelocity(i-1, this->m_nodesStrainJacobians[i], in1_vel);
 
         Vec6 eta_node_i = Adjoint * (m_nodesVelocityVectors[i-1] + m_nodesTangExpVectors[i] *node_Xi_dot );
         m_nodesVelocityVectors.push_back(eta_node_i);
@@ -98,7 +97,7 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>:: applyJ(
         Transform Trans = m_framesExponentialSE3Vectors[i].inversed();
         TangentTransform Adjoint; Adjoint.clear();
         this->computeAdjoint(Trans, Adjoint);
-        Vec6 frame_Xi_dot = in1_vel[m_indicesVectors[i]-1];
+        Vec6 frame_Xi_dot = this->getIntegratedStrainVelocity(m_indicesVectors[i]-1, this->m_framesStrainJacobians[i], in1_vel);
         Vec6 eta_frame_i = Adjoint * (m_nodesVelocityVectors[m_indicesVectors[i]-1] + m_framesTangExpVectors[i] * frame_Xi_dot ); // eta
 
         auto T = Transform(out[i].getCenter(), out[i].getOrientation());
@@ -122,8 +121,8 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>:: applyJT(
     msg_info() << " ########## ApplyJT force R Function ########";
     const OutVecDeriv& in = dataVecInForce[0]->getValue();
 
-    In1VecDeriv out1 = sofa::helper::getWriteAccessor(*dataVecOut1Force[0]);
-    In2VecDeriv out2 = sofa::helper::getWriteAccessor(*dataVecOut2Force[0]);
+    auto out1 = sofa::helper::getWriteAccessor(*dataVecOut1Force[0]);
+    auto out2 = sofa::helper::getWriteAccessor(*dataVecOut2Force[0]);
     const auto baseIndex = d_baseIndex.getValue();
 
     const OutVecCoord& frame = m_toModel->read(sofa::core::ConstVecCoordId::position())->getValue();
@@ -153,8 +152,7 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>:: applyJT(
     Vec6 F_tot; F_tot.clear();
     m_totalBeamForceVectors.push_back(F_tot);
 
-    TangentTransform matB_trans; matB_trans.clear();
-    for(unsigned int k=0; k<3; k++) matB_trans[k][k] = 1.0;
+    const auto addStrainForce = [&out1](unsigned int section, const Deriv1& f) { out1[section] += f; };
 
     for (auto s = sz ; s-- ; ) {
         TangentTransform coAdjoint;
@@ -163,9 +161,9 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>:: applyJT(
         Vec6 node_F_Vec = coAdjoint * local_F_Vec[s];
         Mat6x6 temp = m_framesTangExpVectors[s];   // m_framesTangExpVectors[s] computed in applyJ (here we transpose)
         temp.transpose();
-        Vec6 f = matB_trans * temp * node_F_Vec;
+        Vec6 f = temp * node_F_Vec;
 
-        if(index != m_indicesVectors[s]){
+        while(index != m_indicesVectors[s]){
             index--;
             //bring F_tot to the reference of the new beam
             this->computeCoAdjoint(m_nodesExponentialSE3Vectors[index],coAdjoint);  //m_nodesExponentialSE3Vectors computed in apply
@@ -173,15 +171,14 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>:: applyJT(
             Mat6x6 temp = m_nodesTangExpVectors[index];
             temp.transpose();
             //apply F_tot to the new beam
-            Vec6 temp_f = matB_trans * temp * F_tot;
-            out1[index-1] += temp_f;
+            this->addIntegratedStrainForce(index-1, this->m_nodesStrainJacobians[index], temp * F_tot, addStrainForce);
         }
 
         msg_info() << "f at s ="<< s <<" and index"<< index <<  " is : "<< f;
 
         //compute F_tot
         F_tot += node_F_Vec;
-        out1[m_indicesVectors[s]-1] += f;
+        this->addIntegratedStrainForce(m_indicesVectors[s]-1, this->m_framesStrainJacobians[s], f, addStrainForce);
     }
 
     Transform frame0 = Transform(frame[0].getCenter(),frame[0].getOrientation());
@@ -189,7 +186,7 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>:: applyJT(
     out2[baseIndex] += M * F_tot;
 
     msg_info()
-            << "Node forces "<< out1 << msgendl
+            << "Node forces "<< out1.ref() << msgendl
             << "base Force: "<< out2[baseIndex];
 }
 
@@ -213,9 +210,6 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>::applyJT(
     const In1DataVecCoord* x1fromData = m_fromModel1->read(sofa::core::ConstVecCoordId::position());
     const In1VecCoord x1from = x1fromData->getValue();
 
-    TangentTransform matB_trans; matB_trans.clear();
-    for(unsigned int k=0; k<3; k++) matB_trans[k][k] = 1.0;
-
     vector< std::tuple<int,Vec6> > NodesInvolved;
     vector< std::tuple<int,Vec6> > NodesInvolvedCompressed;
 
@@ -241,6 +235,7 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>::applyJT(
         }
         typename In1MatrixDeriv::RowIterator o1 = out1.writeLine(rowIt.index()); // we store the constraint number
         typename In2MatrixDeriv::RowIterator o2 = out2.writeLine(rowIt.index());
+        const auto addStrainConstraint = [&o1](unsigned int section, const Deriv1& f) { o1.addCol(section, f); };
 
         NodesInvolved.clear();
         while (colIt != colItEnd)
@@ -264,9 +259,9 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>::applyJT(
 
             Vec6 local_F =  coAdjoint * P_trans * valueConst; // constraint direction in local frame of the beam.
 
-            Vec6 f = matB_trans * temp * local_F; // constraint direction in the strain space.
-
-            o1.addCol(indexBeam-1, f);
+            // constraint direction in the strain space.
+            this->addIntegratedStrainForce(indexBeam-1, this->m_framesStrainJacobians[childIndex], temp * local_F,
+                                           addStrainConstraint);
             std::tuple<int,Vec6> node_force = std::make_tuple(indexBeam, local_F);
 
             NodesInvolved.push_back(node_force);
@@ -342,9 +337,9 @@ void DiscreteCosseratMapping<Vec6Types, Rigid3Types, Rigid3Types>::applyJT(
                 // transfer to strain space (local coordinates)
                 Mat6x6 temp = m_nodesTangExpVectors[i-1];
                 temp.transpose();
-                Vec6 temp_f = matB_trans * temp * CumulativeF;
-
-                if(i>1) o1.addCol(i-2, temp_f);
+                if(i>1)
+                    this->addIntegratedStrainForce(i-2, this->m_nodesStrainJacobians[i-1], temp * CumulativeF,
+                                                   addStrainConstraint);
                 i--;
             }
 
@@ -56,6 +56,7 @@ public:
     typedef TIn2 In2;
     typedef TOut Out;
 
+    using typename Inherit1::Deriv1;
     using typename Inherit1::In1VecCoord;
     using typename Inherit1::In1VecDeriv;
     using typename Inherit1::In1MatrixDeriv;
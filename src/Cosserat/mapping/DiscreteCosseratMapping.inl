@@ -253,8 +253,8 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJ(
     Adjoint.clear();
     this->computeAdjoint(Trans, Adjoint);
 
-    /// The null vector is replace by the linear velocity in Vec6Type
-    Vec6 Xi_dot = Vec6(in1_vel[i - 1], Vec3(0.0, 0.0, 0.0));
+    // Velocity of the strain of the section, which depends on its neighbours with a Magnus interpolation
+    Vec6 Xi_dot = this->getIntegratedStrainVelocity(i - 1, this->m_nodesStrainJacobians[i], in1_vel);
 
     Vec6 eta_node_i = Adjoint * (m_nodesVelocityVectors[i - 1] +
                                  m_nodesTangExpVectors[i] * Xi_dot);
@@ -273,12 +273,8 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJ(
         Adjoint; ///< the class insure that the constructed adjoint is zeroed.
     Adjoint.clear();
     this->computeAdjoint(Trans, Adjoint);
-    Vec6 frame_Xi_dot;
-
-    for (auto u = 0; u < 3; u++) {
-      frame_Xi_dot(u) = in1_vel[m_indicesVectors[i] - 1][u];
-      frame_Xi_dot(u + 3) = 0.;
-    }
+    Vec6 frame_Xi_dot = this->getIntegratedStrainVelocity(
+        m_indicesVectors[i] - 1, this->m_framesStrainJacobians[i], in1_vel);
     Vec6 eta_frame_i =
         Adjoint * (m_nodesVelocityVectors[m_indicesVectors[i] - 1] +
                    m_framesTangExpVectors[i] * frame_Xi_dot); // eta
@@ -353,10 +349,9 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJT(
   F_tot.clear();
   m_totalBeamForceVectors.push_back(F_tot);
 
-  Mat3x6 matB_trans;
-  matB_trans.clear();
-  for (unsigned int k = 0; k < 3; k++)
-    matB_trans[k][k] = 1.0;
+  const auto addStrainForce = [&out1](unsigned int section, const Deriv1 &f) {
+    out1[section] += f;
+  };
 
   for (auto s = sz; s--;) {
     Mat6x6 coAdjoint;
@@ -369,9 +364,9 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJT(
         m_framesTangExpVectors[s]; // m_framesTangExpVectors[s] computed in
     // applyJ (here we transpose)
     temp.transpose();
-    Vec3 f = matB_trans * temp * node_F_Vec;
+    const Vec6 f = temp * node_F_Vec;
 
-    if (index != m_indicesVectors[s]) {
+    while (index != m_indicesVectors[s]) {
       index--;
       // bring F_tot to the reference of the new beam
       this->computeCoAdjoint(
@@ -381,8 +376,8 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJT(
       Mat6x6 temp = m_nodesTangExpVectors[index];
       temp.transpose();
       // apply F_tot to the new beam
-      Vec3 temp_f = matB_trans * temp * F_tot;
-      out1[index - 1] += temp_f;
+      this->addIntegratedStrainForce(index - 1, this->m_nodesStrainJacobians[index],
+                                     temp * F_tot, addStrainForce);
     }
     if (d_debug.getValue())
       std::cout << "f at s =" << s << " and index" << index << " is : " << f
@@ -390,7 +385,9 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJT(
 
     // compute F_tot
     F_tot += node_F_Vec;
-    out1[m_indicesVectors[s] - 1] += f;
+    this->addIntegratedStrainForce(m_indicesVectors[s] - 1,
+                                   this->m_framesStrainJacobians[s], f,
+                                   addStrainForce);
   }
 
   Transform frame0 = Transform(frame[0].getCenter(), frame[0].getOrientation());
@@ -439,11 +436,6 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJT(
       m_fromModel1->read(sofa::core::ConstVecCoordId::position());
   const In1VecCoord x1from = x1fromData->getValue();
 
-  Mat3x6 matB_trans;
-  matB_trans.clear();
-  for (unsigned int k = 0; k < 3; k++)
-    matB_trans[k][k] = 1.0;
-
   vector<std::tuple<int, Vec6>> NodesInvolved;
   vector<std::tuple<int, Vec6>> NodesInvolvedCompressed;
   // helper::vector<Vec6> NodesConstraintDirection;
@@ -470,6 +462,10 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJT(
     typename In1MatrixDeriv::RowIterator o1 =
         out1.writeLine(rowIt.index()); // we store the constraint number
     typename In2MatrixDeriv::RowIterator o2 = out2.writeLine(rowIt.index());
+    const auto addStrainConstraint = [&o1](unsigned int section,
+                                           const Deriv1 &f) {
+      o1.addCol(section, f);
+    };
 
     NodesInvolved.clear();
     while (colIt != colItEnd) {
@@ -501,10 +497,10 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJT(
           coAdjoint * P_trans *
           valueConst; // constraint direction in local frame of the beam.
 
-      Vec3 f = matB_trans * temp *
-               local_F; // constraint direction in the strain space.
-
-      o1.addCol(indexBeam - 1, f);
+      // constraint direction in the strain space.
+      this->addIntegratedStrainForce(indexBeam - 1,
+                                     this->m_framesStrainJacobians[childIndex],
+                                     temp * local_F, addStrainConstraint);
       std::tuple<int, Vec6> test = std::make_tuple(indexBeam, local_F);
 
       NodesInvolved.push_back(test);
@@ -576,10 +572,10 @@ void DiscreteCosseratMapping<TIn1, TIn2, TOut>::applyJT(
         // transfer to strain space (local coordinates)
         Mat6x6 temp = m_nodesTangExpVectors[i - 1];
         temp.transpose();
-        Vec3 temp_f = matB_trans * temp * CumulativeF;
-
         if (i > 1)
-          o1.addCol(i - 2, temp_f);
+          this->addIntegratedStrainForce(i - 2, this->m_nodesStrainJacobians[i - 1],
+                                         temp * CumulativeF,
+                                         addStrainConstraint);
         i--;
       }
 
@@ -25,6 +25,7 @@
 
 #include <sofa/core/BaseMapping.h>
 #include <sofa/core/Multi2Mapping.h>
+#include <sofa/core/behavior/BaseMass.h>
 #include <sofa/defaulttype/SolidTypes.h>
 #include <sofa/defaulttype/RigidTypes.h>
 
@@ -45,6 +46,12 @@ using Cosserat::mapping::BaseCosseratMapping;
  * \class DiscretDynamicCosseratMapping
  * @brief Computes and map the length of the beams
  *
+ * When the frames have a mass (e.g. a UniformMass on the output, see frameMass), the velocity dependent
+ * terms of the dynamics of the frames (Coriolis and centrifugal wrenches) are computed in applyJ with a
+ * recursive O(N) pass over the chain, with the mass matrix of each frame read from this mass, and brought
+ * back to the strains and the base with the forces in applyJT. The inertia term J^t M J is the one of
+ * the same mass, mapped by SOFA.
+ *
  * This is a component:
  * https://www.sofa-framework.org/community/doc/programming-with-sofa/create-your-component/
  */
@@ -106,18 +113,25 @@ public:
 
     typedef typename SolidTypes<Real>::Transform      Transform ;
 
+    /// Mass of the frames, its rotational block is the inertia of a frame in its local frame
+    sofa::SingleLink<DiscreteDynamicCosseratMapping<In1,In2,Out>, sofa::core::behavior::BaseMass,
+                     sofa::BaseLink::FLAG_STOREPATH|sofa::BaseLink::FLAG_STRONGLINK> l_frameMass;
+
 protected:
     /// Constructor
     DiscreteDynamicCosseratMapping() ;
     /// Destructor
     ~DiscreteDynamicCosseratMapping()  override {}
 
-    vector<vector<Mat6x3>> m_frameJacobienVector;
-    vector<vector<Mat6x3>> m_frameJacobienDotVector;
-    vector<Mat6x6> m_nodeJacobienVector;
-    vector<vector<Mat6x6>> m_nodeJacobienDotVector;
-    vector<Matrix3> m_MassExpressionVector;
-    Mat6x3 m_matrixBi; // matrixB_i is a constant matrix due to the assumption of constant strain along the section
+    /// Flat arrays filled in O(N) by the recursive pass of applyJ, in the local frames: bias accelerations
+    /// of the nodes and of the frames (their acceleration for a null strain acceleration, i.e. J_dot * q_dot),
+    /// velocities of the frames and their Coriolis and centrifugal wrench [moment, force]
+    vector<Vec6> m_nodesAccelerationBias;
+    vector<Vec6> m_framesAccelerationBias;
+    vector<Vec6> m_framesVelocityVectors;
+    vector<Vec6> m_framesInertialWrench;
+    /// Spatial inertia of each frame in its local frame (twists [w, v]), see computeMassComponent
+    vector<Mat6x6> m_framesMassMatrix;
 
     ////////////////////////// Inherited attributes ////////////////////////////
     /// https://gcc.gnu.org/onlinedocs/gcc/Name-lookup.html
@@ -141,6 +155,8 @@ protected:
     using BaseCosseratMapping<TIn1, TIn2, TOut>::m_toModel;
     using BaseCosseratMapping<TIn1, TIn2, TOut>::m_fromModel1;
     using BaseCosseratMapping<TIn1, TIn2, TOut>::m_fromModel2;
+    using BaseCosseratMapping<TIn1, TIn2, TOut>::m_beamLengthVectors;
+    using BaseCosseratMapping<TIn1, TIn2, TOut>::m_framesLengthVectors;
 
 public:
     /**********************SOFA METHODS**************************/
@@ -179,9 +195,18 @@ public:
 
     /**********************DISCRET DYNAMIC COSSERAT METHODS**************************/
 
-    [[maybe_unused]] void computeMassComponent(const double sectionMass){ SOFA_UNUSED(sectionMass); }
-    void computeJ_Jdot_i(const Mat6x6 &Adjoint, size_t frameId, vector<Mat6x3> &J_i,
-                         const Vec6 &etaFrame, vector<Mat6x3> &J_dot_i);
+    /// Spatial inertia of each frame, read from frameMass: its mass matrix [v, w] reordered as [w, v]
+    void computeMassComponent();
+
+    /// Forward pass over the chain computing the bias accelerations, then the Coriolis and centrifugal wrench
+    /// ad(eta)^t M eta - M a_bias of each frame, which applyJT adds to the forces on the frames
+    void computeInertialWrenches(const In1VecCoord &inDeform, const In1VecDeriv &strainRates);
+
+    /// Variation of the tangent operator of a section along the strain rate, T_dot * Xi_dot (central differences)
+    Vec6 computeTangExpRate(double x, const Coord1 &strain, const Deriv1 &strainRate);
+
+    const vector<Vec6> &getFramesInertialWrench() const { return m_framesInertialWrench; }
+    const vector<Vec6> &getFramesAccelerationBias() const { return m_framesAccelerationBias; }
 
 };
 
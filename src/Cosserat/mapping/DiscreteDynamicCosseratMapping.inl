@@ -25,6 +25,7 @@
 #include <sofa/core/Multi2Mapping.inl>
 #include <sofa/core/visual/VisualParams.h>
 #include <sofa/core/behavior/MechanicalState.h>
+#include <sofa/linearalgebra/FullMatrix.h>
 #include <sofa/core/visual/VisualParams.h>
 #include <sofa/helper/AdvancedTimer.h>
 #include <sofa/core/objectmodel/BaseContext.h>
@@ -43,13 +44,45 @@ using sofa::helper::WriteAccessor;
 
 template <class TIn1, class TIn2, class TOut>
 DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>::DiscreteDynamicCosseratMapping()
+    : l_frameMass(initLink("frameMass", "link to the mass of the frames, searched in the node of the output by default. "
+                           "The Coriolis and centrifugal forces of the frames are added to their forces when it is set"))
 {}
 
 template <class TIn1, class TIn2, class TOut>
 void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>::doBaseCosseratInit()
 {
-    for(size_t i = 0 ; i < 3; i++)
-        m_matrixBi[i][i] = 1.0;
+    // The Jacobians and the inertial terms below use the strain of each section only
+    if (this->getStrainInterpolation() != kinematics::StrainInterpolation::Constant)
+    {
+        msg_warning() << "strainInterpolation is not supported by this mapping, the strain is constant in each section";
+        sofa::helper::OptionsGroup interpolation = this->d_strainInterpolation.getValue();
+        interpolation.setSelectedItem(0);
+        this->d_strainInterpolation.setValue(interpolation);
+    }
+
+    if (l_frameMass.empty())
+    {
+        sofa::core::behavior::BaseMass *mass = nullptr;
+        m_toModel->getContext()->get(mass, BaseContext::Local);
+        if (mass != nullptr)
+            l_frameMass.set(mass);
+    }
+}
+
+template <class TIn1, class TIn2, class TOut>
+void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>::computeMassComponent()
+{
+    // The mass matrix of a rigid frame is ordered as its Deriv [v, w], the twists of the recursion as [w, v]
+    const size_t sz = m_framesVelocityVectors.size();
+    sofa::linearalgebra::FullMatrix<SReal> elementMass;
+    m_framesMassMatrix.resize(sz);
+    for (size_t i = 0; i < sz; i++)
+    {
+        l_frameMass->getElementMass(sofa::Index(i), &elementMass);
+        for (unsigned int r = 0; r < 6; r++)
+            for (unsigned int c = 0; c < 6; c++)
+                m_framesMassMatrix[i][r][c] = elementMass.element((r + 3) % 6, (c + 3) % 6);
+    }
 }
 
 
@@ -70,7 +103,7 @@ void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>::apply(
     const In2VecCoord& in2 = dataVecIn2Pos[0]->getValue();
 
     size_t sz = d_curv_abs_frames.getValue().size();
-    OutVecCoord out = sofa::helper::getWriteAccessor(*dataVecOutPos[0]);
+    auto out = sofa::helper::getWriteAccessor(*dataVecOutPos[0]);
     out.resize(sz);
 
     //update the Exponential Matrices according to new deformation
@@ -111,8 +144,6 @@ void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>:: applyJ(
     sofa::helper::ReadAccessor<Data<vector<double>>> curv_abs_input  = d_curv_abs_section; // This is the vector of X in the paper
     sofa::helper::ReadAccessor<Data<vector<double>>> curv_abs_output = d_curv_abs_frames;
     sofa::helper::ReadAccessor<Data<bool>> debug = d_debug;
-    m_frameJacobienVector.clear();
-    m_frameJacobienDotVector.clear();
 
     // Compute the tangent Exponential SE3 vectors
     const In1VecCoord& inDeform = m_fromModel1->read(sofa::core::ConstVecCoordId::position())->getValue();
@@ -160,6 +191,7 @@ void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>:: applyJ(
     const OutVecCoord& out = m_toModel->read(sofa::core::ConstVecCoordId::position())->getValue();
     size_t sz =curv_abs_output.size();
     outVel.resize(sz);
+    m_framesVelocityVectors.resize(sz);
     for (size_t i = 0 ; i < sz; i++)
     {
         Transform transform= m_framesExponentialSE3Vectors[i].inversed();
@@ -172,11 +204,7 @@ void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>:: applyJ(
         Vec6 etaFrame = tangentTransform * (m_nodesVelocityVectors[m_indicesVectors[i]-1]
                                    + m_framesTangExpVectors[i] * Xi_dot );
 
-        //Compute here jacobien and jacobien_dot
-        vector<Mat6x3> J_i, J_dot_i;
-        computeJ_Jdot_i(tangentTransform, i, J_i, etaFrame, J_dot_i);
-        m_frameJacobienVector.push_back(J_i);
-        m_frameJacobienVector.push_back(J_dot_i);
+        m_framesVelocityVectors[i] = etaFrame;
 
         //Convert from Federico node to Sofa node
         Transform _T = Transform(out[i].getCenter(),out[i].getOrientation());
@@ -190,52 +218,65 @@ void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>:: applyJ(
     //    std::cout << "Inside the apply J, outVel after computation  :  "<< outVel << std::endl;
     dataVecOutVel[0]->endEdit();
     m_indexInput = 0;
+
+    // The velocity dependent forces are only updated with the velocities, not with the other derivatives
+    // (e.g. dx) mapped by applyJ
+    if (l_frameMass.get() != nullptr && dataVecIn1Vel[0] == m_fromModel1->read(sofa::core::ConstVecDerivId::velocity()))
+        computeInertialWrenches(inDeform, in1);
 }
 
 template <class TIn1, class TIn2, class TOut>
-void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>::computeJ_Jdot_i(
-    const Mat6x6 &Adjoint, size_t frameId,
-    vector<Mat6x3> &J_i, const Vec6& etaFrame, vector<Mat6x3> &J_dot_i){
-    size_t sz = d_curv_abs_section.getValue().size();
-    Mat6x3 Si;
-    Mat6x6 M;
-
-    Mat6x3 Si_dot;
-    Mat6x6 adj_eta; //to be computed
-
-    bool reachNode = false;
-    for (unsigned int i = 1; i < sz; i++) {
-        M = Adjoint;
-        unsigned int u = m_indicesVectors[frameId];
-        if(i < u ){
-            for (int j = u; j>0; j--) {
-                M = M * m_nodeAdjointVectors[j] ;
-            }
-            Mat6x6 temp = M * m_nodesTangExpVectors[u];
-            Si = temp * m_matrixBi;
-            J_i.push_back(Si);
-
-            Vec6 etaNode = m_nodesVelocityVectors[i];
-            this->computeAdjoint(etaNode, adj_eta);
-            Si_dot = temp * adj_eta * m_matrixBi;
-            J_dot_i.push_back(Si_dot);
-        }else{
-            if(!reachNode){
-                Mat6x6 temp = M * m_framesTangExpVectors[frameId] ;
-                Si = temp * m_matrixBi;
-                J_i.push_back(Si);
-
-                this->computeAdjoint(etaFrame, adj_eta);
-                Si_dot = temp * adj_eta * m_matrixBi;
-                J_dot_i.push_back(Si_dot);
-                reachNode = true;
-            }else {
-                Si.clear();
-                J_i.push_back(Si);
-                Si_dot.clear();
-                J_dot_i.push_back(Si);
-            }
-        }
+auto DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>::computeTangExpRate(double x, const Coord1 &strain,
+                                                                          const Deriv1 &strainRate) -> Vec6
+{
+    const double epsilon = 1e-6;
+    Mat6x6 TgXPlus, TgXMinus;
+    this->computeTangExp(x, strain + strainRate * epsilon, TgXPlus);
+    this->computeTangExp(x, strain - strainRate * epsilon, TgXMinus);
+    return (TgXPlus - TgXMinus) * Vec6(strainRate, Vec3(0.0, 0.0, 0.0)) / (2.0 * epsilon);
+}
+
+template <class TIn1, class TIn2, class TOut>
+void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>::computeInertialWrenches(const In1VecCoord &inDeform,
+                                                                               const In1VecDeriv &strainRates)
+{
+    // Forward pass: with v_j = Ad(g_j^-1) T_j Xi_dot_j the velocity of a node relative to the previous one,
+    //   eta_j = Ad(g_j^-1) eta_{j-1} + v_j
+    //   a_j   = Ad(g_j^-1) (a_{j-1} + T_dot_j Xi_dot_j) + ad(eta_j) v_j
+    // The acceleration of the base is a DOF, its bias only comes from the rotation of the local frame.
+    const Vec6 &baseVelocity = m_nodesVelocityVectors[0];
+    const Vec3 baseAngular(baseVelocity[0], baseVelocity[1], baseVelocity[2]);
+    const Vec3 baseLinear(baseVelocity[3], baseVelocity[4], baseVelocity[5]);
+    m_nodesAccelerationBias.assign(1, Vec6(Vec3(0.0, 0.0, 0.0), -sofa::type::cross(baseAngular, baseLinear)));
+
+    Mat6x6 adEta;
+    for (size_t i = 1; i < m_nodesVelocityVectors.size(); i++)
+    {
+        const Mat6x6 &Adjoint = m_nodeAdjointVectors[i - 1];
+        const Vec6 relative = Adjoint * (m_nodesTangExpVectors[i] * Vec6(strainRates[i - 1], Vec3(0.0, 0.0, 0.0)));
+        const Vec6 tangRate = computeTangExpRate(m_beamLengthVectors[i - 1], inDeform[i - 1], strainRates[i - 1]);
+        this->computeAdjoint(m_nodesVelocityVectors[i], adEta);
+        m_nodesAccelerationBias.push_back(Adjoint * (m_nodesAccelerationBias[i - 1] + tangRate) + adEta * relative);
+    }
+
+    // Same step from the beginning of the section of each frame, then the inertial wrench of the frame
+    computeMassComponent();
+    const size_t sz = m_framesVelocityVectors.size();
+    m_framesAccelerationBias.resize(sz);
+    m_framesInertialWrench.resize(sz);
+    for (size_t i = 0; i < sz; i++)
+    {
+        const unsigned int section = m_indicesVectors[i] - 1;
+        Mat6x6 Adjoint;
+        this->computeAdjoint(m_framesExponentialSE3Vectors[i].inversed(), Adjoint);
+        const Vec6 relative = Adjoint * (m_framesTangExpVectors[i] * Vec6(strainRates[section], Vec3(0.0, 0.0, 0.0)));
+        const Vec6 tangRate = computeTangExpRate(m_framesLengthVectors[i], inDeform[section], strainRates[section]);
+        this->computeAdjoint(m_framesVelocityVectors[i], adEta);
+        m_framesAccelerationBias[i] = Adjoint * (m_nodesAccelerationBias[section] + tangRate) + adEta * relative;
+
+        // Newton-Euler equation in the local frame: M eta_dot - ad(eta)^t M eta = F
+        const Vec6 momentum = m_framesMassMatrix[i] * m_framesVelocityVectors[i];
+        m_framesInertialWrench[i] = adEta.multTranspose(momentum) - m_framesMassMatrix[i] * m_framesAccelerationBias[i];
     }
 }
 
@@ -275,6 +316,14 @@ void DiscreteDynamicCosseratMapping<TIn1, TIn2, TOut>:: applyJT(
         local_F_Vec.push_back(local_F);
     }
 
+    // Coriolis and centrifugal forces of the frames, computed with the velocities in applyJ
+    if (l_frameMass.get() != nullptr && m_framesInertialWrench.size() == local_F_Vec.size() &&
+        dataVecInForce[0] == m_toModel->read(sofa::core::ConstVecDerivId::force()))
+    {
+        for (size_t var = 0; var < local_F_Vec.size(); ++var)
+            local_F_Vec[var] += m_framesInertialWrench[var];
+    }
+
     //Compute output forces
     size_t sz = m_indicesVectors.size();
 
@@ -14,6 +14,8 @@
 #include <sofa/helper/ColorMap.h>
 
 #include <boost/math/special_functions/legendre.hpp>
+#include <Eigen/Dense>
+#include <Eigen/Sparse>
 
 
 namespace sofa::component::mapping {
@@ -59,10 +61,23 @@ public:
     Data<type::vector<double>> d_vectorOfCurvilinearAbscissa;
     Data<type::vector<double>> d_vectorOfContrePointsAbs;
 
+    /// Basis of the mapping, one row per output (end of a section) and one column per polynomial
+    typedef Eigen::Matrix<Real, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> CoeffsMatrix;
+    typedef Eigen::SparseMatrix<Real, Eigen::RowMajor> SparseCoeffsMatrix;
+    /// A vector of Vec3 seen as a (size x 3) matrix, without copy
+    typedef Eigen::Matrix<Real, Eigen::Dynamic, Coord::total_size, Eigen::RowMajor> StateBlock;
+
 protected:
     LegendrePolynomialsMapping();
     virtual ~LegendrePolynomialsMapping() = default;
-    type::vector<type::vector<double>> m_matOfCoeffs;
+    CoeffsMatrix m_matOfCoeffs;
+    /// Non-zero coefficients of m_matOfCoeffs, used to propagate the constraints
+    SparseCoeffsMatrix m_sparseCoeffs;
+
+    template <class T>
+    static Eigen::Map<StateBlock> asBlock(type::vector<T> &v, sofa::Size size);
+    template <class T>
+    static Eigen::Map<const StateBlock> asBlock(const type::vector<T> &v, sofa::Size size);
 
 public:
 
@@ -71,6 +86,7 @@ public:
     void init() override;
     void reinit() override;
     double legendrePoly(unsigned int n, const double x);
+    const CoeffsMatrix &getMatOfCoeffs() const { return m_matOfCoeffs; }
 
     void apply(const core::MechanicalParams *mparams, Data<VecCoord>& out, const Data<InVecCoord>& in) override;
 
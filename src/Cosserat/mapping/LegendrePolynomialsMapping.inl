@@ -16,6 +16,8 @@
 #include <sofa/core/MechanicalParams.h>
 #include <sofa/component/mapping/nonlinear/RigidMapping.h>
 
+#include <algorithm>
+
 namespace sofa::component::mapping {
 
     template <class TIn, class TOut>
@@ -29,29 +31,57 @@ namespace sofa::component::mapping {
 
     template <class TIn, class TOut>
     double LegendrePolynomialsMapping<TIn, TOut>::legendrePoly(unsigned int n, const double x) {
+        // Bonnet's recurrence: n P_n = (2n - 1) x P_{n-1} - (n - 1) P_{n-2}
+        double previous = 1.;
         if (n == 0)
-            return 1. ;
-        else if (n == 1 )
-            return x ;
-        else
-            return (((2 * x ) - 1) * x * legendrePoly(n - 1, x) - (n - 1) * legendrePoly(n - 2, x)) / double(n);
+            return previous;
+        double current = x;
+        for (unsigned int k = 2; k <= n; k++) {
+            const double next = ((2 * k - 1) * x * current - (k - 1) * previous) / double(k);
+            previous = current;
+            current = next;
+        }
+        return current;
+    }
+
+    template <class TIn, class TOut>
+    template <class T>
+    Eigen::Map<typename LegendrePolynomialsMapping<TIn, TOut>::StateBlock>
+    LegendrePolynomialsMapping<TIn, TOut>::asBlock(type::vector<T> &v, sofa::Size size) {
+        static_assert(sizeof(T) == StateBlock::ColsAtCompileTime * sizeof(Real), "T must be a vector of Real");
+        return Eigen::Map<StateBlock>(reinterpret_cast<Real *>(v.data()), size, StateBlock::ColsAtCompileTime);
+    }
+
+    template <class TIn, class TOut>
+    template <class T>
+    Eigen::Map<const typename LegendrePolynomialsMapping<TIn, TOut>::StateBlock>
+    LegendrePolynomialsMapping<TIn, TOut>::asBlock(const type::vector<T> &v, sofa::Size size) {
+        static_assert(sizeof(T) == StateBlock::ColsAtCompileTime * sizeof(Real), "T must be a vector of Real");
+        return Eigen::Map<const StateBlock>(reinterpret_cast<const Real *>(v.data()), size, StateBlock::ColsAtCompileTime);
     }
 
     template <class TIn, class TOut>
     void LegendrePolynomialsMapping<TIn, TOut>::reinit() {
-        m_matOfCoeffs.clear();
-        auto curvAbs = d_vectorOfCurvilinearAbscissa.getValue();
-        auto  sz = curvAbs.size();
-        // std::cout << " curvAbs :" << curvAbs << std::endl;
-        for (unsigned int i = 1; i < sz; i++){
-            type::vector<double> coeffsOf_i;
-            coeffsOf_i.clear();
-            for (unsigned int order = 0; order < d_order.getValue(); order++)
-                coeffsOf_i.push_back(legendrePoly(order, curvAbs[i]));
-
-            // std::cout << " = = = >coeffsOf_i: " << coeffsOf_i << std::endl;
-            m_matOfCoeffs.push_back(coeffsOf_i);
+        const auto &curvAbs = d_vectorOfCurvilinearAbscissa.getValue();
+        const unsigned int order = d_order.getValue();
+        const sofa::Size nbOut = curvAbs.empty() ? 0 : curvAbs.size() - 1;
+
+        // The polynomials are evaluated at the end of each section, all orders in one pass
+        m_matOfCoeffs.resize(nbOut, order);
+        for (sofa::Index i = 0; i < nbOut; i++) {
+            const double x = curvAbs[i + 1];
+            for (unsigned int n = 0; n < order; n++) {
+                if (n == 0)
+                    m_matOfCoeffs(i, n) = 1.;
+                else if (n == 1)
+                    m_matOfCoeffs(i, n) = x;
+                else
+                    m_matOfCoeffs(i, n) = ((2 * n - 1) * x * m_matOfCoeffs(i, n - 1) - (n - 1) * m_matOfCoeffs(i, n - 2)) / double(n);
+            }
         }
+
+        m_sparseCoeffs = m_matOfCoeffs.sparseView();
+        m_sparseCoeffs.makeCompressed();
     }
 
 
@@ -70,19 +100,12 @@ namespace sofa::component::mapping {
     {
         helper::ReadAccessor< Data<InVecCoord> > in = dIn;
         helper::WriteOnlyAccessor< Data<VecCoord> > out = dOut;
-        const auto sz = d_vectorOfCurvilinearAbscissa.getValue().size();
-        out.resize(sz-1);
+        const sofa::Size nbOut = m_matOfCoeffs.rows();
+        const sofa::Size nbIn = std::min<sofa::Size>(in.size(), m_matOfCoeffs.cols());
+        out.resize(nbOut);
 
-        // std::cout<< "Apply :  in " << in[0] <<std::endl;
-        for (unsigned int i = 0; i < sz-1; i++){
-            type::Vec3 Xi ;
-            for (unsigned int j = 0; j < in.size(); j++)
-                Xi += m_matOfCoeffs[i][j] * in[j];
-
-            // std::cout << "   Xi : "<< Xi << std::endl;
-            out[i] = Xi;
-        }
-        // std::cout<< " " << std::endl;
+        // out = M * in, with the states seen as (size x 3) matrices
+        asBlock(out.wref(), nbOut).noalias() = m_matOfCoeffs.leftCols(nbIn) * asBlock(in.ref(), nbIn);
     }
 
     template <class TIn, class TOut>
@@ -90,22 +113,11 @@ namespace sofa::component::mapping {
     {
         helper::WriteOnlyAccessor< Data<VecDeriv> > velOut = dOut;
         helper::ReadAccessor< Data<InVecDeriv> > velIn = dIn;
+        const sofa::Size nbOut = m_matOfCoeffs.rows();
+        const sofa::Size nbIn = std::min<sofa::Size>(velIn.size(), m_matOfCoeffs.cols());
+        velOut.resize(nbOut);
 
-        helper::WriteOnlyAccessor< Data<VecDeriv> > out = dOut;
-
-        const auto sz = d_vectorOfCurvilinearAbscissa.getValue().size();
-        out.resize(sz-1);
-        // std::cout<< "ApplyJ : "<< std::endl;
-        for(sofa::Index i=0 ; i<sz-1 ; ++i)
-        {
-            type::Vec3 vel ;
-            for (unsigned int j = 0; j < velIn.size(); j++)
-                vel += m_matOfCoeffs[i][j] * velIn[j];
-
-            // std::cout << " vel :" << vel << std::endl;
-            velOut[i] = vel;
-        }
-        // std::cout<< "ApplyJ : "<< velIn << "  out : "<< velOut << std::endl;
+        asBlock(velOut.wref(), nbOut).noalias() = m_matOfCoeffs.leftCols(nbIn) * asBlock(velIn.ref(), nbIn);
     }
 
     template <class TIn, class TOut>
@@ -115,16 +127,12 @@ namespace sofa::component::mapping {
         helper::ReadAccessor< Data<VecDeriv> > in = dIn;
         const unsigned int numDofs = this->getFromModel()->getSize();
         out.resize(numDofs);
-        for (unsigned int cI = 0; cI < out.size(); cI++){
-            for(sofa::Index i=0 ; i<in.size() ; ++i){
-                // std::cout << " cI:" << cI << " i:"<< i <<" m_matOfCoeffs[i][cI] : "<< m_matOfCoeffs[i][cI] * in[i]<< std::endl;
-                //@todo use alpha factor
-                out[cI] += m_matOfCoeffs[i][cI] * in[i];
-            }
-        }
-        // std::cout << "J on mapped DOFs == " << in[0] << "; size :"<< in.size()
-        //  << "\nJ on input  DOFs == " << out[0] << "; size :"<< out.size()  << std::endl;
-        // std::cout<< "ApplyJT : "<< in << "  out : "<< out << std::endl;
+
+        //@todo use alpha factor
+        // out += M^T * in, M is row-major so the product runs along its rows
+        const sofa::Size nbIn = std::min<sofa::Size>(numDofs, m_matOfCoeffs.cols());
+        const sofa::Size nbOut = std::min<sofa::Size>(in.size(), m_matOfCoeffs.rows());
+        asBlock(out.wref(), nbIn).noalias() += m_matOfCoeffs.topLeftCorner(nbOut, nbIn).transpose() * asBlock(in.ref(), nbOut);
     }
 
 // RigidMapping::applyJT( InMatrixDeriv& out, const OutMatrixDeriv& in ) //
@@ -139,11 +147,16 @@ void LegendrePolynomialsMapping<TIn, TOut>::applyJT(const core::ConstraintParams
         InMatrixDeriv& out = *dOut.beginEdit();
         const OutMatrixDeriv& in = dIn.getValue();
 
-        const unsigned int numDofs = this->getFromModel()->getSize();
+        const sofa::Size numDofs = std::min<sofa::Size>(this->getFromModel()->getSize(), m_sparseCoeffs.cols());
+        const sofa::Size nbOut = m_sparseCoeffs.rows();
 
-        typename Out::MatrixDeriv::RowConstIterator rowItEnd = in.end();
-        type::vector<InDeriv> tabF; tabF.resize(numDofs);
+        // The forces of one constraint line are accumulated per order, then written once per order
+        type::vector<InDeriv> lineForces(numDofs);
+        type::vector<bool> isUsed(numDofs, false);
+        type::vector<sofa::Index> usedOrders;
+        usedOrders.reserve(numDofs);
 
+        typename Out::MatrixDeriv::RowConstIterator rowItEnd = in.end();
         for (typename Out::MatrixDeriv::RowConstIterator rowIt = in.begin(); rowIt != rowItEnd; ++rowIt)
         {
             typename OutMatrixDeriv::ColConstIterator colIt = rowIt.begin();
@@ -152,21 +165,39 @@ void LegendrePolynomialsMapping<TIn, TOut>::applyJT(const core::ConstraintParams
             if (colIt == colItEnd)
                 continue;
 
-            typename InMatrixDeriv::RowIterator o = out.writeLine(rowIt.index()); // we store the constraint number
+            usedOrders.clear();
             while (colIt != colItEnd) {
-                int childIndex = colIt.index();
+                const sofa::Index childIndex = colIt.index();
                 const OutDeriv f_It = colIt.val();
-                for (unsigned int order = 0; order < numDofs; order++){
-                    InDeriv f;
-                    f = m_matOfCoeffs[childIndex][order] * f_It;
-                    tabF[order] += f;
-                    o.addCol(order, f);
-                }
                 colIt++;
+                if (childIndex >= nbOut)
+                    continue;
+
+                // Only the non-zero coefficients of the child row are visited
+                for (typename SparseCoeffsMatrix::InnerIterator coeffIt(m_sparseCoeffs, childIndex); coeffIt; ++coeffIt) {
+                    const sofa::Index order = coeffIt.col();
+                    if (order >= numDofs)
+                        break;
+                    if (!isUsed[order]) {
+                        isUsed[order] = true;
+                        lineForces[order] = InDeriv();
+                        usedOrders.push_back(order);
+                    }
+                    lineForces[order] += coeffIt.value() * f_It;
+                }
+            }
+
+            if (usedOrders.empty())
+                continue;
+
+            std::sort(usedOrders.begin(), usedOrders.end());
+            typename InMatrixDeriv::RowIterator o = out.writeLine(rowIt.index()); // we store the constraint number
+            for (const sofa::Index order : usedOrders) {
+                o.addCol(order, lineForces[order]);
+                isUsed[order] = false;
             }
         }
 
-        // std::cout << "applyJT Constraint : new J on input  DOFs = \n" << out << std::endl;
         dOut.endEdit();
 }
 
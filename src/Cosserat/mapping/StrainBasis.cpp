@@ -0,0 +1,154 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#include <Cosserat/mapping/StrainBasis.h>
+
+#include <algorithm>
+#include <cmath>
+
+namespace Cosserat::basis
+{
+
+void evaluateLegendre(unsigned int nbFunctions, double x, double *values, double *derivatives)
+{
+    for (unsigned int n = 0; n < nbFunctions; n++)
+    {
+        // Bonnet's recurrence: n P_n = (2n - 1) x P_{n-1} - (n - 1) P_{n-2}, P'_n = x P'_{n-1} + n P_{n-1}
+        if (n == 0)
+            values[n] = 1.0;
+        else if (n == 1)
+            values[n] = x;
+        else
+            values[n] = ((2 * n - 1) * x * values[n - 1] - (n - 1) * values[n - 2]) / double(n);
+
+        if (derivatives)
+            derivatives[n] = (n == 0) ? 0.0 : x * derivatives[n - 1] + n * values[n - 1];
+    }
+}
+
+void evaluateChebyshev(unsigned int nbFunctions, double x, double *values, double *derivatives)
+{
+    for (unsigned int n = 0; n < nbFunctions; n++)
+    {
+        // T_n = 2x T_{n-1} - T_{n-2}, T'_n = 2 T_{n-1} + 2x T'_{n-1} - T'_{n-2}
+        if (n == 0)
+            values[n] = 1.0;
+        else if (n == 1)
+            values[n] = x;
+        else
+            values[n] = 2 * x * values[n - 1] - values[n - 2];
+
+        if (derivatives)
+        {
+            if (n == 0)
+                derivatives[n] = 0.0;
+            else if (n == 1)
+                derivatives[n] = 1.0;
+            else
+                derivatives[n] = 2 * values[n - 1] + 2 * x * derivatives[n - 1] - derivatives[n - 2];
+        }
+    }
+}
+
+void evaluateBSpline(unsigned int nbFunctions, unsigned int degree, double x, double *values, double *derivatives)
+{
+    if (nbFunctions <= degree)
+        return;
+
+    // Clamped uniform knots: degree+1 zeros, the interior knots, degree+1 ones
+    const unsigned int nbKnots = nbFunctions + degree + 1;
+    const unsigned int nbSpans = nbFunctions - degree;
+    vector<double> knots(nbKnots);
+    for (unsigned int i = 0; i < nbKnots; i++)
+        knots[i] = std::clamp(double(int(i) - int(degree)) / nbSpans, 0.0, 1.0);
+
+    x = std::clamp(x, 0.0, 1.0);
+
+    // Cox-de Boor, N holds the functions of the current degree, the last non-empty span is closed at x = 1
+    vector<double> N(nbKnots - 1, 0.0);
+    const unsigned int span = std::min<unsigned int>(degree + static_cast<unsigned int>(x * nbSpans), nbFunctions - 1);
+    N[span] = 1.0;
+
+    vector<double> previous;
+    for (unsigned int k = 1; k <= degree; k++)
+    {
+        if (k == degree)
+            previous = N;
+        for (unsigned int i = 0; i + k < nbKnots - 1; i++)
+        {
+            const double left = knots[i + k] - knots[i];
+            const double right = knots[i + k + 1] - knots[i + 1];
+            double value = 0.0;
+            if (left > 0.0)
+                value += (x - knots[i]) / left * N[i];
+            if (right > 0.0)
+                value += (knots[i + k + 1] - x) / right * N[i + 1];
+            N[i] = value;
+        }
+    }
+
+    std::copy(N.begin(), N.begin() + nbFunctions, values);
+
+    if (derivatives)
+    {
+        for (unsigned int i = 0; i < nbFunctions; i++)
+        {
+            derivatives[i] = 0.0;
+            if (degree == 0)
+                continue;
+            const double left = knots[i + degree] - knots[i];
+            const double right = knots[i + degree + 1] - knots[i + 1];
+            if (left > 0.0)
+                derivatives[i] += degree / left * previous[i];
+            if (right > 0.0)
+                derivatives[i] -= degree / right * previous[i + 1];
+        }
+    }
+}
+
+void gaussLegendreRule(unsigned int nbPoints, double a, double b, vector<double> &points, vector<double> &weights)
+{
+    points.resize(nbPoints);
+    weights.resize(nbPoints);
+
+    vector<double> values(nbPoints + 1), derivatives(nbPoints + 1);
+    for (unsigned int i = 0; i < nbPoints; i++)
+    {
+        // Newton iterations on the roots of P_n, starting from the Chebyshev-like guess
+        double t = std::cos(M_PI * (i + 0.75) / (nbPoints + 0.5));
+        for (unsigned int it = 0; it < 100; it++)
+        {
+            evaluateLegendre(nbPoints + 1, t, values.data(), derivatives.data());
+            const double dt = values[nbPoints] / derivatives[nbPoints];
+            t -= dt;
+            if (std::abs(dt) < 1e-15)
+                break;
+        }
+        evaluateLegendre(nbPoints + 1, t, values.data(), derivatives.data());
+
+        // Map from [-1, 1] to [a, b], the points are sorted by increasing abscissa
+        const double w = 2.0 / ((1.0 - t * t) * derivatives[nbPoints] * derivatives[nbPoints]);
+        points[nbPoints - 1 - i] = 0.5 * (a + b) + 0.5 * (b - a) * t;
+        weights[nbPoints - 1 - i] = 0.5 * (b - a) * w;
+    }
+}
+
+} // namespace Cosserat::basis
@@ -0,0 +1,49 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+
+#include <Cosserat/config.h>
+#include <sofa/type/vector.h>
+
+/// Free functions evaluating the bases used to reduce the strain of a rod, see StrainBasisMapping.
+/// Each function fills the values (and optionally the derivatives, pass nullptr otherwise) of the
+/// first nbFunctions functions of the basis at the abscissa x.
+namespace Cosserat::basis
+{
+using sofa::type::vector;
+
+/// Legendre polynomials P_0 ... P_{nbFunctions-1}
+SOFA_COSSERAT_API void evaluateLegendre(unsigned int nbFunctions, double x, double *values, double *derivatives);
+
+/// Chebyshev polynomials of the first kind T_0 ... T_{nbFunctions-1}
+SOFA_COSSERAT_API void evaluateChebyshev(unsigned int nbFunctions, double x, double *values, double *derivatives);
+
+/// The nbFunctions clamped B-splines of the given degree, with uniform knots on [0, 1].
+/// nbFunctions must be larger than degree, x is clamped to [0, 1].
+SOFA_COSSERAT_API void evaluateBSpline(unsigned int nbFunctions, unsigned int degree, double x,
+                                       double *values, double *derivatives);
+
+/// Gauss-Legendre quadrature with nbPoints points on [a, b]
+SOFA_COSSERAT_API void gaussLegendreRule(unsigned int nbPoints, double a, double b,
+                                         vector<double> &points, vector<double> &weights);
+
+} // namespace Cosserat::basis
@@ -0,0 +1,36 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#define SOFA_COSSERAT_CPP_StrainBasisMapping
+#include <Cosserat/mapping/StrainBasisMapping.inl>
+
+#include <sofa/defaulttype/VecTypes.h>
+#include <sofa/core/ObjectFactory.h>
+
+namespace sofa::component::mapping
+{
+    using namespace defaulttype;
+
+    // Register in the Factory
+    int StrainBasisMappingClass = core::RegisterObject("Map the coefficients of a reduced basis (Legendre, Chebyshev, B-spline or custom) to the strain of the sections")
+                                   .add< StrainBasisMapping< sofa::defaulttype::Vec3Types, sofa::defaulttype::Vec3Types > >() ;
+    template class SOFA_COSSERAT_API StrainBasisMapping< sofa::defaulttype::Vec3Types, sofa::defaulttype::Vec3Types >;
+} // namespace sofa::component::mapping
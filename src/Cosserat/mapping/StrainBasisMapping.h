@@ -0,0 +1,87 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+#include <Cosserat/config.h>
+#include <Cosserat/mapping/LegendrePolynomialsMapping.h>
+#include <sofa/helper/OptionsGroup.h>
+
+namespace sofa::component::mapping {
+
+/*!
+ * \class StrainBasisMapping
+ * @brief Maps the coefficients of a reduced basis to the strain of each section
+ *
+ * Generalization of LegendrePolynomialsMapping: the strain at the end of each section is
+ * out[i] = sum_j B_j(curvAbscissa[i+1]) * in[j], where the basis B is chosen with basisType:
+ *  - legendre:  the Legendre polynomials, same basis as LegendrePolynomialsMapping,
+ *  - chebyshev: the Chebyshev polynomials of the first kind,
+ *  - bspline:   order clamped B-splines of degree splineDegree on [0, 1],
+ *  - custom:    a table given by customBasis, one row per curvilinear abscissa and one column
+ *               per basis function, linearly interpolated inside the sections.
+ * The values and derivatives of the basis at the section abscissas and at nbGaussPoints Gauss
+ * points per section are computed once in reinit.
+ */
+template<class TIn, class TOut>
+class StrainBasisMapping : public LegendrePolynomialsMapping<TIn, TOut>
+{
+public:
+    SOFA_CLASS(SOFA_TEMPLATE2(StrainBasisMapping,TIn,TOut), SOFA_TEMPLATE2(LegendrePolynomialsMapping,TIn,TOut));
+    typedef LegendrePolynomialsMapping<TIn, TOut> Inherit;
+    typedef typename Inherit::Real Real;
+    typedef typename Inherit::CoeffsMatrix CoeffsMatrix;
+
+    Data<helper::OptionsGroup> d_basisType;
+    Data<unsigned int> d_splineDegree;
+    Data<unsigned int> d_nbGaussPoints;
+    Data<type::vector<type::vector<Real>>> d_customBasis;
+
+    /// Outputs
+    Data<type::vector<Real>> d_gaussAbscissa;
+    Data<type::vector<Real>> d_gaussWeights;
+
+protected:
+    StrainBasisMapping();
+    virtual ~StrainBasisMapping() = default;
+
+    /// Derivatives of the basis with respect to the abscissa, same layout as m_matOfCoeffs
+    CoeffsMatrix m_derivatives;
+    /// Values and derivatives of the basis at the Gauss points, nbGaussPoints rows per section
+    CoeffsMatrix m_gaussBasis;
+    CoeffsMatrix m_gaussDerivatives;
+
+    bool checkBasis();
+    /// Values and derivatives of the basis at x, which belongs to the given section
+    void evaluateBasis(double x, sofa::Index section, double *values, double *derivatives);
+
+public:
+    void reinit() override;
+
+    const CoeffsMatrix &getBasisDerivatives() const { return m_derivatives; }
+    const CoeffsMatrix &getGaussBasis() const { return m_gaussBasis; }
+    const CoeffsMatrix &getGaussBasisDerivatives() const { return m_gaussDerivatives; }
+};
+
+#if !defined(SOFA_COSSERAT_CPP_StrainBasisMapping)
+extern template class SOFA_COSSERAT_API StrainBasisMapping< sofa::defaulttype::Vec3Types, sofa::defaulttype::Vec3Types >;
+#endif
+
+}
@@ -0,0 +1,185 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+#include <Cosserat/mapping/StrainBasisMapping.h>
+#include <Cosserat/mapping/LegendrePolynomialsMapping.inl>
+#include <Cosserat/mapping/StrainBasis.h>
+
+namespace sofa::component::mapping {
+
+    using sofa::helper::OptionsGroup;
+
+    template <class TIn, class TOut>
+    StrainBasisMapping<TIn, TOut>::StrainBasisMapping()
+        : Inherit()
+        , d_basisType(initData(&d_basisType, {"legendre", "chebyshev", "bspline", "custom"}, "basisType",
+                               "The basis of the strain: legendre, chebyshev, bspline or custom"))
+        , d_splineDegree(initData(&d_splineDegree, (unsigned)3, "splineDegree", "The degree of the B-splines, order must be larger"))
+        , d_nbGaussPoints(initData(&d_nbGaussPoints, (unsigned)2, "nbGaussPoints", "The number of Gauss points per section"))
+        , d_customBasis(initData(&d_customBasis, "customBasis",
+                                 "Custom basis, one row per curvAbscissa and one column per basis function"))
+        , d_gaussAbscissa(initData(&d_gaussAbscissa, "gaussAbscissa", "The abscissa of the Gauss points (output)"))
+        , d_gaussWeights(initData(&d_gaussWeights, "gaussWeights", "The weights of the Gauss points (output)"))
+    {
+        d_gaussAbscissa.setReadOnly(true);
+        d_gaussWeights.setReadOnly(true);
+    }
+
+    template <class TIn, class TOut>
+    bool StrainBasisMapping<TIn, TOut>::checkBasis()
+    {
+        const auto &curvAbs = this->d_vectorOfCurvilinearAbscissa.getValue();
+        const unsigned int nbFunctions = this->d_order.getValue();
+
+        if (curvAbs.size() < 2)
+        {
+            msg_error() << "curvAbscissa needs at least two values";
+            return false;
+        }
+        switch (d_basisType.getValue().getSelectedId())
+        {
+        case 2:
+            if (nbFunctions <= d_splineDegree.getValue())
+            {
+                msg_error() << "order (" << nbFunctions << ") must be larger than splineDegree (" << d_splineDegree.getValue() << ")";
+                return false;
+            }
+            break;
+        case 3:
+        {
+            const auto &table = d_customBasis.getValue();
+            if (table.size() != curvAbs.size())
+            {
+                msg_error() << "customBasis has " << table.size() << " rows, one per curvAbscissa is expected (" << curvAbs.size() << ")";
+                return false;
+            }
+            for (const auto &row : table)
+            {
+                if (row.size() < nbFunctions)
+                {
+                    msg_error() << "each row of customBasis needs at least order (" << nbFunctions << ") values";
+                    return false;
+                }
+            }
+            break;
+        }
+        default:
+            break;
+        }
+        return true;
+    }
+
+    template <class TIn, class TOut>
+    void StrainBasisMapping<TIn, TOut>::evaluateBasis(double x, sofa::Index section, double *values, double *derivatives)
+    {
+        const unsigned int nbFunctions = this->d_order.getValue();
+        switch (d_basisType.getValue().getSelectedId())
+        {
+        case 1:
+            Cosserat::basis::evaluateChebyshev(nbFunctions, x, values, derivatives);
+            break;
+        case 2:
+            Cosserat::basis::evaluateBSpline(nbFunctions, d_splineDegree.getValue(), x, values, derivatives);
+            break;
+        case 3:
+        {
+            // Linear interpolation of the table inside the section
+            const auto &curvAbs = this->d_vectorOfCurvilinearAbscissa.getValue();
+            const auto &table = d_customBasis.getValue();
+            const double length = curvAbs[section + 1] - curvAbs[section];
+            const double t = (length > 0.) ? (x - curvAbs[section]) / length : 1.;
+            for (unsigned int j = 0; j < nbFunctions; j++)
+            {
+                const double begin = table[section][j];
+                const double end = table[section + 1][j];
+                values[j] = begin + t * (end - begin);
+                derivatives[j] = (length > 0.) ? (end - begin) / length : 0.;
+            }
+            break;
+        }
+        default:
+            Cosserat::basis::evaluateLegendre(nbFunctions, x, values, derivatives);
+            break;
+        }
+    }
+
+    template <class TIn, class TOut>
+    void StrainBasisMapping<TIn, TOut>::reinit()
+    {
+        const auto &curvAbs = this->d_vectorOfCurvilinearAbscissa.getValue();
+        const unsigned int nbFunctions = this->d_order.getValue();
+        const sofa::Size nbSections = curvAbs.empty() ? 0 : curvAbs.size() - 1;
+        const unsigned int nbGaussPoints = d_nbGaussPoints.getValue();
+
+        this->m_matOfCoeffs.setZero(nbSections, nbFunctions);
+        m_derivatives.setZero(nbSections, nbFunctions);
+        m_gaussBasis.setZero(nbSections * nbGaussPoints, nbFunctions);
+        m_gaussDerivatives.setZero(nbSections * nbGaussPoints, nbFunctions);
+
+        if (!checkBasis())
+        {
+            this->d_componentState.setValue(sofa::core::objectmodel::ComponentState::Invalid);
+            this->m_sparseCoeffs = this->m_matOfCoeffs.sparseView();
+            return;
+        }
+
+        // Basis at the end of each section, as in LegendrePolynomialsMapping
+        type::vector<double> values(nbFunctions), derivatives(nbFunctions);
+        for (sofa::Index i = 0; i < nbSections; i++)
+        {
+            evaluateBasis(curvAbs[i + 1], i, values.data(), derivatives.data());
+            for (unsigned int j = 0; j < nbFunctions; j++)
+            {
+                this->m_matOfCoeffs(i, j) = values[j];
+                m_derivatives(i, j) = derivatives[j];
+            }
+        }
+
+        // Basis at the Gauss points of each section
+        helper::WriteOnlyAccessor<Data<type::vector<Real>>> gaussAbscissa = d_gaussAbscissa;
+        helper::WriteOnlyAccessor<Data<type::vector<Real>>> gaussWeights = d_gaussWeights;
+        gaussAbscissa.clear();
+        gaussWeights.clear();
+        type::vector<double> points, weights;
+        for (sofa::Index i = 0; i < nbSections; i++)
+        {
+            Cosserat::basis::gaussLegendreRule(nbGaussPoints, curvAbs[i], curvAbs[i + 1], points, weights);
+            for (unsigned int k = 0; k < nbGaussPoints; k++)
+            {
+                const sofa::Index row = i * nbGaussPoints + k;
+                evaluateBasis(points[k], i, values.data(), derivatives.data());
+                for (unsigned int j = 0; j < nbFunctions; j++)
+                {
+                    m_gaussBasis(row, j) = values[j];
+                    m_gaussDerivatives(row, j) = derivatives[j];
+                }
+                gaussAbscissa.push_back(points[k]);
+                gaussWeights.push_back(weights[k]);
+            }
+        }
+
+        this->m_sparseCoeffs = this->m_matOfCoeffs.sparseView();
+        this->m_sparseCoeffs.makeCompressed();
+        this->d_componentState.setValue(sofa::core::objectmodel::ComponentState::Valid);
+    }
+
+}
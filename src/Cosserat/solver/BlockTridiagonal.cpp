@@ -0,0 +1,137 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#include <Cosserat/solver/BlockTridiagonal.h>
+
+namespace Cosserat::solver
+{
+
+void BlockTridiagonalFactorization::setStructure(unsigned int blockSize, unsigned int nbBlocks,
+                                                 unsigned int borderSize, bool borderFirst)
+{
+    m_blockSize = blockSize;
+    m_nbBlocks = nbBlocks;
+    m_borderSize = borderSize;
+    m_borderFirst = borderFirst;
+
+    const unsigned int chainSize = blockSize * nbBlocks;
+    m_diagonal.assign(nbBlocks, Matrix::Zero(blockSize, blockSize));
+    m_lower.assign(nbBlocks > 0 ? nbBlocks - 1 : 0, Matrix::Zero(blockSize, blockSize));
+    m_upper.assign(m_lower.size(), Matrix::Zero(blockSize, blockSize));
+    m_borderColumns.setZero(chainSize, borderSize);
+    m_borderRows.setZero(borderSize, chainSize);
+    m_border.setZero(borderSize, borderSize);
+}
+
+bool BlockTridiagonalFactorization::add(unsigned int row, unsigned int col, double value)
+{
+    if (row >= size() || col >= size())
+        return false;
+
+    const bool rowInBorder = inBorder(row);
+    const bool colInBorder = inBorder(col);
+    if (rowInBorder && colInBorder)
+        m_border(row - borderBegin(), col - borderBegin()) += value;
+    else if (rowInBorder)
+        m_borderRows(row - borderBegin(), col - chainBegin()) += value;
+    else if (colInBorder)
+        m_borderColumns(row - chainBegin(), col - borderBegin()) += value;
+    else
+    {
+        const unsigned int i = (row - chainBegin()) / m_blockSize, r = (row - chainBegin()) % m_blockSize;
+        const unsigned int j = (col - chainBegin()) / m_blockSize, c = (col - chainBegin()) % m_blockSize;
+        if (i == j)
+            m_diagonal[i](r, c) += value;
+        else if (i == j + 1)
+            m_lower[j](r, c) += value;
+        else if (j == i + 1)
+            m_upper[i](r, c) += value;
+        else
+            return false;
+    }
+    return true;
+}
+
+bool BlockTridiagonalFactorization::factorize()
+{
+    m_pivots.resize(m_nbBlocks);
+    m_gains.resize(m_upper.size());
+
+    // Forward elimination of the chain: S_i = D_i - L_{i-1} S_{i-1}^-1 U_{i-1}
+    for (unsigned int i = 0; i < m_nbBlocks; i++)
+    {
+        if (i == 0)
+            m_pivots[i].compute(m_diagonal[i]);
+        else
+            m_pivots[i].compute(m_diagonal[i] - m_lower[i - 1] * m_gains[i - 1]);
+        if (!m_pivots[i].isInvertible())
+            return false;
+        if (i < m_upper.size())
+            m_gains[i] = m_pivots[i].solve(m_upper[i]);
+    }
+
+    // Schur complement of the chain in the bordered system
+    if (m_borderSize > 0)
+    {
+        m_solvedColumns = m_borderColumns;
+        solveChain(m_solvedColumns);
+        m_schur.compute(m_border - m_borderRows * m_solvedColumns);
+        if (!m_schur.isInvertible())
+            return false;
+    }
+    return true;
+}
+
+void BlockTridiagonalFactorization::solveChain(Eigen::Ref<Matrix> B) const
+{
+    if (m_nbBlocks == 0)
+        return;
+    const unsigned int s = m_blockSize;
+    // Forward: w_i = S_i^-1 (b_i - L_{i-1} w_{i-1})
+    for (unsigned int i = 0; i < m_nbBlocks; i++)
+    {
+        if (i > 0)
+            B.middleRows(i * s, s) -= m_lower[i - 1] * B.middleRows((i - 1) * s, s);
+        B.middleRows(i * s, s) = m_pivots[i].solve(B.middleRows(i * s, s));
+    }
+    // Backward: x_i = w_i - S_i^-1 U_i x_{i+1}
+    for (unsigned int i = m_nbBlocks - 1; i-- > 0;)
+        B.middleRows(i * s, s) -= m_gains[i] * B.middleRows((i + 1) * s, s);
+}
+
+void BlockTridiagonalFactorization::solve(Matrix &X) const
+{
+    const unsigned int chainSize = m_blockSize * m_nbBlocks;
+    if (m_nbBlocks > 0)
+        solveChain(X.middleRows(chainBegin(), chainSize));
+    if (m_borderSize == 0)
+        return;
+
+    // x_border = (E - R T^-1 C)^-1 (b_border - R T^-1 b_chain), x_chain = T^-1 b_chain - T^-1 C x_border
+    auto border = X.middleRows(borderBegin(), m_borderSize);
+    if (m_nbBlocks > 0)
+        border -= m_borderRows * X.middleRows(chainBegin(), chainSize);
+    border = m_schur.solve(Matrix(border));
+    if (m_nbBlocks > 0)
+        X.middleRows(chainBegin(), chainSize) -= m_solvedColumns * border;
+}
+
+} // namespace Cosserat::solver
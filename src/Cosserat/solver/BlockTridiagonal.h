@@ -0,0 +1,103 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+
+#include <Cosserat/config.h>
+#include <sofa/type/vector.h>
+
+#include <Eigen/Dense>
+
+/// Block LU factorization of the block-tridiagonal systems with a dense border, see BlockTridiagonalSolver.
+namespace Cosserat::solver
+{
+using sofa::type::vector;
+
+/*!
+ * \class BlockTridiagonalFactorization
+ * @brief O(N) factorization of a block-tridiagonal matrix bordered by a few dense rows and columns
+ *
+ * The DOFs of the system are nbBlocks blocks of blockSize DOFs (the strains of the sections), each
+ * block only coupled to its neighbours, and borderSize DOFs (the rigid base) coupled to every block,
+ * placed before the blocks if borderFirst, after them otherwise:
+ *
+ *     | T   C |   T block-tridiagonal (the chain)
+ *     | R   E |   C, R the coupling with the border, E the border
+ *
+ * The chain is factorized with the block Thomas algorithm, S_0 = D_0, S_i = D_i - L_{i-1} S_{i-1}^-1 U_{i-1},
+ * and the border with its Schur complement E - R T^-1 C. Both the factorization and a solve are linear
+ * in the number of blocks.
+ */
+class SOFA_COSSERAT_API BlockTridiagonalFactorization
+{
+public:
+    using Matrix = Eigen::Matrix<double, Eigen::Dynamic, Eigen::Dynamic>;
+    using LU = Eigen::FullPivLU<Matrix>;
+
+    /// Sets the structure of the system and sets all its entries to zero
+    void setStructure(unsigned int blockSize, unsigned int nbBlocks, unsigned int borderSize, bool borderFirst);
+
+    unsigned int size() const { return m_blockSize * m_nbBlocks + m_borderSize; }
+    unsigned int getBlockSize() const { return m_blockSize; }
+    unsigned int getNbBlocks() const { return m_nbBlocks; }
+    unsigned int getBorderSize() const { return m_borderSize; }
+    bool isBorderFirst() const { return m_borderFirst; }
+
+    /// Adds value to the entry (row, col) of the system. Returns false, without changing the system,
+    /// if the entry is outside of the structure.
+    bool add(unsigned int row, unsigned int col, double value);
+
+    /// Factorizes the system, returns false if it is singular
+    bool factorize();
+
+    /// Replaces each column b of X (size() rows) by the solution of A x = b, factorize must have succeeded
+    void solve(Matrix &X) const;
+
+protected:
+    unsigned int m_blockSize{0};
+    unsigned int m_nbBlocks{0};
+    unsigned int m_borderSize{0};
+    bool m_borderFirst{true};
+
+    /// Blocks of the chain: D_i, L_i = A(i + 1, i) and U_i = A(i, i + 1)
+    vector<Matrix> m_diagonal;
+    vector<Matrix> m_lower;
+    vector<Matrix> m_upper;
+    /// Border: C = A(chain, border), R = A(border, chain) and E = A(border, border)
+    Matrix m_borderColumns;
+    Matrix m_borderRows;
+    Matrix m_border;
+
+    /// Factorization: LU of the pivots S_i, S_i^-1 U_i, T^-1 C and LU of the Schur complement
+    vector<LU> m_pivots;
+    vector<Matrix> m_gains;
+    Matrix m_solvedColumns;
+    LU m_schur;
+
+    unsigned int chainBegin() const { return m_borderFirst ? m_borderSize : 0; }
+    unsigned int borderBegin() const { return m_borderFirst ? 0 : m_blockSize * m_nbBlocks; }
+    bool inBorder(unsigned int i) const { return i >= borderBegin() && i < borderBegin() + m_borderSize; }
+
+    /// Solves T X = B in place, B having blockSize * nbBlocks rows
+    void solveChain(Eigen::Ref<Matrix> B) const;
+};
+
+} // namespace Cosserat::solver
@@ -0,0 +1,36 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#define SOFA_COSSERAT_CPP_BlockTridiagonalSolver
+#include <Cosserat/solver/BlockTridiagonalSolver.inl>
+
+#include <sofa/core/ObjectFactory.h>
+
+namespace sofa::component::linearsolver
+{
+    using sofa::linearalgebra::CompressedRowSparseMatrix;
+    using sofa::linearalgebra::FullVector;
+
+    // Register in the Factory
+    int BlockTridiagonalSolverClass = core::RegisterObject("Direct linear solver of the block-tridiagonal systems with a dense border, O(N) when every mass and force field acts on the blocks (e.g. the strains of a rod), sparse LDL^t otherwise")
+                                   .add< BlockTridiagonalSolver< CompressedRowSparseMatrix<SReal>, FullVector<SReal> > >(true);
+    template class SOFA_COSSERAT_API BlockTridiagonalSolver< CompressedRowSparseMatrix<SReal>, FullVector<SReal> >;
+} // namespace sofa::component::linearsolver
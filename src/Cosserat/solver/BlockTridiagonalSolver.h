@@ -0,0 +1,102 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+
+#include <Cosserat/config.h>
+#include <Cosserat/solver/BlockTridiagonal.h>
+
+#include <sofa/component/linearsolver/iterative/MatrixLinearSolver.h>
+#include <sofa/linearalgebra/CompressedRowSparseMatrix.h>
+#include <sofa/linearalgebra/FullVector.h>
+
+#include <Eigen/SparseCholesky>
+
+namespace sofa::component::linearsolver
+{
+
+/*!
+ * \class BlockTridiagonalSolver
+ * @brief Direct linear solver of the systems that are block-tridiagonal with a dense border
+ *
+ * BlockTridiagonalFactorization factorizes and solves in O(N), without the symbolic factorization of
+ * SparseLDLSolver, the systems made of blocks of blockSize DOFs each coupled to its neighbours only,
+ * bordered by borderSize DOFs coupled to all of them. In a Cosserat rod, this is the system of the
+ * strains (cosseratCoordinate) and of the rigid base (rigidBase) only when every mass and force field
+ * acts on the strains directly, e.g. BeamHookeLawForceField with a mass on the strains or without mass.
+ *
+ * It is not an O(N) solver of the dynamics of the rods of the python prefabs, nor of any rod with a
+ * mass or a force field on its frames: the mapping assembles J^t M J and J^t K J, which couple all the
+ * sections, and the solver only sees the assembled matrix, so it cannot fold them into the recursion.
+ * The structure is detected at each factorization from the non-zero entries of the assembled matrix,
+ * with the border either before or after the blocks (the order of the mechanical states in the scene).
+ * If an entry breaks it, the system is factorized with a sparse LDL^t, as SparseLDLSolver does, a
+ * warning is emitted once and chainStructure is false.
+ *
+ * The compliance J A^-1 J^t needed by GenericConstraintCorrection is computed with one O(N) solve per
+ * constraint, all the constraints being solved together.
+ */
+template<class TMatrix, class TVector>
+class BlockTridiagonalSolver : public sofa::component::linearsolver::MatrixLinearSolver<TMatrix, TVector>
+{
+public:
+    SOFA_CLASS(SOFA_TEMPLATE2(BlockTridiagonalSolver, TMatrix, TVector),
+               SOFA_TEMPLATE2(sofa::component::linearsolver::MatrixLinearSolver, TMatrix, TVector));
+
+    typedef sofa::component::linearsolver::MatrixLinearSolver<TMatrix, TVector> Inherit;
+    typedef TMatrix Matrix;
+    typedef TVector Vector;
+    typedef typename Inherit::JMatrixType JMatrixType;
+    typedef typename Inherit::ResMatrixType ResMatrixType;
+    typedef Cosserat::solver::BlockTridiagonalFactorization Factorization;
+
+    Data<unsigned int> d_blockSize;
+    Data<unsigned int> d_borderSize;
+
+    /// Output
+    Data<bool> d_chainStructure;
+
+    void invert(Matrix &M) override;
+    void solve(Matrix &M, Vector &x, Vector &b) override;
+    bool addJMInvJtLocal(Matrix *M, ResMatrixType *result, const JMatrixType *J, SReal fact) override;
+
+protected:
+    BlockTridiagonalSolver();
+
+    Factorization m_factorization;
+    /// Fallback when the system does not have the structure of a chain
+    Eigen::SimplicialLDLT<Eigen::SparseMatrix<double>> m_sparseLDLT;
+    bool m_useChain{false};
+    bool m_factorized{false};
+    bool m_warned{false};
+
+    /// Adds the non-zero entries of M to the factorization, returns false if one is outside of its structure
+    bool fillFactorization(Matrix &M);
+    void factorizeSparse(Matrix &M);
+    /// Replaces each column of X by its product with the inverse of the system
+    void applyInverse(Factorization::Matrix &X) const;
+};
+
+#if !defined(SOFA_COSSERAT_CPP_BlockTridiagonalSolver)
+extern template class SOFA_COSSERAT_API BlockTridiagonalSolver< sofa::linearalgebra::CompressedRowSparseMatrix<SReal>, sofa::linearalgebra::FullVector<SReal> >;
+#endif
+
+} // namespace sofa::component::linearsolver
@@ -0,0 +1,180 @@
+/******************************************************************************
+ *       SOFA, Simulation Open-Framework Architecture, development version     *
+ *                (c) 2006-2019 INRIA, USTL, UJF, CNRS, MGH                    *
+ *                                                                             *
+ * This program is free software; you can redistribute it and/or modify it     *
+ * under the terms of the GNU Lesser General Public License as published by    *
+ * the Free Software Foundation; either version 2.1 of the License, or (at     *
+ * your option) any later version.                                             *
+ *                                                                             *
+ * This program is distributed in the hope that it will be useful, but WITHOUT *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or       *
+ * FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License *
+ * for more details.                                                           *
+ *                                                                             *
+ * You should have received a copy of the GNU Lesser General Public License    *
+ * along with this program. If not, see <http://www.gnu.org/licenses/>.        *
+ *******************************************************************************
+ * Authors: The SOFA Team and external contributors (see Authors.txt)          *
+ *                                                                             *
+ * Contact information: contact@sofa-framework.org                             *
+ ******************************************************************************/
+#pragma once
+
+#include <Cosserat/solver/BlockTridiagonalSolver.h>
+
+#include <algorithm>
+#include <vector>
+
+namespace sofa::component::linearsolver
+{
+
+template<class TMatrix, class TVector>
+BlockTridiagonalSolver<TMatrix, TVector>::BlockTridiagonalSolver()
+    : d_blockSize(initData(&d_blockSize, 3u, "blockSize",
+                           "Number of DOFs of a block of the chain, the size of the strain of a section (3 or 6)"))
+    , d_borderSize(initData(&d_borderSize, 6u, "borderSize",
+                            "Number of DOFs coupled to the whole chain, 6 for the rigid base, 0 without base in the system"))
+    , d_chainStructure(initData(&d_chainStructure, false, "chainStructure",
+                                "True if the last system was factorized as a chain in O(N), false if it was factorized with a sparse LDL^t (output)"))
+{
+    d_chainStructure.setReadOnly(true);
+}
+
+template<class TMatrix, class TVector>
+bool BlockTridiagonalSolver<TMatrix, TVector>::fillFactorization(Matrix &M)
+{
+    const auto &rowIndex = M.getRowIndex();
+    const auto &rowBegin = M.getRowBegin();
+    const auto &colsIndex = M.getColsIndex();
+    const auto &colsValue = M.getColsValue();
+    for (std::size_t xi = 0; xi < rowIndex.size(); ++xi)
+    {
+        for (auto xj = rowBegin[xi]; xj < rowBegin[xi + 1]; ++xj)
+        {
+            const double value = colsValue[xj];
+            if (value != 0.0 && !m_factorization.add(rowIndex[xi], colsIndex[xj], value))
+                return false;
+        }
+    }
+    return true;
+}
+
+template<class TMatrix, class TVector>
+void BlockTridiagonalSolver<TMatrix, TVector>::factorizeSparse(Matrix &M)
+{
+    const unsigned int n = M.rowSize();
+    const auto &rowIndex = M.getRowIndex();
+    const auto &rowBegin = M.getRowBegin();
+    const auto &colsIndex = M.getColsIndex();
+    const auto &colsValue = M.getColsValue();
+    std::vector<Eigen::Triplet<double>> entries;
+    entries.reserve(colsValue.size());
+    for (std::size_t xi = 0; xi < rowIndex.size(); ++xi)
+        for (auto xj = rowBegin[xi]; xj < rowBegin[xi + 1]; ++xj)
+            entries.emplace_back(rowIndex[xi], colsIndex[xj], colsValue[xj]);
+
+    Eigen::SparseMatrix<double> sparse(n, n);
+    sparse.setFromTriplets(entries.begin(), entries.end());
+    m_sparseLDLT.compute(sparse);
+    m_factorized = m_sparseLDLT.info() == Eigen::Success;
+}
+
+template<class TMatrix, class TVector>
+void BlockTridiagonalSolver<TMatrix, TVector>::invert(Matrix &M)
+{
+    M.compress();
+    const unsigned int n = M.rowSize();
+    const unsigned int blockSize = d_blockSize.getValue();
+    const unsigned int borderSize = std::min(d_borderSize.getValue(), n);
+
+    // Try the border before the chain (rigidBase created before cosseratCoordinate), then after it
+    m_useChain = false;
+    if (blockSize > 0 && (n - borderSize) % blockSize == 0)
+    {
+        for (bool borderFirst : {true, false})
+        {
+            m_factorization.setStructure(blockSize, (n - borderSize) / blockSize, borderSize, borderFirst);
+            if (fillFactorization(M))
+            {
+                m_useChain = m_factorization.factorize();
+                break;
+            }
+            if (borderSize == 0)
+                break;
+        }
+    }
+
+    if (m_useChain)
+        m_factorized = true;
+    else
+    {
+        if (!m_warned)
+            msg_warning() << "The system of size " << n << " is not a chain of blocks of " << blockSize
+                          << " DOFs bordered by " << borderSize << " DOFs, or one of its pivots is singular. "
+                          << "It is factorized with a sparse LDL^t, as SparseLDLSolver does. A mass or a force field "
+                          << "on the frames of a rod (e.g. the python prefabs) is mapped on all the sections.";
+        m_warned = true;
+        factorizeSparse(M);
+        if (!m_factorized)
+            msg_error() << "The system is singular";
+    }
+    d_chainStructure.setValue(m_useChain);
+}
+
+template<class TMatrix, class TVector>
+void BlockTridiagonalSolver<TMatrix, TVector>::applyInverse(Factorization::Matrix &X) const
+{
+    if (m_useChain)
+        m_factorization.solve(X);
+    else
+        X = m_sparseLDLT.solve(Factorization::Matrix(X));
+}
+
+template<class TMatrix, class TVector>
+void BlockTridiagonalSolver<TMatrix, TVector>::solve(Matrix & /*M*/, Vector &x, Vector &b)
+{
+    if (!m_factorized)
+        return;
+
+    const unsigned int n = b.size();
+    Factorization::Matrix X(n, 1);
+    for (unsigned int i = 0; i < n; i++)
+        X(i, 0) = b[i];
+    applyInverse(X);
+    for (unsigned int i = 0; i < n; i++)
+        x[i] = X(i, 0);
+}
+
+template<class TMatrix, class TVector>
+bool BlockTridiagonalSolver<TMatrix, TVector>::addJMInvJtLocal(Matrix *M, ResMatrixType *result,
+                                                                const JMatrixType *J, SReal fact)
+{
+    if (!m_factorized)
+        return false;
+
+    // One right-hand side per line of J, all solved together: Y = A^-1 J^t
+    type::vector<decltype(J->begin())> lines;
+    for (auto jit = J->begin(); jit != J->end(); ++jit)
+        lines.push_back(jit);
+    Factorization::Matrix Y = Factorization::Matrix::Zero(M->rowSize(), lines.size());
+    for (std::size_t k = 0; k < lines.size(); ++k)
+        for (auto it = lines[k]->second.begin(); it != lines[k]->second.end(); ++it)
+            Y(it->first, k) = it->second;
+    applyInverse(Y);
+
+    // result += fact * J Y, with the sparse lines of J
+    for (std::size_t k1 = 0; k1 < lines.size(); ++k1)
+    {
+        for (std::size_t k2 = 0; k2 < lines.size(); ++k2)
+        {
+            double value = 0.0;
+            for (auto it = lines[k1]->second.begin(); it != lines[k1]->second.end(); ++it)
+                value += it->second * Y(it->first, k2);
+            result->add(lines[k1]->first, lines[k2]->first, fact * value);
+        }
+    }
+    return true;
+}
+
+} // namespace sofa::component::linearsolver